@@ -0,0 +1,97 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+import logging
+
+from labbenchstudios.pdt.common.SimulationClock import SimulationClock
+
+class ClockScheduler():
+	"""
+	Scheduler for interval jobs driven by the SimulationClock, used by
+	the managers in place of an APScheduler BackgroundScheduler when the
+	clock isn't in real time mode. It supports the same subset of the
+	BackgroundScheduler API the managers use (add_job(), start(),
+	shutdown() and running).
+	
+	"""
+	
+	def __init__(self, clock: SimulationClock = None):
+		"""
+		Constructor.
+		
+		@param clock The clock that runs the jobs (the SimulationClock instance if None).
+		"""
+		self.clock = clock if clock else SimulationClock()
+		self.jobSpecs = []
+		self.jobs = []
+		self.running = False
+	
+	def add_job(self, func, trigger: str = 'interval', seconds: float = 1.0, **kwargs):
+		"""
+		Adds an interval job, which is scheduled on the clock when the
+		scheduler is started. APScheduler options such as max_instances
+		and coalesce are accepted but not needed - clock jobs never run
+		concurrently, and missed runs are always coalesced.
+		
+		@param func The function to run (no args).
+		@param trigger The trigger type. Only 'interval' is supported.
+		@param seconds The interval between runs, in simulated seconds.
+		"""
+		if trigger != 'interval':
+			raise ValueError('Unsupported clock scheduler trigger: ' + str(trigger))
+		
+		self.jobSpecs.append((func, seconds))
+		
+		if self.running:
+			self.jobs.append(self.clock.addIntervalJob(func, seconds))
+	
+	def shutdown(self, wait: bool = True):
+		"""
+		Removes the scheduler's jobs from the clock.
+		
+		"""
+		for job in self.jobs:
+			self.clock.removeJob(job)
+		
+		self.jobs = []
+		self.running = False
+	
+	def start(self):
+		"""
+		Schedules the jobs on the clock. In scaled time mode, this also
+		starts the clock thread; in stepped mode, the clock must be
+		stepped (or its thread started) separately.
+		
+		"""
+		if self.running:
+			logging.warning("Clock scheduler already started. Ignoring.")
+			return
+		
+		self.running = True
+		self.jobs = [self.clock.addIntervalJob(func, seconds) for func, seconds in self.jobSpecs]
+		
+		if self.clock.getMode() == SimulationClock.SCALED_TIME_MODE:
+			self.clock.startClock()
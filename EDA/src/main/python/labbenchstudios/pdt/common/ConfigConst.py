@@ -152,6 +152,66 @@ CMD_DATA_PERSISTENCE_NAME    = 'pdt-cmd-data'
 CONN_DATA_PERSISTENCE_NAME   = 'pdt-conn-data'
 SENSOR_DATA_PERSISTENCE_NAME = 'pdt-sensor-data'
 SYS_DATA_PERSISTENCE_NAME    = 'pdt-sys-data'
+ROLLUP_DATA_PERSISTENCE_NAME = 'pdt-rollup-data'
+
+DEFAULT_ROLLUP_WINDOW_SECS   = 60
+DEFAULT_MAX_SEGMENT_BYTES    = 16777216
+DEFAULT_MAX_SEGMENT_SECS     = 3600
+DEFAULT_INDEX_INTERVAL_BYTES = 4096
+DEFAULT_FILE_DATA_STORE_PATH = './data'
+DEFAULT_SQLITE_DB_FILE       = './data/pdt-historian.db'
+DEFAULT_WRITE_BATCH_SIZE     = 500
+DEFAULT_PRUNE_INTERVAL_SECS  = 60
+DEFAULT_DATA_RETENTION_SECS  = 0
+DEFAULT_SPILL_FILE_PATH      = './data/pdt-tsdb-spill.lp'
+DEFAULT_SPILL_REINGEST_RATE  = 1000
+DEFAULT_SPILL_CHECK_INTERVAL_SECS = 10
+DEFAULT_WRITE_MODE           = 'sync'
+DEFAULT_WRITE_FLUSH_INTERVAL_MILLIS = 1000
+DEFAULT_CACHE_MAX_ENTRIES    = 1024
+DEFAULT_CACHE_STRIPE_COUNT   = 16
+DEFAULT_SENSOR_HISTORY_MAX_SAMPLES = 3600
+DEFAULT_SENSOR_HISTORY_SECS  = 600
+DEFAULT_EWMA_ALPHA           = 0.1
+DEFAULT_Z_SCORE_THRESHOLD    = 4.0
+DEFAULT_WARMUP_SAMPLES       = 30
+DEFAULT_MAD_WINDOW_SIZE      = 31
+DEFAULT_STUCK_SAMPLE_COUNT   = 20
+DEFAULT_STUCK_TOLERANCE      = 0.0
+DEFAULT_MAX_SILENCE_SECS     = 300
+DEFAULT_MIN_POLL_SECS        = 1.0
+DEFAULT_MAX_POLL_SECS        = 60.0
+DEFAULT_LOWER_CHANGE_PCT     = 0.1
+DEFAULT_UPPER_CHANGE_PCT     = 2.0
+DEFAULT_MAX_PENDING_MESSAGES = 100
+DEFAULT_MIN_VALUE_SCALE      = 1.0
+DEFAULT_RATED_WIND_SPEED     = 12.0
+DEFAULT_FORECAST_ALPHA       = 0.3
+DEFAULT_FORECAST_BETA        = 0.1
+DEFAULT_FORECAST_MIN_SAMPLES = 10
+DEFAULT_FORECAST_HORIZON_SECS = 300
+DEFAULT_FLEET_DEVICE_COUNT   = 100
+DEFAULT_FLEET_DEVICE_ID_PREFIX = 'fleetDevice'
+
+# anomaly status codes (negative codes set the data's error flag)
+OUTLIER_ANOMALY_STATUS       = -10
+STUCK_SENSOR_ANOMALY_STATUS  = -11
+
+MIN_PROP         = 'min'
+MAX_PROP         = 'max'
+MEAN_PROP        = 'mean'
+COUNT_PROP       = 'count'
+WINDOW_SECS_PROP = 'windowSecs'
+
+VERSION_PROP             = 'version'
+REQUEST_PROP             = 'request'
+FORMAT_PROP              = 'format'
+SENSOR_DATA_PROP         = 'sensorData'
+ACTUATOR_RESPONSES_PROP  = 'actuatorResponses'
+SYS_PERF_DATA_PROP       = 'systemPerformanceData'
+CONN_STATE_DATA_PROP     = 'connectionStateData'
+FORECASTS_PROP           = 'forecasts'
+HORIZON_SECS_PROP        = 'horizonSecs'
 
 #####
 # Resource and Topic Names
@@ -168,8 +228,16 @@ SENSOR_MSG        = 'SensorMsg'
 SYSTEM_PERF_MSG   = 'SystemPerfMsg'
 
 UPDATE_NOTIFICATIONS_MSG      = 'UpdateMsg'
+TWIN_STATE_MSG                = 'TwinStateMsg'
+ANOMALY_MSG                   = 'AnomalyMsg'
+FORECAST_MSG                  = 'ForecastMsg'
 RESOURCE_REGISTRATION_REQUEST = 'ResourceRegRequest'
 
+# system request names and response formats
+TWIN_STATE_SNAPSHOT_REQUEST = 'TwinStateSnapshot'
+JSON_FORMAT                 = 'json'
+BINARY_FORMAT               = 'binary'
+
 LED_ACTUATOR_NAME        = 'Lighting'
 HUMIDIFIER_ACTUATOR_NAME = 'Humidifier'
 HVAC_ACTUATOR_NAME       = 'HVAC'
@@ -187,6 +255,7 @@ THERMOSTAT_NAME      = 'Thermostat'
 HYGROMETER_NAME      = 'Hygrometer'
 HVAC_NAME            = 'HVAC'
 WIND_TURBINE_NAME    = 'WindTurbine'
+WIND_FARM_NAME       = 'WindFarm'
 SYSTEM_MGMT_NAME     = 'EdgeComputingDevice'
 SYSTEM_PERF_NAME     = 'EdgeComputingDevice'
 CAMERA_SENSOR_NAME   = 'Camera'
@@ -194,6 +263,10 @@ CAMERA_SENSOR_NAME   = 'Camera'
 POWER_OUTPUT_NAME     = 'PowerOutput'
 ROTATIONAL_SPEED_NAME = 'RotationalSpeed'
 WIND_SPEED_NAME       = 'WindSpeed'
+DEW_POINT_NAME        = 'DewPoint'
+HEAT_INDEX_NAME       = 'HeatIndex'
+CAPACITY_FACTOR_NAME  = 'CapacityFactor'
+POWER_COEFF_NAME      = 'PowerCoefficient'
 BRAKE_SYSTEM_NAME     = 'BrakeSystem'
 
 COMMAND_ON  = 1
@@ -217,6 +290,8 @@ THERMOSTAT_TYPE           = 1004
 HUMIDITY_SENSOR_TYPE      = 1010
 PRESSURE_SENSOR_TYPE      = 1012
 TEMP_SENSOR_TYPE          = 1013
+DEW_POINT_SENSOR_TYPE     = 1014
+HEAT_INDEX_SENSOR_TYPE    = 1015
 
 DISPLAY_CATEGORY_TYPE     = 2000
 DISPLAY_DEVICE_TYPE       = DISPLAY_CATEGORY_TYPE
@@ -251,6 +326,9 @@ WIND_TURBINE_POWER_OUTPUT_SENSOR_TYPE     = 4301
 WIND_TURBINE_GENERATOR_TEMP_SENSOR_TYPE   = 4302
 WIND_TURBINE_ROTATIONAL_SPEED_SENSOR_TYPE = 4303
 WIND_TURBINE_AIR_SPEED_SENSOR_TYPE        = 4304
+WIND_TURBINE_CAPACITY_FACTOR_SENSOR_TYPE  = 4305
+WIND_TURBINE_POWER_COEFF_SENSOR_TYPE      = 4306
+WIND_FARM_POWER_OUTPUT_SENSOR_TYPE        = 4307
 
 WIND_TURBINE_BRAKE_SYSTEM_ACTUATOR_TYPE   = 4320
 
@@ -276,11 +354,17 @@ ENABLE_PRODUCTION_NAME = 'enableProduction'
 POWER_DRAW_NAME = 'powerDraw'
 AMBIENT_TEMPERATURE_NAME = 'ambientTemperature'
 ITEMS_PRODUCED_NAME = 'itemsProduced'
+THROUGHPUT_NAME = 'throughput'
+UTILIZATION_NAME = 'utilization'
+WORK_IN_PROGRESS_NAME = 'workInProgress'
 FACTORY_WORKCELL_TYPE_CATEGORY = 6300
 FACTORY_WORKCELL_GENERIC_TYPE = FACTORY_WORKCELL_TYPE_CATEGORY
 FACTORY_WORKCELL_POWER_DRAW_TYPE = 6301
 FACTORY_WORKCELL_AMBIENT_TEMP_TYPE = 6302
 FACTORY_WORKCELL_ITEMS_PRODUCED_TYPE = 6310
+FACTORY_WORKCELL_THROUGHPUT_TYPE = 6311
+FACTORY_WORKCELL_UTILIZATION_TYPE = 6312
+FACTORY_WORKCELL_WIP_TYPE = 6313
 
 FACTORY_WORKCELL_ENABLE_PRODUCTION_ACTUATOR_TYPE = 6320
 
@@ -328,6 +412,9 @@ CDA_MEDIA_DATA_MSG_RESOURCE           = PRODUCT_NAME + '/' + CONSTRAINED_DEVICE
 CDA_REGISTRATION_REQUEST_RESOURCE     = PRODUCT_NAME + '/' + CONSTRAINED_DEVICE + '/' + RESOURCE_REGISTRATION_REQUEST
 CDA_SENSOR_DATA_MSG_RESOURCE          = PRODUCT_NAME + '/' + CONSTRAINED_DEVICE + '/' + SENSOR_MSG
 CDA_SYSTEM_PERF_MSG_RESOURCE          = PRODUCT_NAME + '/' + CONSTRAINED_DEVICE + '/' + SYSTEM_PERF_MSG
+CDA_TWIN_STATE_MSG_RESOURCE           = PRODUCT_NAME + '/' + CONSTRAINED_DEVICE + '/' + TWIN_STATE_MSG
+CDA_ANOMALY_MSG_RESOURCE              = PRODUCT_NAME + '/' + CONSTRAINED_DEVICE + '/' + ANOMALY_MSG
+CDA_FORECAST_MSG_RESOURCE             = PRODUCT_NAME + '/' + CONSTRAINED_DEVICE + '/' + FORECAST_MSG
 
 #####
 # Configuration Sections, Keys and Defaults
@@ -364,6 +451,16 @@ SYSTEM_PERF_SETTINGS_KEY      = SETTINGS_KEY + '.' + 'SystemPerformance'
 ENVIRONMENTAL_SETTINGS_KEY    = SETTINGS_KEY + '.' + 'Environmental'
 WIND_TURBINE_SETTINGS_KEY     = SETTINGS_KEY + '.' + 'WindTurbine'
 FACTORY_WORKCELL_SETTINGS_KEY = SETTINGS_KEY + '.' + 'FactoryWorkcell'
+PERSISTENCE_SETTINGS_KEY      = SETTINGS_KEY + '.' + 'Persistence'
+RULE_ENGINE_SETTINGS_KEY      = SETTINGS_KEY + '.' + 'RuleEngine'
+ANOMALY_DETECTION_SETTINGS_KEY = SETTINGS_KEY + '.' + 'AnomalyDetection'
+REPORT_BY_EXCEPTION_SETTINGS_KEY = SETTINGS_KEY + '.' + 'ReportByException'
+ADAPTIVE_POLLING_SETTINGS_KEY = SETTINGS_KEY + '.' + 'AdaptivePolling'
+DERIVED_METRICS_SETTINGS_KEY  = SETTINGS_KEY + '.' + 'DerivedMetrics'
+FORECASTING_SETTINGS_KEY      = SETTINGS_KEY + '.' + 'Forecasting'
+FLEET_SIM_SETTINGS_KEY        = SETTINGS_KEY + '.' + 'FleetSim'
+REPLAY_SETTINGS_KEY           = SETTINGS_KEY + '.' + 'Replay'
+CLOCK_SETTINGS_KEY            = SETTINGS_KEY + '.' + 'Clock'
 
 DEVICE_ID_KEY          = 'deviceID'
 DEVICE_LOCATION_ID_KEY = 'deviceLocationID'
@@ -416,11 +513,122 @@ ENABLE_MQTT_CLIENT_KEY = 'enableMqttClient'
 ENABLE_COAP_CLIENT_KEY = 'enableCoapClient'
 ENABLE_COAP_SERVER_KEY = 'enableCoapServer'
 
+CMD_DATA_BUCKET_KEY     = 'cmdDataBucket'
+CONN_DATA_BUCKET_KEY    = 'connDataBucket'
+SENSOR_DATA_BUCKET_KEY  = 'sensorDataBucket'
+SYS_DATA_BUCKET_KEY     = 'sysDataBucket'
+ROLLUP_DATA_BUCKET_KEY  = 'rollupDataBucket'
+
+PERSISTENCE_TYPE_KEY        = 'persistenceType'
+INFLUX_PERSISTENCE_TYPE     = 'Influx'
+FILE_PERSISTENCE_TYPE       = 'File'
+SQLITE_PERSISTENCE_TYPE     = 'Sqlite'
+
+FILE_DATA_STORE_PATH_KEY    = 'fileDataStorePath'
+MAX_SEGMENT_BYTES_KEY       = 'maxSegmentBytes'
+MAX_SEGMENT_SECS_KEY        = 'maxSegmentSecs'
+INDEX_INTERVAL_BYTES_KEY    = 'indexIntervalBytes'
+SQLITE_DB_FILE_KEY          = 'sqliteDbFile'
+WRITE_BATCH_SIZE_KEY        = 'writeBatchSize'
+DATA_RETENTION_SECS_KEY     = 'dataRetentionSecs'
+
+ENABLE_ROLLUP_KEY              = 'enableRollup'
+STORE_RAW_SENSOR_DATA_KEY      = 'storeRawSensorData'
+ROLLUP_WINDOW_SECS_KEY         = 'rollupWindowSecs'
+RAW_DATA_RETENTION_SECS_KEY    = 'rawDataRetentionSecs'
+ROLLUP_DATA_RETENTION_SECS_KEY = 'rollupDataRetentionSecs'
+
+ENABLE_SPILL_FILE_KEY          = 'enableSpillFile'
+SPILL_FILE_PATH_KEY            = 'spillFilePath'
+SPILL_REINGEST_RATE_KEY        = 'spillReingestRate'
+SPILL_CHECK_INTERVAL_SECS_KEY  = 'spillCheckIntervalSecs'
+
+WRITE_MODE_KEY                 = 'writeMode'
+SYNC_WRITE_MODE                = 'sync'
+BATCH_WRITE_MODE               = 'batch'
+WRITE_FLUSH_INTERVAL_MILLIS_KEY = 'writeFlushIntervalMillis'
+
+CACHE_MAX_ENTRIES_KEY          = 'cacheMaxEntries'
+CACHE_STRIPE_COUNT_KEY         = 'cacheStripeCount'
+SENSOR_HISTORY_MAX_SAMPLES_KEY = 'sensorHistoryMaxSamples'
+SENSOR_HISTORY_SECS_KEY        = 'sensorHistorySecs'
+
 ENABLE_ROBOTIC_MANIPULATOR_KEY = 'enableRoboticManipulator'
 ENABLE_CONVEYOR_KEY = 'enableConveyor'
 ENABLE_HOPPER_KEY = 'enableHopper'
 ENABLE_PALLET_LOADING_KEY = 'enablePalletLoading'
 
+# sensor data rule engine
+RULE_CONFIG_FILE_KEY           = 'ruleConfigFile'
+
+# rule file properties and supported rule types
+RULES_PROP                = 'rules'
+RULE_TYPE_PROP            = 'ruleType'
+THRESHOLD_RULE_TYPE       = 'Threshold'
+HYSTERESIS_RULE_TYPE      = 'Hysteresis'
+RATE_OF_CHANGE_RULE_TYPE  = 'RateOfChange'
+DURATION_RULE_TYPE        = 'Duration'
+FORECAST_RULE_TYPE        = 'Forecast'
+
+# streaming anomaly detection
+ENABLE_ANOMALY_DETECTION_KEY   = 'enableAnomalyDetection'
+DETECTION_METHOD_KEY           = 'detectionMethod'
+EWMA_DETECTION_METHOD          = 'ewma'
+MAD_DETECTION_METHOD           = 'mad'
+EWMA_ALPHA_KEY                 = 'ewmaAlpha'
+Z_SCORE_THRESHOLD_KEY          = 'zScoreThreshold'
+WARMUP_SAMPLES_KEY             = 'warmupSamples'
+MAD_WINDOW_SIZE_KEY            = 'madWindowSize'
+STUCK_SAMPLE_COUNT_KEY         = 'stuckSampleCount'
+STUCK_TOLERANCE_KEY            = 'stuckTolerance'
+
+# report-by-exception (dead-band) filtering
+ENABLE_REPORT_BY_EXCEPTION_KEY = 'enableReportByException'
+ABSOLUTE_DEAD_BAND_KEY         = 'absoluteDeadBand'
+PERCENT_DEAD_BAND_KEY          = 'percentDeadBand'
+TYPE_ABSOLUTE_DEAD_BANDS_KEY   = 'typeAbsoluteDeadBands'
+TYPE_PERCENT_DEAD_BANDS_KEY    = 'typePercentDeadBands'
+MAX_SILENCE_SECS_KEY           = 'maxSilenceSecs'
+
+# adaptive sensor polling
+ENABLE_ADAPTIVE_POLLING_KEY    = 'enableAdaptivePolling'
+MIN_POLL_SECS_KEY              = 'minPollSecs'
+MAX_POLL_SECS_KEY              = 'maxPollSecs'
+LOWER_CHANGE_PCT_KEY           = 'lowerChangePct'
+UPPER_CHANGE_PCT_KEY           = 'upperChangePct'
+MAX_PENDING_MESSAGES_KEY       = 'maxPendingMessages'
+MIN_VALUE_SCALE_KEY            = 'minValueScale'
+
+# derived metrics
+ENABLE_DERIVED_METRICS_KEY     = 'enableDerivedMetrics'
+RATED_WIND_SPEED_KEY           = 'ratedWindSpeed'
+
+# short-horizon forecasting
+ENABLE_FORECASTING_KEY         = 'enableForecasting'
+FORECAST_HORIZONS_SECS_KEY     = 'forecastHorizonsSecs'
+FORECAST_ALPHA_KEY             = 'forecastAlpha'
+FORECAST_BETA_KEY              = 'forecastBeta'
+FORECAST_MIN_SAMPLES_KEY       = 'forecastMinSamples'
+HVAC_FORECAST_HORIZON_SECS_KEY = 'hvacForecastHorizonSecs'
+
+# multi-device fleet simulation
+FLEET_DEVICE_COUNT_KEY         = 'deviceCount'
+FLEET_DEVICE_ID_PREFIX_KEY     = 'deviceIDPrefix'
+FLEET_NOISE_LEVEL_KEY          = 'noiseLevel'
+FLEET_RANDOM_SEED_KEY          = 'randomSeed'
+
+# historian playback
+REPLAY_FILES_KEY               = 'replayFiles'
+REPLAY_SPEED_KEY               = 'replaySpeed'
+REPLAY_LOOP_KEY                = 'replayLoop'
+KEEP_TIME_STAMPS_KEY           = 'keepTimeStamps'
+
+# simulation clock
+CLOCK_MODE_KEY                 = 'clockMode'
+CLOCK_TIME_SCALE_KEY           = 'clockTimeScale'
+CLOCK_START_TIME_KEY           = 'clockStartTime'
+CLOCK_RUN_SECS_KEY             = 'clockRunSecs'
+
 ENABLE_POWER_GENERATION_KEY = 'enablePowerGeneration'
 ENABLE_SYSTEM_PERF_KEY  = 'enableSystemPerformance'
 ENABLE_ACTUATION_KEY    = 'enableActuation'
@@ -433,12 +641,35 @@ UPDATE_DISPLAY_ON_ACTUATION_KEY = 'updateDisplayOnActuation'
 MIN_WIND_SPEED_KEY       = 'minWindSpeed'
 MAX_WIND_SPEED_KEY       = 'maxWindSpeed'
 
+ENABLE_WEIBULL_WIND_KEY  = 'enableWeibullWind'
+WEIBULL_SHAPE_KEY        = 'weibullShape'
+WEIBULL_SCALE_KEY        = 'weibullScale'
+TURBULENCE_INTENSITY_KEY = 'turbulenceIntensity'
+
+ENABLE_WIND_FARM_KEY         = 'enableWindFarm'
+WIND_FARM_ROWS_KEY           = 'windFarmRows'
+WIND_FARM_COLUMNS_KEY        = 'windFarmColumns'
+WIND_FARM_SPACING_KEY        = 'windFarmSpacing'
+WIND_FARM_TURBINE_INDEX_KEY  = 'windFarmTurbineIndex'
+WIND_DIRECTION_KEY           = 'windDirection'
+WAKE_DECAY_KEY               = 'wakeDecay'
+THRUST_COEFF_KEY             = 'thrustCoefficient'
+
 HUMIDITY_SIM_FLOOR_KEY   = 'humiditySimFloor'
 HUMIDITY_SIM_CEILING_KEY = 'humiditySimCeiling'
 PRESSURE_SIM_FLOOR_KEY   = 'pressureSimFloor'
 PRESSURE_SIM_CEILING_KEY = 'pressureSimCeiling'
 TEMP_SIM_FLOOR_KEY       = 'tempSimFloor'
 TEMP_SIM_CEILING_KEY     = 'tempSimCeiling'
+SIM_DATA_CHUNK_SIZE_KEY  = 'simDataChunkSize'
+SIM_DATA_CACHE_DIR_KEY   = 'simDataCacheDir'
+SIM_RANDOM_SEED_KEY      = 'simRandomSeed'
+SIM_SETPOINT_RESPONSE_KEY = 'simSetpointResponse'
+
+ENABLE_PLANT_MODEL_KEY       = 'enablePlantModel'
+PLANT_TIME_SCALE_KEY         = 'plantTimeScale'
+PLANT_OUTDOOR_TEMP_KEY       = 'plantOutdoorTemp'
+PLANT_OUTDOOR_HUMIDITY_KEY   = 'plantOutdoorHumidity'
 
 HANDLE_TEMP_CHANGE_ON_DEVICE_KEY = 'handleTempChangeOnDevice'
 TRIGGER_HVAC_TEMP_FLOOR_KEY      = 'triggerHvacTempFloor'
@@ -447,6 +678,7 @@ TRIGGER_HVAC_TEMP_CEILING_KEY    = 'triggerHvacTempCeiling'
 MIN_PRODUCTION_RATE_KEY = 'minProductionRate'
 MAX_PRODUCTION_RATE_KEY = 'maxProductionRate'
 DEFAULT_PRODUCTION_RATE_KEY = 'defaultProductionRate'
+WORKCELL_TIME_SCALE_KEY = 'workcellTimeScale'
 
 RUN_FOREVER_KEY    = 'runForever'
 TEST_EMPTY_APP_KEY = 'testEmptyApp'
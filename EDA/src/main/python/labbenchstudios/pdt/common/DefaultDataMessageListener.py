@@ -77,6 +77,24 @@ class DefaultDataMessageListener(IDataMessageListener):
 		"""
 		pass
 	
+	def getPendingMessageCount(self) -> int:
+		"""
+		Retrieves the number of messages waiting to be processed.
+		
+		@return int
+		"""
+		pass
+	
+	def getSensorHistory(self, name: str = None, windowSecs: float = 0) -> tuple:
+		"""
+		Retrieves the recent history of the named sensor.
+		
+		@param name
+		@param windowSecs
+		@return tuple
+		"""
+		pass
+	
 	def handleActuatorCommandMessage(self, data: ActuatorData) -> bool:
 		"""
 		Callback function to handle an actuator command message packaged as a ActuatorData object.
@@ -63,6 +63,25 @@ class IDataMessageListener():
 		"""
 		pass
 	
+	def getPendingMessageCount(self) -> int:
+		"""
+		Retrieves the number of messages waiting to be processed, which
+		data producers may use as a backpressure signal.
+		
+		@return int
+		"""
+		pass
+	
+	def getSensorHistory(self, name: str = None, windowSecs: float = 0) -> tuple:
+		"""
+		Retrieves the recent history of the named sensor.
+		
+		@param name The sensor data name.
+		@param windowSecs The window length in seconds, relative to the newest sample (0 = all retained samples).
+		@return tuple The (timeStampsMillis, values) numpy arrays, oldest first, or None if there's no history.
+		"""
+		pass
+	
 	def handleActuatorCommandMessage(self, data: ActuatorData) -> ActuatorData:
 		"""
 		Callback function to handle an actuator command message packaged as a ActuatorData object.
@@ -147,6 +147,8 @@ class ResourceNameContainer(object):
 
 		@return str
 		"""
+		return self.persistenceName
+	
 	def getProductPrefix(self):
 		"""
 		Returns the resource product prefix, which is the string content that
@@ -68,6 +68,9 @@ class ResourceNameEnum(Enum):
 	CDA_SYSTEM_PERF_MSG_RESOURCE	  = ConfigConst.CDA_SYSTEM_PERF_MSG_RESOURCE
 	CDA_UPDATE_NOTIFICATIONS_RESOURCE = ConfigConst.CDA_UPDATE_NOTIFICATIONS_MSG_RESOURCE
 	CDA_REGISTRATION_REQUEST_RESOURCE = ConfigConst.CDA_REGISTRATION_REQUEST_RESOURCE
+	CDA_TWIN_STATE_MSG_RESOURCE       = ConfigConst.CDA_TWIN_STATE_MSG_RESOURCE
+	CDA_ANOMALY_MSG_RESOURCE          = ConfigConst.CDA_ANOMALY_MSG_RESOURCE
+	CDA_FORECAST_MSG_RESOURCE         = ConfigConst.CDA_FORECAST_MSG_RESOURCE
 	SYSTEM_REQUEST_RESOURCE           = ConfigConst.SYSTEM_REQUEST_RESOURCE
 
 	def getResourceNameByValue(self, val: str) -> str:
@@ -0,0 +1,427 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+from datetime import datetime, timezone
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
+from labbenchstudios.pdt.common.Singleton import Singleton
+
+class SimulationClock(metaclass = Singleton):
+	"""
+	Clock service for the schedulers, simulations and data time stamps,
+	so simulated scenarios don't have to run in real time.
+	
+	Supports three modes:
+	- REAL_TIME_MODE: the wall clock (the default). Schedulers are
+	  APScheduler BackgroundScheduler instances, as before.
+	- SCALED_TIME_MODE: simulated time runs timeScale times faster
+	  (or slower) than the wall clock, from the start time.
+	- STEPPED_TIME_MODE: simulated time only moves when stepped -
+	  either explicitly via advance(), or by the clock thread (see
+	  startClock()), which jumps straight to the next scheduled job
+	  or sleeper, so scenarios run as fast as the jobs do.
+	
+	In the simulated modes, scheduled jobs run one at a time on the
+	clock thread (or the thread calling advance()).
+	
+	Implemented as a Singleton using the Singleton metaclass.
+	
+	"""
+	
+	REAL_TIME_MODE    = 'realTime'
+	SCALED_TIME_MODE  = 'scaledTime'
+	STEPPED_TIME_MODE = 'stepped'
+	
+	# longest the clock thread waits before re-checking its schedule
+	MAX_WAIT_SECS = 1.0
+	
+	def __init__(self):
+		"""
+		Constructor - loads the clock mode, time scale and start time
+		from the configuration.
+		
+		"""
+		configUtil = ConfigUtil()
+		
+		startTime = \
+			configUtil.getProperty( \
+				section = ConfigConst.CLOCK_SETTINGS_KEY, key = ConfigConst.CLOCK_START_TIME_KEY, defaultVal = None)
+		
+		self.condition = threading.Condition()
+		self.jobs = []
+		self.jobSequence = itertools.count()
+		self.sleepers = []
+		self.clockThread = None
+		self.isRunning = False
+		
+		self.configure( \
+			mode = configUtil.getProperty( \
+				section = ConfigConst.CLOCK_SETTINGS_KEY, key = ConfigConst.CLOCK_MODE_KEY, defaultVal = self.REAL_TIME_MODE), \
+			timeScale = configUtil.getFloat( \
+				section = ConfigConst.CLOCK_SETTINGS_KEY, key = ConfigConst.CLOCK_TIME_SCALE_KEY, defaultVal = 1.0), \
+			startTime = datetime.fromisoformat(startTime).timestamp() if startTime else None)
+	
+	def addIntervalJob(self, func, intervalSecs: float = 1.0):
+		"""
+		Schedules func to run every intervalSecs of simulated time, with
+		the first run one interval from now. Only used in the simulated
+		modes (see createScheduler()).
+		
+		@param func The function to run (no args).
+		@param intervalSecs The simulated interval between runs.
+		@return object The job handle, for removeJob().
+		"""
+		if self.mode == self.REAL_TIME_MODE:
+			raise RuntimeError('Clock jobs are only supported in the simulated clock modes.')
+		
+		if intervalSecs <= 0.0:
+			raise ValueError('Invalid clock job interval: ' + str(intervalSecs))
+		
+		job = _ClockJob(func, intervalSecs)
+		
+		with self.condition:
+			self._pushJob(self._getElapsedSecs() + intervalSecs, job)
+			self.condition.notify_all()
+		
+		return job
+	
+	def advance(self, durationSecs: float = 1.0) -> int:
+		"""
+		Steps simulated time forward by durationSecs, running each job
+		that falls due (in time order) on the calling thread. Only
+		supported in STEPPED_TIME_MODE, while the clock thread isn't
+		running.
+		
+		@param durationSecs The simulated time to advance.
+		@return int The number of jobs run.
+		"""
+		if self.mode != self.STEPPED_TIME_MODE or self.isRunning:
+			raise RuntimeError('The clock can only be advanced in stepped mode, while the clock thread is stopped.')
+		
+		endSecs = self.elapsedSecs + max(durationSecs, 0.0)
+		runCount = 0
+		
+		while True:
+			with self.condition:
+				if not self.jobs or self.jobs[0][0] > endSecs:
+					self._setElapsedSecs(endSecs)
+					
+					return runCount
+				
+				dueSecs, sequence, job = heapq.heappop(self.jobs)
+				self._setElapsedSecs(dueSecs)
+			
+			self._runJob(dueSecs, job)
+			runCount += 1
+	
+	def configure(self, mode: str = REAL_TIME_MODE, timeScale: float = 1.0, startTime: float = None):
+		"""
+		Sets the clock mode, and restarts simulated time. Must be called
+		before any jobs are scheduled.
+		
+		@param mode The clock mode (REAL_TIME_MODE, SCALED_TIME_MODE or STEPPED_TIME_MODE).
+		@param timeScale The simulated seconds per wall clock second (SCALED_TIME_MODE only).
+		@param startTime The simulated start time, in seconds since the epoch (None = now).
+		"""
+		if mode not in (self.REAL_TIME_MODE, self.SCALED_TIME_MODE, self.STEPPED_TIME_MODE):
+			raise ValueError('Invalid clock mode: ' + str(mode))
+		
+		if mode == self.SCALED_TIME_MODE and timeScale <= 0.0:
+			raise ValueError('Invalid clock time scale: ' + str(timeScale))
+		
+		with self.condition:
+			if self.jobs or self.isRunning:
+				raise RuntimeError('The clock can only be configured while no jobs are scheduled.')
+			
+			self.mode = mode
+			self.timeScale = timeScale if mode == self.SCALED_TIME_MODE else 1.0
+			self.startTime = startTime if startTime is not None else time.time()
+			self.anchorTime = time.monotonic()
+			self.elapsedSecs = 0.0
+		
+		if mode != self.REAL_TIME_MODE:
+			logging.info( \
+				"Simulation clock mode: %s, time scale: %s, start time: %s", mode, str(self.timeScale), \
+				datetime.fromtimestamp(self.startTime, timezone.utc).isoformat())
+	
+	def createScheduler(self):
+		"""
+		Creates a scheduler for the managers' polling jobs: an APScheduler
+		BackgroundScheduler in REAL_TIME_MODE, and a ClockScheduler (which
+		supports the same add_job(), start() and shutdown() subset) driven
+		by this clock otherwise.
+		
+		@return object The scheduler.
+		"""
+		if self.mode == self.REAL_TIME_MODE:
+			from apscheduler.schedulers.background import BackgroundScheduler
+			
+			return BackgroundScheduler()
+		
+		from labbenchstudios.pdt.common.ClockScheduler import ClockScheduler
+		
+		return ClockScheduler(clock = self)
+	
+	def getDateTime(self) -> datetime:
+		"""
+		Returns the current (simulated) UTC date / time.
+		
+		@return datetime
+		"""
+		if self.mode == self.REAL_TIME_MODE:
+			return datetime.now(timezone.utc)
+		
+		return datetime.fromtimestamp(self.now(), timezone.utc)
+	
+	def getElapsedSecs(self) -> float:
+		"""
+		Returns the simulated seconds since the clock was configured.
+		
+		@return float
+		"""
+		with self.condition:
+			return self._getElapsedSecs()
+	
+	def getMode(self) -> str:
+		return self.mode
+	
+	def getTimeScale(self) -> float:
+		return self.timeScale
+	
+	def isRealTime(self) -> bool:
+		return self.mode == self.REAL_TIME_MODE
+	
+	def monotonic(self) -> float:
+		"""
+		Returns a monotonic (simulated) time in seconds, for measuring
+		intervals - the equivalent of time.monotonic().
+		
+		@return float
+		"""
+		if self.mode == self.REAL_TIME_MODE:
+			return time.monotonic()
+		
+		return self.getElapsedSecs()
+	
+	def now(self) -> float:
+		"""
+		Returns the current (simulated) time in seconds since the epoch -
+		the equivalent of time.time().
+		
+		@return float
+		"""
+		if self.mode == self.REAL_TIME_MODE:
+			return time.time()
+		
+		return self.startTime + self.getElapsedSecs()
+	
+	def removeJob(self, job = None):
+		"""
+		Removes a job added with addIntervalJob().
+		
+		@param job The job handle.
+		"""
+		with self.condition:
+			# the job may be running, so make sure it isn't rescheduled
+			job.isActive = False
+			self.jobs = [entry for entry in self.jobs if entry[2] is not job]
+			heapq.heapify(self.jobs)
+			self.condition.notify_all()
+	
+	def notifySleepers(self):
+		"""
+		Wakes the threads in sleep(), so they re-check their isCancelled
+		function (in the simulated modes).
+		
+		"""
+		with self.condition:
+			self.condition.notify_all()
+	
+	def sleep(self, durationSecs: float = 0.0, isCancelled = None) -> bool:
+		"""
+		Blocks the calling thread for durationSecs of simulated time - the
+		equivalent of time.sleep(). In STEPPED_TIME_MODE, this only returns
+		once the clock has been stepped past the wake time.
+		
+		@param durationSecs The simulated time to sleep.
+		@param isCancelled Optional function (no args) that ends the sleep early when it returns
+		True - it's checked whenever notifySleepers() is called (simulated modes only).
+		@return bool True if the full duration elapsed; False if cancelled.
+		"""
+		if self.mode == self.REAL_TIME_MODE:
+			time.sleep(durationSecs)
+			return True
+		
+		with self.condition:
+			wakeSecs = self._getElapsedSecs() + max(durationSecs, 0.0)
+			
+			if self.mode == self.STEPPED_TIME_MODE:
+				heapq.heappush(self.sleepers, wakeSecs)
+				self.condition.notify_all()
+			
+			while self._getElapsedSecs() < wakeSecs:
+				if isCancelled and isCancelled():
+					return False
+				
+				if self.mode == self.SCALED_TIME_MODE:
+					self.condition.wait(min((wakeSecs - self._getElapsedSecs()) / self.timeScale, self.MAX_WAIT_SECS))
+				else:
+					self.condition.wait()
+			
+			return True
+	
+	def startClock(self) -> bool:
+		"""
+		Starts the clock thread that runs the scheduled jobs (in the
+		simulated modes). In STEPPED_TIME_MODE, the thread steps straight
+		from each job or sleeper to the next, as fast as they run.
+		
+		@return bool True if started; False if in REAL_TIME_MODE or already running.
+		"""
+		with self.condition:
+			if self.mode == self.REAL_TIME_MODE or self.isRunning:
+				return False
+			
+			self.isRunning = True
+			self.clockThread = threading.Thread(target = self._runClock, name = "SimulationClock", daemon = True)
+			self.clockThread.start()
+		
+		logging.info("Simulation clock started.")
+		
+		return True
+	
+	def stopClock(self) -> bool:
+		"""
+		Stops the clock thread (scheduled jobs are kept).
+		
+		@return bool True if stopped; False if not running.
+		"""
+		with self.condition:
+			if not self.isRunning:
+				return False
+			
+			self.isRunning = False
+			self.condition.notify_all()
+		
+		if self.clockThread is not threading.current_thread():
+			self.clockThread.join(timeout = 5.0)
+		
+		self.clockThread = None
+		
+		logging.info("Simulation clock stopped at %s.", self.getDateTime().isoformat())
+		
+		return True
+	
+	def _getElapsedSecs(self) -> float:
+		if self.mode == self.SCALED_TIME_MODE:
+			return (time.monotonic() - self.anchorTime) * self.timeScale
+		
+		if self.mode == self.REAL_TIME_MODE:
+			return time.monotonic() - self.anchorTime
+		
+		return self.elapsedSecs
+	
+	def _pushJob(self, dueSecs: float, job):
+		heapq.heappush(self.jobs, (dueSecs, next(self.jobSequence), job))
+	
+	def _runClock(self):
+		while True:
+			with self.condition:
+				if not self.isRunning:
+					break
+				
+				dueSecs = self.jobs[0][0] if self.jobs else None
+				
+				if self.mode == self.STEPPED_TIME_MODE:
+					# step to the next job or sleeper, whichever is first
+					if self.sleepers and (dueSecs is None or self.sleepers[0] < dueSecs):
+						self._setElapsedSecs(heapq.heappop(self.sleepers))
+						continue
+					
+					if dueSecs is None:
+						self.condition.wait(self.MAX_WAIT_SECS)
+						continue
+					
+					self._setElapsedSecs(dueSecs)
+				else:
+					if dueSecs is None:
+						self.condition.wait(self.MAX_WAIT_SECS)
+						continue
+					
+					waitSecs = (dueSecs - self._getElapsedSecs()) / self.timeScale
+					
+					if waitSecs > 0.0:
+						self.condition.wait(min(waitSecs, self.MAX_WAIT_SECS))
+						continue
+				
+				dueSecs, sequence, job = heapq.heappop(self.jobs)
+			
+			self._runJob(dueSecs, job)
+	
+	def _runJob(self, dueSecs: float, job):
+		try:
+			job.func()
+		except Exception as e:
+			logging.exception("Simulation clock job failed: %s", str(e))
+		
+		with self.condition:
+			if job.isActive:
+				# coalesce missed runs (e.g. if the job ran longer than its interval)
+				nextDueSecs = dueSecs + job.intervalSecs
+				
+				if nextDueSecs <= self._getElapsedSecs():
+					nextDueSecs = self._getElapsedSecs() + job.intervalSecs
+				
+				self._pushJob(nextDueSecs, job)
+	
+	def _setElapsedSecs(self, elapsedSecs: float):
+		if elapsedSecs > self.elapsedSecs:
+			self.elapsedSecs = elapsedSecs
+			
+			while self.sleepers and self.sleepers[0] <= elapsedSecs:
+				heapq.heappop(self.sleepers)
+			
+			self.condition.notify_all()
+
+
+class _ClockJob():
+	"""
+	A job scheduled on the SimulationClock.
+	
+	"""
+	
+	def __init__(self, func, intervalSecs: float):
+		self.func = func
+		self.intervalSecs = intervalSecs
+		self.isActive = True
@@ -22,11 +22,12 @@
 # SOFTWARE.
 #
 
-from datetime import datetime, timezone, timedelta
+from datetime import timedelta
 
 import labbenchstudios.pdt.common.ConfigConst as ConfigConst
 
 from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
+from labbenchstudios.pdt.common.SimulationClock import SimulationClock
 
 class BaseIotData(object):
 	"""
@@ -249,8 +250,8 @@ class BaseIotData(object):
 		
 	def updateTimeStamp(self):
 		"""
-		Updates the internal time stamp to the current date / time
-		in Zulu time.
+		Updates the internal time stamp to the current (SimulationClock)
+		date / time in Zulu time.
 		This retrieves the time since Epoch and converts to an ISO 8601
 		string, with second granularity, as follows:
 		
@@ -260,7 +261,7 @@ class BaseIotData(object):
 		with 'Z' if desired. In testing, the format above is
 		compatible with the GDA's parsing logic.
 		"""
-		t = datetime.now(timezone.utc) + timedelta(seconds = self.timeOffsetSeconds)
+		t = SimulationClock().getDateTime() + timedelta(seconds = self.timeOffsetSeconds)
 		
 		self.timeStamp = str(t.isoformat())
 	
@@ -0,0 +1,102 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+
+class SensorDataRollup(SensorData):
+	"""
+	Data container for a single tumbling-window rollup (downsampled
+	aggregate) of SensorData readings for a given device ID and type ID.
+	
+	The inherited 'value' property holds the mean of the window, and
+	the inherited timestamp represents the time the rollup was closed.
+	
+	"""
+		
+	def __init__(self, \
+		typeCategoryID: int = ConfigConst.DEFAULT_SENSOR_TYPE, \
+		typeID: int = ConfigConst.DEFAULT_SENSOR_TYPE, \
+		name = ConfigConst.NOT_SET, \
+		d = None):
+		super(SensorDataRollup, self).__init__(\
+			name = name, typeID = typeID, typeCategoryID = typeCategoryID, d = d)
+		
+		self.minValue = ConfigConst.DEFAULT_VAL
+		self.maxValue = ConfigConst.DEFAULT_VAL
+		self.sampleCount = 0
+		self.windowSecs = ConfigConst.DEFAULT_ROLLUP_WINDOW_SECS
+		self.windowStartMillis = 0
+	
+	def getMaxValue(self) -> float:
+		return self.maxValue
+	
+	def getMeanValue(self) -> float:
+		return self.value
+	
+	def getMinValue(self) -> float:
+		return self.minValue
+	
+	def getSampleCount(self) -> int:
+		return self.sampleCount
+	
+	def getWindowSecs(self) -> int:
+		return self.windowSecs
+	
+	def getWindowStartMillis(self) -> int:
+		return self.windowStartMillis
+	
+	def setRollupValues(self, minVal: float, maxVal: float, meanVal: float, count: int):
+		self.minValue = minVal
+		self.maxValue = maxVal
+		self.sampleCount = count
+		self.setValue(meanVal)
+	
+	def setWindow(self, startMillis: int, windowSecs: int):
+		self.windowStartMillis = startMillis
+		self.windowSecs = windowSecs
+		
+	def _handleUpdateData(self, data):
+		if data and isinstance(data, SensorDataRollup):
+			self.value = data.getValue()
+			self.minValue = data.getMinValue()
+			self.maxValue = data.getMaxValue()
+			self.sampleCount = data.getSampleCount()
+			self.windowSecs = data.getWindowSecs()
+			self.windowStartMillis = data.getWindowStartMillis()
+
+	def __str__(self):
+		"""
+		String override function.
+		
+		"""
+		s = SensorData.__str__(self) + ',{}={},{}={},{}={},{}={}'
+		
+		return s.format(
+			ConfigConst.MIN_PROP, self.minValue,
+			ConfigConst.MAX_PROP, self.maxValue,
+			ConfigConst.COUNT_PROP, self.sampleCount,
+			ConfigConst.WINDOW_SECS_PROP, self.windowSecs)
@@ -0,0 +1,145 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import operator
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.data.ActuatorData import ActuatorData
+from labbenchstudios.pdt.data.SensorData import SensorData
+
+class BaseSensorDataRule():
+	"""
+	Base class for all sensor data rules evaluated by SensorDataRuleEngine.
+	
+	A rule applies to one sensor type ID, and tracks an active / inactive
+	state per device. Sub-classes implement _evaluateCondition(), which
+	returns the rule's desired state for each reading (or None to leave
+	the state unchanged); an actuator command is only generated when the
+	state changes - the 'on' command when the rule becomes active, and
+	the 'off' command when it becomes inactive. All rules start inactive.
+	
+	"""
+	
+	# supported comparison operators for rule conditions
+	OPERATORS = {'>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le}
+	
+	def __init__(self, \
+		name: str = ConfigConst.NOT_SET, typeID: int = ConfigConst.DEFAULT_SENSOR_TYPE, \
+		actuatorName: str = ConfigConst.HVAC_ACTUATOR_NAME, \
+		actuatorTypeID: int = ConfigConst.HVAC_ACTUATOR_TYPE, \
+		actuatorTypeCategoryID: int = ConfigConst.ENV_TYPE_CATEGORY, \
+		onCommand: int = ConfigConst.COMMAND_ON, offCommand: int = ConfigConst.COMMAND_OFF, \
+		onValue: float = None, offValue: float = None):
+		"""
+		Constructor.
+		
+		@param name The rule name.
+		@param typeID The sensor type ID the rule applies to.
+		@param actuatorName The target actuator name.
+		@param actuatorTypeID The target actuator type ID.
+		@param actuatorTypeCategoryID The target actuator type category ID.
+		@param onCommand The command sent when the rule becomes active.
+		@param offCommand The command sent when the rule becomes inactive.
+		@param onValue The value sent with the 'on' command (the sensor value if None).
+		@param offValue The value sent with the 'off' command (the sensor value if None).
+		"""
+		self.name = name
+		self.typeID = typeID
+		
+		self.actuatorName = actuatorName
+		self.actuatorTypeID = actuatorTypeID
+		self.actuatorTypeCategoryID = actuatorTypeCategoryID
+		
+		self.onCommand = onCommand
+		self.offCommand = offCommand
+		self.onValue = onValue
+		self.offValue = offValue
+		
+		# deviceID -> True if the rule is currently active for the device
+		self.activeStates = {}
+	
+	def getName(self) -> str:
+		return self.name
+	
+	def getTypeID(self) -> int:
+		return self.typeID
+	
+	def isActive(self, deviceID: str = None) -> bool:
+		"""
+		Returns the current rule state for the given device.
+		
+		@param deviceID
+		@return bool
+		"""
+		return self.activeStates.get(deviceID, False)
+	
+	def processSensorData(self, data: SensorData = None, timeMillis: int = 0) -> ActuatorData:
+		"""
+		Evaluates the rule against the given reading.
+		
+		@param data The sensor reading.
+		@param timeMillis The reading's timestamp in millis.
+		@return ActuatorData The command to send if the rule state changed; None otherwise.
+		"""
+		deviceID = data.getDeviceID()
+		isActive = self._evaluateCondition(deviceID, data.getValue(), timeMillis)
+		
+		if isActive is None or isActive == self.activeStates.get(deviceID, False):
+			return None
+		
+		self.activeStates[deviceID] = isActive
+		
+		return self._createActuatorCommand(data, isActive)
+	
+	def _createActuatorCommand(self, data: SensorData = None, isActive: bool = False) -> ActuatorData:
+		"""
+		Creates the actuator command for a rule state change.
+		
+		"""
+		ad = ActuatorData( \
+			name = self.actuatorName, \
+			typeCategoryID = self.actuatorTypeCategoryID, \
+			typeID = self.actuatorTypeID)
+		
+		value = self.onValue if isActive else self.offValue
+		
+		ad.setCommand(self.onCommand if isActive else self.offCommand)
+		ad.setValue(data.getValue() if value is None else value)
+		ad.setStateData(self.name + ': ' + data.getName() + ' = ' + str(data.getValue()))
+		
+		return ad
+	
+	def _evaluateCondition(self, deviceID: str = None, value: float = 0.0, timeMillis: int = 0) -> bool:
+		"""
+		Returns the desired rule state for the reading, or None to leave
+		the current state unchanged. Sub-classes must override this.
+		
+		@param deviceID The device the reading came from.
+		@param value The reading value.
+		@param timeMillis The reading's timestamp in millis.
+		@return bool
+		"""
+		pass
@@ -0,0 +1,289 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+
+from functools import partial
+
+import numpy as np
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+
+class DerivedMetricEngine():
+	"""
+	Computes derived metrics - such as dew point or wind turbine capacity
+	factor - that combine the latest values of several sensor types.
+	
+	Each metric declares the sensor type IDs it depends on, and is indexed
+	by each of them, so a reading only triggers the metrics that use its
+	type. A metric is only recomputed for a device once values for all of
+	its inputs have been received, and only if at least one of them has
+	changed since it was last computed. Each result is returned as a new
+	SensorData instance with the metric's own type ID.
+	
+	Metric functions are written with numpy operations, so the same
+	function is used for single readings and, via evaluateBatch(), for
+	batch or historical arrays.
+	
+	"""
+	
+	# Magnus formula coefficients (for temperatures in C)
+	MAGNUS_A = 17.62
+	MAGNUS_B = 243.12
+	
+	def __init__(self):
+		"""
+		Constructor.
+		
+		"""
+		# name -> _DerivedMetric
+		self.metricsByName = {}
+		
+		# input typeID -> list of dependent metrics
+		self.metricsByInputTypeID = {}
+		
+		# (deviceID, typeID) -> latest value
+		self.latestValues = {}
+		
+		# (metric name, deviceID) -> input values used for the last result
+		self.lastInputValues = {}
+	
+	def addMetric(self, \
+		name: str = None, typeID: int = ConfigConst.DEFAULT_SENSOR_TYPE, inputTypeIDs: tuple = (), calcFunc = None, \
+		typeCategoryID: int = ConfigConst.DEFAULT_TYPE_CATEGORY_ID) -> bool:
+		"""
+		Adds a derived metric.
+		
+		@param name The metric name, used as the name of the derived SensorData.
+		@param typeID The type ID of the derived SensorData.
+		@param inputTypeIDs The sensor type IDs the metric depends on, in calcFunc argument order.
+		@param calcFunc Callable that computes the metric from the input values (scalars or numpy arrays).
+		@param typeCategoryID The type category ID of the derived SensorData.
+		@return bool True on success; False otherwise.
+		"""
+		if not name or not inputTypeIDs or not calcFunc or name in self.metricsByName:
+			logging.warning("Ignoring invalid or duplicate derived metric: %s", str(name))
+			return False
+		
+		if typeID in inputTypeIDs:
+			logging.warning("Ignoring derived metric that depends on its own type ID: %s", name)
+			return False
+		
+		metric = _DerivedMetric(name, typeID, typeCategoryID, tuple(inputTypeIDs), calcFunc)
+		self.metricsByName[name] = metric
+		
+		for inputTypeID in metric.inputTypeIDs:
+			self.metricsByInputTypeID.setdefault(inputTypeID, []).append(metric)
+		
+		return True
+	
+	def addEnvironmentalMetrics(self):
+		"""
+		Adds the dew point and heat index metrics, both derived from
+		temperature (C) and relative humidity (%).
+		
+		"""
+		inputTypeIDs = (ConfigConst.TEMP_SENSOR_TYPE, ConfigConst.HUMIDITY_SENSOR_TYPE)
+		
+		self.addMetric( \
+			name = ConfigConst.DEW_POINT_NAME, typeID = ConfigConst.DEW_POINT_SENSOR_TYPE, \
+			inputTypeIDs = inputTypeIDs, calcFunc = self.calculateDewPoint, typeCategoryID = ConfigConst.ENV_TYPE_CATEGORY)
+		
+		self.addMetric( \
+			name = ConfigConst.HEAT_INDEX_NAME, typeID = ConfigConst.HEAT_INDEX_SENSOR_TYPE, \
+			inputTypeIDs = inputTypeIDs, calcFunc = self.calculateHeatIndex, typeCategoryID = ConfigConst.ENV_TYPE_CATEGORY)
+	
+	def addWindTurbineMetrics(self, \
+		airDensity: float = 1.225, rotorSweptArea: float = 0.0, maxPowerCoeff: float = 0.35, \
+		ratedWindSpeed: float = ConfigConst.DEFAULT_RATED_WIND_SPEED):
+		"""
+		Adds the wind turbine capacity factor (derived from power output)
+		and power coefficient (derived from power output and wind speed)
+		metrics, using the given rotor parameters.
+		
+		@param airDensity The air density in kg/m3.
+		@param rotorSweptArea The rotor swept area in m2.
+		@param maxPowerCoeff The turbine's max power coefficient.
+		@param ratedWindSpeed The wind speed (m/s) at which the turbine reaches its rated power.
+		"""
+		ratedPower = maxPowerCoeff * (airDensity / 2.0) * rotorSweptArea * pow(ratedWindSpeed, 3)
+		
+		self.addMetric( \
+			name = ConfigConst.CAPACITY_FACTOR_NAME, typeID = ConfigConst.WIND_TURBINE_CAPACITY_FACTOR_SENSOR_TYPE, \
+			inputTypeIDs = (ConfigConst.WIND_TURBINE_POWER_OUTPUT_SENSOR_TYPE,), \
+			calcFunc = partial(self.calculateCapacityFactor, ratedPower = ratedPower), \
+			typeCategoryID = ConfigConst.ENERGY_TYPE_CATEGORY)
+		
+		self.addMetric( \
+			name = ConfigConst.POWER_COEFF_NAME, typeID = ConfigConst.WIND_TURBINE_POWER_COEFF_SENSOR_TYPE, \
+			inputTypeIDs = (ConfigConst.WIND_TURBINE_POWER_OUTPUT_SENSOR_TYPE, ConfigConst.WIND_TURBINE_AIR_SPEED_SENSOR_TYPE), \
+			calcFunc = partial(self.calculatePowerCoefficient, airDensity = airDensity, rotorSweptArea = rotorSweptArea), \
+			typeCategoryID = ConfigConst.ENERGY_TYPE_CATEGORY)
+	
+	def processSensorData(self, data: SensorData = None) -> list:
+		"""
+		Updates the latest value for the reading's device and type, and
+		recomputes any dependent metrics whose inputs have changed.
+		
+		@param data The sensor reading.
+		@return list The derived SensorData instances (may be empty).
+		"""
+		metrics = self.metricsByInputTypeID.get(data.getTypeID())
+		
+		if not metrics:
+			return []
+		
+		deviceID = data.getDeviceID()
+		self.latestValues[(deviceID, data.getTypeID())] = data.getValue()
+		
+		derivedDataList = []
+		
+		for metric in metrics:
+			inputValues = tuple(self.latestValues.get((deviceID, inputTypeID)) for inputTypeID in metric.inputTypeIDs)
+			
+			if None in inputValues:
+				continue
+			
+			lastInputKey = (metric.name, deviceID)
+			
+			if self.lastInputValues.get(lastInputKey) == inputValues:
+				continue
+			
+			self.lastInputValues[lastInputKey] = inputValues
+			
+			derivedData = SensorData(name = metric.name, typeID = metric.typeID, typeCategoryID = metric.typeCategoryID)
+			derivedData.setDeviceID(deviceID)
+			derivedData.setLocationID(data.getLocationID())
+			derivedData.setValue(float(metric.calcFunc(*inputValues)))
+			
+			derivedDataList.append(derivedData)
+		
+		return derivedDataList
+	
+	def evaluateBatch(self, name: str = None, inputs: dict = None) -> np.ndarray:
+		"""
+		Computes the named metric over aligned arrays of input values.
+		
+		@param name The metric name.
+		@param inputs Input typeID -> 1-D array-like of values (all the same length).
+		@return np.ndarray The metric values, or None if the metric or any input is missing.
+		"""
+		metric = self.metricsByName.get(name)
+		
+		if not metric or not inputs or any(inputTypeID not in inputs for inputTypeID in metric.inputTypeIDs):
+			logging.warning("Can't evaluate derived metric %s - unknown metric or missing inputs.", str(name))
+			return None
+		
+		inputArrays = [np.asarray(inputs[inputTypeID], dtype = np.float64) for inputTypeID in metric.inputTypeIDs]
+		
+		return np.asarray(metric.calcFunc(*inputArrays), dtype = np.float64)
+	
+	def getMetricNames(self) -> list:
+		return list(self.metricsByName.keys())
+	
+	def hasDependentMetrics(self, typeID: int = ConfigConst.DEFAULT_TYPE_ID) -> bool:
+		return typeID in self.metricsByInputTypeID
+	
+	def calculateDewPoint(self, temperature = 0.0, humidity = 0.0):
+		"""
+		Calculates the dew point (C) using the Magnus formula.
+		
+		@param temperature The temperature in C.
+		@param humidity The relative humidity in %.
+		@return The dew point in C (same shape as the inputs).
+		"""
+		humidity = np.clip(humidity, 0.01, 100.0)
+		gamma = np.log(humidity / 100.0) + (self.MAGNUS_A * temperature) / (self.MAGNUS_B + temperature)
+		
+		return (self.MAGNUS_B * gamma) / (self.MAGNUS_A - gamma)
+	
+	def calculateHeatIndex(self, temperature = 0.0, humidity = 0.0):
+		"""
+		Calculates the heat index (C) using the NWS Rothfusz regression,
+		or the NWS simple formula where the heat index is below 80F
+		(the regression's low / high humidity adjustments are not applied).
+		
+		@param temperature The temperature in C.
+		@param humidity The relative humidity in %.
+		@return The heat index in C (same shape as the inputs).
+		"""
+		tempF = np.asarray(temperature) * 1.8 + 32.0
+		
+		simpleIndex = 0.5 * (tempF + 61.0 + (tempF - 68.0) * 1.2 + humidity * 0.094)
+		fullIndex = -42.379 + 2.04901523 * tempF + 10.14333127 * humidity \
+			- 0.22475541 * tempF * humidity - 0.00683783 * tempF * tempF \
+			- 0.05481717 * humidity * humidity + 0.00122874 * tempF * tempF * humidity \
+			+ 0.00085282 * tempF * humidity * humidity - 0.00000199 * tempF * tempF * humidity * humidity
+		
+		heatIndexF = np.where((simpleIndex + tempF) / 2.0 < 80.0, simpleIndex, fullIndex)
+		
+		return (heatIndexF - 32.0) / 1.8
+	
+	def calculateCapacityFactor(self, powerOutput = 0.0, ratedPower: float = 0.0):
+		"""
+		Calculates the instantaneous capacity factor: the power output as
+		a fraction of the rated power, limited to [0, 1].
+		
+		@param powerOutput The power output in W.
+		@param ratedPower The rated power in W.
+		@return The capacity factor (same shape as the input).
+		"""
+		if ratedPower <= 0.0:
+			return np.zeros_like(np.asarray(powerOutput, dtype = np.float64))
+		
+		return np.clip(np.asarray(powerOutput) / ratedPower, 0.0, 1.0)
+	
+	def calculatePowerCoefficient(self, powerOutput = 0.0, windSpeed = 0.0, airDensity: float = 1.225, rotorSweptArea: float = 0.0):
+		"""
+		Calculates the power coefficient (Cp): the power output as a
+		fraction of the power available in the wind passing through the
+		rotor, i.e. P / (0.5 * p * A * V^3). It's 0 when there's no wind.
+		
+		@param powerOutput The power output in W.
+		@param windSpeed The wind speed in m/s.
+		@param airDensity The air density in kg/m3.
+		@param rotorSweptArea The rotor swept area in m2.
+		@return The power coefficient (same shape as the inputs).
+		"""
+		availablePower = 0.5 * airDensity * rotorSweptArea * np.power(np.asarray(windSpeed, dtype = np.float64), 3)
+		
+		return np.divide( \
+			np.asarray(powerOutput, dtype = np.float64), availablePower, \
+			out = np.zeros_like(availablePower), where = availablePower > 0.0)
+
+class _DerivedMetric():
+	"""
+	Derived metric definition used by DerivedMetricEngine.
+	
+	"""
+	
+	def __init__(self, name: str, typeID: int, typeCategoryID: int, inputTypeIDs: tuple, calcFunc):
+		self.name = name
+		self.typeID = typeID
+		self.typeCategoryID = typeCategoryID
+		self.inputTypeIDs = inputTypeIDs
+		self.calcFunc = calcFunc
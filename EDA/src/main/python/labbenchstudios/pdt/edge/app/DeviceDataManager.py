@@ -22,22 +22,32 @@
 # SOFTWARE.
 #
 
+import json
 import logging
+import threading
+
+from datetime import datetime
+from importlib import import_module
 
 from labbenchstudios.pdt.edge.app.EventDispatchManager import EventDispatchManager
-# from labbenchstudios.pdt.edge.connection.InfluxClientConnector import InfluxClientConnector
-from labbenchstudios.pdt.edge.connection.MqttClientConnector import MqttClientConnector
+from labbenchstudios.pdt.edge.app.ForecastThresholdRule import ForecastThresholdRule
+from labbenchstudios.pdt.edge.app.LatestDataCache import LatestDataCache
+from labbenchstudios.pdt.edge.app.SensorDataRuleEngine import SensorDataRuleEngine
+from labbenchstudios.pdt.edge.app.SensorForecaster import SensorForecaster
+from labbenchstudios.pdt.edge.app.ThresholdRule import ThresholdRule
+from labbenchstudios.pdt.edge.app.TwinStateManager import TwinStateManager
 
-from labbenchstudios.pdt.edge.system.WindTurbineAdapterManager import WindTurbineAdapterManager
-from labbenchstudios.pdt.edge.system.ActuatorAdapterManager import ActuatorAdapterManager
-from labbenchstudios.pdt.edge.system.SensorAdapterManager import SensorAdapterManager
-from labbenchstudios.pdt.edge.system.SystemPerformanceManager import SystemPerformanceManager
+# NOTE: the connectors, managers and numpy-based app components are
+# imported on demand (see _createComponent()), so their dependencies -
+# paho, influxdb_client, apscheduler, psutil, numpy and matplotlib -
+# are only loaded if they're enabled
 
 import labbenchstudios.pdt.common.ConfigConst as ConfigConst
 
 from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
 from labbenchstudios.pdt.common.IDataMessageListener import IDataMessageListener
 from labbenchstudios.pdt.common.ResourceNameEnum import ResourceNameEnum
+from labbenchstudios.pdt.common.SimulationClock import SimulationClock
 
 from labbenchstudios.pdt.data.DataUtil import DataUtil
 from labbenchstudios.pdt.data.ActuatorData import ActuatorData
@@ -59,8 +69,28 @@ class DeviceDataManager(IDataMessageListener):
 	on a separate thread. All incoming and outgoing messages should be handled via
 	the EventDispatchManager to ensure DeviceDataManager calls on the main thread
 	are not blocked.
+	
+	The latest value caches (see LatestDataCache) are the exception: they're
+	thread-safe, so the getLatest*FromCache() methods may be called from any thread.
 	"""
 	
+	# on demand component modules (see _createComponent())
+	ANOMALY_DETECTOR_MODULE         = 'labbenchstudios.pdt.edge.app.SensorAnomalyDetector'
+	DERIVED_METRIC_ENGINE_MODULE    = 'labbenchstudios.pdt.edge.app.DerivedMetricEngine'
+	ROLLUP_PROCESSOR_MODULE         = 'labbenchstudios.pdt.edge.app.SensorDataRollupProcessor'
+	SENSOR_HISTORY_BUFFER_MODULE    = 'labbenchstudios.pdt.edge.app.SensorHistoryBuffer'
+	FILE_PERSISTENCE_MODULE         = 'labbenchstudios.pdt.edge.connection.FilePersistenceConnector'
+	INFLUX_CLIENT_MODULE            = 'labbenchstudios.pdt.edge.connection.InfluxClientConnector'
+	MQTT_CLIENT_MODULE              = 'labbenchstudios.pdt.edge.connection.MqttClientConnector'
+	SQLITE_PERSISTENCE_MODULE       = 'labbenchstudios.pdt.edge.connection.SqlitePersistenceConnector'
+	ACTUATOR_ADAPTER_MANAGER_MODULE = 'labbenchstudios.pdt.edge.system.ActuatorAdapterManager'
+	FACTORY_WORKCELL_MANAGER_MODULE = 'labbenchstudios.pdt.edge.system.FactoryWorkcellAdapterManager'
+	FLEET_SIM_MANAGER_MODULE        = 'labbenchstudios.pdt.edge.system.FleetSimAdapterManager'
+	HISTORIAN_PLAYER_MODULE         = 'labbenchstudios.pdt.edge.simulation.DataHistorianPlayer'
+	SENSOR_ADAPTER_MANAGER_MODULE   = 'labbenchstudios.pdt.edge.system.SensorAdapterManager'
+	SYSTEM_PERF_MANAGER_MODULE      = 'labbenchstudios.pdt.edge.system.SystemPerformanceManager'
+	WIND_TURBINE_MANAGER_MODULE     = 'labbenchstudios.pdt.edge.system.WindTurbineAdapterManager'
+	
 	def __init__(self):
 		"""
 		Constructor.
@@ -75,12 +105,26 @@ class DeviceDataManager(IDataMessageListener):
 		self.actuatorAdapterMgr = None
 
 		self.windTurbineMgr        = None
+		self.fleetSimMgr           = None
+		self.factoryWorkcellMgr    = None
+		self.historianPlayer       = None
 		self.roboticManipulatorMgr = None
 
 		self.actuatorResponseCache = None
 		self.sensorDataCache = None
 		self.sysPerfDataCache = None
 
+		# per sensor name history; buffers are created on the dispatch thread,
+		# but may be read from any thread
+		self.sensorHistoryBuffers = {}
+		self.sensorHistoryLock = threading.Lock()
+
+		self.sensorDataRollupProcessor = None
+		self.twinStateMgr = None
+		self.anomalyDetector = None
+		self.derivedMetricEngine = None
+		self.sensorForecaster = None
+
 		# init config settings first, then init all the manager components
 		self._initConfigurationSettings()
 		self._initManager()
@@ -92,9 +136,8 @@ class DeviceDataManager(IDataMessageListener):
 		@param name
 		@return ActuatorData
 		"""
-		if name:
-			if name in self.actuatorResponseCache:
-				return self.actuatorResponseCache[name]
+		if name and self.actuatorResponseCache:
+			return self.actuatorResponseCache.getDataByName(name)
 			
 		return None
 		
@@ -105,12 +148,87 @@ class DeviceDataManager(IDataMessageListener):
 		@param name
 		@return SensorData
 		"""
-		if name:
-			if name in self.sensorDataCache:
-				return self.sensorDataCache[name]
+		if name and self.sensorDataCache:
+			return self.sensorDataCache.getDataByName(name)
 			
 		return None
 	
+	def getLatestSensorDataFromCacheByDevice(self, deviceID: str = None, typeID: int = ConfigConst.DEFAULT_SENSOR_TYPE) -> SensorData:
+		"""
+		Retrieves the latest sensor data item for the given device and type from
+		the internal data cache.
+		
+		@param deviceID
+		@param typeID
+		@return SensorData
+		"""
+		if self.sensorDataCache:
+			return self.sensorDataCache.getDataByDeviceAndType(deviceID, typeID)
+			
+		return None
+	
+	def getSensorDataCacheSnapshot(self) -> dict:
+		"""
+		Returns a snapshot (name -> SensorData) of the internal sensor data cache.
+		The dict is a copy, but the cached SensorData instances are shared and
+		must not be modified.
+		
+		@return dict
+		"""
+		if self.sensorDataCache:
+			return self.sensorDataCache.getNameSnapshot()
+		
+		return {}
+	
+	def getPendingMessageCount(self) -> int:
+		"""
+		Retrieves the number of messages waiting in the event dispatch queue.
+		
+		@return int
+		"""
+		return self.eventDispatchMgr.getPendingMessageCount()
+	
+	def getSensorHistory(self, name: str = None, windowSecs: float = 0) -> tuple:
+		"""
+		Retrieves the recent history of the named sensor as zero-copy views
+		of its ring buffer.
+		
+		@param name The sensor data name.
+		@param windowSecs The window length in seconds, relative to the newest sample (0 = all retained samples).
+		@return tuple The (timeStampsMillis, values) numpy arrays, oldest first, or None if there's no history.
+		"""
+		historyBuffer = self.getSensorHistoryBuffer(name)
+		
+		if historyBuffer:
+			return historyBuffer.getWindow(windowSecs = windowSecs)
+		
+		return None
+	
+	def getSensorHistoryBuffer(self, name: str = None):
+		"""
+		Retrieves the named sensor's history buffer, which also provides
+		rolling statistics (mean, min, max, std dev and slope) over the
+		retained samples.
+		
+		@param name The sensor data name.
+		@return SensorHistoryBuffer The buffer, or None if there's no history.
+		"""
+		return self.sensorHistoryBuffers.get(name) if name else None
+	
+	def getTwinStateSnapshot(self):
+		"""
+		Returns a consistent, versioned snapshot of the latest sensor data,
+		actuator responses, system performance data and connection state.
+		Taking a snapshot doesn't block the dispatch thread.
+		
+		@return MappingProxyType The read-only snapshot.
+		"""
+		# connection state is polled, since the MQTT client tracks it internally
+		if self.mqttClient:
+			self.twinStateMgr.updateConnectionState(self.mqttClient.getConnectionState())
+		
+		return self.twinStateMgr.getSnapshot()
+	
 	def getLatestSystemPerformanceDataFromCache(self, name: str = None) -> SystemPerformanceData:
 		"""
 		Retrieves the named system performance data from the internal data cache.
@@ -118,9 +236,8 @@ class DeviceDataManager(IDataMessageListener):
 		@param name
 		@return SystemPerformanceData
 		"""
-		if name:
-			if name in self.sysPerfDataCache:
-				return self.sysPerfDataCache
+		if name and self.sysPerfDataCache:
+			return self.sysPerfDataCache.getDataByName(name)
 		
 		return None
 	
@@ -152,6 +269,10 @@ class DeviceDataManager(IDataMessageListener):
 					if self.windTurbineMgr:
 						self.windTurbineMgr.updateSimulationData(data = data)
 						isHandled = True
+				elif (data.getTypeCategoryID() == ConfigConst.FACTORY_WORKCELL_TYPE_CATEGORY):
+					if self.factoryWorkcellMgr:
+						self.factoryWorkcellMgr.updateSimulationData(data = data)
+						isHandled = True
 				else:
 					if self.sensorAdapterMgr:
 						self.sensorAdapterMgr.updateSimulationData(data = data)
@@ -180,9 +301,11 @@ class DeviceDataManager(IDataMessageListener):
 				logging.warning("Incoming actuator response not set as response. Updating.")
 				data.setAsResponse()
 
-			# store the data in the cache
+			# store the data in the cache and twin state
 			if (self.actuatorResponseCache):
-				self.actuatorResponseCache[data.getName()] = data
+				self.actuatorResponseCache.storeData(data)
+			
+			self.twinStateMgr.updateActuatorResponse(data)
 
 			# store the data in the TSDB (if enabled)
 			if (self.tsdbClient):
@@ -211,16 +334,43 @@ class DeviceDataManager(IDataMessageListener):
 		if data:
 			logging.info("Incoming sensor data received (from sensor manager): " + str(data))
 			
+			# flag anomalous readings before they're stored or analyzed
+			isAnomaly = self._processSensorDataAnomalyCheck(data)
+			
+			# store the data in the cache, history and twin state
+			if (self.sensorDataCache):
+				self.sensorDataCache.storeData(data)
+			
+			self._updateSensorHistory(data)
+			self.twinStateMgr.updateSensorData(data)
+			
 			# store the data in the TSDB (if enabled)
 			if (self.tsdbClient):
-				self.tsdbClient.storeSensorData(data = data)
+				# with rollup enabled, raw readings may be dropped so only rollups are stored
+				if (self.storeRawSensorData or not self.sensorDataRollupProcessor):
+					self.tsdbClient.storeSensorData(data = data)
+				
+				# store any rollup windows closed by this reading
+				if (self.sensorDataRollupProcessor):
+					for rollup in self.sensorDataRollupProcessor.processSensorData(data = data):
+						self.tsdbClient.storeSensorDataRollup(data = rollup)
 			
-			# handle any local data analysis (this may trigger an actuation event)
-			self._processSensorDataAnalysis(data)
+			# handle any local data analysis (this may trigger an actuation event),
+			# unless the reading is anomalous
+			if not isAnomaly:
+				self._processSensorDataAnalysis(data)
 			
 			jsonData = DataUtil().sensorDataToJson(data = data)
 			self._processUpstreamTransmission(resource = ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE, msg = jsonData)
 			
+			# derived readings (e.g. dew point) are handled just like any other reading
+			if self.derivedMetricEngine and not isAnomaly:
+				for derivedData in self.derivedMetricEngine.processSensorData(data):
+					self.handleSensorMessage(derivedData)
+			
+			if self.sensorForecaster and not isAnomaly:
+				self._processSensorDataForecast(data)
+			
 			return True
 		else:
 			logging.warning("Incoming sensor data is invalid (null). Ignoring.")
@@ -238,6 +388,12 @@ class DeviceDataManager(IDataMessageListener):
 		if data:
 			logging.info("Incoming system performance message received (from sys perf manager): " + str(data))
 			
+			# store the data in the cache and twin state
+			if (self.sysPerfDataCache):
+				self.sysPerfDataCache.storeData(data)
+			
+			self.twinStateMgr.updateSystemPerformanceData(data)
+			
 			# store the data in the TSDB (if enabled)
 			if (self.tsdbClient):
 				self.tsdbClient.storeSystemPerformanceData(data = data)
@@ -263,6 +419,9 @@ class DeviceDataManager(IDataMessageListener):
 		if resource and msg:
 			logging.info("Incoming msg received. Topic: %s  Payload: %s", str(resource), msg)
 			
+			if resource == ResourceNameEnum.SYSTEM_REQUEST_RESOURCE:
+				return self._processSystemRequest(msg)
+			
 			# delegate the internal analysis / action of the message
 			self._processIncomingDataAnalysis(msg)
 			
@@ -291,6 +450,15 @@ class DeviceDataManager(IDataMessageListener):
 		
 		if self.windTurbineMgr:
 			self.windTurbineMgr.startManager()
+		
+		if self.fleetSimMgr:
+			self.fleetSimMgr.startManager()
+		
+		if self.factoryWorkcellMgr:
+			self.factoryWorkcellMgr.startManager()
+		
+		if self.historianPlayer:
+			self.historianPlayer.startManager()
 
 		if self.sysPerfMgr:
 			self.sysPerfMgr.startManager()
@@ -300,6 +468,10 @@ class DeviceDataManager(IDataMessageListener):
 
 		if self.tsdbClient:
 			self.tsdbClient.connectClient()
+		
+		# START: AFTER all managers and connections (in stepped mode,
+		# the clock runs the scheduled jobs as fast as possible)
+		SimulationClock().startClock()
 			
 		logging.info("Started DeviceDataManager.")
 		
@@ -311,8 +483,19 @@ class DeviceDataManager(IDataMessageListener):
 		"""
 		logging.info("Stopping DeviceDataManager...")
 		
+		SimulationClock().stopClock()
+		
 		if self.windTurbineMgr:
 			self.windTurbineMgr.stopManager()
+		
+		if self.fleetSimMgr:
+			self.fleetSimMgr.stopManager()
+		
+		if self.factoryWorkcellMgr:
+			self.factoryWorkcellMgr.stopManager()
+		
+		if self.historianPlayer:
+			self.historianPlayer.stopManager()
 
 		if self.sysPerfMgr:
 			self.sysPerfMgr.stopManager()
@@ -329,9 +512,15 @@ class DeviceDataManager(IDataMessageListener):
 			
 		if self.mqttClient:
 			self.mqttClient.unsubscribeFromTopic(ResourceNameEnum.CDA_ACTUATOR_CMD_RESOURCE)
+			self.mqttClient.unsubscribeFromTopic(ResourceNameEnum.SYSTEM_REQUEST_RESOURCE)
 			self.mqttClient.disconnectClient()
 				
 		if self.tsdbClient:
+			# store any partial rollup windows before disconnecting
+			if self.sensorDataRollupProcessor:
+				for rollup in self.sensorDataRollupProcessor.flushRollups():
+					self.tsdbClient.storeSensorDataRollup(data = rollup)
+					
 			self.tsdbClient.disconnectClient()
 		
 		logging.info("Stopped DeviceDataManager.")
@@ -361,6 +550,26 @@ class DeviceDataManager(IDataMessageListener):
 			self.configUtil.getFloat( \
 				section = ConfigConst.ENVIRONMENTAL_SETTINGS_KEY, key = ConfigConst.TRIGGER_HVAC_TEMP_CEILING_KEY)
 		
+		self.ruleConfigFile = \
+			self.configUtil.getProperty( \
+				section = ConfigConst.RULE_ENGINE_SETTINGS_KEY, key = ConfigConst.RULE_CONFIG_FILE_KEY, defaultVal = None)
+		
+		self.enableAnomalyDetection = \
+			self.configUtil.getBoolean( \
+				section = ConfigConst.ANOMALY_DETECTION_SETTINGS_KEY, key = ConfigConst.ENABLE_ANOMALY_DETECTION_KEY)
+		
+		self.enableDerivedMetrics = \
+			self.configUtil.getBoolean( \
+				section = ConfigConst.DERIVED_METRICS_SETTINGS_KEY, key = ConfigConst.ENABLE_DERIVED_METRICS_KEY)
+		
+		self.enableForecasting = \
+			self.configUtil.getBoolean( \
+				section = ConfigConst.FORECASTING_SETTINGS_KEY, key = ConfigConst.ENABLE_FORECASTING_KEY)
+		
+		self.hvacForecastHorizonSecs = \
+			self.configUtil.getFloat( \
+				section = ConfigConst.FORECASTING_SETTINGS_KEY, key = ConfigConst.HVAC_FORECAST_HORIZON_SECS_KEY, defaultVal = 0.0)
+		
 		self.enableEnvActuationEvents    = \
 			self.configUtil.getBoolean( \
 				section = ConfigConst.EDGE_DEVICE, key = ConfigConst.ENABLE_ACTUATION_KEY)
@@ -377,6 +586,44 @@ class DeviceDataManager(IDataMessageListener):
 			self.configUtil.getBoolean( \
 				section = ConfigConst.EDGE_DEVICE, key = ConfigConst.ENABLE_TSDB_CLIENT_KEY)
 		
+		self.persistenceType = \
+			self.configUtil.getProperty( \
+				section = ConfigConst.PERSISTENCE_SETTINGS_KEY, key = ConfigConst.PERSISTENCE_TYPE_KEY, \
+				defaultVal = ConfigConst.INFLUX_PERSISTENCE_TYPE)
+		
+		self.enableSensorDataRollup = \
+			self.configUtil.getBoolean( \
+				section = ConfigConst.DATA_GATEWAY_SERVICE, key = ConfigConst.ENABLE_ROLLUP_KEY)
+		
+		self.storeRawSensorData = \
+			self.configUtil.getBoolean( \
+				section = ConfigConst.DATA_GATEWAY_SERVICE, key = ConfigConst.STORE_RAW_SENSOR_DATA_KEY)
+		
+		self.rollupWindowSecs = \
+			self.configUtil.getInteger( \
+				section = ConfigConst.DATA_GATEWAY_SERVICE, key = ConfigConst.ROLLUP_WINDOW_SECS_KEY, \
+				defaultVal = ConfigConst.DEFAULT_ROLLUP_WINDOW_SECS)
+		
+		self.cacheMaxEntries = \
+			self.configUtil.getInteger( \
+				section = ConfigConst.EDGE_DEVICE, key = ConfigConst.CACHE_MAX_ENTRIES_KEY, \
+				defaultVal = ConfigConst.DEFAULT_CACHE_MAX_ENTRIES)
+		
+		self.cacheStripeCount = \
+			self.configUtil.getInteger( \
+				section = ConfigConst.EDGE_DEVICE, key = ConfigConst.CACHE_STRIPE_COUNT_KEY, \
+				defaultVal = ConfigConst.DEFAULT_CACHE_STRIPE_COUNT)
+		
+		self.sensorHistoryMaxSamples = \
+			self.configUtil.getInteger( \
+				section = ConfigConst.EDGE_DEVICE, key = ConfigConst.SENSOR_HISTORY_MAX_SAMPLES_KEY, \
+				defaultVal = ConfigConst.DEFAULT_SENSOR_HISTORY_MAX_SAMPLES)
+		
+		self.sensorHistorySecs = \
+			self.configUtil.getInteger( \
+				section = ConfigConst.EDGE_DEVICE, key = ConfigConst.SENSOR_HISTORY_SECS_KEY, \
+				defaultVal = ConfigConst.DEFAULT_SENSOR_HISTORY_SECS)
+		
 		self.enableEventBasedDisplayUpdates = \
 			self.configUtil.getBoolean( \
 				section = ConfigConst.EDGE_DEVICE, key = ConfigConst.SEND_EVENT_DISPLAY_UPDATES_KEY)
@@ -397,6 +644,14 @@ class DeviceDataManager(IDataMessageListener):
 			self.configUtil.getBoolean( \
 				section = ConfigConst.FACTORY_WORKCELL_SETTINGS_KEY, key = ConfigConst.ENABLE_OPERATION_KEY)
 			
+		self.enableFleetSim   = \
+			self.configUtil.getBoolean( \
+				section = ConfigConst.FLEET_SIM_SETTINGS_KEY, key = ConfigConst.ENABLE_OPERATION_KEY)
+			
+		self.enableReplay   = \
+			self.configUtil.getBoolean( \
+				section = ConfigConst.REPLAY_SETTINGS_KEY, key = ConfigConst.ENABLE_OPERATION_KEY)
+			
 	def _initManager(self):
 		"""
 		Simple method for initializing DeviceDataManager's internally managed managers,
@@ -407,38 +662,232 @@ class DeviceDataManager(IDataMessageListener):
 		# initialize the event dispatch manager
 		self.eventDispatchMgr = EventDispatchManager(dataMsgListener = self)
 
+		# initialize the latest value caches (these may be read from other threads)
+		self.actuatorResponseCache = LatestDataCache(maxEntries = self.cacheMaxEntries, stripeCount = self.cacheStripeCount)
+		self.sensorDataCache       = LatestDataCache(maxEntries = self.cacheMaxEntries, stripeCount = self.cacheStripeCount)
+		self.sysPerfDataCache      = LatestDataCache(maxEntries = self.cacheMaxEntries, stripeCount = self.cacheStripeCount)
+		
+		self.twinStateMgr = TwinStateManager(deviceID = self.deviceID)
+		
+		self._initRuleEngine()
+		
+		if self.enableAnomalyDetection:
+			self._initAnomalyDetector()
+		
+		if self.enableForecasting:
+			self._initSensorForecaster()
+
 		if self.enableTsdbClient:
-			self.tsdbClient = InfluxClientConnector(dataMsgListener = self.eventDispatchMgr)
-			logging.info("TSDB connector enabled")
+			if self.persistenceType == ConfigConst.FILE_PERSISTENCE_TYPE:
+				self.tsdbClient = self._createComponent(self.FILE_PERSISTENCE_MODULE, dataMsgListener = self.eventDispatchMgr)
+				logging.info("File persistence connector enabled")
+			elif self.persistenceType == ConfigConst.SQLITE_PERSISTENCE_TYPE:
+				self.tsdbClient = self._createComponent(self.SQLITE_PERSISTENCE_MODULE, dataMsgListener = self.eventDispatchMgr)
+				logging.info("SQLite historian connector enabled")
+			else:
+				self.tsdbClient = self._createComponent(self.INFLUX_CLIENT_MODULE, dataMsgListener = self.eventDispatchMgr)
+				logging.info("TSDB connector enabled")
+			
+			if self.enableSensorDataRollup:
+				self.sensorDataRollupProcessor = self._createComponent(self.ROLLUP_PROCESSOR_MODULE, windowSecs = self.rollupWindowSecs)
+				logging.info("TSDB sensor data rollup enabled. Storing raw sensor data: %s", str(self.storeRawSensorData))
 
 		if self.enableMqttClient:
-			self.mqttClient = MqttClientConnector()
+			self.mqttClient = self._createComponent(self.MQTT_CLIENT_MODULE)
 			self.mqttClient.setDataMessageListener(self.eventDispatchMgr)
 			logging.info("MQTT connector enabled")
 			
 		if self.enableSystemPerfEvents:
-			self.sysPerfMgr = SystemPerformanceManager()
+			self.sysPerfMgr = self._createComponent(self.SYSTEM_PERF_MANAGER_MODULE)
 			self.sysPerfMgr.setDataMessageListener(self.eventDispatchMgr)
 			logging.info("Local system performance tracking enabled")
 		
 		if self.enableEnvSensingEvents:
-			self.sensorAdapterMgr = SensorAdapterManager()
+			self.sensorAdapterMgr = self._createComponent(self.SENSOR_ADAPTER_MANAGER_MODULE)
 			self.sensorAdapterMgr.setDataMessageListener(self.eventDispatchMgr)
 			logging.info("Local sensor tracking enabled")
 			
 		if self.enableEnvActuationEvents:
-			self.actuatorAdapterMgr = ActuatorAdapterManager(dataMsgListener = self.eventDispatchMgr)
+			self.actuatorAdapterMgr = self._createComponent(self.ACTUATOR_ADAPTER_MANAGER_MODULE, dataMsgListener = self.eventDispatchMgr)
 			logging.info("Local actuation capabilities enabled")
 
 		if self.enableWindTurbineSim:
-			self.windTurbineMgr = WindTurbineAdapterManager()
+			self.windTurbineMgr = self._createComponent(self.WIND_TURBINE_MANAGER_MODULE)
 			self.windTurbineMgr.setDataMessageListener(self.eventDispatchMgr)
 			logging.info("Local wind turbine management enabled")
 		
+		if self.enableFleetSim:
+			self.fleetSimMgr = self._createComponent(self.FLEET_SIM_MANAGER_MODULE)
+			self.fleetSimMgr.setDataMessageListener(self.eventDispatchMgr)
+			logging.info("Fleet simulation enabled")
+		
 		if self.enableFactoryWorkCellSim:
-			#self.factoryWorkcellMgr = FactoryWorkcellManager()
-			#self.factoryWorkcellMgr.setDataMessageListener(self.eventDispatchMgr)
-			logging.info("TEST LOG MSG ONLY: Factory workcell sim enabled")
+			self.factoryWorkcellMgr = self._createComponent(self.FACTORY_WORKCELL_MANAGER_MODULE)
+			self.factoryWorkcellMgr.setDataMessageListener(self.eventDispatchMgr)
+			logging.info("Factory workcell simulation enabled")
+		
+		if self.enableReplay:
+			self._initHistorianPlayer()
+		
+		if self.enableDerivedMetrics:
+			self._initDerivedMetricEngine()
+		
+	def _createComponent(self, moduleName: str = None, **kwargs):
+		"""
+		Imports the named component module (if it isn't already loaded),
+		and creates an instance of its class - which, by convention, has
+		the same name as the module.
+		
+		Components are imported on demand rather than when this module is
+		loaded, so the heavy dependencies they pull in are only loaded if
+		they're enabled, which keeps EDA startup fast.
+		
+		@param moduleName The fully qualified module name.
+		@param kwargs The constructor arguments.
+		@return object The new component instance.
+		"""
+		componentClass = getattr(import_module(moduleName), moduleName.rsplit('.', 1)[-1])
+		
+		return componentClass(**kwargs)
+		
+	def _initHistorianPlayer(self):
+		"""
+		Initializes the historian player, which replays the configured
+		recordings into the event dispatch manager.
+		
+		"""
+		section = ConfigConst.REPLAY_SETTINGS_KEY
+		
+		self.historianPlayer = self._createComponent(self.HISTORIAN_PLAYER_MODULE, \
+			fileNames = self.configUtil.getProperty(section = section, key = ConfigConst.REPLAY_FILES_KEY, defaultVal = None), \
+			speedFactor = self.configUtil.getFloat(section = section, key = ConfigConst.REPLAY_SPEED_KEY, defaultVal = 1.0), \
+			enableLoop = self.configUtil.getBoolean(section = section, key = ConfigConst.REPLAY_LOOP_KEY), \
+			updateTimeStamps = not self.configUtil.getBoolean(section = section, key = ConfigConst.KEEP_TIME_STAMPS_KEY), \
+			dataMsgListener = self.eventDispatchMgr)
+		
+		logging.info("Historian player enabled")
+		
+	def _initDerivedMetricEngine(self):
+		"""
+		Initializes the derived metric engine with the environmental
+		metrics, plus the wind turbine metrics (using the simulated
+		turbine's rotor parameters) if the wind turbine sim is enabled.
+		
+		"""
+		self.derivedMetricEngine = self._createComponent(self.DERIVED_METRIC_ENGINE_MODULE)
+		self.derivedMetricEngine.addEnvironmentalMetrics()
+		
+		if self.windTurbineMgr:
+			turbineTask = self.windTurbineMgr.windTurbineSimTask
+			
+			self.derivedMetricEngine.addWindTurbineMetrics( \
+				airDensity = turbineTask.getAirDensity(), \
+				rotorSweptArea = turbineTask.getRotorSweptArea(), \
+				maxPowerCoeff = turbineTask.getMaxPowerCoefficient(), \
+				ratedWindSpeed = self.configUtil.getFloat( \
+					section = ConfigConst.DERIVED_METRICS_SETTINGS_KEY, key = ConfigConst.RATED_WIND_SPEED_KEY, \
+					defaultVal = ConfigConst.DEFAULT_RATED_WIND_SPEED))
+		
+		logging.info("Derived metrics enabled: %s", str(self.derivedMetricEngine.getMetricNames()))
+		
+	def _initRuleEngine(self):
+		"""
+		Initializes the sensor data rule engine with the configured
+		HVAC temperature rules (if enabled), along with any rules
+		in the configured rule file.
+		
+		"""
+		self.ruleEngine = SensorDataRuleEngine()
+		
+		if self.handleTempChangeOnDevice:
+			hvacRuleArgs = { \
+				'typeID': ConfigConst.TEMP_SENSOR_TYPE, \
+				'actuatorName': ConfigConst.HVAC_ACTUATOR_NAME, \
+				'actuatorTypeID': ConfigConst.HVAC_ACTUATOR_TYPE, \
+				'actuatorTypeCategoryID': ConfigConst.ENV_TYPE_CATEGORY }
+			
+			hvacRuleClass = ThresholdRule
+			
+			# if enabled, the HVAC rules act on the forecast temperature
+			# as well as the current temperature
+			if self.hvacForecastHorizonSecs > 0.0:
+				hvacRuleClass = ForecastThresholdRule
+				hvacRuleArgs['horizonSecs'] = self.hvacForecastHorizonSecs
+				
+				logging.info("HVAC rules will use a %.1f sec temperature forecast", self.hvacForecastHorizonSecs)
+			
+			# both rules drive the HVAC actuator - the rule engine sends 'off'
+			# commands before 'on' commands, so a jump straight across the
+			# floor / ceiling range still leaves the HVAC on
+			self.ruleEngine.addRule( \
+				hvacRuleClass( \
+					name = 'HvacCooling', operator = '>', threshold = self.triggerHvacTempCeiling, \
+					onValue = self.triggerHvacTempCeiling, **hvacRuleArgs))
+			
+			self.ruleEngine.addRule( \
+				hvacRuleClass( \
+					name = 'HvacHeating', operator = '<', threshold = self.triggerHvacTempFloor, \
+					onValue = self.triggerHvacTempFloor, **hvacRuleArgs))
+		
+		if self.ruleConfigFile:
+			self.ruleEngine.loadRules(self.ruleConfigFile)
+		
+		logging.info("Sensor data rule engine initialized with %d rules", self.ruleEngine.getRuleCount())
+		
+	def _initAnomalyDetector(self):
+		"""
+		Initializes the sensor data anomaly detector using the
+		anomaly detection settings.
+		
+		"""
+		section = ConfigConst.ANOMALY_DETECTION_SETTINGS_KEY
+		
+		self.anomalyDetector = self._createComponent(self.ANOMALY_DETECTOR_MODULE, \
+			detectionMethod = self.configUtil.getProperty( \
+				section = section, key = ConfigConst.DETECTION_METHOD_KEY, defaultVal = ConfigConst.EWMA_DETECTION_METHOD), \
+			ewmaAlpha = self.configUtil.getFloat( \
+				section = section, key = ConfigConst.EWMA_ALPHA_KEY, defaultVal = ConfigConst.DEFAULT_EWMA_ALPHA), \
+			zScoreThreshold = self.configUtil.getFloat( \
+				section = section, key = ConfigConst.Z_SCORE_THRESHOLD_KEY, defaultVal = ConfigConst.DEFAULT_Z_SCORE_THRESHOLD), \
+			warmupSamples = self.configUtil.getInteger( \
+				section = section, key = ConfigConst.WARMUP_SAMPLES_KEY, defaultVal = ConfigConst.DEFAULT_WARMUP_SAMPLES), \
+			madWindowSize = self.configUtil.getInteger( \
+				section = section, key = ConfigConst.MAD_WINDOW_SIZE_KEY, defaultVal = ConfigConst.DEFAULT_MAD_WINDOW_SIZE), \
+			stuckSampleCount = self.configUtil.getInteger( \
+				section = section, key = ConfigConst.STUCK_SAMPLE_COUNT_KEY, defaultVal = ConfigConst.DEFAULT_STUCK_SAMPLE_COUNT), \
+			stuckTolerance = self.configUtil.getFloat( \
+				section = section, key = ConfigConst.STUCK_TOLERANCE_KEY, defaultVal = ConfigConst.DEFAULT_STUCK_TOLERANCE))
+		
+		logging.info("Sensor data anomaly detection enabled")
+		
+	def _initSensorForecaster(self):
+		"""
+		Initializes the sensor data forecaster using the forecasting
+		settings. The horizons are a comma-separated list of seconds.
+		
+		"""
+		section = ConfigConst.FORECASTING_SETTINGS_KEY
+		
+		horizonsStr = self.configUtil.getProperty( \
+			section = section, key = ConfigConst.FORECAST_HORIZONS_SECS_KEY, \
+			defaultVal = str(ConfigConst.DEFAULT_FORECAST_HORIZON_SECS))
+		
+		try:
+			horizonsSecs = tuple(float(horizon) for horizon in horizonsStr.split(',') if horizon.strip())
+		except ValueError:
+			logging.warning("Invalid forecast horizons '%s'. Using default.", horizonsStr)
+			horizonsSecs = (ConfigConst.DEFAULT_FORECAST_HORIZON_SECS,)
+		
+		self.sensorForecaster = SensorForecaster( \
+			alpha = self.configUtil.getFloat( \
+				section = section, key = ConfigConst.FORECAST_ALPHA_KEY, defaultVal = ConfigConst.DEFAULT_FORECAST_ALPHA), \
+			beta = self.configUtil.getFloat( \
+				section = section, key = ConfigConst.FORECAST_BETA_KEY, defaultVal = ConfigConst.DEFAULT_FORECAST_BETA), \
+			horizonsSecs = horizonsSecs, \
+			minSamples = self.configUtil.getInteger( \
+				section = section, key = ConfigConst.FORECAST_MIN_SAMPLES_KEY, defaultVal = ConfigConst.DEFAULT_FORECAST_MIN_SAMPLES))
+		
+		logging.info("Sensor data forecasting enabled with horizons (secs): %s", str(self.sensorForecaster.getHorizons()))
 		
 	def _processIncomingDataAnalysis(self, resource = None, msg: str = None):
 		"""
@@ -468,52 +917,78 @@ class DeviceDataManager(IDataMessageListener):
 		except:
 			logging.warning("Failed to convert message to ActuatorData: ", msg)
 		
+	def _processSensorDataAnomalyCheck(self, data: SensorData = None) -> bool:
+		"""
+		Checks the data using the anomaly detector (if enabled). Anomalous
+		readings are flagged with an anomaly status code (which also sets
+		their error flag), and published to the anomaly resource.
+		
+		@param data
+		@return bool True if the reading is anomalous; False otherwise.
+		"""
+		if not self.anomalyDetector:
+			return False
+		
+		status = self.anomalyDetector.processSensorData(data)
+		
+		if status == ConfigConst.DEFAULT_STATUS:
+			return False
+		
+		logging.warning("Anomalous sensor data detected (status %d): %s", status, str(data))
+		
+		jsonData = DataUtil().sensorDataToJson(data = data)
+		self._processUpstreamTransmission(resource = ResourceNameEnum.CDA_ANOMALY_MSG_RESOURCE, msg = jsonData)
+		
+		return True
+		
+	def _processSensorDataForecast(self, data: SensorData = None):
+		"""
+		Updates the reading's forecast stream, and publishes its forecasts
+		(once the stream has enough readings) to the forecast resource.
+		
+		@param data
+		"""
+		forecasts = self.sensorForecaster.processSensorData(data)
+		
+		if not forecasts:
+			return
+		
+		forecastDict = { \
+			ConfigConst.NAME_PROP: data.getName(), \
+			ConfigConst.TYPE_ID_PROP: data.getTypeID(), \
+			ConfigConst.DEVICE_ID_PROP: data.getDeviceID(), \
+			ConfigConst.TIMESTAMP_PROP: data.getTimeStamp(), \
+			ConfigConst.VALUE_PROP: data.getValue(), \
+			ConfigConst.FORECASTS_PROP: [ \
+				{ConfigConst.HORIZON_SECS_PROP: horizonSecs, ConfigConst.VALUE_PROP: value} \
+					for horizonSecs, value in forecasts.items()] }
+		
+		self._processUpstreamTransmission(resource = ResourceNameEnum.CDA_FORECAST_MSG_RESOURCE, msg = json.dumps(forecastDict))
+		
 	def _processSensorDataAnalysis(self, data: SensorData = None):
 		"""
 		Check if the data requires any internal action (such as
 		enabling / disabling an actuator), and execute that action.
 		
-		The current implementation will check if we received temperature
-		data that requires an HVAC state change. This is a VERY simple
-		implementation that will trigger an HVAC actuator update to
-		raise the temp if the floor value is exceeded, or lower the
-		temp if the ceiling value is exceeded.
-		
-		This function will NOT check current status of the target
-		actuator, so if invoked, will always send either an ON
-		or OFF ActuatorData command to the actuator manager.
+		The current implementation evaluates the data against the rule
+		engine's rules for the data's type ID (which include the HVAC
+		temperature floor / ceiling rules if handleTempChangeOnDevice
+		is enabled). Rules only generate actuator commands when their
+		state changes - e.g. the HVAC is switched ON when the temperature
+		first exceeds the ceiling, and OFF once it's back within range - so
+		repeated readings within the same state send no commands.
 		
 		@param data
 		"""
 		
-		if self.handleTempChangeOnDevice and data.getTypeID() == ConfigConst.TEMP_SENSOR_TYPE:
-			logging.info("Handle temp change: %s - type ID: %s", \
-				str(self.handleTempChangeOnDevice), str(data.getTypeID()))
-			
-			ad = ActuatorData( \
-				name = ConfigConst.HVAC_ACTUATOR_NAME, \
-				typeCategoryID = ConfigConst.ENV_TYPE_CATEGORY, \
-				typeID = ConfigConst.HVAC_ACTUATOR_TYPE)
-			
-			ad.setDeviceID(self.deviceID)
-			ad.setLocationID(self.locationID)
-
-			if data.getValue() > self.triggerHvacTempCeiling:
-				ad.setCommand(ConfigConst.COMMAND_ON)
-				ad.setValue(self.triggerHvacTempCeiling)
-			elif data.getValue() < self.triggerHvacTempFloor:
-				ad.setCommand(ConfigConst.COMMAND_ON)
-				ad.setValue(self.triggerHvacTempFloor)
-			else:
-				ad.setCommand(ConfigConst.COMMAND_OFF)
+		if self.ruleEngine.hasRules(data.getTypeID()):
+			for ad in self.ruleEngine.processSensorData(data):
+				logging.info("Rule state change for %s - sending actuator command: %s", data.getName(), ad.getStateData())
 				
-			# NOTE: ActuatorAdapterManager and its associated actuator
-			# task implementations contain logic to avoid processing
-			# duplicative actuator commands - for the purposes
-			# of this exercise, the logic for filtering commands is
-			# left to ActuatorAdapterManager and its associated actuator
-			# task implementations, and not this function
-			self.handleActuatorCommandMessage(ad)
+				ad.setDeviceID(self.deviceID)
+				ad.setLocationID(self.locationID)
+				
+				self.handleActuatorCommandMessage(ad)
 
 		elif (self.enableEventBasedDisplayUpdates):
 			logging.info('Generating LED display message for actuator command [non-actionable]...')
@@ -532,6 +1007,51 @@ class DeviceDataManager(IDataMessageListener):
 			
 			self.handleActuatorCommandMessage(ad)
 	
+	def _processSystemRequest(self, msg: str = None) -> bool:
+		"""
+		Handles a system request. Currently, only twin state snapshot requests
+		are supported: the msg is either the request name, or a JSON object
+		with the request name and an optional response format, e.g.
+		
+		{"request": "TwinStateSnapshot", "format": "binary"}
+		
+		The snapshot is published to the twin state resource as JSON, or as
+		zlib compressed JSON if the 'binary' format is requested.
+		
+		@param msg The request message.
+		@return bool True if the request was handled; False otherwise.
+		"""
+		request = msg.strip() if isinstance(msg, str) else msg
+		responseFormat = ConfigConst.JSON_FORMAT
+		
+		try:
+			if isinstance(request, str) and request.startswith('{'):
+				requestDict = json.loads(request)
+				request = requestDict.get(ConfigConst.REQUEST_PROP)
+				responseFormat = requestDict.get(ConfigConst.FORMAT_PROP, ConfigConst.JSON_FORMAT)
+		except ValueError:
+			logging.warning("Failed to parse system request: %s", msg)
+			
+			return False
+		
+		if request != ConfigConst.TWIN_STATE_SNAPSHOT_REQUEST:
+			logging.warning("Unsupported system request. Ignoring: %s", msg)
+			
+			return False
+		
+		snapshot = self.getTwinStateSnapshot()
+		
+		if responseFormat == ConfigConst.BINARY_FORMAT:
+			snapshotMsg = self.twinStateMgr.getSnapshotAsBytes(snapshot)
+		else:
+			snapshotMsg = self.twinStateMgr.getSnapshotAsJson(snapshot)
+		
+		logging.info("Publishing twin state snapshot. Version: %s", str(snapshot[ConfigConst.VERSION_PROP]))
+		
+		self._processUpstreamTransmission(resource = ResourceNameEnum.CDA_TWIN_STATE_MSG_RESOURCE, msg = snapshotMsg)
+		
+		return True
+	
 	def _processUpstreamTransmission(self, resource = None, msg: str = None):
 		"""
 		Checks if we have a valid MQTT and / or CoAP client connection, and if so,
@@ -556,4 +1076,27 @@ class DeviceDataManager(IDataMessageListener):
 				logging.debug("Published incoming data to resource (MQTT): %s", str(resource))
 			else:
 				logging.warning("Failed to publish incoming data to resource (MQTT): %s", str(resource))
-			
\ No newline at end of file
+			
+
+	def _updateSensorHistory(self, data: SensorData = None):
+		"""
+		Appends the sensor data value to its named history buffer,
+		creating the buffer if needed.
+		
+		@param data The SensorData to add.
+		"""
+		try:
+			historyBuffer = self.sensorHistoryBuffers.get(data.getName())
+			
+			if not historyBuffer:
+				with self.sensorHistoryLock:
+					historyBuffer = \
+						self.sensorHistoryBuffers.setdefault( \
+							data.getName(), \
+							self._createComponent( \
+								self.SENSOR_HISTORY_BUFFER_MODULE, capacity = self.sensorHistoryMaxSamples, historySecs = self.sensorHistorySecs))
+			
+			historyBuffer.addSample( \
+				timeStampMillis = int(datetime.fromisoformat(data.getTimeStamp()).timestamp() * 1000), value = data.getValue())
+		except Exception as e:
+			logging.warning("Failed to update sensor history for %s: %s", data.getName(), str(e))
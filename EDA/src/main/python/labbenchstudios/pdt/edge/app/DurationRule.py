@@ -0,0 +1,67 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.edge.app.BaseSensorDataRule import BaseSensorDataRule
+
+class DurationRule(BaseSensorDataRule):
+	"""
+	Rule that only activates once the reading has continuously compared
+	true against a threshold for at least durationSecs (e.g. value > 30.0
+	for 5 minutes). It deactivates as soon as the condition is false.
+	
+	"""
+	
+	def __init__(self, operator: str = '>', threshold: float = ConfigConst.DEFAULT_VAL, durationSecs: float = 0.0, **kwargs):
+		"""
+		Constructor.
+		
+		@param operator The comparison operator: one of '>', '>=', '<' or '<='.
+		@param threshold The threshold value.
+		@param durationSecs How long the condition must hold before the rule activates.
+		@param kwargs The BaseSensorDataRule parameters.
+		"""
+		super(DurationRule, self).__init__(**kwargs)
+		
+		if operator not in self.OPERATORS:
+			raise ValueError('Unsupported operator for rule ' + str(self.name) + ': ' + str(operator))
+		
+		self.compareFunc = self.OPERATORS[operator]
+		self.threshold = float(threshold)
+		self.durationMillis = int(float(durationSecs) * 1000)
+		
+		# deviceID -> time (millis) the condition started holding
+		self.conditionStartTimes = {}
+	
+	def _evaluateCondition(self, deviceID: str = None, value: float = 0.0, timeMillis: int = 0) -> bool:
+		if not self.compareFunc(value, self.threshold):
+			self.conditionStartTimes.pop(deviceID, None)
+			
+			return False
+		
+		startMillis = self.conditionStartTimes.setdefault(deviceID, timeMillis)
+		
+		return timeMillis - startMillis >= self.durationMillis
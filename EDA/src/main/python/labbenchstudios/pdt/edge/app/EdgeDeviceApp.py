@@ -27,11 +27,10 @@ import logging
 import os
 import traceback
 
-from time import sleep
-
 import labbenchstudios.pdt.common.ConfigConst as ConfigConst
 
 from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
+from labbenchstudios.pdt.common.SimulationClock import SimulationClock
 from labbenchstudios.pdt.edge.app.DeviceDataManager import DeviceDataManager
 
 LOG_FORMAT = "%(asctime)s:::%(thread)d:%(name)s.%(module)s.%(funcName)s()[%(lineno)s]:%(levelname)s:%(message)s"
@@ -96,7 +95,8 @@ def main():
 	"""
 	Main function definition for running client as application.
 	
-	Current implementation runs for 65 seconds then exits.
+	Current implementation runs for clockRunSecs (65 by default) seconds
+	of SimulationClock time then exits, unless runForever is set.
 	"""
 	argParser = argparse.ArgumentParser( \
 		description = 'Edge Device Application for simulating data sets as part of the Building Digital Twins course.')
@@ -127,15 +127,19 @@ def main():
 		# check if EDA should run forever
 		runForever = configUtil.getBoolean(ConfigConst.EDGE_DEVICE, ConfigConst.RUN_FOREVER_KEY)
 
+		clock = SimulationClock()
+		
 		if runForever:
 			# sleep ~5 seconds every loop
 			while (True):
-				sleep(5)
+				clock.sleep(5)
 			
 		else:
-			# run EDA for ~65 seconds then exit
+			# run EDA for ~65 (simulated) seconds then exit
+			runSecs = configUtil.getFloat(ConfigConst.CLOCK_SETTINGS_KEY, ConfigConst.CLOCK_RUN_SECS_KEY, defaultVal = 65.0)
+			
 			if (eda.isAppStarted()):
-				sleep(65)
+				clock.sleep(runSecs)
 				eda.stopApp(0)
 			
 	except KeyboardInterrupt:
@@ -100,6 +100,31 @@ class EventDispatchManager(IDataMessageListener):
 		"""
 		pass
 	
+	def getPendingMessageCount(self) -> int:
+		"""
+		Retrieves the (approximate) number of messages in the queue.
+		
+		@return int
+		"""
+		if self.msgQueue:
+			return self.msgQueue.qsize()
+		
+		return 0
+	
+	def getSensorHistory(self, name: str = None, windowSecs: float = 0) -> tuple:
+		"""
+		Delegates directly to the data message listener (this is a
+		read-only, thread-safe call, so it isn't queued).
+		
+		@param name
+		@param windowSecs
+		@return tuple
+		"""
+		if self.dataMsgListener:
+			return self.dataMsgListener.getSensorHistory(name = name, windowSecs = windowSecs)
+		
+		return None
+	
 	def handleActuatorCommandMessage(self, data: ActuatorData = None) -> ActuatorData:
 		"""
 		Callback function to handle an actuator command message packaged as a ActuatorData object.
@@ -169,7 +194,13 @@ class EventDispatchManager(IDataMessageListener):
 		@param data The string-based message received.
 		@return bool True on success; False otherwise.
 		"""
-		logging.warning("Generic incoming message callback not implemented. Use data container specific interface.")
+		if self.msgQueue:
+			msgQueueItem = MessageQueueItem(msgData = (resource, msg), callbackFunc = self._processIncomingMessage)
+			self.msgQueue.put(msgQueueItem)
+
+			logging.info("Added incoming message to message queue.")
+		else:
+			logging.warning("Message queue not enabled. Ignoring incoming msg.")
 
 	def startManager(self):
 		"""
@@ -228,6 +259,20 @@ class EventDispatchManager(IDataMessageListener):
 		else:
 			logging.warning("No data message listener instance stored. Ignoring queued ActuatorData response msg.")
 	
+	def _processIncomingMessage(self, resourceAndMsg: tuple = None) -> bool:
+		"""
+		Callback function to handle a generic string-based message.
+		
+		@param resourceAndMsg The (resource, msg) tuple received.
+		@return bool True on success; False otherwise.
+		"""
+		if self.dataMsgListener:
+			logging.info("Dispatching queued incoming message to message listener implementation.")
+
+			return self.dataMsgListener.handleIncomingMessage(resourceAndMsg[0], resourceAndMsg[1])
+		else:
+			logging.warning("No data message listener instance stored. Ignoring queued incoming msg.")
+	
 	def _processSensorMessage(self, data: SensorData = None) -> bool:
 		"""
 		Callback function to handle a sensor message packaged as a SensorData object.
@@ -0,0 +1,81 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.edge.app.BaseSensorDataRule import BaseSensorDataRule
+from labbenchstudios.pdt.edge.app.SensorForecaster import SensorForecaster
+
+class ForecastThresholdRule(BaseSensorDataRule):
+	"""
+	Rule that's active while the reading's forecast horizonSecs ahead
+	compares true against a fixed threshold - e.g. to start cooling
+	before the temperature actually exceeds the ceiling. If
+	includeCurrentValue is set, the rule is also active while the
+	current reading itself compares true.
+	
+	Each rule keeps its own per-device forecast streams, so rules with
+	different horizons or smoothing factors don't interfere.
+	
+	"""
+	
+	def __init__(self, \
+		operator: str = '>', threshold: float = ConfigConst.DEFAULT_VAL, \
+		horizonSecs: float = ConfigConst.DEFAULT_FORECAST_HORIZON_SECS, includeCurrentValue: bool = True, \
+		alpha: float = ConfigConst.DEFAULT_FORECAST_ALPHA, beta: float = ConfigConst.DEFAULT_FORECAST_BETA, \
+		minSamples: int = ConfigConst.DEFAULT_FORECAST_MIN_SAMPLES, **kwargs):
+		"""
+		Constructor.
+		
+		@param operator The comparison operator: one of '>', '>=', '<' or '<='.
+		@param threshold The threshold value.
+		@param horizonSecs How far ahead (in seconds) to forecast.
+		@param includeCurrentValue If True, the current reading is also compared.
+		@param alpha The forecast level smoothing factor.
+		@param beta The forecast trend smoothing factor.
+		@param minSamples The number of readings per device before forecasts are used.
+		@param kwargs The BaseSensorDataRule parameters.
+		"""
+		super(ForecastThresholdRule, self).__init__(**kwargs)
+		
+		if operator not in self.OPERATORS:
+			raise ValueError('Unsupported operator for rule ' + str(self.name) + ': ' + str(operator))
+		
+		self.compareFunc = self.OPERATORS[operator]
+		self.threshold = float(threshold)
+		self.horizonSecs = float(horizonSecs)
+		self.includeCurrentValue = includeCurrentValue
+		
+		self.forecaster = SensorForecaster(alpha = alpha, beta = beta, horizonsSecs = (self.horizonSecs,), minSamples = minSamples)
+	
+	def _evaluateCondition(self, deviceID: str = None, value: float = 0.0, timeMillis: int = 0) -> bool:
+		self.forecaster.updateValue(streamKey = deviceID, value = value, timeSecs = timeMillis / 1000.0)
+		
+		if self.includeCurrentValue and self.compareFunc(value, self.threshold):
+			return True
+		
+		forecast = self.forecaster.getForecast(streamKey = deviceID, horizonSecs = self.horizonSecs)
+		
+		return forecast is not None and self.compareFunc(forecast, self.threshold)
@@ -0,0 +1,72 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.edge.app.BaseSensorDataRule import BaseSensorDataRule
+
+class HysteresisRule(BaseSensorDataRule):
+	"""
+	Rule with separate activation and deactivation thresholds, which
+	avoids rapid on / off cycling when the reading hovers near a single
+	threshold.
+	
+	If onThreshold >= offThreshold, the rule activates when the reading
+	rises to onThreshold, and deactivates when it falls to offThreshold
+	(e.g. cooling). Otherwise, it activates when the reading falls to
+	onThreshold, and deactivates when it rises to offThreshold (e.g. heating).
+	
+	"""
+	
+	def __init__(self, onThreshold: float = ConfigConst.DEFAULT_VAL, offThreshold: float = ConfigConst.DEFAULT_VAL, **kwargs):
+		"""
+		Constructor.
+		
+		@param onThreshold The threshold that activates the rule.
+		@param offThreshold The threshold that deactivates the rule.
+		@param kwargs The BaseSensorDataRule parameters.
+		"""
+		super(HysteresisRule, self).__init__(**kwargs)
+		
+		self.onThreshold = float(onThreshold)
+		self.offThreshold = float(offThreshold)
+		self.isRising = self.onThreshold >= self.offThreshold
+	
+	def _evaluateCondition(self, deviceID: str = None, value: float = 0.0, timeMillis: int = 0) -> bool:
+		if self.isRising:
+			if value >= self.onThreshold:
+				return True
+			
+			if value <= self.offThreshold:
+				return False
+		else:
+			if value <= self.onThreshold:
+				return True
+			
+			if value >= self.offThreshold:
+				return False
+		
+		# within the dead band: no change
+		return None
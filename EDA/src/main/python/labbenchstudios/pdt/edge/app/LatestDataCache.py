@@ -0,0 +1,182 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import threading
+
+from collections import OrderedDict
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.data.IotDataContext import IotDataContext
+
+class LatestDataCache():
+	"""
+	Thread-safe, bounded cache of the latest data item received for each
+	name, and for each (deviceID, typeID) pair. Both lookups are O(1).
+	
+	Each index is split into lock stripes - a key's stripe is selected by
+	its hash - so readers on other threads (e.g. MQTT or scheduler threads)
+	only contend with the dispatch thread when they touch the same stripe.
+	Each stripe is an LRU map; once a stripe reaches its share of the
+	max entry count, the least recently used entry is evicted.
+	
+	Cached items are shared references, not copies: callers must treat
+	them as read-only. Snapshots are shallow dict copies of the index,
+	so no data item is copied.
+	
+	"""
+	
+	def __init__(self, \
+		maxEntries: int = ConfigConst.DEFAULT_CACHE_MAX_ENTRIES, \
+		stripeCount: int = ConfigConst.DEFAULT_CACHE_STRIPE_COUNT):
+		"""
+		Constructor.
+		
+		@param maxEntries The max number of entries per index.
+		@param stripeCount The number of lock stripes per index.
+		"""
+		if stripeCount is None or stripeCount <= 0:
+			stripeCount = ConfigConst.DEFAULT_CACHE_STRIPE_COUNT
+		
+		if maxEntries is None or maxEntries <= 0:
+			maxEntries = ConfigConst.DEFAULT_CACHE_MAX_ENTRIES
+		
+		self.stripeCount = min(stripeCount, maxEntries)
+		self.maxEntriesPerStripe = -(-maxEntries // self.stripeCount)
+		
+		self.nameStripes = [(threading.Lock(), OrderedDict()) for i in range(self.stripeCount)]
+		self.typeStripes = [(threading.Lock(), OrderedDict()) for i in range(self.stripeCount)]
+		
+		self.evictionCount = 0
+		
+	def clear(self):
+		"""
+		Removes all cached entries.
+		
+		"""
+		for lock, entries in self.nameStripes + self.typeStripes:
+			with lock:
+				entries.clear()
+	
+	def getDataByName(self, name: str = None) -> IotDataContext:
+		"""
+		Returns the latest data item with the given name.
+		
+		@param name The data item name.
+		@return IotDataContext The cached item, or None if not cached.
+		"""
+		return self._getEntry(self.nameStripes, name)
+	
+	def getDataByDeviceAndType(self, deviceID: str = None, typeID: int = ConfigConst.DEFAULT_TYPE_ID) -> IotDataContext:
+		"""
+		Returns the latest data item for the given device and type ID.
+		
+		@param deviceID The device ID.
+		@param typeID The type ID.
+		@return IotDataContext The cached item, or None if not cached.
+		"""
+		return self._getEntry(self.typeStripes, (deviceID, typeID))
+	
+	def getEvictionCount(self) -> int:
+		return self.evictionCount
+	
+	def getNameSnapshot(self) -> dict:
+		"""
+		Returns a point-in-time snapshot of the name index. Only the dict
+		is copied (one stripe at a time); the data items are shared.
+		
+		@return dict Name -> latest data item.
+		"""
+		return self._getSnapshot(self.nameStripes)
+	
+	def getDeviceAndTypeSnapshot(self) -> dict:
+		"""
+		Returns a point-in-time snapshot of the (deviceID, typeID) index.
+		Only the dict is copied (one stripe at a time); the data items are shared.
+		
+		@return dict (deviceID, typeID) -> latest data item.
+		"""
+		return self._getSnapshot(self.typeStripes)
+	
+	def getSize(self) -> int:
+		"""
+		Returns the number of entries in the name index.
+		
+		@return int
+		"""
+		return sum(len(entries) for lock, entries in self.nameStripes)
+	
+	def storeData(self, data: IotDataContext = None) -> bool:
+		"""
+		Stores the data item as the latest for its name, and for its
+		(deviceID, typeID) pair.
+		
+		@param data The data item to cache.
+		@return bool True on success; False otherwise.
+		"""
+		if not data:
+			return False
+		
+		self._putEntry(self.nameStripes, data.getName(), data)
+		self._putEntry(self.typeStripes, (data.getDeviceID(), data.getTypeID()), data)
+		
+		return True
+	
+	def _getEntry(self, stripes: list, key) -> IotDataContext:
+		if key is None:
+			return None
+		
+		lock, entries = stripes[hash(key) % self.stripeCount]
+		
+		with lock:
+			data = entries.get(key)
+			
+			if data is not None:
+				entries.move_to_end(key)
+			
+			return data
+	
+	def _getSnapshot(self, stripes: list) -> dict:
+		snapshot = {}
+		
+		for lock, entries in stripes:
+			with lock:
+				snapshot.update(entries)
+		
+		return snapshot
+	
+	def _putEntry(self, stripes: list, key, data: IotDataContext):
+		lock, entries = stripes[hash(key) % self.stripeCount]
+		
+		with lock:
+			entries[key] = data
+			entries.move_to_end(key)
+			
+			if len(entries) > self.maxEntriesPerStripe:
+				evictedKey, evictedData = entries.popitem(last = False)
+				self.evictionCount += 1
+				
+				logging.debug('Evicted cache entry: %s', str(evictedKey))
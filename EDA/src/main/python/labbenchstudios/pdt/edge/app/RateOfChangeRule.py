@@ -0,0 +1,70 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.edge.app.BaseSensorDataRule import BaseSensorDataRule
+
+class RateOfChangeRule(BaseSensorDataRule):
+	"""
+	Rule that's active while the rate of change between consecutive
+	readings from a device (in value units per second) compares true
+	against a threshold. A positive threshold with '>' detects rapid
+	rises, a negative threshold with '<' detects rapid drops, and
+	useAbsoluteRate detects rapid changes in either direction.
+	
+	"""
+	
+	def __init__(self, operator: str = '>', rateThreshold: float = ConfigConst.DEFAULT_VAL, useAbsoluteRate: bool = False, **kwargs):
+		"""
+		Constructor.
+		
+		@param operator The comparison operator: one of '>', '>=', '<' or '<='.
+		@param rateThreshold The rate threshold, in value units per second.
+		@param useAbsoluteRate If True, the absolute rate is compared.
+		@param kwargs The BaseSensorDataRule parameters.
+		"""
+		super(RateOfChangeRule, self).__init__(**kwargs)
+		
+		if operator not in self.OPERATORS:
+			raise ValueError('Unsupported operator for rule ' + str(self.name) + ': ' + str(operator))
+		
+		self.compareFunc = self.OPERATORS[operator]
+		self.rateThreshold = float(rateThreshold)
+		self.useAbsoluteRate = useAbsoluteRate
+		
+		# deviceID -> (timeMillis, value) of the previous reading
+		self.lastReadings = {}
+	
+	def _evaluateCondition(self, deviceID: str = None, value: float = 0.0, timeMillis: int = 0) -> bool:
+		lastReading = self.lastReadings.get(deviceID)
+		self.lastReadings[deviceID] = (timeMillis, value)
+		
+		if not lastReading or timeMillis <= lastReading[0]:
+			return None
+		
+		rate = (value - lastReading[1]) * 1000.0 / (timeMillis - lastReading[0])
+		
+		return self.compareFunc(abs(rate) if self.useAbsoluteRate else rate, self.rateThreshold)
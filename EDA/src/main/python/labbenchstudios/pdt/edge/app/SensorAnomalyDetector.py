@@ -0,0 +1,342 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import bisect
+import logging
+import math
+
+from collections import deque
+
+import numpy as np
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+
+class SensorAnomalyDetector():
+	"""
+	Incremental anomaly detector for sensor data streams. Each
+	(deviceID, typeID) stream is tracked separately, using a fixed
+	amount of state, so the cost per reading is constant regardless
+	of how long the stream has been running.
+	
+	Two outlier detection methods are supported:
+	
+	- 'ewma': the reading's z-score against an exponentially weighted
+	  moving mean and variance (EWMA / EWMV) of the previous readings.
+	- 'mad': the reading's robust z-score against the median and median
+	  absolute deviation (MAD) of a fixed size window of previous
+	  readings, which is less sensitive to the outliers themselves.
+	
+	Independently of the method, a stream is flagged as stuck once
+	stuckSampleCount consecutive readings stay within stuckTolerance
+	of each other.
+	
+	Anomalous readings are flagged by setting a negative status code
+	(which also sets the data's error flag). backfillValues() applies
+	the same checks to a historical array in vectorized form.
+	
+	"""
+	
+	# the MAD scale factor for normally distributed data
+	MAD_SCALE_FACTOR = 0.6745
+	
+	def __init__(self, \
+		detectionMethod: str = ConfigConst.EWMA_DETECTION_METHOD, \
+		ewmaAlpha: float = ConfigConst.DEFAULT_EWMA_ALPHA, \
+		zScoreThreshold: float = ConfigConst.DEFAULT_Z_SCORE_THRESHOLD, \
+		warmupSamples: int = ConfigConst.DEFAULT_WARMUP_SAMPLES, \
+		madWindowSize: int = ConfigConst.DEFAULT_MAD_WINDOW_SIZE, \
+		stuckSampleCount: int = ConfigConst.DEFAULT_STUCK_SAMPLE_COUNT, \
+		stuckTolerance: float = ConfigConst.DEFAULT_STUCK_TOLERANCE):
+		"""
+		Constructor.
+		
+		@param detectionMethod The outlier detection method: 'ewma' or 'mad'.
+		@param ewmaAlpha The EWMA smoothing factor (0 < alpha <= 1).
+		@param zScoreThreshold The z-score above which a reading is an outlier.
+		@param warmupSamples The number of readings per stream before EWMA outliers are flagged.
+		@param madWindowSize The number of previous readings used for the median / MAD.
+		@param stuckSampleCount The consecutive unchanged readings that flag a stuck sensor (0 disables).
+		@param stuckTolerance The max change between readings that counts as unchanged.
+		"""
+		if detectionMethod not in (ConfigConst.EWMA_DETECTION_METHOD, ConfigConst.MAD_DETECTION_METHOD):
+			raise ValueError('Unsupported anomaly detection method: ' + str(detectionMethod))
+		
+		if not 0.0 < ewmaAlpha <= 1.0:
+			raise ValueError('EWMA alpha must be in (0, 1]: ' + str(ewmaAlpha))
+		
+		self.detectionMethod = detectionMethod
+		self.ewmaAlpha = ewmaAlpha
+		self.zScoreThreshold = zScoreThreshold
+		self.warmupSamples = max(1, warmupSamples)
+		self.madWindowSize = max(3, madWindowSize)
+		self.stuckSampleCount = max(0, stuckSampleCount)
+		self.stuckTolerance = stuckTolerance
+		
+		# (deviceID, typeID) -> _SensorStreamState
+		self.streamStates = {}
+		
+		self.outlierCount = 0
+		self.stuckCount = 0
+		
+		logging.info("Sensor anomaly detector initialized using %s method.", self.detectionMethod)
+	
+	def processSensorData(self, data: SensorData = None) -> int:
+		"""
+		Checks the reading against its stream's state, updates the
+		state, and sets the reading's status code if it's anomalous.
+		
+		@param data The sensor reading.
+		@return int The anomaly status code, or ConfigConst.DEFAULT_STATUS if the reading is normal.
+		"""
+		status = self.processValue(streamKey = (data.getDeviceID(), data.getTypeID()), value = data.getValue())
+		
+		if status != ConfigConst.DEFAULT_STATUS:
+			data.setStatusCode(status)
+		
+		return status
+	
+	def processValue(self, streamKey = None, value: float = 0.0) -> int:
+		"""
+		Checks the value against the given stream's state, and updates
+		the state.
+		
+		@param streamKey The stream key (any hashable value).
+		@param value The reading value.
+		@return int The anomaly status code, or ConfigConst.DEFAULT_STATUS if the value is normal.
+		"""
+		state = self.streamStates.get(streamKey)
+		
+		if not state:
+			state = _SensorStreamState(self.madWindowSize if self.detectionMethod == ConfigConst.MAD_DETECTION_METHOD else 0)
+			self.streamStates[streamKey] = state
+		
+		if self.detectionMethod == ConfigConst.EWMA_DETECTION_METHOD:
+			isOutlier = self._checkEwma(state, value)
+		else:
+			isOutlier = self._checkMad(state, value)
+		
+		isStuck = self._checkStuck(state, value)
+		
+		state.lastValue = value
+		state.count += 1
+		
+		if isOutlier:
+			self.outlierCount += 1
+			return ConfigConst.OUTLIER_ANOMALY_STATUS
+		
+		if isStuck:
+			self.stuckCount += 1
+			return ConfigConst.STUCK_SENSOR_ANOMALY_STATUS
+		
+		return ConfigConst.DEFAULT_STATUS
+	
+	def backfillValues(self, values = None) -> np.ndarray:
+		"""
+		Applies the configured checks to a historical array of readings
+		from a single stream, as if they were processed one at a time by
+		processValue() on a new stream (the detector's stream state is
+		not modified).
+		
+		@param values The readings, oldest first (any 1-D array-like).
+		@return np.ndarray The anomaly status code for each reading.
+		"""
+		values = np.asarray(values, dtype = np.float64)
+		statusCodes = np.full(values.shape[0], ConfigConst.DEFAULT_STATUS, dtype = np.int32)
+		
+		if values.shape[0] < 2:
+			return statusCodes
+		
+		if self.detectionMethod == ConfigConst.EWMA_DETECTION_METHOD:
+			outliers = self._backfillEwma(values)
+		else:
+			outliers = self._backfillMad(values)
+		
+		if self.stuckSampleCount > 0:
+			statusCodes[self._backfillStuck(values)] = ConfigConst.STUCK_SENSOR_ANOMALY_STATUS
+		
+		statusCodes[outliers] = ConfigConst.OUTLIER_ANOMALY_STATUS
+		
+		return statusCodes
+	
+	def getOutlierCount(self) -> int:
+		return self.outlierCount
+	
+	def getStuckCount(self) -> int:
+		return self.stuckCount
+	
+	def getStreamCount(self) -> int:
+		return len(self.streamStates)
+	
+	def resetStream(self, streamKey = None):
+		"""
+		Discards the state of the given stream (e.g. after a sensor is
+		replaced or recalibrated).
+		
+		@param streamKey The stream key.
+		"""
+		self.streamStates.pop(streamKey, None)
+	
+	def _checkEwma(self, state = None, value: float = 0.0) -> bool:
+		if state.count == 0:
+			state.mean = value
+			return False
+		
+		delta = value - state.mean
+		isOutlier = state.count >= self.warmupSamples and state.variance > 0.0 and \
+			abs(delta) > self.zScoreThreshold * math.sqrt(state.variance)
+		
+		state.mean += self.ewmaAlpha * delta
+		state.variance = (1.0 - self.ewmaAlpha) * (state.variance + self.ewmaAlpha * delta * delta)
+		
+		return isOutlier
+	
+	def _checkMad(self, state = None, value: float = 0.0) -> bool:
+		isOutlier = False
+		window = state.window
+		
+		if len(window) == self.madWindowSize:
+			median = self._getSortedMedian(state.sortedWindow)
+			mad = self._getSortedMedian(sorted(abs(v - median) for v in state.sortedWindow))
+			
+			isOutlier = mad > 0.0 and self.MAD_SCALE_FACTOR * abs(value - median) > self.zScoreThreshold * mad
+			
+			# drop the oldest value from the sorted copy before the deque evicts it
+			del state.sortedWindow[bisect.bisect_left(state.sortedWindow, window[0])]
+		
+		window.append(value)
+		bisect.insort(state.sortedWindow, value)
+		
+		return isOutlier
+	
+	def _checkStuck(self, state = None, value: float = 0.0) -> bool:
+		if self.stuckSampleCount == 0 or state.count == 0:
+			return False
+		
+		if abs(value - state.lastValue) <= self.stuckTolerance:
+			state.unchangedCount += 1
+		else:
+			state.unchangedCount = 0
+		
+		return state.unchangedCount >= self.stuckSampleCount - 1
+	
+	def _getSortedMedian(self, sortedValues: list = None) -> float:
+		mid = len(sortedValues) // 2
+		
+		if len(sortedValues) % 2:
+			return sortedValues[mid]
+		
+		return (sortedValues[mid - 1] + sortedValues[mid]) / 2.0
+	
+	def _backfillEwma(self, values: np.ndarray = None) -> np.ndarray:
+		decay = 1.0 - self.ewmaAlpha
+		
+		# means[i] is the EWMA after values[i + 1]; each value is checked
+		# against the mean and variance from before it was processed
+		means = self._applyDecayFilter(self.ewmaAlpha * values[1:], decay, values[0])
+		deltas = values[1:] - np.concatenate(([values[0]], means[:-1]))
+		variances = self._applyDecayFilter(decay * self.ewmaAlpha * deltas * deltas, decay, 0.0)
+		priorVariances = np.concatenate(([0.0], variances[:-1]))
+		
+		outliers = np.zeros(values.shape[0], dtype = bool)
+		outliers[1:] = (priorVariances > 0.0) & (np.abs(deltas) > self.zScoreThreshold * np.sqrt(priorVariances))
+		outliers[:self.warmupSamples] = False
+		
+		return outliers
+	
+	def _backfillMad(self, values: np.ndarray = None, chunkSize: int = 65536) -> np.ndarray:
+		outliers = np.zeros(values.shape[0], dtype = bool)
+		windowSize = self.madWindowSize
+		
+		if values.shape[0] <= windowSize:
+			return outliers
+		
+		# windows[i] holds the readings preceding values[i + windowSize]
+		windows = np.lib.stride_tricks.sliding_window_view(values[:-1], windowSize)
+		
+		# process in chunks to bound the size of the median / MAD temporaries
+		for start in range(0, windows.shape[0], chunkSize):
+			chunk = windows[start:start + chunkSize]
+			current = values[windowSize + start:windowSize + start + chunk.shape[0]]
+			
+			medians = np.median(chunk, axis = 1)
+			mads = np.median(np.abs(chunk - medians[:, None]), axis = 1)
+			
+			outliers[windowSize + start:windowSize + start + chunk.shape[0]] = \
+				(mads > 0.0) & (self.MAD_SCALE_FACTOR * np.abs(current - medians) > self.zScoreThreshold * mads)
+		
+		return outliers
+	
+	def _backfillStuck(self, values: np.ndarray = None) -> np.ndarray:
+		unchanged = np.zeros(values.shape[0], dtype = bool)
+		unchanged[1:] = np.abs(np.diff(values)) <= self.stuckTolerance
+		
+		# length of the run of unchanged readings ending at each index
+		indexes = np.arange(values.shape[0])
+		lastChangeIndexes = np.maximum.accumulate(np.where(unchanged, 0, indexes))
+		
+		return (indexes > 0) & ((indexes - lastChangeIndexes) >= self.stuckSampleCount - 1)
+	
+	def _applyDecayFilter(self, inputs: np.ndarray = None, decay: float = 0.0, initial: float = 0.0) -> np.ndarray:
+		"""
+		Vectorized form of the recurrence y[i] = decay * y[i - 1] + inputs[i],
+		with y[-1] = initial. The closed form is evaluated in blocks, sized
+		so the decay^-i scaling factors stay well within float precision.
+		
+		"""
+		if decay <= 0.0:
+			return inputs.copy()
+		
+		outputs = np.empty_like(inputs)
+		blockSize = max(1, int(12.0 / -math.log10(decay)))
+		powers = decay ** np.arange(min(blockSize, inputs.shape[0]))
+		carry = initial
+		
+		for start in range(0, inputs.shape[0], blockSize):
+			block = inputs[start:start + blockSize]
+			blockPowers = powers[:block.shape[0]]
+			
+			outputs[start:start + block.shape[0]] = blockPowers * (decay * carry + np.cumsum(block / blockPowers))
+			carry = outputs[start + block.shape[0] - 1]
+		
+		return outputs
+
+class _SensorStreamState():
+	"""
+	Per-stream state used by SensorAnomalyDetector.
+	
+	"""
+	
+	def __init__(self, windowSize: int = 0):
+		self.count = 0
+		self.mean = 0.0
+		self.variance = 0.0
+		self.lastValue = 0.0
+		self.unchangedCount = 0
+		
+		# previous readings (in arrival and sorted order) - MAD method only
+		self.window = deque(maxlen = windowSize) if windowSize > 0 else None
+		self.sortedWindow = [] if windowSize > 0 else None
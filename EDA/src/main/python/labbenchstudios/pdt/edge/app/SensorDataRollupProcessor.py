@@ -0,0 +1,184 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+
+from datetime import datetime
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+from labbenchstudios.pdt.data.SensorDataRollup import SensorDataRollup
+
+class SensorDataRollupProcessor():
+	"""
+	Edge rollup (downsampling) stage for SensorData, intended to run before
+	persistence. Readings are grouped by (deviceID, typeID) into tumbling
+	windows aligned to the epoch, and min / max / mean / count are maintained
+	incrementally - each reading is O(1) in time and each open window is
+	O(1) in memory, regardless of the window length.
+	
+	When a reading arrives for a newer window, the previous window for that
+	key is closed and returned as a SensorDataRollup. Readings that arrive
+	for a window that's already been closed are counted as late and dropped.
+	
+	NOTE: This is NOT a thread-safe class by design; it's expected to be
+	invoked from the EventDispatchManager's dispatch thread only.
+	
+	"""
+	
+	# indices into each open window entry
+	_START  = 0
+	_COUNT  = 1
+	_MIN    = 2
+	_MAX    = 3
+	_SUM    = 4
+	_SAMPLE = 5
+	
+	def __init__(self, windowSecs: int = ConfigConst.DEFAULT_ROLLUP_WINDOW_SECS):
+		"""
+		Constructor.
+		
+		@param windowSecs The tumbling window length in seconds.
+		"""
+		if windowSecs is None or windowSecs <= 0:
+			logging.warning("Invalid rollup window: %s. Using default: %s", str(windowSecs), str(ConfigConst.DEFAULT_ROLLUP_WINDOW_SECS))
+			windowSecs = ConfigConst.DEFAULT_ROLLUP_WINDOW_SECS
+			
+		self.windowSecs = int(windowSecs)
+		self.windowMillis = self.windowSecs * 1000
+		
+		self.openWindows = {}
+		self.lateReadingCount = 0
+		
+		logging.info("Created SensorDataRollupProcessor with window (secs): %s", str(self.windowSecs))
+		
+	def getLateReadingCount(self) -> int:
+		"""
+		Returns the number of readings dropped because their window had already closed.
+		
+		@return int
+		"""
+		return self.lateReadingCount
+	
+	def getOpenWindowCount(self) -> int:
+		"""
+		Returns the number of currently open (deviceID, typeID) windows.
+		
+		@return int
+		"""
+		return len(self.openWindows)
+	
+	def getWindowSecs(self) -> int:
+		"""
+		Returns the tumbling window length in seconds.
+		
+		@return int
+		"""
+		return self.windowSecs
+	
+	def processSensorData(self, data: SensorData = None) -> list:
+		"""
+		Folds the given reading into its (deviceID, typeID) window.
+		
+		@param data The SensorData reading to process.
+		@return list A list of SensorDataRollup instances for any window(s) closed
+		by this reading. This will almost always be empty or contain one entry.
+		"""
+		if not data:
+			return []
+		
+		timeMillis = self._convertTimeStampToMillis(data.getTimeStamp())
+		startMillis = timeMillis - (timeMillis % self.windowMillis)
+		key = (data.getDeviceID(), data.getTypeID())
+		val = data.getValue()
+		
+		entry = self.openWindows.get(key)
+		
+		if entry and entry[self._START] == startMillis:
+			entry[self._COUNT] += 1
+			entry[self._SUM] += val
+			
+			if val < entry[self._MIN]: entry[self._MIN] = val
+			if val > entry[self._MAX]: entry[self._MAX] = val
+			
+			return []
+		
+		if entry and startMillis < entry[self._START]:
+			self.lateReadingCount += 1
+			logging.debug("Dropping late reading for closed rollup window: %s", str(key))
+			
+			return []
+		
+		self.openWindows[key] = [startMillis, 1, val, val, val, data]
+		
+		if entry:
+			return [self._createRollup(entry)]
+		
+		return []
+	
+	def flushRollups(self) -> list:
+		"""
+		Closes all open windows, regardless of their end time. This is typically
+		used during shutdown so partial windows are not lost.
+		
+		@return list A list of SensorDataRollup instances, one per open window.
+		"""
+		rollups = [self._createRollup(entry) for entry in self.openWindows.values()]
+		
+		self.openWindows.clear()
+		
+		return rollups
+	
+	def _createRollup(self, entry: list = None) -> SensorDataRollup:
+		"""
+		Creates a SensorDataRollup from the given window entry.
+		
+		@param entry The internal open window entry.
+		@return SensorDataRollup
+		"""
+		sample = entry[self._SAMPLE]
+		count = entry[self._COUNT]
+		
+		rollup = SensorDataRollup( \
+			typeCategoryID = sample.getTypeCategoryID(), typeID = sample.getTypeID(), name = sample.getName())
+		
+		rollup.setDeviceID(sample.getDeviceID())
+		rollup.setLocationID(sample.getLocationID())
+		rollup.setWindow(startMillis = entry[self._START], windowSecs = self.windowSecs)
+		rollup.setRollupValues( \
+			minVal = entry[self._MIN], maxVal = entry[self._MAX], meanVal = entry[self._SUM] / count, count = count)
+		
+		return rollup
+	
+	def _convertTimeStampToMillis(self, timeStampStr: str = None) -> int:
+		"""
+		Converts the given ISO 8601 timestamp (as generated by BaseIotData)
+		into milliseconds since the epoch.
+		
+		@param timeStampStr
+		@return int
+		"""
+		return int(datetime.fromisoformat(timeStampStr).timestamp() * 1000)
@@ -0,0 +1,181 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import json
+import logging
+
+from datetime import datetime
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.data.ActuatorData import ActuatorData
+from labbenchstudios.pdt.data.SensorData import SensorData
+
+from labbenchstudios.pdt.edge.app.BaseSensorDataRule import BaseSensorDataRule
+from labbenchstudios.pdt.edge.app.DurationRule import DurationRule
+from labbenchstudios.pdt.edge.app.ForecastThresholdRule import ForecastThresholdRule
+from labbenchstudios.pdt.edge.app.HysteresisRule import HysteresisRule
+from labbenchstudios.pdt.edge.app.RateOfChangeRule import RateOfChangeRule
+from labbenchstudios.pdt.edge.app.ThresholdRule import ThresholdRule
+
+class SensorDataRuleEngine():
+	"""
+	Evaluates incoming sensor data against a set of rules, and returns
+	the actuator commands generated by any rule state changes.
+	
+	Rules are indexed by sensor type ID, so each reading only evaluates
+	the rules registered for its type - the cost per reading depends on
+	the number of rules for that type, not the total number of rules.
+	
+	Several rules may drive the same actuator (e.g. HVAC cooling and
+	heating rules). When a single reading changes the state of more than
+	one rule, the 'off' commands are returned before the 'on' commands,
+	so the actuator ends up in the state of the rule that just activated
+	- regardless of the order the rules were added in.
+	
+	Rules can be added directly, or loaded from a JSON file with the
+	following structure (each rule's remaining properties are passed
+	to its constructor):
+	
+	{"rules": [{"ruleType": "Threshold", "name": "...", "typeID": 1013, "operator": ">", "threshold": 25.0}]}
+	
+	"""
+	
+	# rule type name -> rule class
+	RULE_TYPES = { \
+		ConfigConst.THRESHOLD_RULE_TYPE: ThresholdRule, \
+		ConfigConst.HYSTERESIS_RULE_TYPE: HysteresisRule, \
+		ConfigConst.RATE_OF_CHANGE_RULE_TYPE: RateOfChangeRule, \
+		ConfigConst.DURATION_RULE_TYPE: DurationRule, \
+		ConfigConst.FORECAST_RULE_TYPE: ForecastThresholdRule }
+	
+	def __init__(self):
+		"""
+		Constructor.
+		
+		"""
+		# typeID -> list of rules
+		self.rulesByTypeID = {}
+		self.ruleCount = 0
+	
+	def addRule(self, rule: BaseSensorDataRule = None) -> bool:
+		"""
+		Adds the rule to the engine.
+		
+		@param rule The rule to add.
+		@return bool True on success; False otherwise.
+		"""
+		if not rule:
+			logging.warning("Ignoring null rule.")
+			return False
+		
+		self.rulesByTypeID.setdefault(rule.getTypeID(), []).append(rule)
+		self.ruleCount += 1
+		
+		return True
+	
+	def loadRules(self, ruleConfigFile: str = None) -> int:
+		"""
+		Loads all rules from the given JSON rule file. Invalid rule
+		definitions are logged and skipped.
+		
+		@param ruleConfigFile The rule file path.
+		@return int The number of rules loaded.
+		"""
+		try:
+			with open(ruleConfigFile, 'r') as f:
+				ruleDefs = json.load(f).get(ConfigConst.RULES_PROP, [])
+		except Exception as e:
+			logging.warning("Failed to load rule file %s: %s", ruleConfigFile, str(e))
+			return 0
+		
+		loadCount = 0
+		
+		for ruleDef in ruleDefs:
+			ruleArgs = dict(ruleDef)
+			ruleType = ruleArgs.pop(ConfigConst.RULE_TYPE_PROP, None)
+			ruleClass = self.RULE_TYPES.get(ruleType)
+			
+			if not ruleClass:
+				logging.warning("Ignoring rule with unsupported rule type %s: %s", str(ruleType), str(ruleDef))
+				continue
+			
+			try:
+				if self.addRule(ruleClass(**ruleArgs)):
+					loadCount += 1
+			except Exception as e:
+				logging.warning("Ignoring invalid rule %s: %s", str(ruleDef), str(e))
+		
+		logging.info("Loaded %d rules from rule file: %s", loadCount, ruleConfigFile)
+		
+		return loadCount
+	
+	def processSensorData(self, data: SensorData = None) -> list:
+		"""
+		Evaluates all rules registered for the reading's type ID.
+		
+		@param data The sensor reading.
+		@return list The ActuatorData commands generated by rule state changes,
+		deactivations first (may be empty).
+		"""
+		rules = self.rulesByTypeID.get(data.getTypeID())
+		
+		if not rules:
+			return []
+		
+		timeMillis = int(datetime.fromisoformat(data.getTimeStamp()).timestamp() * 1000)
+		offCommands = []
+		onCommands = []
+		
+		for rule in rules:
+			ad = rule.processSensorData(data, timeMillis)
+			
+			if ad:
+				if rule.isActive(data.getDeviceID()):
+					onCommands.append(ad)
+				else:
+					offCommands.append(ad)
+		
+		return offCommands + onCommands
+	
+	def hasRules(self, typeID: int = ConfigConst.DEFAULT_TYPE_ID) -> bool:
+		"""
+		Returns True if any rules are registered for the given type ID.
+		
+		@param typeID
+		@return bool
+		"""
+		return typeID in self.rulesByTypeID
+	
+	def getRuleCount(self) -> int:
+		return self.ruleCount
+	
+	def clearRules(self):
+		"""
+		Removes all rules from the engine.
+		
+		"""
+		self.rulesByTypeID.clear()
+		self.ruleCount = 0
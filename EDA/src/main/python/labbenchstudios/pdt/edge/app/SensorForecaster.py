@@ -0,0 +1,179 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+
+from datetime import datetime
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+
+class SensorForecaster():
+	"""
+	Short-horizon forecaster for sensor data streams, using Holt's linear
+	trend method (double exponential smoothing) per stream.
+	
+	The model is fitted incrementally: each reading updates the stream's
+	level and trend in constant time and memory, so the fitting cost per
+	poll cycle is fixed regardless of history length. Readings don't need
+	to be evenly spaced - the trend is tracked per second, and each update
+	accounts for the time elapsed since the previous reading.
+	
+	A stream's forecast for h seconds ahead is level + trend * h. No
+	forecasts are made until a stream has received minSamples readings.
+	
+	"""
+	
+	def __init__(self, \
+		alpha: float = ConfigConst.DEFAULT_FORECAST_ALPHA, beta: float = ConfigConst.DEFAULT_FORECAST_BETA, \
+		horizonsSecs: tuple = (ConfigConst.DEFAULT_FORECAST_HORIZON_SECS,), \
+		minSamples: int = ConfigConst.DEFAULT_FORECAST_MIN_SAMPLES):
+		"""
+		Constructor.
+		
+		@param alpha The level smoothing factor (0 < alpha <= 1).
+		@param beta The trend smoothing factor (0 < beta <= 1).
+		@param horizonsSecs The forecast horizons (in seconds) returned by processSensorData().
+		@param minSamples The number of readings per stream before forecasts are made.
+		"""
+		if not (0.0 < alpha <= 1.0 and 0.0 < beta <= 1.0):
+			raise ValueError('Forecast smoothing factors must be in (0, 1]: ' + str(alpha) + ', ' + str(beta))
+		
+		self.alpha = alpha
+		self.beta = beta
+		self.horizonsSecs = tuple(sorted(horizonsSecs))
+		self.minSamples = max(2, minSamples)
+		
+		# stream key -> _HoltState
+		self.streamStates = {}
+	
+	def getHorizons(self) -> tuple:
+		return self.horizonsSecs
+	
+	def processSensorData(self, data: SensorData = None) -> dict:
+		"""
+		Updates the reading's (deviceID, typeID) stream, and returns its
+		forecasts for the configured horizons.
+		
+		@param data The sensor reading.
+		@return dict Horizon (secs) -> forecast value; empty until the stream has enough readings.
+		"""
+		streamKey = (data.getDeviceID(), data.getTypeID())
+		timeSecs = datetime.fromisoformat(data.getTimeStamp()).timestamp()
+		
+		self.updateValue(streamKey = streamKey, value = data.getValue(), timeSecs = timeSecs)
+		
+		return self.getForecasts(streamKey)
+	
+	def updateValue(self, streamKey = None, value: float = 0.0, timeSecs: float = 0.0):
+		"""
+		Updates the stream's level and trend with the given reading.
+		Readings that aren't newer than the previous one are ignored.
+		
+		@param streamKey The stream key (any hashable value).
+		@param value The reading value.
+		@param timeSecs The reading time in seconds.
+		"""
+		state = self.streamStates.get(streamKey)
+		
+		if not state:
+			self.streamStates[streamKey] = _HoltState(value, timeSecs)
+			return
+		
+		elapsedSecs = timeSecs - state.lastTimeSecs
+		
+		if elapsedSecs <= 0.0:
+			logging.debug("Ignoring out of order reading for forecast stream: %s", str(streamKey))
+			return
+		
+		if state.count == 1:
+			# the first step initializes the trend
+			state.trend = (value - state.level) / elapsedSecs
+		
+		predicted = state.level + state.trend * elapsedSecs
+		level = self.alpha * value + (1.0 - self.alpha) * predicted
+		
+		state.trend = self.beta * (level - state.level) / elapsedSecs + (1.0 - self.beta) * state.trend
+		
+		state.level = level
+		state.lastTimeSecs = timeSecs
+		state.count += 1
+	
+	def getForecast(self, streamKey = None, horizonSecs: float = 0.0) -> float:
+		"""
+		Returns the stream's forecast for the given time ahead of its
+		latest reading.
+		
+		@param streamKey The stream key.
+		@param horizonSecs The forecast horizon in seconds.
+		@return float The forecast, or None if the stream doesn't have enough readings.
+		"""
+		state = self.streamStates.get(streamKey)
+		
+		if not state or state.count < self.minSamples:
+			return None
+		
+		return state.level + state.trend * horizonSecs
+	
+	def getForecasts(self, streamKey = None) -> dict:
+		"""
+		Returns the stream's forecasts for the configured horizons.
+		
+		@param streamKey The stream key.
+		@return dict Horizon (secs) -> forecast value; empty if the stream doesn't have enough readings.
+		"""
+		state = self.streamStates.get(streamKey)
+		
+		if not state or state.count < self.minSamples:
+			return {}
+		
+		return {horizonSecs: state.level + state.trend * horizonSecs for horizonSecs in self.horizonsSecs}
+	
+	def getTrend(self, streamKey = None) -> float:
+		"""
+		Returns the stream's current trend, in value units per second.
+		
+		@param streamKey The stream key.
+		@return float The trend, or None if the stream is unknown.
+		"""
+		state = self.streamStates.get(streamKey)
+		
+		return state.trend if state else None
+	
+	def getStreamCount(self) -> int:
+		return len(self.streamStates)
+
+class _HoltState():
+	"""
+	Per-stream state used by SensorForecaster.
+	
+	"""
+	
+	def __init__(self, value: float = 0.0, timeSecs: float = 0.0):
+		self.level = value
+		self.trend = 0.0
+		self.lastTimeSecs = timeSecs
+		self.count = 1
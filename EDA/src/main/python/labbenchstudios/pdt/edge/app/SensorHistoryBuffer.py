@@ -0,0 +1,265 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import math
+import threading
+
+from collections import deque
+
+import numpy as np
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+class SensorHistoryBuffer():
+	"""
+	Fixed capacity ring buffer of (timestamp, value) samples for a single
+	sensor stream, holding at most the last 'historySecs' of samples.
+	
+	Values (float64) and timestamps (int64, millis) are stored in arrays
+	preallocated to twice the capacity, and each sample is written at both
+	'i' and 'i + capacity'. The most recent N samples are therefore always
+	contiguous, so windows are returned as zero-copy numpy views.
+	
+	Appends are O(1) (amortized for min / max). Mean, std dev and slope
+	over the retained samples are maintained incrementally with running
+	sums, and min / max with monotonic deques.
+	
+	NOTE: Returned views share memory with the buffer, so a view of the
+	full capacity will see its oldest samples overwritten by later
+	appends. Copy the view if it must remain stable.
+	
+	"""
+	
+	def __init__(self, \
+		capacity: int = ConfigConst.DEFAULT_SENSOR_HISTORY_MAX_SAMPLES, \
+		historySecs: int = ConfigConst.DEFAULT_SENSOR_HISTORY_SECS):
+		"""
+		Constructor.
+		
+		@param capacity The max number of samples retained.
+		@param historySecs The max age of retained samples, relative to the newest (0 = no limit).
+		"""
+		self.capacity = max(1, int(capacity))
+		self.historyMillis = max(0, int(historySecs)) * 1000
+		
+		self.values = np.zeros(2 * self.capacity, dtype = np.float64)
+		self.timeStamps = np.zeros(2 * self.capacity, dtype = np.int64)
+		
+		self.lock = threading.Lock()
+		
+		# sequence number of the next sample; samples [nextSeq - count, nextSeq) are retained
+		self.nextSeq = 0
+		self.count = 0
+		
+		# running sums are relative to the first sample, which keeps the
+		# sums small and limits cancellation error in the variance and slope
+		self.baseValue = None
+		self.baseTimeMillis = None
+		
+		self.sumV = 0.0
+		self.sumVV = 0.0
+		self.sumT = 0.0
+		self.sumTT = 0.0
+		self.sumTV = 0.0
+		
+		# monotonic deques of (seq, value) for rolling min and max
+		self.minDeque = deque()
+		self.maxDeque = deque()
+	
+	def addSample(self, timeStampMillis: int = 0, value: float = 0.0):
+		"""
+		Appends a sample, evicting any samples that exceed the capacity or
+		are older than the history window.
+		
+		@param timeStampMillis The sample timestamp in millis.
+		@param value The sample value.
+		"""
+		with self.lock:
+			if self.baseValue is None:
+				self.baseValue = value
+				self.baseTimeMillis = timeStampMillis
+			
+			if self.count == self.capacity:
+				self._evictOldest()
+			
+			if self.historyMillis > 0:
+				oldestAllowed = timeStampMillis - self.historyMillis
+				
+				while self.count > 0 and self.timeStamps[self._getIndex(self.nextSeq - self.count)] < oldestAllowed:
+					self._evictOldest()
+			
+			i = self.nextSeq % self.capacity
+			
+			self.values[i] = self.values[i + self.capacity] = value
+			self.timeStamps[i] = self.timeStamps[i + self.capacity] = timeStampMillis
+			
+			v = value - self.baseValue
+			t = (timeStampMillis - self.baseTimeMillis) / 1000.0
+			
+			self.sumV += v
+			self.sumVV += v * v
+			self.sumT += t
+			self.sumTT += t * t
+			self.sumTV += t * v
+			
+			while self.minDeque and self.minDeque[-1][1] >= value:
+				self.minDeque.pop()
+			
+			while self.maxDeque and self.maxDeque[-1][1] <= value:
+				self.maxDeque.pop()
+			
+			self.minDeque.append((self.nextSeq, value))
+			self.maxDeque.append((self.nextSeq, value))
+			
+			self.nextSeq += 1
+			self.count += 1
+			
+			# once per lap, re-base the running sums on the oldest retained
+			# sample (amortized O(1)) so they don't drift as time advances
+			if self.nextSeq % self.capacity == 0:
+				self._rebaseSums()
+	
+	def getCount(self) -> int:
+		return self.count
+	
+	def getMax(self) -> float:
+		"""
+		Returns the max of the retained samples.
+		
+		@return float The max, or NaN if empty.
+		"""
+		with self.lock:
+			return self.maxDeque[0][1] if self.maxDeque else math.nan
+	
+	def getMean(self) -> float:
+		"""
+		Returns the mean of the retained samples.
+		
+		@return float The mean, or NaN if empty.
+		"""
+		with self.lock:
+			return self.baseValue + self.sumV / self.count if self.count > 0 else math.nan
+	
+	def getMin(self) -> float:
+		"""
+		Returns the min of the retained samples.
+		
+		@return float The min, or NaN if empty.
+		"""
+		with self.lock:
+			return self.minDeque[0][1] if self.minDeque else math.nan
+	
+	def getSlope(self) -> float:
+		"""
+		Returns the least squares slope of the retained samples, in value
+		units per second.
+		
+		@return float The slope, or NaN if fewer than 2 samples (or no time spread).
+		"""
+		with self.lock:
+			n = self.count
+			denominator = n * self.sumTT - self.sumT * self.sumT
+			
+			if n < 2 or denominator <= 0.0:
+				return math.nan
+			
+			return (n * self.sumTV - self.sumT * self.sumV) / denominator
+	
+	def getStdDev(self) -> float:
+		"""
+		Returns the population standard deviation of the retained samples.
+		
+		@return float The std dev, or NaN if empty.
+		"""
+		with self.lock:
+			if self.count == 0:
+				return math.nan
+			
+			mean = self.sumV / self.count
+			
+			return math.sqrt(max(0.0, self.sumVV / self.count - mean * mean))
+	
+	def getWindow(self, windowSecs: float = 0) -> tuple:
+		"""
+		Returns zero-copy views of the samples within the last 'windowSecs'
+		(relative to the newest sample).
+		
+		@param windowSecs The window length in seconds (0 = all retained samples).
+		@return tuple The (timeStampsMillis, values) numpy array views, oldest first.
+		"""
+		with self.lock:
+			timeStamps, values = self._getRetained()
+			
+			if windowSecs and windowSecs > 0 and self.count > 0:
+				offset = int(np.searchsorted(timeStamps, timeStamps[-1] - int(windowSecs * 1000), side = 'left'))
+				timeStamps = timeStamps[offset:]
+				values = values[offset:]
+			
+			return (timeStamps, values)
+	
+	def _evictOldest(self):
+		oldestSeq = self.nextSeq - self.count
+		i = self._getIndex(oldestSeq)
+		
+		v = self.values[i] - self.baseValue
+		t = (int(self.timeStamps[i]) - self.baseTimeMillis) / 1000.0
+		
+		self.sumV -= v
+		self.sumVV -= v * v
+		self.sumT -= t
+		self.sumTT -= t * t
+		self.sumTV -= t * v
+		
+		if self.minDeque and self.minDeque[0][0] == oldestSeq:
+			self.minDeque.popleft()
+		
+		if self.maxDeque and self.maxDeque[0][0] == oldestSeq:
+			self.maxDeque.popleft()
+		
+		self.count -= 1
+	
+	def _rebaseSums(self):
+		timeStamps, values = self._getRetained()
+		
+		self.baseValue = float(values[0])
+		self.baseTimeMillis = int(timeStamps[0])
+		
+		v = values - self.baseValue
+		t = (timeStamps - self.baseTimeMillis) / 1000.0
+		
+		self.sumV = float(v.sum())
+		self.sumVV = float(np.dot(v, v))
+		self.sumT = float(t.sum())
+		self.sumTT = float(np.dot(t, t))
+		self.sumTV = float(np.dot(t, v))
+	
+	def _getRetained(self) -> tuple:
+		end = self._getIndex(self.nextSeq - 1) + self.capacity + 1 if self.count > 0 else 0
+		start = end - self.count
+		
+		return (self.timeStamps[start:end], self.values[start:end])
+	
+	def _getIndex(self, seq: int) -> int:
+		return seq % self.capacity
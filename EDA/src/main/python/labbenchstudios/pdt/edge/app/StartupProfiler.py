@@ -0,0 +1,212 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import argparse
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from pathlib import Path
+
+class StartupProfiler():
+	"""
+	Utility for profiling EDA startup: import times (using Python's
+	'-X importtime' option) and the end to end latency of creating a
+	DeviceDataManager. Each measurement runs in a fresh interpreter, so
+	nothing is already imported or cached.
+	
+	Run as a module to print a report, e.g.:
+	
+	python -m labbenchstudios.pdt.edge.app.StartupProfiler -c config/eda001.props -b 10
+	
+	"""
+	
+	DEFAULT_MODULE = 'labbenchstudios.pdt.edge.app.DeviceDataManager'
+	
+	# slow to import, so only loaded by the components that need them
+	HEAVY_PACKAGES = ('apscheduler', 'influxdb_client', 'matplotlib', 'numpy', 'paho', 'psutil')
+	
+	IMPORT_TIME_PREFIX = 'import time:'
+	
+	STARTUP_SCRIPT = \
+		'import sys\n' + \
+		'from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil\n' + \
+		'ConfigUtil(sys.argv[1] if len(sys.argv) > 1 else None)\n' + \
+		'from labbenchstudios.pdt.edge.app.DeviceDataManager import DeviceDataManager\n' + \
+		'DeviceDataManager()\n'
+	
+	def __init__(self, pythonExecutable: str = sys.executable):
+		"""
+		Constructor.
+		
+		@param pythonExecutable The Python interpreter used for the measurements.
+		"""
+		self.pythonExecutable = pythonExecutable
+		
+		# the directory containing the labbenchstudios package
+		self.sourcePath = str(Path(__file__).resolve().parents[4])
+	
+	def benchmarkStartup(self, configFile: str = None, runCount: int = 5) -> list:
+		"""
+		Measures the wall clock time to start an interpreter, load the
+		configuration and create a DeviceDataManager (which creates all
+		enabled components, but doesn't start them).
+		
+		@param configFile The optional configuration file.
+		@param runCount The number of runs.
+		@return list The startup time of each run, in seconds.
+		"""
+		args = [self.pythonExecutable, '-c', self.STARTUP_SCRIPT]
+		
+		if configFile:
+			args.append(configFile)
+		
+		startupTimes = []
+		
+		for i in range(runCount):
+			startTime = time.perf_counter()
+			
+			self._runPython(args)
+			
+			startupTimes.append(time.perf_counter() - startTime)
+		
+		return startupTimes
+	
+	def getLoadedPackages(self, moduleName: str = DEFAULT_MODULE) -> set:
+		"""
+		Returns the top level packages loaded by importing the module.
+		
+		@param moduleName The module to import.
+		@return set The top level package names.
+		"""
+		script = \
+			'import sys\n' + \
+			'import ' + moduleName + '\n' + \
+			'print(\'\\n\'.join(sorted(set(name.split(\'.\')[0] for name in sys.modules))))\n'
+		
+		result = self._runPython([self.pythonExecutable, '-c', script])
+		
+		return set(result.stdout.split())
+	
+	def profileImports(self, moduleName: str = DEFAULT_MODULE) -> list:
+		"""
+		Imports the module with '-X importtime', and returns the parsed
+		import times, sorted by cumulative time (slowest first).
+		
+		@param moduleName The module to import.
+		@return list The (module name, self micros, cumulative micros) tuples.
+		"""
+		result = self._runPython([self.pythonExecutable, '-X', 'importtime', '-c', 'import ' + moduleName])
+		
+		importTimes = []
+		
+		for line in result.stderr.splitlines():
+			if not line.startswith(self.IMPORT_TIME_PREFIX):
+				continue
+			
+			fields = line[len(self.IMPORT_TIME_PREFIX):].split('|')
+			
+			# skip the header line
+			if len(fields) != 3 or not fields[0].strip().isdigit():
+				continue
+			
+			importTimes.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+		
+		importTimes.sort(key = lambda importTime: importTime[2], reverse = True)
+		
+		return importTimes
+	
+	def logReport(self, moduleName: str = DEFAULT_MODULE, topCount: int = 20, configFile: str = None, runCount: int = 0):
+		"""
+		Logs the import time report for the module and, if runCount is
+		positive, the startup benchmark.
+		
+		@param moduleName The module to profile.
+		@param topCount The number of slowest imports to list.
+		@param configFile The optional configuration file for the startup benchmark.
+		@param runCount The number of startup benchmark runs (0 = no benchmark).
+		"""
+		importTimes = self.profileImports(moduleName)
+		loadedHeavyPackages = sorted(self.getLoadedPackages(moduleName).intersection(self.HEAVY_PACKAGES))
+		
+		logging.info("Import time for %s: %.1f ms", moduleName, self._getCumulativeMicros(importTimes, moduleName) / 1000.0)
+		logging.info("Heavy packages loaded on import: %s", ', '.join(loadedHeavyPackages) if loadedHeavyPackages else 'none')
+		logging.info("Slowest imports (cumulative / self ms):")
+		
+		for name, selfMicros, cumulativeMicros in importTimes[:topCount]:
+			logging.info("  %9.1f %9.1f  %s", cumulativeMicros / 1000.0, selfMicros / 1000.0, name)
+		
+		if runCount > 0:
+			startupTimes = self.benchmarkStartup(configFile = configFile, runCount = runCount)
+			
+			logging.info( \
+				"Startup latency over %d runs (config: %s): min %.1f ms, median %.1f ms, max %.1f ms", \
+				runCount, str(configFile), min(startupTimes) * 1000.0, \
+				statistics.median(startupTimes) * 1000.0, max(startupTimes) * 1000.0)
+	
+	def _getCumulativeMicros(self, importTimes: list = None, moduleName: str = None) -> int:
+		for name, selfMicros, cumulativeMicros in importTimes:
+			if name == moduleName:
+				return cumulativeMicros
+		
+		return 0
+	
+	def _runPython(self, args: list = None) -> subprocess.CompletedProcess:
+		"""
+		Runs the interpreter with the EDA source path prepended to PYTHONPATH.
+		
+		@param args The command line.
+		@return CompletedProcess The result, with stdout and stderr as text.
+		@raise CalledProcessError If the interpreter exits with an error.
+		"""
+		env = dict(os.environ)
+		env['PYTHONPATH'] = os.pathsep.join(filter(None, (self.sourcePath, env.get('PYTHONPATH'))))
+		
+		return subprocess.run(args, env = env, capture_output = True, text = True, check = True)
+	
+def main():
+	"""
+	Main function definition for running the profiler as an application.
+	
+	"""
+	logging.basicConfig(format = '%(asctime)s:%(levelname)s:%(message)s', level = logging.INFO)
+	
+	argParser = argparse.ArgumentParser(description = 'EDA import time and startup latency profiler.')
+	
+	argParser.add_argument('-m', '--module', default = StartupProfiler.DEFAULT_MODULE, help = 'The module to profile.')
+	argParser.add_argument('-n', '--top', type = int, default = 20, help = 'The number of slowest imports to list.')
+	argParser.add_argument('-c', '--configFile', help = 'Optional configuration file for the startup benchmark.')
+	argParser.add_argument('-b', '--benchmarkRuns', type = int, default = 0, help = 'The number of startup benchmark runs.')
+	
+	args = argParser.parse_args()
+	
+	StartupProfiler().logReport( \
+		moduleName = args.module, topCount = args.top, configFile = args.configFile, runCount = args.benchmarkRuns)
+
+if __name__ == '__main__':
+	main()
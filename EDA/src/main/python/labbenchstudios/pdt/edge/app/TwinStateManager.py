@@ -0,0 +1,184 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import json
+import threading
+import zlib
+
+from types import MappingProxyType
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.SimulationClock import SimulationClock
+
+from labbenchstudios.pdt.data.ActuatorData import ActuatorData
+from labbenchstudios.pdt.data.ConnectionStateData import ConnectionStateData
+from labbenchstudios.pdt.data.SensorData import SensorData
+from labbenchstudios.pdt.data.SystemPerformanceData import SystemPerformanceData
+
+class TwinStateManager():
+	"""
+	Maintains a consistent, versioned view of the latest device state -
+	sensor values, actuator responses, system performance data and
+	connection state - for digital twin synchronization.
+	
+	State is copy-on-write: each update copies the affected category
+	(name -> data properties) and publishes a new immutable state object
+	with an incremented version, using a single reference assignment.
+	Writers are serialized with a lock, but readers never lock - taking a
+	snapshot just reads the current state reference, so it never blocks
+	(or is blocked by) the dispatch thread, and is always internally
+	consistent.
+	
+	"""
+	
+	def __init__(self, deviceID: str = ConfigConst.NOT_SET):
+		"""
+		Constructor.
+		
+		@param deviceID The device ID to include in each snapshot.
+		"""
+		self.deviceID = deviceID
+		self.writeLock = threading.Lock()
+		
+		emptyCategory = MappingProxyType({})
+		
+		self.state = \
+			MappingProxyType({ \
+				ConfigConst.VERSION_PROP: 0, \
+				ConfigConst.DEVICE_ID_PROP: self.deviceID, \
+				ConfigConst.TIMESTAMP_PROP: self._getTimeStamp(), \
+				ConfigConst.SENSOR_DATA_PROP: emptyCategory, \
+				ConfigConst.ACTUATOR_RESPONSES_PROP: emptyCategory, \
+				ConfigConst.SYS_PERF_DATA_PROP: emptyCategory, \
+				ConfigConst.CONN_STATE_DATA_PROP: emptyCategory})
+	
+	def getSnapshot(self) -> MappingProxyType:
+		"""
+		Returns the current state snapshot. The snapshot (and each category
+		within it) is a read-only mapping that's never modified after it's
+		published, so it can be safely read or serialized on any thread.
+		
+		@return MappingProxyType The snapshot.
+		"""
+		return self.state
+	
+	def getSnapshotAsBytes(self, snapshot: MappingProxyType = None) -> bytes:
+		"""
+		Serializes the snapshot as zlib compressed UTF-8 JSON.
+		
+		@param snapshot The snapshot to serialize (the current snapshot if None).
+		@return bytes
+		"""
+		return zlib.compress(self.getSnapshotAsJson(snapshot).encode('utf-8'))
+	
+	def getSnapshotAsJson(self, snapshot: MappingProxyType = None) -> str:
+		"""
+		Serializes the snapshot as JSON.
+		
+		@param snapshot The snapshot to serialize (the current snapshot if None).
+		@return str
+		"""
+		if snapshot is None:
+			snapshot = self.state
+		
+		return json.dumps(snapshot, default = dict, separators = (',', ':'))
+	
+	def getVersion(self) -> int:
+		return self.state[ConfigConst.VERSION_PROP]
+	
+	def loadSnapshotFromBytes(self, data: bytes = None) -> dict:
+		"""
+		Deserializes a snapshot created by getSnapshotAsBytes().
+		
+		@param data The compressed snapshot.
+		@return dict The snapshot as a plain dict.
+		"""
+		return json.loads(zlib.decompress(data).decode('utf-8'))
+	
+	def updateActuatorResponse(self, data: ActuatorData = None) -> int:
+		"""
+		Updates the latest actuator response for the data's name.
+		
+		@param data The ActuatorData response.
+		@return int The new state version.
+		"""
+		return self._updateState(ConfigConst.ACTUATOR_RESPONSES_PROP, data)
+	
+	def updateConnectionState(self, data: ConnectionStateData = None) -> int:
+		"""
+		Updates the latest connection state for the data's name.
+		
+		@param data The ConnectionStateData.
+		@return int The new state version.
+		"""
+		return self._updateState(ConfigConst.CONN_STATE_DATA_PROP, data)
+	
+	def updateSensorData(self, data: SensorData = None) -> int:
+		"""
+		Updates the latest sensor data for the data's name.
+		
+		@param data The SensorData.
+		@return int The new state version.
+		"""
+		return self._updateState(ConfigConst.SENSOR_DATA_PROP, data)
+	
+	def updateSystemPerformanceData(self, data: SystemPerformanceData = None) -> int:
+		"""
+		Updates the latest system performance data for the data's name.
+		
+		@param data The SystemPerformanceData.
+		@return int The new state version.
+		"""
+		return self._updateState(ConfigConst.SYS_PERF_DATA_PROP, data)
+	
+	def _getTimeStamp(self) -> str:
+		return str(SimulationClock().getDateTime().isoformat())
+	
+	def _updateState(self, category: str = None, data = None) -> int:
+		"""
+		Copies the category with the data's properties (also copied, so
+		later changes to the data instance don't leak into the snapshot),
+		then publishes a new state with an incremented version.
+		
+		"""
+		if not data:
+			return self.getVersion()
+		
+		with self.writeLock:
+			currentState = self.state
+			
+			categoryEntries = dict(currentState[category])
+			categoryEntries[data.getName()] = MappingProxyType(dict(data.__dict__))
+			
+			newState = dict(currentState)
+			newState[category] = MappingProxyType(categoryEntries)
+			newState[ConfigConst.VERSION_PROP] = currentState[ConfigConst.VERSION_PROP] + 1
+			newState[ConfigConst.TIMESTAMP_PROP] = self._getTimeStamp()
+			
+			# a single reference assignment publishes the new state to readers
+			self.state = MappingProxyType(newState)
+			
+			return newState[ConfigConst.VERSION_PROP]
@@ -0,0 +1,466 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import bisect
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+
+from datetime import datetime
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
+from labbenchstudios.pdt.common.IDataMessageListener import IDataMessageListener
+from labbenchstudios.pdt.common.ResourceNameContainer import ResourceNameContainer
+
+from labbenchstudios.pdt.edge.connection.IPersistenceClient import IPersistenceClient
+
+from labbenchstudios.pdt.data.ActuatorData import ActuatorData
+from labbenchstudios.pdt.data.ConnectionStateData import ConnectionStateData
+from labbenchstudios.pdt.data.SensorData import SensorData
+from labbenchstudios.pdt.data.SensorDataRollup import SensorDataRollup
+from labbenchstudios.pdt.data.SystemPerformanceData import SystemPerformanceData
+
+class FilePersistenceConnector(IPersistenceClient):
+	"""
+	Local, file-based persistence client for edge nodes that can't run a TSDB.
+	
+	Each data type is written to its own directory (named after the equivalent
+	TSDB bucket) as a series of append-only segment files. Each record is a
+	single line: the timestamp in millis, a tab, then the compact JSON form of
+	the data container. Every 'indexIntervalBytes' a (timestamp, offset) pair
+	is appended to the segment's sparse index file, which range queries use to
+	seek directly into a memory-mapped segment. Segments roll over once they
+	exceed 'maxSegmentBytes' or span more than 'maxSegmentSecs'.
+	
+	Range queries assume records are appended in (roughly) time order, which
+	is the case when writes originate from the EventDispatchManager thread.
+	
+	"""
+	
+	SEGMENT_FILE_EXT = '.seg'
+	INDEX_FILE_EXT   = '.idx'
+	
+	_INDEX_ENTRY = struct.Struct('<qq')
+	
+	def __init__(self, storagePath: str = None, dataMsgListener: IDataMessageListener = None):
+		"""
+		Constructor.
+		
+		@param storagePath The root directory to store data in. If None, the
+		configured path will be used.
+		@param dataMsgListener The (optional) data message listener.
+		"""
+		self.config = ConfigUtil()
+		self.dataMsgListener = dataMsgListener
+		
+		if not storagePath:
+			storagePath = \
+				self.config.getProperty( \
+					ConfigConst.PERSISTENCE_SETTINGS_KEY, ConfigConst.FILE_DATA_STORE_PATH_KEY, ConfigConst.DEFAULT_FILE_DATA_STORE_PATH)
+		
+		self.storagePath = os.path.abspath(storagePath)
+		
+		self.maxSegmentBytes = \
+			self.config.getInteger( \
+				ConfigConst.PERSISTENCE_SETTINGS_KEY, ConfigConst.MAX_SEGMENT_BYTES_KEY, ConfigConst.DEFAULT_MAX_SEGMENT_BYTES)
+		
+		self.maxSegmentMillis = \
+			self.config.getInteger( \
+				ConfigConst.PERSISTENCE_SETTINGS_KEY, ConfigConst.MAX_SEGMENT_SECS_KEY, ConfigConst.DEFAULT_MAX_SEGMENT_SECS) * 1000
+		
+		self.indexIntervalBytes = \
+			self.config.getInteger( \
+				ConfigConst.PERSISTENCE_SETTINGS_KEY, ConfigConst.INDEX_INTERVAL_BYTES_KEY, ConfigConst.DEFAULT_INDEX_INTERVAL_BYTES)
+		
+		# bucket name -> active segment writer state
+		self.segmentWriters = {}
+		self.writeLock = threading.RLock()
+		self.isConnected = False
+		
+		logging.info('File persistence storage path: %s', self.storagePath)
+		
+	def connectClient(self) -> bool:
+		"""
+		Creates the storage directory (if needed). Existing segments are left
+		intact, and new writes always start a new segment.
+		
+		@return bool True on success; False otherwise.
+		"""
+		try:
+			os.makedirs(self.storagePath, exist_ok = True)
+			self.isConnected = True
+			
+			logging.info('File persistence client connected: %s', self.storagePath)
+		except OSError as e:
+			logging.error('Failed to create file persistence storage path %s: %s', self.storagePath, str(e))
+			self.isConnected = False
+		
+		return self.isConnected
+	
+	def disconnectClient(self) -> bool:
+		"""
+		Flushes and closes all active segments.
+		
+		@return bool True on success; False otherwise.
+		"""
+		with self.writeLock:
+			for writer in self.segmentWriters.values():
+				self._closeSegment(writer)
+			
+			self.segmentWriters.clear()
+			self.isConnected = False
+		
+		return True
+	
+	def flush(self):
+		"""
+		Flushes all active segment and index files to disk.
+		
+		"""
+		with self.writeLock:
+			for writer in self.segmentWriters.values():
+				writer['segFile'].flush()
+				writer['idxFile'].flush()
+	
+	def loadActuatorData(self, resource: ResourceNameContainer = None, typeID: int = 0, startDate: datetime = None, endDate: datetime = None) -> ActuatorData:
+		"""
+		Attempts to retrieve the named data instance(s) from local storage.
+		
+		@param resource The target resource name.
+		@param typeID The type ID of the data to retrieve (0 for all).
+		@param startDate The start date (null if narrowing is not needed).
+		@param endDate The end date (null if narrowing is not needed).
+		@return ActuatorData[] The data instance(s) associated with the lookup parameters.
+		"""
+		bucketName = self._getBucketName(resource, ConfigConst.CMD_DATA_PERSISTENCE_NAME)
+		
+		return self._loadData(bucketName, ActuatorData, typeID, startDate, endDate)
+
+	def loadConnectionStateData(self, resource: ResourceNameContainer = None, startDate: datetime = None, endDate: datetime = None) -> ConnectionStateData:
+		"""
+		Attempts to retrieve the named data instance(s) from local storage.
+		
+		@param resource The target resource name.
+		@param startDate The start date (null if narrowing is not needed).
+		@param endDate The end date (null if narrowing is not needed).
+		@return ConnectionStateData[] The data instance(s) associated with the lookup parameters.
+		"""
+		bucketName = self._getBucketName(resource, ConfigConst.CONN_DATA_PERSISTENCE_NAME)
+		
+		return self._loadData(bucketName, ConnectionStateData, 0, startDate, endDate)
+
+	def loadSensorData(self, resource: ResourceNameContainer = None, typeID: int = 0, startDate: datetime = None, endDate: datetime = None) -> SensorData:
+		"""
+		Attempts to retrieve the named data instance(s) from local storage.
+		
+		@param resource The target resource name.
+		@param typeID The type ID of the data to retrieve (0 for all).
+		@param startDate The start date (null if narrowing is not needed).
+		@param endDate The end date (null if narrowing is not needed).
+		@return SensorData[] The data instance(s) associated with the lookup parameters.
+		"""
+		bucketName = self._getBucketName(resource, ConfigConst.SENSOR_DATA_PERSISTENCE_NAME)
+		
+		return self._loadData(bucketName, SensorData, typeID, startDate, endDate)
+
+	def loadSystemPerformanceData(self, resource: ResourceNameContainer = None, startDate: datetime = None, endDate: datetime = None) -> SystemPerformanceData:
+		"""
+		Attempts to retrieve the named data instance(s) from local storage.
+		
+		@param resource The target resource name.
+		@param startDate The start date (null if narrowing is not needed).
+		@param endDate The end date (null if narrowing is not needed).
+		@return SystemPerformanceData[] The data instance(s) associated with the lookup parameters.
+		"""
+		bucketName = self._getBucketName(resource, ConfigConst.SYS_DATA_PERSISTENCE_NAME)
+		
+		return self._loadData(bucketName, SystemPerformanceData, 0, startDate, endDate)
+
+	def storeActuatorData(self, resource: ResourceNameContainer = None, qos: int = 0, data: ActuatorData = None) -> bool:
+		"""
+		Appends the source data instance to the active actuator data segment.
+		
+		@param resource The target resource name.
+		@param qos The intended target QoS (ignored).
+		@param data The data instance to store.
+		@return boolean True on success; false otherwise.
+		"""
+		return self._storeData(self._getBucketName(resource, ConfigConst.CMD_DATA_PERSISTENCE_NAME), data)
+
+	def storeConnectionStateData(self, resource: ResourceNameContainer = None, qos: int = 0, data: ConnectionStateData = None) -> bool:
+		"""
+		Appends the source data instance to the active connection state data segment.
+		
+		@param resource The target resource name.
+		@param qos The intended target QoS (ignored).
+		@param data The data instance to store.
+		@return boolean True on success; false otherwise.
+		"""
+		return self._storeData(self._getBucketName(resource, ConfigConst.CONN_DATA_PERSISTENCE_NAME), data)
+
+	def storeSensorData(self, resource: ResourceNameContainer = None, qos: int = 0, data: SensorData = None) -> bool:
+		"""
+		Appends the source data instance to the active sensor data segment.
+		
+		@param resource The target resource name.
+		@param qos The intended target QoS (ignored).
+		@param data The data instance to store.
+		@return boolean True on success; false otherwise.
+		"""
+		return self._storeData(self._getBucketName(resource, ConfigConst.SENSOR_DATA_PERSISTENCE_NAME), data)
+
+	def storeSensorDataRollup(self, resource: ResourceNameContainer = None, qos: int = 0, data: SensorDataRollup = None) -> bool:
+		"""
+		Appends the source rollup data instance to the active rollup data segment.
+		
+		@param resource The target resource name.
+		@param qos The intended target QoS (ignored).
+		@param data The data instance to store.
+		@return boolean True on success; false otherwise.
+		"""
+		return self._storeData(self._getBucketName(resource, ConfigConst.ROLLUP_DATA_PERSISTENCE_NAME), data)
+
+	def storeSystemPerformanceData(self, resource: ResourceNameContainer = None, qos: int = 0, data: SystemPerformanceData = None) -> bool:
+		"""
+		Appends the source data instance to the active system performance data segment.
+		
+		@param resource The target resource name.
+		@param qos The intended target QoS (ignored).
+		@param data The data instance to store.
+		@return boolean True on success; false otherwise.
+		"""
+		return self._storeData(self._getBucketName(resource, ConfigConst.SYS_DATA_PERSISTENCE_NAME), data)
+
+	def setDataMessageListener(self, listener: IDataMessageListener = None) -> bool:
+		"""
+		Sets the data message listener reference, assuming listener is non-null.
+		
+		@param listener The data message listener instance.
+		@return bool True on success; False otherwise.
+		"""
+		if listener:
+			self.dataMsgListener = listener
+			return True
+		
+		return False
+	
+	def _getBucketName(self, resource: ResourceNameContainer = None, defaultName: str = None) -> str:
+		"""
+		Returns the persistence name from the resource (if set), or the default name.
+		
+		"""
+		if resource and isinstance(resource, ResourceNameContainer):
+			if resource.getPersistenceName():
+				return resource.getPersistenceName()
+		
+		return defaultName
+	
+	def _storeData(self, bucketName: str = None, data = None) -> bool:
+		"""
+		Appends a single record to the active segment for the bucket, rolling
+		over to a new segment as needed.
+		
+		@param bucketName The bucket (directory) name.
+		@param data The data container to store.
+		@return bool True on success; False otherwise.
+		"""
+		if not data:
+			logging.warning('Invalid data container. Ignoring store request for bucket %s.', bucketName)
+			return False
+		
+		timeMillis = self._convertTimeStampToMillis(data.getTimeStamp())
+		record = (str(timeMillis) + '\t' + json.dumps(data.__dict__, separators = (',', ':')) + '\n').encode('utf-8')
+		
+		with self.writeLock:
+			writer = self.segmentWriters.get(bucketName)
+			
+			if writer and \
+				(writer['size'] >= self.maxSegmentBytes or timeMillis - writer['startMillis'] >= self.maxSegmentMillis):
+				self._closeSegment(writer)
+				writer = None
+			
+			if not writer:
+				writer = self._openSegment(bucketName, timeMillis)
+				
+				if not writer:
+					return False
+				
+				self.segmentWriters[bucketName] = writer
+			
+			if writer['size'] >= writer['nextIndexOffset']:
+				writer['idxFile'].write(self._INDEX_ENTRY.pack(timeMillis, writer['size']))
+				writer['nextIndexOffset'] = writer['size'] + self.indexIntervalBytes
+			
+			writer['segFile'].write(record)
+			writer['size'] += len(record)
+		
+		return True
+	
+	def _openSegment(self, bucketName: str, startMillis: int) -> dict:
+		"""
+		Creates a new segment (and its index) in the bucket directory.
+		
+		@return dict The writer state, or None on failure.
+		"""
+		bucketPath = os.path.join(self.storagePath, bucketName)
+		
+		try:
+			os.makedirs(bucketPath, exist_ok = True)
+			
+			# segment names must be unique and sort by start time
+			while os.path.exists(self._getSegmentFileName(bucketPath, startMillis)):
+				startMillis += 1
+			
+			segFileName = self._getSegmentFileName(bucketPath, startMillis)
+			idxFileName = segFileName[:-len(self.SEGMENT_FILE_EXT)] + self.INDEX_FILE_EXT
+			
+			logging.debug('Opening new segment: %s', segFileName)
+			
+			return { \
+				'startMillis': startMillis, 'size': 0, 'nextIndexOffset': 0, \
+				'segFile': open(segFileName, 'ab'), 'idxFile': open(idxFileName, 'ab') }
+		except OSError as e:
+			logging.error('Failed to open segment in %s: %s', bucketPath, str(e))
+			
+			return None
+	
+	def _closeSegment(self, writer: dict = None):
+		"""
+		Flushes and closes the segment and its index.
+		
+		"""
+		writer['segFile'].close()
+		writer['idxFile'].close()
+	
+	def _getSegmentFileName(self, bucketPath: str, startMillis: int) -> str:
+		return os.path.join(bucketPath, '%015d%s' % (startMillis, self.SEGMENT_FILE_EXT))
+	
+	def _loadData(self, bucketName: str, dataType, typeID: int = 0, startDate: datetime = None, endDate: datetime = None) -> list:
+		"""
+		Scans the bucket's segments for records within [startDate, endDate].
+		Only segments whose time span overlaps the range are opened, and each
+		is memory-mapped and entered at the nearest sparse index offset.
+		
+		@return list The matching data instances, in storage order.
+		"""
+		startMillis = int(startDate.timestamp() * 1000) if startDate else 0
+		endMillis = int(endDate.timestamp() * 1000) if endDate else (1 << 62)
+		
+		bucketPath = os.path.join(self.storagePath, bucketName)
+		
+		if not os.path.isdir(bucketPath):
+			return []
+		
+		# make sure any buffered records are visible to the mmap
+		self.flush()
+		
+		segStarts = sorted( \
+			int(fileName[:-len(self.SEGMENT_FILE_EXT)]) \
+				for fileName in os.listdir(bucketPath) if fileName.endswith(self.SEGMENT_FILE_EXT))
+		
+		dataList = []
+		
+		for i, segStart in enumerate(segStarts):
+			if segStart > endMillis:
+				break
+			
+			# a segment can end with records stamped at the next segment's start time
+			if i + 1 < len(segStarts) and segStarts[i + 1] < startMillis:
+				continue
+			
+			segFileName = self._getSegmentFileName(bucketPath, segStart)
+			
+			self._scanSegment(segFileName, dataType, typeID, startMillis, endMillis, dataList)
+		
+		return dataList
+	
+	def _scanSegment(self, segFileName: str, dataType, typeID: int, startMillis: int, endMillis: int, dataList: list):
+		"""
+		Appends matching records from a single segment to dataList.
+		
+		"""
+		if os.path.getsize(segFileName) == 0:
+			return
+		
+		offset = self._findIndexOffset(segFileName[:-len(self.SEGMENT_FILE_EXT)] + self.INDEX_FILE_EXT, startMillis)
+		
+		with open(segFileName, 'rb') as segFile:
+			with mmap.mmap(segFile.fileno(), 0, access = mmap.ACCESS_READ) as mm:
+				size = len(mm)
+				pos = offset
+				
+				while pos < size:
+					tabPos = mm.find(b'\t', pos)
+					endPos = mm.find(b'\n', tabPos)
+					
+					if tabPos < 0 or endPos < 0:
+						break
+					
+					timeMillis = int(mm[pos:tabPos])
+					
+					if timeMillis > endMillis:
+						break
+					
+					if timeMillis >= startMillis:
+						d = json.loads(mm[tabPos + 1:endPos])
+						
+						if not typeID or d.get(ConfigConst.TYPE_ID_PROP) == typeID:
+							data = dataType()
+							data.__dict__.update(d)
+							dataList.append(data)
+					
+					pos = endPos + 1
+	
+	def _findIndexOffset(self, idxFileName: str, startMillis: int) -> int:
+		"""
+		Returns the offset of the last indexed record before startMillis.
+		Records can share a time stamp, so an index entry stamped at
+		startMillis may follow earlier records with the same time stamp.
+		
+		"""
+		try:
+			with open(idxFileName, 'rb') as idxFile:
+				entries = list(self._INDEX_ENTRY.iter_unpack(idxFile.read()))
+		except (OSError, struct.error):
+			return 0
+		
+		if not entries:
+			return 0
+		
+		i = bisect.bisect_left([entry[0] for entry in entries], startMillis)
+		
+		return entries[i - 1][1] if i > 0 else 0
+	
+	def _convertTimeStampToMillis(self, timeStampStr: str = None) -> int:
+		"""
+		Converts the given ISO 8601 timestamp into milliseconds since the epoch.
+		
+		"""
+		return int(datetime.fromisoformat(timeStampStr).timestamp() * 1000)
@@ -31,6 +31,7 @@ from labbenchstudios.pdt.common.IDataMessageListener import IDataMessageListener
 from labbenchstudios.pdt.data.ActuatorData import ActuatorData
 from labbenchstudios.pdt.data.ConnectionStateData import ConnectionStateData
 from labbenchstudios.pdt.data.SensorData import SensorData
+from labbenchstudios.pdt.data.SensorDataRollup import SensorDataRollup
 from labbenchstudios.pdt.data.SystemPerformanceData import SystemPerformanceData
 
 class IPersistenceClient(IDataLoader):
@@ -87,6 +88,18 @@ class IPersistenceClient(IDataLoader):
 		@return boolean True on success; false otherwise.
 		"""
 
+	def storeSensorDataRollup(self, resource: ResourceNameContainer = None, qos: int = 0, data: SensorDataRollup = None) -> bool:
+		"""
+		Attempts to write the source rollup (downsampled) data instance to the
+		persistence server. Implementations should store rollups separately from
+		raw SensorData (e.g. in a dedicated rollup bucket).
+		
+		@param resource The target resource name.
+		@param qos The intended target QoS.
+		@param data The data instance to store.
+		@return boolean True on success; false otherwise.
+		"""
+
 	def storeSystemPerformanceData(self, resource: ResourceNameContainer = None, qos: int = 0, data: SystemPerformanceData = None) -> bool:
 		"""
 		Attempts to write the source data instance to the persistence server.
@@ -28,8 +28,8 @@ import dateutil
 import socket
 import traceback
 
-from influxdb_client import InfluxDBClient, Point
-from influxdb_client.client.write_api import SYNCHRONOUS
+from influxdb_client import BucketRetentionRules, InfluxDBClient, Point
+from influxdb_client.client.write_api import SYNCHRONOUS, WriteOptions
 
 import labbenchstudios.pdt.common.ConfigConst as ConfigConst
 
@@ -39,11 +39,13 @@ from labbenchstudios.pdt.common.ResourceNameContainer import ResourceNameContain
 from labbenchstudios.pdt.common.ResourceNameEnum import ResourceNameEnum
 
 from labbenchstudios.pdt.edge.connection.IPersistenceClient import IPersistenceClient
+from labbenchstudios.pdt.edge.connection.SpillFileManager import SpillFileManager
 
 from labbenchstudios.pdt.data.DataUtil import DataUtil
 from labbenchstudios.pdt.data.ActuatorData import ActuatorData
 from labbenchstudios.pdt.data.ConnectionStateData import ConnectionStateData
 from labbenchstudios.pdt.data.SensorData import SensorData
+from labbenchstudios.pdt.data.SensorDataRollup import SensorDataRollup
 from labbenchstudios.pdt.data.SystemPerformanceData import SystemPerformanceData
 
 class InfluxClientConnector(IPersistenceClient):
@@ -55,15 +57,20 @@ class InfluxClientConnector(IPersistenceClient):
 	def __init__(self, \
 		serverHost: str = None, serverPort: int = None, \
 		clientToken: str = None, orgID: str = None, \
-		dataMsgListener: IDataMessageListener = None):
+		dataMsgListener: IDataMessageListener = None, writeMode: str = None, \
+		spillFilePath: str = None, enableSpillFile: bool = None):
 		"""
 		Default constructor. This will set remote TSDB server information and client
 		connection information based on the default configuration file contents.
+		Any non-null parameter overrides the related configuration value.
 		
 		@param serverHost
 		@param serverPort
 		@param clientToken
 		@param orgID
+		@param writeMode Either 'sync' (one request per point) or 'batch'.
+		@param spillFilePath If set, enables the spill file using this path.
+		@param enableSpillFile If set, enables or disables the spill file.
 		"""
 		self.config = ConfigUtil()
 
@@ -94,15 +101,110 @@ class InfluxClientConnector(IPersistenceClient):
 
 			if oid:
 				self.orgID = oid
+
+		if serverHost:
+			self.host = serverHost
+
+		if serverPort:
+			self.port = serverPort
+
+		if clientToken:
+			self.clientToken = clientToken
+
+		if orgID:
+			self.orgID = orgID
 				
 		self.defaultQos = \
 			self.config.getInteger( \
 				ConfigConst.MQTT_GATEWAY_SERVICE, ConfigConst.DEFAULT_QOS_KEY, ConfigConst.DEFAULT_QOS)
-		
+
+		self.cmdDataBucket = \
+			self.config.getProperty( \
+				ConfigConst.DATA_GATEWAY_SERVICE, ConfigConst.CMD_DATA_BUCKET_KEY, ConfigConst.CMD_DATA_PERSISTENCE_NAME)
+
+		self.connDataBucket = \
+			self.config.getProperty( \
+				ConfigConst.DATA_GATEWAY_SERVICE, ConfigConst.CONN_DATA_BUCKET_KEY, ConfigConst.CONN_DATA_PERSISTENCE_NAME)
+
+		self.sensorDataBucket = \
+			self.config.getProperty( \
+				ConfigConst.DATA_GATEWAY_SERVICE, ConfigConst.SENSOR_DATA_BUCKET_KEY, ConfigConst.SENSOR_DATA_PERSISTENCE_NAME)
+
+		self.sysDataBucket = \
+			self.config.getProperty( \
+				ConfigConst.DATA_GATEWAY_SERVICE, ConfigConst.SYS_DATA_BUCKET_KEY, ConfigConst.SYS_DATA_PERSISTENCE_NAME)
+
+		self.rollupDataBucket = \
+			self.config.getProperty( \
+				ConfigConst.DATA_GATEWAY_SERVICE, ConfigConst.ROLLUP_DATA_BUCKET_KEY, ConfigConst.ROLLUP_DATA_PERSISTENCE_NAME)
+
+		# 'sync' writes each point in its own request; 'batch' buffers points
+		# and writes them in the background by batch size or flush interval
+		self.writeMode = writeMode
+
+		if not self.writeMode:
+			self.writeMode = \
+				self.config.getProperty( \
+					ConfigConst.DATA_GATEWAY_SERVICE, ConfigConst.WRITE_MODE_KEY, ConfigConst.DEFAULT_WRITE_MODE)
+
+		self.writeBatchSize = \
+			self.config.getInteger( \
+				ConfigConst.DATA_GATEWAY_SERVICE, ConfigConst.WRITE_BATCH_SIZE_KEY, ConfigConst.DEFAULT_WRITE_BATCH_SIZE)
+
+		self.writeFlushIntervalMillis = \
+			self.config.getInteger( \
+				ConfigConst.DATA_GATEWAY_SERVICE, ConfigConst.WRITE_FLUSH_INTERVAL_MILLIS_KEY, ConfigConst.DEFAULT_WRITE_FLUSH_INTERVAL_MILLIS)
+
+		# raw and rollup retention are independent; 0 leaves the bucket's retention as-is
+		self.rawDataRetentionSecs = \
+			self.config.getInteger( \
+				ConfigConst.DATA_GATEWAY_SERVICE, ConfigConst.RAW_DATA_RETENTION_SECS_KEY, ConfigConst.DEFAULT_DATA_RETENTION_SECS)
+
+		self.rollupDataRetentionSecs = \
+			self.config.getInteger( \
+				ConfigConst.DATA_GATEWAY_SERVICE, ConfigConst.ROLLUP_DATA_RETENTION_SECS_KEY, ConfigConst.DEFAULT_DATA_RETENTION_SECS)
+
 		self.dbClient = None
 		self.dbClientWriteApi = None
 		self.dbClientQueryApi = None
 
+		# while the server is unreachable, points are spilled to a local file
+		# and re-ingested in the background once it's reachable again
+		self.isServerAvailable = True
+		self.spillFileMgr = None
+
+		self.enableSpillFile = \
+			self.config.getBoolean( \
+				ConfigConst.DATA_GATEWAY_SERVICE, ConfigConst.ENABLE_SPILL_FILE_KEY)
+
+		if enableSpillFile is not None:
+			self.enableSpillFile = enableSpillFile
+		elif spillFilePath:
+			self.enableSpillFile = True
+		
+		if self.enableSpillFile:
+			if not spillFilePath:
+				spillFilePath = \
+					self.config.getProperty( \
+						ConfigConst.DATA_GATEWAY_SERVICE, ConfigConst.SPILL_FILE_PATH_KEY, ConfigConst.DEFAULT_SPILL_FILE_PATH)
+
+			reingestRate = \
+				self.config.getInteger( \
+					ConfigConst.DATA_GATEWAY_SERVICE, ConfigConst.SPILL_REINGEST_RATE_KEY, ConfigConst.DEFAULT_SPILL_REINGEST_RATE)
+
+			checkIntervalSecs = \
+				self.config.getInteger( \
+					ConfigConst.DATA_GATEWAY_SERVICE, ConfigConst.SPILL_CHECK_INTERVAL_SECS_KEY, ConfigConst.DEFAULT_SPILL_CHECK_INTERVAL_SECS)
+
+			self.spillFileMgr = \
+				SpillFileManager( \
+					spillFileName = spillFilePath, \
+					writeFunc = self._writeLines, \
+					healthCheckFunc = self._isServerReachable, \
+					reingestCompleteFunc = self._handleReingestComplete, \
+					maxPointsPerSec = reingestRate, \
+					checkIntervalSecs = checkIntervalSecs)
+
 		self.uriPath = "http://" + self.host + ":" + str(self.port)
 		
 		logging.info('\tInfluxDB Host:Port: %s:%s', self.host, str(self.port))
@@ -130,10 +232,21 @@ class InfluxClientConnector(IPersistenceClient):
 		"""
 		if not self.dbClient:
 			self.dbClient = InfluxDBClient(url = self.uriPath, token = self.clientToken, org = self.orgID)
-			self.dbClientWriteApi = self.dbClient.write_api(write_options = SYNCHRONOUS)
 			self.dbClientQueryApi = self.dbClient.query_api()
 
-			logging.info('Created Influx DB client instance and write / query API instances.')
+			if self.writeMode == ConfigConst.BATCH_WRITE_MODE:
+				writeOptions = WriteOptions(batch_size = self.writeBatchSize, flush_interval = self.writeFlushIntervalMillis)
+				self.dbClientWriteApi = self.dbClient.write_api(write_options = writeOptions, error_callback = self._handleBatchWriteError)
+			else:
+				self.dbClientWriteApi = self.dbClient.write_api(write_options = SYNCHRONOUS)
+
+			logging.info('Created Influx DB client instance and write / query API instances. Write mode: %s', self.writeMode)
+
+			self._applyBucketRetention(bucketName = self.sensorDataBucket, retentionSecs = self.rawDataRetentionSecs)
+			self._applyBucketRetention(bucketName = self.rollupDataBucket, retentionSecs = self.rollupDataRetentionSecs)
+
+			if self.spillFileMgr:
+				self.spillFileMgr.startManager()
 
 		return True
 	
@@ -147,6 +260,19 @@ class InfluxClientConnector(IPersistenceClient):
 		if not self.dbClient:
 			logging.warning('InfluxDB client not yet created / connected. Ignoring.')
 
+			return False
+
+		if self.spillFileMgr:
+			self.spillFileMgr.stopManager()
+
+		# closing the write API flushes any pending batches
+		self.dbClientWriteApi.close()
+		self.dbClient.close()
+
+		self.dbClient = None
+		self.dbClientWriteApi = None
+		self.dbClientQueryApi = None
+
 		return True
 
 	def loadActuatorData(self, resource: ResourceNameContainer = None, typeID: int = 0, startDate: datetime = None, endDate: datetime = None) -> ActuatorData:
@@ -215,17 +341,17 @@ class InfluxClientConnector(IPersistenceClient):
 		"""
 		if (data):
 			dataPoint = self._createActuatorDataPoint(data)
-			bucketName = ConfigConst.CMD_DATA_PERSISTENCE_NAME
+			bucketName = self.cmdDataBucket
 			deviceID = data.getDeviceID()
 
 			if (resource):
 				if (resource.getPersistenceName()) : bucketName = resource.getPersistenceName()
 
-			self.dbClientWriteApi.write(bucket = bucketName, record = dataPoint)
+			success = self._writePoint(bucketName = bucketName, dataPoint = dataPoint)
 
 			logging.debug('Wrote ActuatorData instance %s to bucket %s', deviceID, bucketName)
 
-			return True
+			return success
 		
 		else:
 			logging.warning('Invalid resource name and / or data container. Ignoring store SensorData request.')
@@ -243,17 +369,17 @@ class InfluxClientConnector(IPersistenceClient):
 		"""
 		if (data):
 			dataPoint = self._createConnectionStateDataPoint(data)
-			bucketName = ConfigConst.CONN_DATA_PERSISTENCE_NAME
+			bucketName = self.connDataBucket
 			deviceID = data.getDeviceID()
 
 			if (resource):
 				if (resource.getPersistenceName()) : bucketName = resource.getPersistenceName()
 
-			self.dbClientWriteApi.write(bucket = bucketName, record = dataPoint)
+			success = self._writePoint(bucketName = bucketName, dataPoint = dataPoint)
 
 			logging.debug('Wrote ConnectionStateData instance %s to bucket %s', deviceID, bucketName)
 
-			return True
+			return success
 		
 		else:
 			logging.warning('Invalid resource name and / or data container. Ignoring store SensorData request.')
@@ -271,23 +397,51 @@ class InfluxClientConnector(IPersistenceClient):
 		"""
 		if (data):
 			dataPoint = self._createSensorDataPoint(data)
-			bucketName = ConfigConst.SENSOR_DATA_PERSISTENCE_NAME
+			bucketName = self.sensorDataBucket
 			deviceID = data.getDeviceID()
 
 			if (resource):
 				if (resource.getPersistenceName()) : bucketName = resource.getPersistenceName()
 
-			self.dbClientWriteApi.write(bucket = bucketName, record = dataPoint)
+			success = self._writePoint(bucketName = bucketName, dataPoint = dataPoint)
 
 			logging.debug('Wrote SensorData instance %s to bucket %s', deviceID, bucketName)
 			
-			return True
+			return success
 		
 		else:
 			logging.warning('Invalid resource name and / or data container. Ignoring store SensorData request.')
 
 		return False
 
+	def storeSensorDataRollup(self, resource: ResourceNameContainer = None, qos: int = 0, data: SensorDataRollup = None) -> bool:
+		"""
+		Attempts to write the source rollup data instance to the rollup bucket.
+
+		@param resource The target resource name.
+		@param qos The intended target QoS.
+		@param data The data instance to store.
+		@return boolean True on success; false otherwise.
+		"""
+		if (data):
+			dataPoint = self._createSensorDataRollupPoint(data)
+			bucketName = self.rollupDataBucket
+			deviceID = data.getDeviceID()
+
+			if (resource):
+				if (resource.getPersistenceName()) : bucketName = resource.getPersistenceName()
+
+			success = self._writePoint(bucketName = bucketName, dataPoint = dataPoint)
+
+			logging.debug('Wrote SensorDataRollup instance %s to bucket %s', deviceID, bucketName)
+
+			return success
+
+		else:
+			logging.warning('Invalid resource name and / or data container. Ignoring store SensorDataRollup request.')
+
+		return False
+
 	def storeSystemPerformanceData(self, resource: ResourceNameContainer = None, qos: int = 0, data: SystemPerformanceData = None) -> bool:
 		"""
 		Attempts to write the source data instance to the persistence server.
@@ -299,23 +453,147 @@ class InfluxClientConnector(IPersistenceClient):
 		"""
 		if (data):
 			dataPoint = self._createSystemPerformanceDataPoint(data)
-			bucketName = ConfigConst.SYS_DATA_PERSISTENCE_NAME
+			bucketName = self.sysDataBucket
 			deviceID = data.getDeviceID()
 
 			if (resource):
 				if (resource.getPersistenceName()) : bucketName = resource.getPersistenceName()
 
-			self.dbClientWriteApi.write(bucket = bucketName, record = dataPoint)
+			success = self._writePoint(bucketName = bucketName, dataPoint = dataPoint)
 
 			logging.debug('Wrote SystemPerformanceData instance %s to bucket %s', deviceID, bucketName)
 			
-			return True
+			return success
 		
 		else:
 			logging.warning('Invalid resource name and / or data container. Ignoring store SensorData request.')
 
 		return False
 
+	def _applyBucketRetention(self, bucketName: str = None, retentionSecs: int = 0):
+		"""
+		Applies an expiry-based retention rule to the named bucket, creating the
+		bucket if it doesn't yet exist. A retention of 0 (or less) leaves the
+		bucket untouched. Failures are logged but not propagated, as the server
+		may not permit bucket management with the configured token.
+
+		@param bucketName The name of the bucket to update.
+		@param retentionSecs The retention period in seconds.
+		"""
+		if not bucketName or retentionSecs <= 0:
+			return
+
+		try:
+			bucketsApi = self.dbClient.buckets_api()
+			retentionRules = BucketRetentionRules(type = "expire", every_seconds = retentionSecs)
+			bucket = bucketsApi.find_bucket_by_name(bucketName)
+
+			if bucket:
+				bucket.retention_rules = [retentionRules]
+				bucketsApi.update_bucket(bucket = bucket)
+			else:
+				bucketsApi.create_bucket(bucket_name = bucketName, retention_rules = retentionRules, org = self.orgID)
+
+			logging.info('Applied retention of %s secs to bucket %s', str(retentionSecs), bucketName)
+		except Exception as e:
+			logging.warning('Failed to apply retention of %s secs to bucket %s: %s', str(retentionSecs), bucketName, str(e))
+
+	def _handleBatchWriteError(self, conf: tuple, data, exception: Exception):
+		"""
+		Callback from the batching write API once a batch has failed after
+		all retries. The batch is spilled to the local file, if enabled.
+
+		@param conf The (bucket, org, precision) of the failed batch.
+		@param data The failed batch as line protocol.
+		@param exception The cause of the failure.
+		"""
+		bucketName = conf[0]
+		lines = (data.decode('utf-8') if isinstance(data, bytes) else data).splitlines()
+
+		if self.spillFileMgr:
+			logging.warning('InfluxDB server unavailable. Spilling batch of %d point(s) to local file: %s', len(lines), str(exception))
+
+			self._spillPoints(bucketName = bucketName, lines = lines)
+		else:
+			logging.error('Failed to write batch of %d point(s) to bucket %s: %s', len(lines), bucketName, str(exception))
+
+	def _handleReingestComplete(self):
+		"""
+		Callback from the spill file manager once all spilled points have
+		been re-ingested. Direct writes to the server resume.
+		
+		"""
+		if not self.isServerAvailable:
+			logging.info('InfluxDB server available again. Resuming direct writes.')
+
+		self.isServerAvailable = True
+
+	def _isServerReachable(self) -> bool:
+		"""
+		Health check used by the spill file manager.
+
+		@return bool True if the server responds to a ping; False otherwise.
+		"""
+		return self.dbClient is not None and self.dbClient.ping()
+
+	def _spillPoints(self, bucketName: str = None, lines: list = None) -> bool:
+		"""
+		Appends the points to the spill file, and spills further points
+		directly until the spill file has been re-ingested. If the append
+		fails with nothing else spilled, there's nothing for the re-ingest
+		thread to drain (and so nothing to signal recovery), so direct
+		writes are resumed instead.
+
+		@param bucketName The target bucket name.
+		@param lines The line protocol strings.
+		@return bool True if the points were spilled; False otherwise.
+		"""
+		self.isServerAvailable = False
+
+		if self.spillFileMgr.appendPoints(bucketName = bucketName, lines = lines):
+			return True
+
+		if not self.spillFileMgr.hasSpilledPoints():
+			self.isServerAvailable = True
+
+		return False
+
+	def _writeLines(self, bucketName: str = None, lines: list = None):
+		"""
+		Writes a batch of line protocol strings (with millisecond timestamps)
+		to the given bucket. Exceptions are propagated to the caller.
+
+		@param bucketName The target bucket name.
+		@param lines The line protocol strings.
+		"""
+		self.dbClientWriteApi.write(bucket = bucketName, record = lines, write_precision = "ms")
+
+	def _writePoint(self, bucketName: str = None, dataPoint: Point = None) -> bool:
+		"""
+		Writes the point to the server. If the server is unreachable, and the
+		spill file is enabled, the point is appended to the local spill file
+		instead, and any further points are spilled directly (without another
+		write attempt) until the spill file has been re-ingested.
+
+		@param bucketName The target bucket name.
+		@param dataPoint The point to write.
+		@return bool True if the point was written or spilled; False otherwise.
+		"""
+		if self.isServerAvailable or not self.spillFileMgr:
+			try:
+				self.dbClientWriteApi.write(bucket = bucketName, record = dataPoint)
+
+				return True
+			except Exception as e:
+				if not self.spillFileMgr:
+					logging.warning('Failed to write point to bucket %s: %s', bucketName, str(e))
+
+					return False
+
+				logging.warning('InfluxDB server unavailable. Spilling points to local file: %s', str(e))
+
+		return self._spillPoints(bucketName = bucketName, lines = [dataPoint.to_line_protocol()])
+
 	def _convertIso8601TimeStampToMillis(self, timeStampStr: str = None) -> int:
 		"""
 		A simple conversion function that accepts an expected ISO 8601
@@ -398,6 +676,29 @@ class InfluxClientConnector(IPersistenceClient):
 
 		return dataPoint
 
+	def _createSensorDataRollupPoint(self, data: SensorDataRollup = None) -> Point:
+		"""
+		Creates an InfluxDB Point instance for the given type. The point's
+		time is the start of the rollup window.
+
+		@return Point The Point instance that represents the given
+		data type container.
+		"""
+		dataPoint = \
+			Point(data.getName()) \
+				.tag(ConfigConst.DEVICE_ID_PROP, data.getDeviceID()) \
+				.tag(ConfigConst.LOCATION_ID_PROP, data.getLocationID()) \
+				.tag(ConfigConst.TYPE_ID_PROP, data.getTypeID()) \
+				.tag(ConfigConst.TYPE_CATEGORY_ID_PROP, data.getTypeCategoryID()) \
+				.tag(ConfigConst.WINDOW_SECS_PROP, data.getWindowSecs()) \
+				.field(ConfigConst.MIN_PROP, data.getMinValue()) \
+				.field(ConfigConst.MAX_PROP, data.getMaxValue()) \
+				.field(ConfigConst.MEAN_PROP, data.getMeanValue()) \
+				.field(ConfigConst.COUNT_PROP, data.getSampleCount()) \
+				.time(data.getWindowStartMillis(), write_precision = "ms")
+
+		return dataPoint
+
 	def _createSystemPerformanceDataPoint(self, data: SystemPerformanceData = None) -> Point:
 		"""
 		Creates an InfluxDB Point instance for the given type.
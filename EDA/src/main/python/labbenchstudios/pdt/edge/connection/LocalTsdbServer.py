@@ -0,0 +1,424 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import gzip
+import json
+import logging
+import random
+import re
+import threading
+import time
+
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+class LocalTsdbServer():
+	"""
+	Lightweight, in-process stand-in for an InfluxDB 2.x server, intended
+	for offline testing and benchmarking of InfluxClientConnector.
+	
+	It implements the '/api/v2/write' endpoint (line protocol is recorded
+	as received), a minimal '/api/v2/query' subset (bucket, measurement and
+	field filters plus 'limit', returned as annotated CSV), and the '/ping'
+	and '/health' endpoints. Request latency and a random request error
+	rate can be injected to exercise client batching and failover paths.
+	
+	"""
+	
+	PRECISION_TO_NANOS = {'ns': 1, 'us': 1000, 'ms': 1000000, 's': 1000000000}
+	
+	def __init__(self, \
+		host: str = ConfigConst.DEFAULT_HOST, port: int = 0, \
+		latencyMillis: int = 0, errorRate: float = 0.0, seed: int = None):
+		"""
+		Constructor.
+		
+		@param host The host address to bind to.
+		@param port The port to bind to (0 selects a free ephemeral port).
+		@param latencyMillis The delay added to each write and query request.
+		@param errorRate The fraction (0.0 - 1.0) of write requests to reject with a 503.
+		@param seed Optional seed for the error injection random generator.
+		"""
+		self.host = host
+		self.port = port
+		self.latencyMillis = latencyMillis
+		self.errorRate = errorRate
+		self.rng = random.Random(seed)
+		
+		self.dataLock = threading.Lock()
+		
+		# each received point is stored as (bucket, precision, line)
+		self.receivedPoints = []
+		self.writeRequestCount = 0
+		self.rejectedRequestCount = 0
+		
+		self.httpServer = None
+		self.serverThread = None
+	
+	def clearData(self):
+		"""
+		Clears all recorded points and request counters.
+		
+		"""
+		with self.dataLock:
+			self.receivedPoints = []
+			self.writeRequestCount = 0
+			self.rejectedRequestCount = 0
+	
+	def getPort(self) -> int:
+		"""
+		Returns the bound port (valid after startServer()).
+		
+		@return int
+		"""
+		return self.port
+	
+	def getReceivedLines(self, bucketName: str = None) -> list:
+		"""
+		Returns a copy of the received line protocol strings.
+		
+		@param bucketName Optional bucket name filter.
+		@return list
+		"""
+		with self.dataLock:
+			return [line for bucket, precision, line in self.receivedPoints if not bucketName or bucket == bucketName]
+	
+	def getReceivedPointCount(self) -> int:
+		return len(self.receivedPoints)
+	
+	def getRejectedRequestCount(self) -> int:
+		return self.rejectedRequestCount
+	
+	def getWriteRequestCount(self) -> int:
+		return self.writeRequestCount
+	
+	def setErrorRate(self, errorRate: float = 0.0):
+		self.errorRate = errorRate
+	
+	def setLatency(self, latencyMillis: int = 0):
+		self.latencyMillis = latencyMillis
+	
+	def startServer(self) -> bool:
+		"""
+		Starts the HTTP server on a background thread.
+		
+		@return bool True if started; False if already running.
+		"""
+		if self.httpServer:
+			return False
+		
+		self.httpServer = ThreadingHTTPServer((self.host, self.port), _LocalTsdbRequestHandler)
+		self.httpServer.daemon_threads = True
+		self.httpServer.tsdbServer = self
+		self.port = self.httpServer.server_address[1]
+		
+		self.serverThread = threading.Thread(target = self.httpServer.serve_forever, name = "LocalTsdbServer", daemon = True)
+		self.serverThread.start()
+		
+		logging.info('Started local TSDB server on %s:%d', self.host, self.port)
+		
+		return True
+	
+	def stopServer(self) -> bool:
+		"""
+		Stops the HTTP server.
+		
+		@return bool True if stopped; False if not running.
+		"""
+		if not self.httpServer:
+			return False
+		
+		self.httpServer.shutdown()
+		self.httpServer.server_close()
+		self.serverThread.join()
+		
+		self.httpServer = None
+		self.serverThread = None
+		
+		logging.info('Stopped local TSDB server.')
+		
+		return True
+	
+	def handleWrite(self, bucketName: str = None, precision: str = 'ns', body: str = None) -> bool:
+		"""
+		Records the line protocol points in the request body, unless the
+		request is selected for error injection.
+		
+		@param bucketName The target bucket.
+		@param precision The timestamp precision of the points.
+		@param body The line protocol request body.
+		@return bool True if accepted; False if rejected.
+		"""
+		self._applyLatency()
+		
+		with self.dataLock:
+			self.writeRequestCount += 1
+			
+			if self.errorRate > 0.0 and self.rng.random() < self.errorRate:
+				self.rejectedRequestCount += 1
+				
+				return False
+			
+			self.receivedPoints.extend((bucketName, precision, line) for line in body.splitlines() if line and not line.startswith('#'))
+		
+		return True
+	
+	def handleQuery(self, query: str = None) -> str:
+		"""
+		Evaluates a minimal Flux query subset and returns the result as
+		annotated CSV. Supported: 'from(bucket: "...")', filters on
+		'r._measurement == "..."' and 'r._field == "..."', and 'limit(n: N)'.
+		Time ranges are accepted but not applied.
+		
+		@param query The Flux query string.
+		@return str The annotated CSV response.
+		"""
+		self._applyLatency()
+		
+		bucketMatch = re.search(r'from\(\s*bucket\s*:\s*"([^"]+)"\s*\)', query or '')
+		measurementMatch = re.search(r'r\._measurement\s*==\s*"([^"]+)"', query or '')
+		fieldMatch = re.search(r'r\._field\s*==\s*"([^"]+)"', query or '')
+		limitMatch = re.search(r'limit\(\s*n\s*:\s*(\d+)\s*\)', query or '')
+		
+		if not bucketMatch:
+			raise ValueError('Query must start with from(bucket: "...")')
+		
+		# series key -> (measurement, tags, field, datatype, [(timeNanos, value)])
+		seriesTable = {}
+		
+		with self.dataLock:
+			bucketPoints = [(precision, line) for bucket, precision, line in self.receivedPoints if bucket == bucketMatch.group(1)]
+		
+		for precision, line in bucketPoints:
+			measurement, tags, fields, timeNanos = self._parseLine(line, precision)
+			
+			if measurementMatch and measurement != measurementMatch.group(1):
+				continue
+			
+			for fieldName, (datatype, value) in fields.items():
+				if fieldMatch and fieldName != fieldMatch.group(1):
+					continue
+				
+				key = (measurement, tuple(sorted(tags.items())), fieldName)
+				series = seriesTable.setdefault(key, (measurement, tags, fieldName, datatype, []))
+				series[4].append((timeNanos, value))
+		
+		csvBlocks = []
+		
+		for tableID, (measurement, tags, fieldName, datatype, rows) in enumerate(seriesTable.values()):
+			rows.sort()
+			
+			if limitMatch:
+				rows = rows[0:int(limitMatch.group(1))]
+			
+			tagNames = sorted(tags)
+			block = [ \
+				'#datatype,string,long,dateTime:RFC3339,' + datatype + ',string,string' + ',string' * len(tagNames), \
+				'#group,false,false,false,false,true,true' + ',true' * len(tagNames), \
+				'#default,_result,,,,,' + ',' * len(tagNames), \
+				',result,table,_time,_value,_field,_measurement' + ''.join(',' + tagName for tagName in tagNames)]
+			
+			for timeNanos, value in rows:
+				block.append( \
+					',,' + str(tableID) + ',' + self._formatTime(timeNanos) + ',' + self._formatCsvValue(value) + ',' + \
+					self._formatCsvValue(fieldName) + ',' + self._formatCsvValue(measurement) + \
+					''.join(',' + self._formatCsvValue(tags[tagName]) for tagName in tagNames))
+			
+			csvBlocks.append('\r\n'.join(block) + '\r\n')
+		
+		return '\r\n'.join(csvBlocks) + '\r\n'
+	
+	def _applyLatency(self):
+		if self.latencyMillis > 0:
+			time.sleep(self.latencyMillis / 1000.0)
+	
+	def _formatCsvValue(self, value) -> str:
+		strVal = str(value).lower() if isinstance(value, bool) else str(value)
+		
+		if any(c in strVal for c in ',"\r\n'):
+			strVal = '"' + strVal.replace('"', '""') + '"'
+		
+		return strVal
+	
+	def _formatTime(self, timeNanos: int) -> str:
+		timeSecs, nanos = divmod(timeNanos, 1000000000)
+		
+		return datetime.fromtimestamp(timeSecs, tz = timezone.utc).strftime('%Y-%m-%dT%H:%M:%S') + '.%09dZ' % nanos
+	
+	def _parseLine(self, line: str, precision: str = 'ns') -> tuple:
+		"""
+		Parses a line protocol string into its measurement, tags, fields
+		(name -> (csv datatype, value)) and timestamp in nanoseconds.
+		
+		"""
+		parts = self._splitUnescaped(line, ' ')
+		seriesParts = self._splitUnescaped(parts[0], ',')
+		
+		measurement = self._unescape(seriesParts[0])
+		tags = {}
+		fields = {}
+		
+		for tag in seriesParts[1:]:
+			tagName, tagValue = self._splitUnescaped(tag, '=', 1)
+			tags[self._unescape(tagName)] = self._unescape(tagValue)
+		
+		for field in self._splitUnescaped(parts[1], ','):
+			fieldName, fieldValue = self._splitUnescaped(field, '=', 1)
+			fields[self._unescape(fieldName)] = self._parseFieldValue(fieldValue)
+		
+		if len(parts) > 2:
+			timeNanos = int(parts[2]) * self.PRECISION_TO_NANOS.get(precision, 1)
+		else:
+			timeNanos = time.time_ns()
+		
+		return (measurement, tags, fields, timeNanos)
+	
+	def _parseFieldValue(self, fieldValue: str) -> tuple:
+		if fieldValue.startswith('"'):
+			return ('string', fieldValue[1:-1].replace('\\"', '"').replace('\\\\', '\\'))
+		
+		if fieldValue in ('t', 'T', 'true', 'True', 'TRUE'):
+			return ('boolean', True)
+		
+		if fieldValue in ('f', 'F', 'false', 'False', 'FALSE'):
+			return ('boolean', False)
+		
+		if fieldValue.endswith('i'):
+			return ('long', int(fieldValue[:-1]))
+		
+		if fieldValue.endswith('u'):
+			return ('unsignedLong', int(fieldValue[:-1]))
+		
+		return ('double', float(fieldValue))
+	
+	def _splitUnescaped(self, text: str, sep: str, maxSplit: int = -1) -> list:
+		"""
+		Splits the text on separators that are neither escaped with a
+		backslash nor inside a double quoted string field value.
+		
+		"""
+		parts = []
+		start = 0
+		inQuotes = False
+		i = 0
+		
+		while i < len(text):
+			c = text[i]
+			
+			if c == '\\':
+				i += 2
+				continue
+			
+			if c == '"':
+				inQuotes = not inQuotes
+			elif c == sep and not inQuotes and (maxSplit < 0 or len(parts) < maxSplit):
+				parts.append(text[start:i])
+				start = i + 1
+			
+			i += 1
+		
+		parts.append(text[start:])
+		
+		return parts
+	
+	def _unescape(self, text: str) -> str:
+		return re.sub(r'\\(.)', r'\1', text)
+
+
+class _LocalTsdbRequestHandler(BaseHTTPRequestHandler):
+	"""
+	HTTP request handler for LocalTsdbServer. Delegates to the owning
+	server instance for all write and query processing.
+	
+	"""
+	protocol_version = 'HTTP/1.1'
+	
+	def do_GET(self):
+		path = urlparse(self.path).path
+		
+		if path == '/ping':
+			self._sendResponse(204)
+		elif path == '/health':
+			self._sendResponse(200, 'application/json', json.dumps({'name': 'influxdb', 'status': 'pass'}))
+		else:
+			self._sendError(404, 'not found', 'path not found')
+	
+	def do_HEAD(self):
+		self.do_GET()
+	
+	def do_POST(self):
+		url = urlparse(self.path)
+		params = parse_qs(url.query)
+		body = self._readBody()
+		tsdbServer = self.server.tsdbServer
+		
+		if url.path == '/api/v2/write':
+			bucketName = params.get('bucket', [None])[0]
+			
+			if not bucketName or not params.get('org', [None])[0]:
+				self._sendError(400, 'invalid', 'bucket and org are required')
+			elif tsdbServer.handleWrite(bucketName, params.get('precision', ['ns'])[0], body):
+				self._sendResponse(204)
+			else:
+				self._sendError(503, 'unavailable', 'injected write error')
+		
+		elif url.path == '/api/v2/query':
+			try:
+				query = json.loads(body).get('query') if body.lstrip().startswith('{') else body
+				self._sendResponse(200, 'text/csv; charset=utf-8', tsdbServer.handleQuery(query))
+			except Exception as e:
+				self._sendError(400, 'invalid', str(e))
+		
+		else:
+			self._sendError(404, 'not found', 'path not found')
+	
+	def log_message(self, format, *args):
+		logging.debug('Local TSDB server request: ' + format, *args)
+	
+	def _readBody(self) -> str:
+		body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+		
+		if self.headers.get('Content-Encoding', '') == 'gzip':
+			body = gzip.decompress(body)
+		
+		return body.decode('utf-8')
+	
+	def _sendError(self, statusCode: int, code: str, message: str):
+		self._sendResponse(statusCode, 'application/json', json.dumps({'code': code, 'message': message}))
+	
+	def _sendResponse(self, statusCode: int, contentType: str = None, payload: str = None):
+		data = payload.encode('utf-8') if payload else b''
+		
+		self.send_response(statusCode)
+		
+		if contentType:
+			self.send_header('Content-Type', contentType)
+		
+		self.send_header('Content-Length', str(len(data)))
+		self.end_headers()
+		self.wfile.write(data)
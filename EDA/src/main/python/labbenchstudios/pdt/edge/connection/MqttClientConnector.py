@@ -38,6 +38,7 @@ from labbenchstudios.pdt.common.ResourceNameEnum import ResourceNameEnum
 
 from labbenchstudios.pdt.edge.connection.IPubSubClient import IPubSubClient
 
+from labbenchstudios.pdt.data.ConnectionStateData import ConnectionStateData
 from labbenchstudios.pdt.data.DataUtil import DataUtil
 
 class MqttClientConnector(IPubSubClient):
@@ -87,6 +88,9 @@ class MqttClientConnector(IPubSubClient):
 		
 		self.mqttClient = None
 		
+		self.msgInCount = 0
+		self.msgOutCount = 0
+		
 		self.deviceID = \
 			self.config.getProperty( \
 				ConfigConst.CONSTRAINED_DEVICE, ConfigConst.DEVICE_ID_KEY, 'EdgeDeviceApp')
@@ -171,6 +175,15 @@ class MqttClientConnector(IPubSubClient):
 		
 		logging.info('Subscribed to incoming command topic: ' + actuatorCmdTopic)
 		
+		self.mqttClient.subscribe( \
+			topic = ResourceNameEnum.SYSTEM_REQUEST_RESOURCE.value, qos = self.defaultQos)
+		
+		self.mqttClient.message_callback_add( \
+			sub = ResourceNameEnum.SYSTEM_REQUEST_RESOURCE.value, \
+			callback = self.onSystemRequestMessage)
+		
+		logging.info('Subscribed to incoming system request topic: ' + ResourceNameEnum.SYSTEM_REQUEST_RESOURCE.value)
+		
 	def onDisconnect(self, client, userdata, rc):
 		"""
 		"""
@@ -180,6 +193,7 @@ class MqttClientConnector(IPubSubClient):
 		"""
 		"""
 		payload = msg.payload
+		self.msgInCount += 1
 		
 		if payload:
 			logging.info('MQTT message received with payload: ' + str(payload.decode("utf-8")))
@@ -200,6 +214,8 @@ class MqttClientConnector(IPubSubClient):
 		"""
 		logging.info('[Callback] Actuator command message received. Topic: %s.', msg.topic)
 		
+		self.msgInCount += 1
+		
 		if self.dataMsgListener:
 			try:
 				# assumes all data is encoded using UTF-8 and that the data
@@ -210,6 +226,23 @@ class MqttClientConnector(IPubSubClient):
 			except:
 				logging.exception("Failed to convert incoming actuation command payload to ActuatorData: ")
 					
+	def onSystemRequestMessage(self, client, userdata, msg):
+		"""
+		This callback is used to process incoming system requests (such as
+		twin state snapshot requests) from the subscribed system request topic.
+		
+		@param client The client reference context.
+		@param userdata The user reference context.
+		@param msg The message context, including the embedded payload.
+		"""
+		logging.info('[Callback] System request message received. Topic: %s.', msg.topic)
+		
+		self.msgInCount += 1
+		
+		if self.dataMsgListener and msg.payload:
+			self.dataMsgListener.handleIncomingMessage( \
+				resource = ResourceNameEnum.SYSTEM_REQUEST_RESOURCE, msg = msg.payload.decode('utf-8'))
+					
 	def onPublish(self, client, userdata, mid):
 		"""
 		"""
@@ -241,6 +274,8 @@ class MqttClientConnector(IPubSubClient):
 		if self.mqttClient:
 			msgInfo = self.mqttClient.publish(topic = resource.value, payload = msg, qos = qos)
 			msgInfo.wait_for_publish()
+			
+			self.msgOutCount += 1
 
 			return True
 		else:
@@ -312,6 +347,26 @@ class MqttClientConnector(IPubSubClient):
 			logging.warning('MQTT client not yet created. Call connectClient() first.')
 			return False
 
+	def getConnectionState(self) -> ConnectionStateData:
+		"""
+		Returns the current connection state of the client, including the
+		message in / out counts.
+		
+		@return ConnectionStateData
+		"""
+		connState = ConnectionStateData(name = ConfigConst.MQTT_GATEWAY_SERVICE)
+		connState.setHostName(self.host)
+		connState.setHostPort(self.port)
+		connState.setMessageInCount(self.msgInCount)
+		connState.setMessageOutCount(self.msgOutCount)
+		
+		if self.mqttClient and self.mqttClient.is_connected():
+			connState.setIsClientConnectedFlag(True)
+		else:
+			connState.setIsClientDisconnectedFlag(True)
+		
+		return connState
+	
 	def setDataMessageListener(self, listener: IDataMessageListener = None):
 		"""
 		"""
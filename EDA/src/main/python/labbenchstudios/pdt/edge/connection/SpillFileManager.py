@@ -0,0 +1,320 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import os
+import shutil
+import threading
+import time
+
+from collections import OrderedDict
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+class SpillFileManager():
+	"""
+	Local spill file used as a persistence failover path. While the remote
+	store is unreachable, points are appended to the spill file (one
+	'<bucket>\\t<line protocol>' record per line). A background re-ingest
+	thread periodically checks whether the store is healthy again, and if
+	so drains the spill file at a bounded rate. The spill file is streamed
+	one batch at a time, so memory use doesn't grow with the outage length.
+	
+	Duplicate points - the same bucket, series (measurement plus tags) and
+	timestamp - within a window of recently drained points are only
+	re-ingested once, so repeated spills of the same point don't multiply
+	the re-ingest load. Duplicates further apart are re-ingested, which is
+	harmless, as the store keeps the last write for a series and timestamp.
+	
+	"""
+	
+	DRAIN_FILE_EXT = '.draining'
+	DEDUP_WINDOW_SIZE = 10000
+	
+	def __init__(self, \
+		spillFileName: str = None, \
+		writeFunc = None, healthCheckFunc = None, reingestCompleteFunc = None, \
+		maxPointsPerSec: int = ConfigConst.DEFAULT_SPILL_REINGEST_RATE, \
+		batchSize: int = ConfigConst.DEFAULT_WRITE_BATCH_SIZE, \
+		checkIntervalSecs: float = ConfigConst.DEFAULT_SPILL_CHECK_INTERVAL_SECS):
+		"""
+		Constructor.
+		
+		@param spillFileName The spill file name.
+		@param writeFunc Callable of (bucketName, lines) that writes a list of
+		line protocol strings to the store, raising an exception on failure.
+		@param healthCheckFunc Callable that returns True if the store is reachable.
+		@param reingestCompleteFunc Optional callable invoked once the spill file is fully drained.
+		@param maxPointsPerSec The maximum re-ingest rate.
+		@param batchSize The max number of points per re-ingest write.
+		@param checkIntervalSecs The delay between health checks while points are spilled.
+		"""
+		self.spillFileName = os.path.abspath(spillFileName)
+		self.drainFileName = self.spillFileName + self.DRAIN_FILE_EXT
+		
+		self.writeFunc = writeFunc
+		self.healthCheckFunc = healthCheckFunc
+		self.reingestCompleteFunc = reingestCompleteFunc
+		
+		self.maxPointsPerSec = max(1, maxPointsPerSec)
+		self.batchSize = max(1, batchSize)
+		self.checkIntervalSecs = checkIntervalSecs
+		
+		self.fileLock = threading.Lock()
+		self.stopEvent = threading.Event()
+		self.reingestThread = None
+		
+		self.spilledCount = 0
+		self.reingestedCount = 0
+		self.duplicateCount = 0
+		
+		os.makedirs(os.path.dirname(self.spillFileName), exist_ok = True)
+		
+	def appendPoints(self, bucketName: str = None, lines: list = None) -> bool:
+		"""
+		Appends the given line protocol strings to the spill file.
+		
+		@param bucketName The target bucket name.
+		@param lines The line protocol strings.
+		@return bool True on success; False otherwise.
+		"""
+		if not bucketName or not lines:
+			return False
+		
+		records = ''.join(bucketName + '\t' + line + '\n' for line in lines)
+		
+		try:
+			with self.fileLock:
+				with open(self.spillFileName, 'a', encoding = 'utf-8') as spillFile:
+					spillFile.write(records)
+			
+			self.spilledCount += len(lines)
+			
+			return True
+		except OSError as e:
+			logging.error('Failed to append %d point(s) to spill file %s: %s', len(lines), self.spillFileName, str(e))
+			
+			return False
+	
+	def getDuplicateCount(self) -> int:
+		return self.duplicateCount
+	
+	def getReingestedCount(self) -> int:
+		return self.reingestedCount
+	
+	def getSpilledCount(self) -> int:
+		return self.spilledCount
+	
+	def hasSpilledPoints(self) -> bool:
+		"""
+		Checks if any points are waiting for re-ingest.
+		
+		@return bool
+		"""
+		return self._getFileSize(self.spillFileName) > 0 or self._getFileSize(self.drainFileName) > 0
+	
+	def startManager(self):
+		"""
+		Starts the background re-ingest thread.
+		
+		"""
+		if not self.reingestThread:
+			self.stopEvent.clear()
+			self.reingestThread = threading.Thread(target = self._runReingest, name = "SpillFileReingest", daemon = True)
+			self.reingestThread.start()
+			
+			logging.info('Started spill file re-ingest thread: %s', self.spillFileName)
+	
+	def stopManager(self):
+		"""
+		Stops the background re-ingest thread. Any remaining spilled points
+		stay on disk and will be re-ingested after the next start.
+		
+		"""
+		if self.reingestThread:
+			self.stopEvent.set()
+			self.reingestThread.join()
+			self.reingestThread = None
+			
+			logging.info('Stopped spill file re-ingest thread.')
+	
+	def reingestSpilledPoints(self) -> bool:
+		"""
+		Drains the spill file into the store. The spill file is first renamed
+		so new spills can continue while the drain is in progress; if a write
+		fails, the undrained points are appended back to the spill file.
+		
+		@return bool True if all spilled points were re-ingested; False otherwise.
+		"""
+		with self.fileLock:
+			if not os.path.exists(self.drainFileName):
+				if self._getFileSize(self.spillFileName) == 0:
+					return True
+				
+				os.replace(self.spillFileName, self.drainFileName)
+		
+		with open(self.drainFileName, 'r', encoding = 'utf-8') as drainFile:
+			isDrained = self._drainRecords(drainFile)
+		
+		# any undrained records are back in the spill file by now
+		os.remove(self.drainFileName)
+		
+		if isDrained:
+			logging.info('Re-ingested spilled points. Total re-ingested: %d, duplicates skipped: %d', self.reingestedCount, self.duplicateCount)
+		
+		return isDrained
+	
+	def _drainRecords(self, drainFile) -> bool:
+		"""
+		Reads the drain file one batch at a time, writing each batch to the
+		store at no more than maxPointsPerSec. On failure (or stop), the
+		unwritten points are appended back to the spill file.
+		
+		@param drainFile The open drain file.
+		@return bool True if all records were written; False otherwise.
+		"""
+		recentPoints = OrderedDict()
+		pending = {}
+		pendingCount = 0
+		startTime = time.monotonic()
+		sentCount = 0
+		
+		while True:
+			record = drainFile.readline()
+			
+			if record:
+				bucketName, sep, line = record.rstrip('\n').partition('\t')
+				
+				if not sep or not line:
+					continue
+				
+				# series key is everything before the first unescaped space;
+				# the timestamp is always the last space-delimited token
+				pointKey = (bucketName, self._getSeriesKey(line), line.rpartition(' ')[2])
+				
+				if pointKey in recentPoints:
+					self.duplicateCount += 1
+					continue
+				
+				recentPoints[pointKey] = True
+				
+				if len(recentPoints) > self.DEDUP_WINDOW_SIZE:
+					recentPoints.popitem(last = False)
+				
+				pending.setdefault(bucketName, []).append(line)
+				pendingCount += 1
+				
+				if pendingCount < self.batchSize:
+					continue
+			elif not pendingCount:
+				return True
+			
+			if not self._writePending(pending):
+				# keep everything not yet written for the next attempt
+				self._restoreUnwritten(pending, drainFile)
+				
+				return False
+			
+			if not record:
+				return True
+			
+			sentCount += pendingCount
+			pending = {}
+			pendingCount = 0
+			
+			# simple rate limiter: never exceed maxPointsPerSec on average
+			delay = sentCount / self.maxPointsPerSec - (time.monotonic() - startTime)
+			
+			if delay > 0 and self.stopEvent.wait(delay):
+				self._restoreUnwritten(pending, drainFile)
+				
+				return False
+	
+	def _runReingest(self):
+		"""
+		Background loop: while points are spilled, check the store's health
+		and drain when it's reachable.
+		
+		"""
+		while not self.stopEvent.wait(self.checkIntervalSecs):
+			if not self.hasSpilledPoints():
+				continue
+			
+			try:
+				if not self.healthCheckFunc():
+					continue
+				
+				if self.reingestSpilledPoints() and self.reingestCompleteFunc:
+					self.reingestCompleteFunc()
+			except Exception as e:
+				logging.warning('Spill file re-ingest attempt failed: %s', str(e))
+	
+	def _writePending(self, pending: dict = None) -> bool:
+		"""
+		Writes the pending points (grouped by bucket) to the store.
+		
+		"""
+		try:
+			for bucketName, lines in pending.items():
+				self.writeFunc(bucketName, lines)
+				self.reingestedCount += len(lines)
+				lines.clear()
+			
+			return True
+		except Exception as e:
+			logging.warning('Failed to re-ingest spilled points. Will retry: %s', str(e))
+			
+			return False
+	
+	def _restoreUnwritten(self, pending: dict = None, drainFile = None):
+		"""
+		Appends the unwritten pending points, followed by the rest of the
+		drain file, back to the spill file.
+		
+		"""
+		with self.fileLock:
+			with open(self.spillFileName, 'a', encoding = 'utf-8') as spillFile:
+				for bucketName, lines in pending.items():
+					spillFile.write(''.join(bucketName + '\t' + line + '\n' for line in lines))
+				
+				shutil.copyfileobj(drainFile, spillFile)
+	
+	def _getSeriesKey(self, line: str) -> str:
+		"""
+		Returns the measurement and tag set portion of a line protocol string.
+		
+		"""
+		pos = line.find(' ')
+		
+		while pos > 0 and line[pos - 1] == '\\':
+			pos = line.find(' ', pos + 1)
+		
+		return line[:pos] if pos > 0 else line
+	
+	def _getFileSize(self, fileName: str) -> int:
+		try:
+			return os.path.getsize(fileName)
+		except OSError:
+			return 0
@@ -0,0 +1,528 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+
+import numpy as np
+
+from datetime import datetime, timezone
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
+from labbenchstudios.pdt.common.IDataMessageListener import IDataMessageListener
+from labbenchstudios.pdt.common.ResourceNameContainer import ResourceNameContainer
+from labbenchstudios.pdt.common.SimulationClock import SimulationClock
+
+from labbenchstudios.pdt.edge.connection.IPersistenceClient import IPersistenceClient
+
+from labbenchstudios.pdt.data.ActuatorData import ActuatorData
+from labbenchstudios.pdt.data.ConnectionStateData import ConnectionStateData
+from labbenchstudios.pdt.data.SensorData import SensorData
+from labbenchstudios.pdt.data.SensorDataRollup import SensorDataRollup
+from labbenchstudios.pdt.data.SystemPerformanceData import SystemPerformanceData
+
+class SqlitePersistenceConnector(IPersistenceClient):
+	"""
+	Embedded SQLite historian for offline or air-gapped sites.
+	
+	Store calls only convert the data container to a row tuple and queue it;
+	a background writer thread drains the queue and inserts rows in batches
+	(one transaction and one executemany() per table per batch). The database
+	runs in WAL mode so load calls can read concurrently with the writer.
+	
+	Each table has a covering index on (typeID, deviceID, ts) - sensor data
+	also includes the value - and an index on ts, which is used for range
+	queries without a type ID and for time-based retention pruning.
+	
+	Column names match the data container property names, so rows map
+	directly to and from each container's attributes.
+	
+	"""
+	
+	SENSOR_TABLE    = 'sensor_data'
+	ACTUATOR_TABLE  = 'actuator_data'
+	CONN_TABLE      = 'conn_state_data'
+	SYS_PERF_TABLE  = 'sys_perf_data'
+	ROLLUP_TABLE    = 'sensor_rollup_data'
+	
+	_COMMON_COLUMNS = ( \
+		'ts', 'deviceID', 'typeID', 'typeCategoryID', 'name', 'locationID', 'statusCode', 'hasError')
+	
+	_TABLE_COLUMNS = { \
+		SENSOR_TABLE:   _COMMON_COLUMNS + ('value',), \
+		ACTUATOR_TABLE: _COMMON_COLUMNS + ('command', 'commandName', 'stateData', 'value', 'isResponse'), \
+		CONN_TABLE:     _COMMON_COLUMNS + ( \
+			'hostName', 'hostPort', 'msgInCount', 'msgOutCount', 'isConnecting', 'isConnected', 'isDisconnected'), \
+		SYS_PERF_TABLE: _COMMON_COLUMNS + ('cpuUtil', 'memUtil', 'diskUtil'), \
+		ROLLUP_TABLE:   _COMMON_COLUMNS + ('minValue', 'maxValue', 'value', 'sampleCount', 'windowSecs') }
+	
+	_COVERING_COLUMNS = { \
+		SENSOR_TABLE: ('typeID', 'deviceID', 'ts', 'value'), \
+		ROLLUP_TABLE: ('typeID', 'deviceID', 'ts', 'minValue', 'maxValue', 'value') }
+	
+	_BOOLEAN_COLUMNS = frozenset(['hasError', 'isResponse', 'isConnecting', 'isConnected', 'isDisconnected'])
+	
+	def __init__(self, dbFile: str = None, dataMsgListener: IDataMessageListener = None):
+		"""
+		Constructor.
+		
+		@param dbFile The SQLite database file. If None, the configured file will be used.
+		@param dataMsgListener The (optional) data message listener.
+		"""
+		self.config = ConfigUtil()
+		self.dataMsgListener = dataMsgListener
+		
+		if not dbFile:
+			dbFile = \
+				self.config.getProperty( \
+					ConfigConst.PERSISTENCE_SETTINGS_KEY, ConfigConst.SQLITE_DB_FILE_KEY, ConfigConst.DEFAULT_SQLITE_DB_FILE)
+		
+		self.dbFile = dbFile
+		
+		self.writeBatchSize = \
+			self.config.getInteger( \
+				ConfigConst.PERSISTENCE_SETTINGS_KEY, ConfigConst.WRITE_BATCH_SIZE_KEY, ConfigConst.DEFAULT_WRITE_BATCH_SIZE)
+		
+		self.retentionSecs = \
+			self.config.getInteger( \
+				ConfigConst.PERSISTENCE_SETTINGS_KEY, ConfigConst.DATA_RETENTION_SECS_KEY, ConfigConst.DEFAULT_DATA_RETENTION_SECS)
+		
+		self.pruneIntervalSecs = ConfigConst.DEFAULT_PRUNE_INTERVAL_SECS
+		
+		self._insertSql = { \
+			table: 'INSERT INTO {} ({}) VALUES ({})'.format(table, ','.join(columns), ','.join('?' * len(columns))) \
+				for table, columns in self._TABLE_COLUMNS.items() }
+		
+		self.writeQueue = queue.SimpleQueue()
+		self.writerThread = None
+		self.readConn = None
+		self.readLock = threading.Lock()
+		self.lastPruneTime = 0.0
+		self.rowsWritten = 0
+		
+		logging.info('SQLite historian database file: %s', self.dbFile)
+		
+	def connectClient(self) -> bool:
+		"""
+		Opens (and if needed creates) the database and starts the background writer.
+		
+		@return bool True on success; False otherwise.
+		"""
+		if self.writerThread:
+			return True
+		
+		try:
+			dbDir = os.path.dirname(os.path.abspath(self.dbFile))
+			os.makedirs(dbDir, exist_ok = True)
+			
+			self.readConn = self._createConnection()
+			self._createSchema(self.readConn)
+		except (OSError, sqlite3.Error) as e:
+			logging.error('Failed to open SQLite historian %s: %s', self.dbFile, str(e))
+			
+			return False
+		
+		self.writerThread = threading.Thread(target = self._processWriteQueue, name = "SqliteHistorianWriter", daemon = True)
+		self.writerThread.start()
+		
+		logging.info('SQLite historian connected: %s', self.dbFile)
+		
+		return True
+	
+	def disconnectClient(self) -> bool:
+		"""
+		Writes any queued rows, stops the background writer and closes the database.
+		
+		@return bool True on success; False otherwise.
+		"""
+		if not self.writerThread:
+			logging.warning('SQLite historian not yet connected. Ignoring.')
+			
+			return False
+		
+		self.writeQueue.put(None)
+		self.writerThread.join()
+		self.writerThread = None
+		
+		with self.readLock:
+			self.readConn.close()
+			self.readConn = None
+		
+		logging.info('SQLite historian disconnected. Total rows written: %s', str(self.rowsWritten))
+		
+		return True
+	
+	def flush(self, timeout: float = None) -> bool:
+		"""
+		Blocks until all rows queued before this call have been committed.
+		
+		@param timeout The max time to wait in seconds (None to wait indefinitely).
+		@return bool True if the rows were committed; False otherwise.
+		"""
+		if not self.writerThread:
+			return False
+		
+		barrier = threading.Event()
+		self.writeQueue.put(barrier)
+		
+		return barrier.wait(timeout)
+	
+	def getRowsWritten(self) -> int:
+		"""
+		Returns the number of rows committed by the background writer.
+		
+		@return int
+		"""
+		return self.rowsWritten
+	
+	def loadActuatorData(self, resource: ResourceNameContainer = None, typeID: int = 0, startDate: datetime = None, endDate: datetime = None) -> ActuatorData:
+		"""
+		Attempts to retrieve the matching data instance(s) from the historian.
+		
+		@param resource The target resource name. The device name is used as a filter if set.
+		@param typeID The type ID of the data to retrieve (0 for all).
+		@param startDate The start date (null if narrowing is not needed).
+		@param endDate The end date (null if narrowing is not needed).
+		@return ActuatorData[] The data instance(s) associated with the lookup parameters.
+		"""
+		return self._loadData(self.ACTUATOR_TABLE, ActuatorData, resource, typeID, startDate, endDate)
+
+	def loadConnectionStateData(self, resource: ResourceNameContainer = None, startDate: datetime = None, endDate: datetime = None) -> ConnectionStateData:
+		"""
+		Attempts to retrieve the matching data instance(s) from the historian.
+		
+		@param resource The target resource name. The device name is used as a filter if set.
+		@param startDate The start date (null if narrowing is not needed).
+		@param endDate The end date (null if narrowing is not needed).
+		@return ConnectionStateData[] The data instance(s) associated with the lookup parameters.
+		"""
+		return self._loadData(self.CONN_TABLE, ConnectionStateData, resource, 0, startDate, endDate)
+
+	def loadSensorData(self, resource: ResourceNameContainer = None, typeID: int = 0, startDate: datetime = None, endDate: datetime = None) -> SensorData:
+		"""
+		Attempts to retrieve the matching data instance(s) from the historian.
+		
+		@param resource The target resource name. The device name is used as a filter if set.
+		@param typeID The type ID of the data to retrieve (0 for all).
+		@param startDate The start date (null if narrowing is not needed).
+		@param endDate The end date (null if narrowing is not needed).
+		@return SensorData[] The data instance(s) associated with the lookup parameters.
+		"""
+		return self._loadData(self.SENSOR_TABLE, SensorData, resource, typeID, startDate, endDate)
+
+	def loadSensorDataColumns(self, resource: ResourceNameContainer = None, typeID: int = 0, startDate: datetime = None, endDate: datetime = None) -> dict:
+		"""
+		Columnar variant of loadSensorData(), intended for analytics where
+		creating one SensorData object per row is unnecessary. When a type ID
+		is given, the query is answered entirely from the covering index.
+		
+		@param resource The target resource name. The device name is used as a filter if set.
+		@param typeID The type ID of the data to retrieve (0 for all).
+		@param startDate The start date (null if narrowing is not needed).
+		@param endDate The end date (null if narrowing is not needed).
+		@return dict Keys 'ts' (int64 millis), 'value' (float64), 'typeID' (int64)
+		and 'deviceID' (list of str), each of equal length.
+		"""
+		rows = self._queryRows(self.SENSOR_TABLE, ('ts', 'value', 'typeID', 'deviceID'), resource, typeID, startDate, endDate)
+		
+		return { \
+			'ts': np.fromiter((row[0] for row in rows), dtype = np.int64, count = len(rows)), \
+			'value': np.fromiter((row[1] for row in rows), dtype = np.float64, count = len(rows)), \
+			'typeID': np.fromiter((row[2] for row in rows), dtype = np.int64, count = len(rows)), \
+			'deviceID': [row[3] for row in rows] }
+
+	def loadSystemPerformanceData(self, resource: ResourceNameContainer = None, startDate: datetime = None, endDate: datetime = None) -> SystemPerformanceData:
+		"""
+		Attempts to retrieve the matching data instance(s) from the historian.
+		
+		@param resource The target resource name. The device name is used as a filter if set.
+		@param startDate The start date (null if narrowing is not needed).
+		@param endDate The end date (null if narrowing is not needed).
+		@return SystemPerformanceData[] The data instance(s) associated with the lookup parameters.
+		"""
+		return self._loadData(self.SYS_PERF_TABLE, SystemPerformanceData, resource, 0, startDate, endDate)
+
+	def storeActuatorData(self, resource: ResourceNameContainer = None, qos: int = 0, data: ActuatorData = None) -> bool:
+		"""
+		Queues the source data instance for insertion by the background writer.
+		
+		@param resource The target resource name (ignored).
+		@param qos The intended target QoS (ignored).
+		@param data The data instance to store.
+		@return boolean True on success; false otherwise.
+		"""
+		return self._storeData(self.ACTUATOR_TABLE, data)
+
+	def storeConnectionStateData(self, resource: ResourceNameContainer = None, qos: int = 0, data: ConnectionStateData = None) -> bool:
+		"""
+		Queues the source data instance for insertion by the background writer.
+		
+		@param resource The target resource name (ignored).
+		@param qos The intended target QoS (ignored).
+		@param data The data instance to store.
+		@return boolean True on success; false otherwise.
+		"""
+		return self._storeData(self.CONN_TABLE, data)
+
+	def storeSensorData(self, resource: ResourceNameContainer = None, qos: int = 0, data: SensorData = None) -> bool:
+		"""
+		Queues the source data instance for insertion by the background writer.
+		
+		@param resource The target resource name (ignored).
+		@param qos The intended target QoS (ignored).
+		@param data The data instance to store.
+		@return boolean True on success; false otherwise.
+		"""
+		return self._storeData(self.SENSOR_TABLE, data)
+
+	def storeSensorDataRollup(self, resource: ResourceNameContainer = None, qos: int = 0, data: SensorDataRollup = None) -> bool:
+		"""
+		Queues the source rollup data instance for insertion by the background
+		writer. The row's timestamp is the start of the rollup window.
+		
+		@param resource The target resource name (ignored).
+		@param qos The intended target QoS (ignored).
+		@param data The data instance to store.
+		@return boolean True on success; false otherwise.
+		"""
+		return self._storeData(self.ROLLUP_TABLE, data, timeMillis = data.getWindowStartMillis() if data else 0)
+
+	def storeSystemPerformanceData(self, resource: ResourceNameContainer = None, qos: int = 0, data: SystemPerformanceData = None) -> bool:
+		"""
+		Queues the source data instance for insertion by the background writer.
+		
+		@param resource The target resource name (ignored).
+		@param qos The intended target QoS (ignored).
+		@param data The data instance to store.
+		@return boolean True on success; false otherwise.
+		"""
+		return self._storeData(self.SYS_PERF_TABLE, data)
+
+	def setDataMessageListener(self, listener: IDataMessageListener = None) -> bool:
+		"""
+		Sets the data message listener reference, assuming listener is non-null.
+		
+		@param listener The data message listener instance.
+		@return bool True on success; False otherwise.
+		"""
+		if listener:
+			self.dataMsgListener = listener
+			return True
+		
+		return False
+	
+	def _createConnection(self) -> sqlite3.Connection:
+		"""
+		Creates a new WAL mode connection to the database.
+		
+		"""
+		conn = sqlite3.connect(self.dbFile, check_same_thread = False)
+		conn.execute('PRAGMA journal_mode=WAL')
+		conn.execute('PRAGMA synchronous=NORMAL')
+		
+		return conn
+	
+	def _createSchema(self, conn: sqlite3.Connection = None):
+		"""
+		Creates the tables and indexes if they don't yet exist.
+		
+		"""
+		with conn:
+			for table, columns in self._TABLE_COLUMNS.items():
+				conn.execute('CREATE TABLE IF NOT EXISTS {} ({})'.format(table, ','.join(columns)))
+				
+				indexColumns = self._COVERING_COLUMNS.get(table, ('typeID', 'deviceID', 'ts'))
+				
+				conn.execute( \
+					'CREATE INDEX IF NOT EXISTS {0}_type_device_ts ON {0} ({1})'.format(table, ','.join(indexColumns)))
+				conn.execute( \
+					'CREATE INDEX IF NOT EXISTS {0}_ts ON {0} (ts)'.format(table))
+	
+	def _storeData(self, table: str = None, data = None, timeMillis: int = None) -> bool:
+		"""
+		Converts the data container into a row and queues it for the writer.
+		
+		"""
+		if not data:
+			logging.warning('Invalid data container. Ignoring store request for table %s.', table)
+			return False
+		
+		if not self.writerThread:
+			logging.warning('SQLite historian not yet connected. Ignoring store request for table %s.', table)
+			return False
+		
+		if timeMillis is None:
+			timeMillis = int(datetime.fromisoformat(data.getTimeStamp()).timestamp() * 1000)
+		
+		attrs = data.__dict__
+		row = (timeMillis,) + tuple(attrs.get(column) for column in self._TABLE_COLUMNS[table][1:])
+		
+		self.writeQueue.put((table, row))
+		
+		return True
+	
+	def _processWriteQueue(self):
+		"""
+		Background writer loop. Blocks for the first item, then drains up to
+		writeBatchSize items and commits them as a single transaction.
+		
+		"""
+		conn = self._createConnection()
+		isRunning = True
+		
+		while isRunning:
+			try:
+				item = self.writeQueue.get(timeout = 1.0)
+			except queue.Empty:
+				self._pruneExpiredRows(conn)
+				continue
+			
+			batch = {}
+			barriers = []
+			rowCount = 0
+			
+			while True:
+				if item is None:
+					# stop sentinel - everything queued before it has been drained
+					isRunning = False
+				elif isinstance(item, threading.Event):
+					barriers.append(item)
+				else:
+					batch.setdefault(item[0], []).append(item[1])
+					rowCount += 1
+				
+				if not isRunning or rowCount >= self.writeBatchSize:
+					break
+				
+				try:
+					item = self.writeQueue.get_nowait()
+				except queue.Empty:
+					break
+			
+			try:
+				with conn:
+					for table, rows in batch.items():
+						conn.executemany(self._insertSql[table], rows)
+				
+				self.rowsWritten += rowCount
+			except sqlite3.Error as e:
+				logging.error('Failed to write batch to SQLite historian: %s', str(e))
+			
+			self._pruneExpiredRows(conn)
+			
+			for barrier in barriers:
+				barrier.set()
+		
+		conn.close()
+	
+	def _pruneExpiredRows(self, conn: sqlite3.Connection = None):
+		"""
+		Deletes rows older than the retention period (at most once per prune interval).
+		
+		"""
+		if self.retentionSecs <= 0:
+			return
+		
+		# rows are time stamped by the (possibly simulated) clock
+		now = SimulationClock().now()
+		
+		if now - self.lastPruneTime < self.pruneIntervalSecs:
+			return
+		
+		self.lastPruneTime = now
+		cutoffMillis = int((now - self.retentionSecs) * 1000)
+		
+		try:
+			with conn:
+				for table in self._TABLE_COLUMNS.keys():
+					conn.execute('DELETE FROM {} WHERE ts < ?'.format(table), (cutoffMillis,))
+		except sqlite3.Error as e:
+			logging.warning('Failed to prune expired rows from SQLite historian: %s', str(e))
+	
+	def _queryRows(self, table: str, columns: tuple, resource: ResourceNameContainer = None, typeID: int = 0, startDate: datetime = None, endDate: datetime = None) -> list:
+		"""
+		Runs a range query against the given table, returning the raw rows.
+		
+		"""
+		if not self.readConn:
+			logging.warning('SQLite historian not yet connected. Ignoring load request for table %s.', table)
+			return []
+		
+		self.flush()
+		
+		clauses = []
+		params = []
+		
+		if typeID:
+			clauses.append('typeID = ?')
+			params.append(typeID)
+		
+		if resource and isinstance(resource, ResourceNameContainer) and resource.getDeviceName() != ConfigConst.NOT_SET:
+			clauses.append('deviceID = ?')
+			params.append(resource.getDeviceName())
+		
+		if startDate:
+			clauses.append('ts >= ?')
+			params.append(int(startDate.timestamp() * 1000))
+		
+		if endDate:
+			clauses.append('ts <= ?')
+			params.append(int(endDate.timestamp() * 1000))
+		
+		sql = 'SELECT {} FROM {}'.format(','.join(columns), table)
+		
+		if clauses:
+			sql += ' WHERE ' + ' AND '.join(clauses)
+		
+		sql += ' ORDER BY ts'
+		
+		with self.readLock:
+			return self.readConn.execute(sql, params).fetchall()
+	
+	def _loadData(self, table: str, dataType, resource: ResourceNameContainer = None, typeID: int = 0, startDate: datetime = None, endDate: datetime = None) -> list:
+		"""
+		Runs a range query and converts each row into a data container.
+		
+		"""
+		columns = self._TABLE_COLUMNS[table]
+		dataList = []
+		
+		for row in self._queryRows(table, columns, resource, typeID, startDate, endDate):
+			data = dataType()
+			attrs = data.__dict__
+			
+			for column, val in zip(columns[1:], row[1:]):
+				attrs[column] = bool(val) if column in self._BOOLEAN_COLUMNS else val
+			
+			data.timeStamp = datetime.fromtimestamp(row[0] / 1000, timezone.utc).isoformat()
+			
+			dataList.append(data)
+		
+		return dataList
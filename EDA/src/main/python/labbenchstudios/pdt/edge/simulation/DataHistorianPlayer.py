@@ -0,0 +1,553 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+import heapq
+import json
+import logging
+import threading
+
+from datetime import datetime
+
+from labbenchstudios.pdt.common.IDataManager import IDataManager
+from labbenchstudios.pdt.common.IDataMessageListener import IDataMessageListener
+from labbenchstudios.pdt.common.SimulationClock import SimulationClock
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+
+class DataHistorianPlayer(IDataManager):
+	"""
+	Replays recorded sensorDataList JSON files (such as those in the
+	simTestData directory) to a data message listener - typically the
+	EventDispatchManager - preserving the relative timing of the
+	recorded readings.
+	
+	Each file is stream parsed one record at a time, and the files are
+	merged by their time offsets (so temperature, humidity and pressure
+	recordings play back together), so memory use is bounded by the read
+	size and the largest single record, regardless of the recording size.
+	
+	Playback runs on its own thread at the given speed factor (1.0 =
+	real time, N = N times real time, MAX_SPEED = as fast as the listener
+	accepts the data), and can be paused, resumed, sought and looped.
+	Playback time is SimulationClock time, so in the scaled and stepped
+	clock modes the recordings keep pace with the rest of the simulation.
+	
+	"""
+	
+	MAX_SPEED = 0.0
+	
+	DEFAULT_READ_SIZE = 65536
+	
+	# longest the player thread waits before re-checking the playback state
+	MAX_WAIT_SECS = 1.0
+	
+	# most records dispatched per lock hold, so control calls aren't starved at max speed
+	DISPATCH_BATCH_SIZE = 100
+	
+	def __init__(self, \
+		fileNames = None, speedFactor: float = 1.0, enableLoop: bool = False, updateTimeStamps: bool = True, \
+		readSize: int = DEFAULT_READ_SIZE, dataMsgListener: IDataMessageListener = None):
+		"""
+		Constructor.
+		
+		@param fileNames The recording file name, or a list (or comma separated string) of file names.
+		@param speedFactor The playback speed relative to real time (MAX_SPEED = as fast as possible).
+		@param enableLoop If True, playback restarts from the beginning once all records are played.
+		@param updateTimeStamps If True, each record is time stamped when played; otherwise the recorded time stamp is kept.
+		@param readSize The number of characters read from each file at a time.
+		@param dataMsgListener The listener to receive the replayed data.
+		"""
+		if isinstance(fileNames, str):
+			fileNames = [fileName.strip() for fileName in fileNames.split(',') if fileName.strip()]
+		
+		if not fileNames:
+			raise ValueError('At least one recording file name must be set.')
+		
+		if speedFactor < 0.0 or readSize < 1:
+			raise ValueError('Invalid historian player speed factor or read size.')
+		
+		self.fileNames = list(fileNames)
+		self.speedFactor = speedFactor
+		self.enableLoop = enableLoop
+		self.updateTimeStamps = updateTimeStamps
+		self.readSize = readSize
+		self.dataMsgListener = dataMsgListener
+		
+		self.lock = threading.RLock()
+		self.controlEvent = threading.Event()
+		self.clock = SimulationClock()
+		self.playerThread = None
+		self.isRunning = False
+		self.isPausedFlag = False
+		
+		self.readers = []
+		self.pendingRecords = []
+		
+		# playback offset at the anchor (clock monotonic) time
+		self.playbackOffset = 0.0
+		self.anchorTime = self.clock.monotonic()
+		
+		self.recordCount = 0
+		self.loopCount = 0
+		
+		self._openReaders()
+	
+	def getLoopCount(self) -> int:
+		return self.loopCount
+	
+	def getPlaybackOffset(self) -> float:
+		"""
+		Returns the current playback position, in seconds from the start
+		of the recordings.
+		
+		@return float
+		"""
+		with self.lock:
+			if self.isRunning and not self.isPausedFlag and self.speedFactor > 0.0:
+				return self.playbackOffset + (self.clock.monotonic() - self.anchorTime) * self.speedFactor
+			
+			return self.playbackOffset
+	
+	def getRecordCount(self) -> int:
+		"""
+		Returns the number of records played (across all loops).
+		
+		@return int
+		"""
+		return self.recordCount
+	
+	def getSpeedFactor(self) -> float:
+		return self.speedFactor
+	
+	def isPaused(self) -> bool:
+		return self.isPausedFlag
+	
+	def isPlaying(self) -> bool:
+		"""
+		Returns True if the player thread is running and not paused.
+		
+		@return bool
+		"""
+		return self.isRunning and not self.isPausedFlag
+	
+	def pause(self):
+		"""
+		Pauses playback at the current position.
+		
+		"""
+		with self.lock:
+			self._reanchor()
+			self.isPausedFlag = True
+		
+		self._notifyControlChange()
+	
+	def playToOffset(self, offsetSecs: float) -> int:
+		"""
+		Plays all remaining records up to (and including) the given
+		offset immediately, rather than waiting for them - e.g. to
+		replay a recording synchronously. Looping doesn't apply.
+		
+		@param offsetSecs The playback offset to play up to.
+		@return int The number of records played.
+		"""
+		playCount = 0
+		
+		with self.lock:
+			while self.pendingRecords and self.pendingRecords[0][0] <= offsetSecs:
+				self._playNextRecord()
+				playCount += 1
+			
+			self.playbackOffset = max(self.playbackOffset, offsetSecs)
+			self.anchorTime = self.clock.monotonic()
+		
+		return playCount
+	
+	def resume(self):
+		"""
+		Resumes playback from the current position.
+		
+		"""
+		with self.lock:
+			self._reanchor()
+			self.isPausedFlag = False
+		
+		self._notifyControlChange()
+	
+	def seek(self, offsetSecs: float = 0.0):
+		"""
+		Moves the playback position to the given offset. Records before
+		the offset are skipped; seeking backwards re-opens the recordings
+		and skips forward from the start.
+		
+		@param offsetSecs The new playback offset, in seconds from the start of the recordings.
+		"""
+		offsetSecs = max(offsetSecs, 0.0)
+		
+		with self.lock:
+			if offsetSecs < self.getPlaybackOffset():
+				self._openReaders()
+			
+			while self.pendingRecords and self.pendingRecords[0][0] < offsetSecs:
+				readerIndex = heapq.heappop(self.pendingRecords)[1]
+				self._pushNextRecord(readerIndex)
+			
+			self.playbackOffset = offsetSecs
+			self.anchorTime = self.clock.monotonic()
+		
+		self._notifyControlChange()
+	
+	def setDataMessageListener(self, listener: IDataMessageListener = None):
+		if listener:
+			self.dataMsgListener = listener
+	
+	def setLoopEnabled(self, enable: bool = True):
+		self.enableLoop = enable
+		self._notifyControlChange()
+	
+	def setSpeedFactor(self, speedFactor: float = 1.0):
+		"""
+		Sets the playback speed, keeping the current position.
+		
+		@param speedFactor The playback speed relative to real time (MAX_SPEED = as fast as possible).
+		"""
+		if speedFactor < 0.0:
+			raise ValueError('Invalid historian player speed factor: ' + str(speedFactor))
+		
+		with self.lock:
+			self._reanchor()
+			self.speedFactor = speedFactor
+		
+		self._notifyControlChange()
+	
+	def startManager(self) -> bool:
+		"""
+		Starts playback on the player thread.
+		
+		@return bool True if started; False if already running.
+		"""
+		with self.lock:
+			if self.isRunning:
+				logging.warning("Historian player already started. Ignoring.")
+				return False
+			
+			self.isRunning = True
+			self.anchorTime = self.clock.monotonic()
+			self.playerThread = threading.Thread(target = self._runPlayer, name = "DataHistorianPlayer", daemon = True)
+			self.playerThread.start()
+		
+		logging.info("Started historian player: %s at speed %s", str(self.fileNames), str(self.speedFactor))
+		
+		return True
+	
+	def stopManager(self) -> bool:
+		"""
+		Stops playback and closes the recordings.
+		
+		@return bool True if stopped; False if not running.
+		"""
+		with self.lock:
+			if not self.isRunning:
+				return False
+			
+			self._reanchor()
+			self.isRunning = False
+		
+		self._notifyControlChange()
+		
+		if self.playerThread and self.playerThread is not threading.current_thread():
+			self.playerThread.join(timeout = 5.0)
+		
+		self.playerThread = None
+		self._closeReaders()
+		
+		logging.info("Stopped historian player after %d records.", self.recordCount)
+		
+		return True
+	
+	def _closeReaders(self):
+		for reader in self.readers:
+			reader.close()
+		
+		self.readers = []
+		self.pendingRecords = []
+	
+	def _dispatchDueRecords(self) -> float:
+		"""
+		Plays the records that are due at the current playback offset.
+		
+		@return float The seconds to wait until the next record is due, or None when playback has finished.
+		"""
+		with self.lock:
+			if not self.isRunning:
+				return None
+			
+			if self.isPausedFlag:
+				return self.MAX_WAIT_SECS
+			
+			curOffset = self.getPlaybackOffset()
+			
+			for i in range(self.DISPATCH_BATCH_SIZE):
+				if not self.pendingRecords:
+					if not self.enableLoop:
+						return None
+					
+					self._openReaders()
+					
+					if not self.pendingRecords:
+						return None
+					
+					self.loopCount += 1
+					self.playbackOffset = curOffset = 0.0
+					self.anchorTime = self.clock.monotonic()
+					
+					logging.info("Historian player restarting recordings (loop %d).", self.loopCount)
+				
+				nextOffset = self.pendingRecords[0][0]
+				
+				if self.speedFactor > 0.0:
+					if nextOffset > curOffset:
+						return (nextOffset - curOffset) / self.speedFactor
+				else:
+					self.playbackOffset = max(self.playbackOffset, nextOffset)
+				
+				self._playNextRecord()
+			
+			return 0.0
+	
+	def _notifyControlChange(self):
+		# wakes the player thread, wherever it's waiting
+		self.controlEvent.set()
+		
+		if not self.clock.isRealTime():
+			self.clock.notifySleepers()
+	
+	def _openReaders(self):
+		self._closeReaders()
+		
+		self.readers = [_SensorDataListReader(fileName, self.readSize) for fileName in self.fileNames]
+		
+		for readerIndex in range(len(self.readers)):
+			self._pushNextRecord(readerIndex)
+	
+	def _playNextRecord(self):
+		offsetSecs, readerIndex, data = heapq.heappop(self.pendingRecords)
+		self._pushNextRecord(readerIndex)
+		
+		if self.updateTimeStamps:
+			# the time offset is added to the current time - use the play time as is
+			data.addTimeOffsetSeconds(0.0)
+			data.updateTimeStamp()
+		
+		self.recordCount += 1
+		
+		if self.dataMsgListener:
+			self.dataMsgListener.handleSensorMessage(data)
+	
+	def _pushNextRecord(self, readerIndex: int):
+		record = self.readers[readerIndex].readRecord()
+		
+		if record:
+			offsetSecs, jsonStruct = record
+			data = SensorData()
+			
+			# same mapping as DataUtil - only keys that are SensorData properties are set
+			varStruct = vars(data)
+			
+			for key in jsonStruct:
+				if key in varStruct:
+					setattr(data, key, jsonStruct[key])
+			
+			# each reader has at most one pending record, so the reader index breaks ties
+			heapq.heappush(self.pendingRecords, (offsetSecs, readerIndex, data))
+	
+	def _reanchor(self):
+		self.playbackOffset = self.getPlaybackOffset()
+		self.anchorTime = self.clock.monotonic()
+	
+	def _runPlayer(self):
+		while self.isRunning:
+			self.controlEvent.clear()
+			
+			try:
+				waitSecs = self._dispatchDueRecords()
+			except Exception as e:
+				logging.error("Historian player failed. Stopping playback: %s", str(e))
+				waitSecs = None
+			
+			if waitSecs is None:
+				break
+			
+			if waitSecs > 0.0:
+				if self.clock.isRealTime():
+					self.controlEvent.wait(min(waitSecs, self.MAX_WAIT_SECS))
+				else:
+					# the clock wakes the player at the (simulated) time the next record is due
+					self.clock.sleep(waitSecs, isCancelled = self.controlEvent.is_set)
+		
+		with self.lock:
+			if self.isRunning:
+				self._reanchor()
+				self.isRunning = False
+				
+				logging.info("Historian player finished after %d records.", self.recordCount)
+
+
+class _SensorDataListReader():
+	"""
+	Incremental reader for a JSON recording that's either an object with a
+	sensorDataList array, or a bare array, of SensorData records. Only the
+	unparsed remainder of the current read is buffered.
+	
+	"""
+	
+	LIST_KEY = '"sensorDataList"'
+	
+	TIME_OFFSET_KEY = 'timeOffsetSeconds'
+	TIME_STAMP_KEY = 'timeStamp'
+	
+	# largest single record (in characters) before the file is considered invalid
+	MAX_RECORD_SIZE = 1048576
+	
+	def __init__(self, fileName: str, readSize: int):
+		self.fileName = fileName
+		self.readSize = readSize
+		self.decoder = json.JSONDecoder()
+		self.buffer = ''
+		self.pos = 0
+		self.isEof = False
+		self.isDone = False
+		self.firstTimeStamp = None
+		
+		self.file = open(fileName, 'r', encoding = 'utf-8')
+		
+		try:
+			self._findListStart()
+		except Exception:
+			self.close()
+			raise
+	
+	def close(self):
+		if self.file:
+			self.file.close()
+			self.file = None
+		
+		self.isDone = True
+		self.buffer = ''
+		self.pos = 0
+	
+	def readRecord(self) -> tuple:
+		"""
+		Reads the next record.
+		
+		@return tuple The (offset secs, record dict), or None at the end of the list.
+		"""
+		while not self.isDone:
+			c = self._peekChar(separators = ' \t\r\n,')
+			
+			if c is None:
+				logging.warning("Recording ended before its sensorDataList was closed: %s", self.fileName)
+				self.close()
+			elif c == ']':
+				self.close()
+			else:
+				try:
+					jsonStruct, self.pos = self.decoder.raw_decode(self.buffer, self.pos)
+				except json.JSONDecodeError:
+					if self.isEof or len(self.buffer) - self.pos > self.MAX_RECORD_SIZE:
+						raise ValueError('Invalid sensorDataList record in recording: ' + self.fileName)
+					
+					self._readMore()
+					continue
+				
+				if isinstance(jsonStruct, dict):
+					return (self._getTimeOffset(jsonStruct), jsonStruct)
+				
+				logging.warning("Ignoring non-object sensorDataList entry in recording: %s", self.fileName)
+		
+		return None
+	
+	def _findListStart(self):
+		c = self._peekChar()
+		
+		if c == '{':
+			self.pos = self._findText(self.LIST_KEY) + len(self.LIST_KEY)
+		elif c != '[':
+			raise ValueError('Recording is not a sensorDataList object or array: ' + self.fileName)
+		
+		self.pos = self._findText('[') + 1
+	
+	def _findText(self, text: str) -> int:
+		while True:
+			index = self.buffer.find(text, self.pos)
+			
+			if index >= 0:
+				return index
+			
+			if self.isEof:
+				raise ValueError('Recording has no sensorDataList: ' + self.fileName)
+			
+			# keep enough of the buffer to match text split across reads
+			self.pos = max(self.pos, len(self.buffer) - len(text) + 1)
+			self._readMore()
+	
+	def _getTimeOffset(self, jsonStruct: dict) -> float:
+		offsetSecs = jsonStruct.get(self.TIME_OFFSET_KEY)
+		
+		if offsetSecs is not None:
+			return float(offsetSecs)
+		
+		# fall back to the time since the first record's time stamp
+		try:
+			timeStamp = datetime.fromisoformat(jsonStruct[self.TIME_STAMP_KEY])
+		except (KeyError, TypeError, ValueError):
+			return 0.0
+		
+		if self.firstTimeStamp is None:
+			self.firstTimeStamp = timeStamp
+		
+		return (timeStamp - self.firstTimeStamp).total_seconds()
+	
+	def _peekChar(self, separators: str = ' \t\r\n') -> str:
+		while True:
+			while self.pos < len(self.buffer) and self.buffer[self.pos] in separators:
+				self.pos += 1
+			
+			if self.pos < len(self.buffer):
+				return self.buffer[self.pos]
+			
+			if self.isEof:
+				return None
+			
+			self._readMore()
+	
+	def _readMore(self):
+		chunk = self.file.read(self.readSize)
+		
+		if chunk:
+			self.buffer = self.buffer[self.pos:] + chunk
+			self.pos = 0
+		else:
+			self.isEof = True
@@ -0,0 +1,307 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+import logging
+import math
+
+import numpy as np
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.data.ActuatorData import ActuatorData
+
+class EnvironmentPlantModel():
+	"""
+	Lumped capacitance thermal and humidity model for one or more zones,
+	closing the loop between the environmental actuators and the
+	temperature and humidity sim tasks.
+	
+	Each zone's temperature T and relative humidity H follow:
+	
+	C dT/dt = UA (Tout - T) + Q
+	  dH/dt = (Hout - H) / tauH + M
+	
+	where C is the thermal capacitance (J/K), UA the conductance to the
+	outdoors (W/K), and tauH the moisture exchange time constant (sec).
+	The HVAC heat input Q and humidifier moisture input M come from the
+	actuator state: when on, the HVAC drives the zone toward its setpoint
+	(heating or cooling at up to hvacCapacity watts), and the humidifier
+	adds moisture at up to humidifierCapacity %RH per hour while below
+	its setpoint. Both throttle linearly within controlBand of the setpoint.
+	
+	Each step holds the inputs constant and integrates the linear system
+	exactly, so it's stable for any timestep. All zones are stepped
+	together as NumPy arrays, and zone parameters may be scalars or
+	per-zone arrays. The model has no notion of wall clock time, so
+	run() can simulate hours of plant response in milliseconds.
+	
+	"""
+	
+	DEFAULT_THERMAL_CAPACITANCE   = 2.0e6
+	DEFAULT_THERMAL_CONDUCTANCE   = 150.0
+	DEFAULT_HVAC_CAPACITY         = 3000.0
+	DEFAULT_HUMIDITY_TIME_CONST   = 7200.0
+	DEFAULT_HUMIDIFIER_CAPACITY   = 10.0
+	DEFAULT_CONTROL_BAND          = 1.0
+	DEFAULT_MAX_STEP_SECS         = 60.0
+	
+	def __init__(self, \
+		zoneCount: int = 1, \
+		initialTemp = 20.0, initialHumidity = 40.0, \
+		outdoorTemp = 10.0, outdoorHumidity = 30.0, \
+		thermalCapacitance = DEFAULT_THERMAL_CAPACITANCE, \
+		thermalConductance = DEFAULT_THERMAL_CONDUCTANCE, \
+		hvacCapacity = DEFAULT_HVAC_CAPACITY, \
+		humidityTimeConstant = DEFAULT_HUMIDITY_TIME_CONST, \
+		humidifierCapacity = DEFAULT_HUMIDIFIER_CAPACITY, \
+		controlBand: float = DEFAULT_CONTROL_BAND):
+		"""
+		Constructor. Other than zoneCount and controlBand, each parameter
+		may be a scalar (applied to all zones) or a per-zone sequence.
+		
+		@param zoneCount The number of zones.
+		@param initialTemp The initial zone temperature (C).
+		@param initialHumidity The initial zone relative humidity (%).
+		@param outdoorTemp The outdoor temperature (C).
+		@param outdoorHumidity The outdoor relative humidity (%).
+		@param thermalCapacitance The zone thermal capacitance (J/K).
+		@param thermalConductance The zone conductance to the outdoors (W/K).
+		@param hvacCapacity The maximum HVAC heating or cooling power (W).
+		@param humidityTimeConstant The moisture exchange time constant (sec).
+		@param humidifierCapacity The maximum humidifier output (%RH per hour).
+		@param controlBand The band around a setpoint within which the actuators throttle.
+		"""
+		if zoneCount < 1:
+			raise ValueError('Plant zone count must be positive: ' + str(zoneCount))
+		
+		self.zoneCount = zoneCount
+		self.controlBand = max(controlBand, 1.0e-6)
+		self.simTimeSecs = 0.0
+		
+		self.temps = self._toZoneArray(initialTemp)
+		self.humidities = self._toZoneArray(initialHumidity)
+		
+		self.outdoorTemps = self._toZoneArray(outdoorTemp)
+		self.outdoorHumidities = self._toZoneArray(outdoorHumidity)
+		
+		self.thermalCapacitances = self._toZoneArray(thermalCapacitance)
+		self.thermalConductances = self._toZoneArray(thermalConductance)
+		self.hvacCapacities = self._toZoneArray(hvacCapacity)
+		self.humidityTimeConstants = self._toZoneArray(humidityTimeConstant)
+		
+		# stored per second, to match the other rates
+		self.humidifierRates = self._toZoneArray(humidifierCapacity) / 3600.0
+		
+		# actuator state: on/off and setpoint per zone
+		self.hvacEnabled = np.zeros(zoneCount, dtype = bool)
+		self.hvacSetpoints = self.temps.copy()
+		self.humidifierEnabled = np.zeros(zoneCount, dtype = bool)
+		self.humidifierSetpoints = self.humidities.copy()
+	
+	def applyActuatorCommand(self, data: ActuatorData = None, zoneIndex: int = None) -> bool:
+		"""
+		Applies an HVAC, thermostat or humidifier command to the actuator
+		state. An 'on' command enables the actuator with the command value
+		as its setpoint; an 'off' command disables it.
+		
+		@param data The ActuatorData command.
+		@param zoneIndex The zone to apply the command to (None = all zones).
+		@return bool True if the command was applied; False if it isn't for a plant actuator.
+		"""
+		if not data:
+			return False
+		
+		isEnabled = (data.getCommand() != ConfigConst.COMMAND_OFF)
+		typeID = data.getTypeID()
+		
+		if typeID == ConfigConst.HVAC_ACTUATOR_TYPE or typeID == ConfigConst.THERMOSTAT_TYPE:
+			self.setHvacState(enable = isEnabled, setpoint = data.getValue(), zoneIndex = zoneIndex)
+		elif typeID == ConfigConst.HUMIDIFIER_ACTUATOR_TYPE:
+			self.setHumidifierState(enable = isEnabled, setpoint = data.getValue(), zoneIndex = zoneIndex)
+		else:
+			return False
+		
+		logging.debug("Plant actuator update: type = %s, enabled = %s, setpoint = %s", str(typeID), str(isEnabled), str(data.getValue()))
+		
+		return True
+	
+	def getHumidities(self) -> np.ndarray:
+		"""
+		Returns a copy of the zone relative humidities (%).
+		
+		@return ndarray
+		"""
+		return self.humidities.copy()
+	
+	def getHumidity(self, zoneIndex: int = 0) -> float:
+		return float(self.humidities[zoneIndex])
+	
+	def getSimTimeSecs(self) -> float:
+		return self.simTimeSecs
+	
+	def getTemperatures(self) -> np.ndarray:
+		"""
+		Returns a copy of the zone temperatures (C).
+		
+		@return ndarray
+		"""
+		return self.temps.copy()
+	
+	def getTemperature(self, zoneIndex: int = 0) -> float:
+		return float(self.temps[zoneIndex])
+	
+	def getZoneCount(self) -> int:
+		return self.zoneCount
+	
+	def run(self, durationSecs: float = 3600.0, stepSecs: float = DEFAULT_MAX_STEP_SECS) -> tuple:
+		"""
+		Steps the model for the given duration as fast as possible (e.g.
+		for control logic regression runs), recording the state after
+		every step. The actuator state is held for the whole run.
+		
+		@param durationSecs The simulated duration.
+		@param stepSecs The fixed timestep.
+		@return tuple The (times, temperatures, humidities) arrays; the latter are steps x zones.
+		"""
+		if stepSecs <= 0.0:
+			raise ValueError('Plant step size must be positive: ' + str(stepSecs))
+		
+		stepCount = max(1, int(math.ceil(durationSecs / stepSecs)))
+		
+		times = np.empty(stepCount)
+		temps = np.empty((stepCount, self.zoneCount))
+		humidities = np.empty((stepCount, self.zoneCount))
+		
+		for i in range(stepCount):
+			self.step(stepSecs)
+			
+			times[i] = self.simTimeSecs
+			temps[i] = self.temps
+			humidities[i] = self.humidities
+		
+		return (times, temps, humidities)
+	
+	def setHumidifierState(self, enable: bool = True, setpoint: float = None, zoneIndex: int = None):
+		"""
+		Sets the humidifier state.
+		
+		@param enable True to switch the humidifier on; False for off.
+		@param setpoint The target humidity (None = unchanged).
+		@param zoneIndex The zone (None = all zones).
+		"""
+		zones = self._getZoneSelector(zoneIndex)
+		
+		self.humidifierEnabled[zones] = enable
+		
+		if setpoint is not None:
+			self.humidifierSetpoints[zones] = setpoint
+	
+	def setHvacState(self, enable: bool = True, setpoint: float = None, zoneIndex: int = None):
+		"""
+		Sets the HVAC state.
+		
+		@param enable True to switch the HVAC on; False for off.
+		@param setpoint The target temperature (None = unchanged).
+		@param zoneIndex The zone (None = all zones).
+		"""
+		zones = self._getZoneSelector(zoneIndex)
+		
+		self.hvacEnabled[zones] = enable
+		
+		if setpoint is not None:
+			self.hvacSetpoints[zones] = setpoint
+	
+	def setOutdoorConditions(self, outdoorTemp = None, outdoorHumidity = None):
+		"""
+		Updates the outdoor conditions; each may be a scalar or per-zone sequence.
+		
+		@param outdoorTemp The outdoor temperature (None = unchanged).
+		@param outdoorHumidity The outdoor relative humidity (None = unchanged).
+		"""
+		if outdoorTemp is not None:
+			self.outdoorTemps = self._toZoneArray(outdoorTemp)
+		
+		if outdoorHumidity is not None:
+			self.outdoorHumidities = self._toZoneArray(outdoorHumidity)
+	
+	def step(self, dtSecs: float = DEFAULT_MAX_STEP_SECS, maxStepSecs: float = DEFAULT_MAX_STEP_SECS):
+		"""
+		Advances all zones by dtSecs, which may vary from call to call.
+		Longer steps are split into sub-steps of at most maxStepSecs, so
+		the actuator throttling responds to the changing zone state.
+		
+		@param dtSecs The time to advance.
+		@param maxStepSecs The maximum sub-step size.
+		"""
+		if dtSecs <= 0.0:
+			return
+		
+		subStepCount = max(1, int(math.ceil(dtSecs / maxStepSecs))) if maxStepSecs > 0.0 else 1
+		subStepSecs = dtSecs / subStepCount
+		
+		for i in range(subStepCount):
+			self._integrate(subStepSecs)
+		
+		self.simTimeSecs += dtSecs
+	
+	def _getZoneSelector(self, zoneIndex: int = None):
+		return slice(None) if zoneIndex is None else zoneIndex
+	
+	def _integrate(self, dtSecs: float):
+		"""
+		Integrates one step exactly, holding the actuator inputs constant.
+		
+		@param dtSecs The step size.
+		"""
+		# HVAC heats or cools toward its setpoint, at full power outside the control band
+		heatInputs = \
+			self.hvacEnabled * self.hvacCapacities * \
+			np.clip((self.hvacSetpoints - self.temps) / self.controlBand, -1.0, 1.0)
+		
+		# the humidifier can only add moisture
+		moistureInputs = \
+			self.humidifierEnabled * self.humidifierRates * \
+			np.clip((self.humidifierSetpoints - self.humidities) / self.controlBand, 0.0, 1.0)
+		
+		# each state decays exponentially toward its equilibrium for the current inputs
+		equilibriumTemps = self.outdoorTemps + heatInputs / self.thermalConductances
+		tempDecay = np.exp(-dtSecs * self.thermalConductances / self.thermalCapacitances)
+		
+		self.temps = equilibriumTemps + (self.temps - equilibriumTemps) * tempDecay
+		
+		equilibriumHumidities = self.outdoorHumidities + moistureInputs * self.humidityTimeConstants
+		humidityDecay = np.exp(-dtSecs / self.humidityTimeConstants)
+		
+		self.humidities = np.clip(equilibriumHumidities + (self.humidities - equilibriumHumidities) * humidityDecay, 0.0, 100.0)
+	
+	def _toZoneArray(self, value) -> np.ndarray:
+		"""
+		Converts a scalar or per-zone sequence into a per-zone float array.
+		
+		"""
+		zoneArray = np.array(np.broadcast_to(np.asarray(value, dtype = np.float64), (self.zoneCount,)))
+		
+		return zoneArray
@@ -23,11 +23,14 @@
 #
 
 import logging
+import random
 
 import labbenchstudios.pdt.common.ConfigConst as ConfigConst
 
 from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
+from labbenchstudios.pdt.common.SimulationClock import SimulationClock
 from labbenchstudios.pdt.edge.system.BaseSensorTask import BaseSensorTask
+from labbenchstudios.pdt.edge.simulation.WorkcellEventSimulator import WorkcellEventSimulator
 from labbenchstudios.pdt.data.SensorData import SensorData
 
 class FactoryWorkcellSimTask(BaseSensorTask):
@@ -35,7 +38,20 @@ class FactoryWorkcellSimTask(BaseSensorTask):
 	This is a simple wrapper for a Simulator abstraction - it provides
 	a container for the simulator's state, value, name, and status.
 	
+	Production is modelled by a WorkcellEventSimulator, with a station
+	for each enabled workcell component. Each call to generateTelemetry()
+	advances the simulation by the elapsed wall clock time (multiplied
+	by the configured time scale), and the telemetry getters report on
+	that interval.
+	
 	"""
+	
+	# (enable key, name, mean service secs, buffer capacity, MTBF secs, MTTR secs, idle kW, busy kW)
+	STATIONS = ( \
+		(ConfigConst.ENABLE_HOPPER_KEY, 'hopper', 1.0, 20, 8 * 3600.0, 600.0, 0.1, 0.4), \
+		(ConfigConst.ENABLE_CONVEYOR_KEY, 'conveyor', 1.5, 10, 24 * 3600.0, 900.0, 0.3, 0.75), \
+		(ConfigConst.ENABLE_ROBOTIC_MANIPULATOR_KEY, 'roboticManipulator', 1.8, 5, 12 * 3600.0, 1800.0, 0.5, 1.5), \
+		(ConfigConst.ENABLE_PALLET_LOADING_KEY, 'palletLoader', 1.2, 10, 16 * 3600.0, 1200.0, 0.2, 0.9))
 
 	def __init__(self, \
 		configSection: str = ConfigConst.FACTORY_WORKCELL_SETTINGS_KEY, \
@@ -50,49 +66,55 @@ class FactoryWorkcellSimTask(BaseSensorTask):
 				typeCategoryID = ConfigConst.FACTORY_WORKCELL_TYPE_CATEGORY)
 		
 		self._initDefaultValues()
+	
+	def generateTelemetry(self, typeID: int = None, typeName: str = None, minVal: float = None, maxVal: float = None) -> SensorData:
+		"""
+		Advances the workcell simulation by the (scaled) wall clock time
+		since the last call, starting a new statistics interval.
+		
+		@return SensorData The items produced telemetry.
+		"""
+		curTime = SimulationClock().monotonic()
+		
+		self.workcellSim.resetStatistics()
+		
+		if self.lastRunTime is not None:
+			self.workcellSim.run((curTime - self.lastRunTime) * self.timeScale)
+		
+		self.lastRunTime = curTime
+		self.itemProductionCounter = self.workcellSim.getItemsProduced()
+		self.latestSensorData = self.getCurrentItemsProducedSensorData()
+		
+		return self.latestSensorData
 
 	def getPowerDrawTelemetrySensorData(self) -> SensorData:
 		"""
-		"""
-		# generate random float between 2.0 and 3.0 (KW)
-		sensorData = \
-			self.generateTelemetry( \
-				typeID = ConfigConst.FACTORY_WORKCELL_POWER_DRAW_TYPE, \
-				typeName = ConfigConst.POWER_DRAW_NAME, \
-				minVal = 2.0, \
-				maxVal = 3.0)
+		Returns the average power draw (kW) of the workcell over the
+		last interval.
 		
-		return sensorData
+		@return SensorData
+		"""
+		return self._createSensorData( \
+			typeID = ConfigConst.FACTORY_WORKCELL_POWER_DRAW_TYPE, \
+			typeName = ConfigConst.POWER_DRAW_NAME, \
+			value = self.workcellSim.getAveragePowerDraw())
 
 	def getAmbientTemperatureTelemetrySensorData(self) -> SensorData:
 		"""
 		"""
 		# generate random float between 18.0 and 22.0 (C)
-		sensorData = \
-			self.generateTelemetry( \
-				typeID = ConfigConst.FACTORY_WORKCELL_AMBIENT_TEMP_TYPE, \
-				typeName = ConfigConst.AMBIENT_TEMPERATURE_NAME, \
-				minVal = 18.0, \
-				maxVal = 22.0)
-
-		return sensorData
+		return self._createSensorData( \
+			typeID = ConfigConst.FACTORY_WORKCELL_AMBIENT_TEMP_TYPE, \
+			typeName = ConfigConst.AMBIENT_TEMPERATURE_NAME, \
+			value = random.uniform(18.0, 22.0))
 	
 	def getCurrentItemsProducedSensorData(self) -> SensorData:
 		"""
 		"""
-		sensorData = \
-			self.generateTelemetry( \
-				typeID = ConfigConst.FACTORY_WORKCELL_ITEMS_PRODUCED_TYPE, \
-				typeName = ConfigConst.ITEMS_PRODUCED_NAME, \
-				minVal = float(self.minItemProdRate), \
-				maxVal = float(self.maxItemProdRate))
-
-		# the value from generateTelemetry will be randomly calculated
-		# as a float betweein minVal and maxVal - override it to set
-		# the actual items produced value instead
-		sensorData.setValue(self.itemProductionCounter)
-
-		return sensorData
+		return self._createSensorData( \
+			typeID = ConfigConst.FACTORY_WORKCELL_ITEMS_PRODUCED_TYPE, \
+			typeName = ConfigConst.ITEMS_PRODUCED_NAME, \
+			value = float(self.itemProductionCounter))
 	
 	def getCurrentItemsProducedAsValue(self) -> int:
 		"""
@@ -114,6 +136,55 @@ class FactoryWorkcellSimTask(BaseSensorTask):
 		"""
 		return self.maxItemProdRate
 	
+	def getThroughputTelemetrySensorData(self) -> SensorData:
+		"""
+		Returns the items produced per minute over the last interval.
+		
+		@return SensorData
+		"""
+		return self._createSensorData( \
+			typeID = ConfigConst.FACTORY_WORKCELL_THROUGHPUT_TYPE, \
+			typeName = ConfigConst.THROUGHPUT_NAME, \
+			value = self.workcellSim.getThroughput())
+	
+	def getUtilizationTelemetrySensorData(self) -> list:
+		"""
+		Returns the utilization (fraction of time processing items) of
+		each station over the last interval, named after the station.
+		
+		@return list The SensorData for each station.
+		"""
+		utilizationDataList = []
+		
+		for stationName, utilization in self.workcellSim.getUtilizations().items():
+			sensorData = \
+				self._createSensorData( \
+					typeID = ConfigConst.FACTORY_WORKCELL_UTILIZATION_TYPE, \
+					typeName = ConfigConst.UTILIZATION_NAME, \
+					value = utilization)
+			
+			sensorData.setName(stationName)
+			utilizationDataList.append(sensorData)
+		
+		return utilizationDataList
+	
+	def getWorkcellSimulator(self) -> WorkcellEventSimulator:
+		"""
+		"""
+		return self.workcellSim
+	
+	def getWorkInProgressTelemetrySensorData(self) -> SensorData:
+		"""
+		Returns the average number of items in the workcell over the
+		last interval.
+		
+		@return SensorData
+		"""
+		return self._createSensorData( \
+			typeID = ConfigConst.FACTORY_WORKCELL_WIP_TYPE, \
+			typeName = ConfigConst.WORK_IN_PROGRESS_NAME, \
+			value = self.workcellSim.getAverageWorkInProgress())
+	
 	def isProductionPaused(self):
 		"""
 		"""
@@ -121,23 +192,41 @@ class FactoryWorkcellSimTask(BaseSensorTask):
 	
 	def setProductionPauseFlag(self, enable: bool = False):
 		"""
+		Pauses or resumes item arrivals - items already in the workcell
+		continue through it.
+		
 		"""
-		self.pauseProduction = enable
-
-	def _generateSensorReading(self, sensorVal: float = ConfigConst.DEFAULT_VAL) -> float:
+		if enable != self.pauseProduction:
+			self.pauseProduction = enable
+			self.workcellSim.setArrivalRate(0.0 if enable else self.curItemProdRate)
+	
+	def setProductionRate(self, itemsPerMinute: float = 0.0):
 		"""
-		This call simply increments the itemProductionCounter if production is NOT paused.
-		If production is paused, no action is taken.
+		Sets the item arrival rate, which takes effect immediately unless
+		production is paused.
+		
+		@param itemsPerMinute The item arrival rate.
 		"""
+		self.curItemProdRate = itemsPerMinute
+		
 		if not self.pauseProduction:
-			self.itemProductionCounter += 1
+			self.workcellSim.setArrivalRate(itemsPerMinute)
 
-		return float(self.itemProductionCounter)
+	def _createSensorData(self, typeID: int, typeName: str, value: float) -> SensorData:
+		"""
+		"""
+		sensorData = SensorData(typeID = typeID, typeCategoryID = self.typeCategoryID, name = self.name)
+		sensorData.setTypeName(typeName)
+		sensorData.setValue(value)
+		
+		return sensorData
 
 	def _initDefaultValues(self):
 		"""
 		"""
 		self.itemProductionCounter = 0
+		self.pauseProduction = False
+		self.lastRunTime = None
 
 		self.configUtil = ConfigUtil()
 		
@@ -160,3 +249,25 @@ class FactoryWorkcellSimTask(BaseSensorTask):
 		self.defaultItemProdRate = \
 			self.configUtil.getFloat( \
 				section = ConfigConst.FACTORY_WORKCELL_SETTINGS_KEY, key = ConfigConst.DEFAULT_PRODUCTION_RATE_KEY, defaultVal = 30.0)
+		
+		self.curItemProdRate = self.defaultItemProdRate
+		
+		# simulated seconds per wall clock second
+		self.timeScale = \
+			self.configUtil.getFloat( \
+				section = ConfigConst.FACTORY_WORKCELL_SETTINGS_KEY, key = ConfigConst.WORKCELL_TIME_SCALE_KEY, defaultVal = 1.0)
+		
+		self.workcellSim = WorkcellEventSimulator(arrivalRate = self.curItemProdRate)
+		
+		enabledStations = \
+			[station for station in self.STATIONS \
+				if self.configUtil.getBoolean(section = ConfigConst.FACTORY_WORKCELL_SETTINGS_KEY, key = station[0])]
+		
+		if not enabledStations:
+			logging.warning("No workcell stations are enabled. Using all stations.")
+			enabledStations = self.STATIONS
+		
+		for enableKey, name, serviceTimeSecs, bufferCapacity, mtbfSecs, mttrSecs, idlePower, busyPower in enabledStations:
+			self.workcellSim.addStation( \
+				name = name, serviceTimeSecs = serviceTimeSecs, bufferCapacity = bufferCapacity, \
+				mtbfSecs = mtbfSecs, mttrSecs = mttrSecs, idlePower = idlePower, busyPower = busyPower)
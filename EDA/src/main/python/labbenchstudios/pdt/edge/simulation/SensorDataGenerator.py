@@ -24,8 +24,13 @@
 
 import logging
 import math
+import zlib
 import numpy as calcLib
-import matplotlib.pyplot as plotLib
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
+from labbenchstudios.pdt.edge.simulation.SensorDataSetCache import SensorDataSetCache
 
 class SensorDataGenerator(object):
 	"""
@@ -83,7 +88,7 @@ class SensorDataGenerator(object):
 	DEFAULT_HUMIDITY_CURVE = BELL_CURVE
 	DEFAULT_PRESSURE_CURVE = INVERSE_CURVE
 	
-	def __init__(self, epochOffsetSeconds: float = 0.0, useCurrentTime: bool = True, alignGeneratorToDay: bool = True):
+	def __init__(self, epochOffsetSeconds: float = 0.0, useCurrentTime: bool = True, alignGeneratorToDay: bool = True, cacheDir: str = None, randomSeed: int = None):
 		"""
 		Constructor.
 		
@@ -97,13 +102,35 @@ class SensorDataGenerator(object):
 		generator logic will be aligned to create a single sine wave for
 		a day - meaning the 24 hr start and end values will be approximately
 		the same.
+		@param cacheDir If set, generated data sets are cached in (and loaded from)
+		this directory. Defaults to the simDataCacheDir setting (empty = no cache).
+		Noisy data sets are only cached if randomSeed is set.
+		@param randomSeed If set, the noise is seeded (per data set) so the same
+		parameters always generate the same data set. Defaults to the simRandomSeed
+		setting (empty = unseeded).
 		"""
 		self.epochOffsetSeconds = epochOffsetSeconds
 		self.useCurrentTime = useCurrentTime
 		self.alignGeneratorToDay = alignGeneratorToDay
 		self.dayDenominator = (1 - (calcLib.pi / 10)) + calcLib.pi
 		
-	def generateDailyEnvironmentHumidityDataSet(self, noiseLevel: int = DEFAULT_NOISE, minValue: float = MIN_ENV_HUMIDITY, maxValue: float = MAX_ENV_HUMIDITY, useSeconds: bool = False):
+		configUtil = ConfigUtil()
+		
+		if cacheDir is None:
+			cacheDir = configUtil.getProperty( \
+				section = ConfigConst.ENVIRONMENTAL_SETTINGS_KEY, key = ConfigConst.SIM_DATA_CACHE_DIR_KEY, defaultVal = None)
+		
+		if randomSeed is None:
+			randomSeedStr = configUtil.getProperty( \
+				section = ConfigConst.ENVIRONMENTAL_SETTINGS_KEY, key = ConfigConst.SIM_RANDOM_SEED_KEY, defaultVal = None)
+			
+			if randomSeedStr:
+				randomSeed = int(randomSeedStr)
+		
+		self.randomSeed = randomSeed
+		self.dataSetCache = SensorDataSetCache(cacheDir = cacheDir) if cacheDir else None
+		
+	def generateDailyEnvironmentHumidityDataSet(self, noiseLevel: int = DEFAULT_NOISE, minValue: float = MIN_ENV_HUMIDITY, maxValue: float = MAX_ENV_HUMIDITY, useSeconds: bool = False, chunkSize: int = 0):
 		"""
 		Generates a time-series data set for indoor temperature simulation over a 24-hour period.
 		
@@ -118,15 +145,17 @@ class SensorDataGenerator(object):
 		@param: useSeconds Defaults to False. If True, the data set will be generated using
 		second-level granularity; that is, one data pair for every second between
 		startHour and endHour.
+		@param: chunkSize Defaults to 0 (generate the full data set). If positive, a
+		SensorDataStream is returned instead, which generates chunkSize entries at a time.
 		@return SensorDataSet The sensor data set containing both time entries and data
 		values for those time entries.
 		"""
 		if maxValue < self.MIN_ENV_HUMIDITY or maxValue > self.MAX_ENV_HUMIDITY: maxValue = self.MAX_ENV_HUMIDITY
 		if minValue < self.MIN_ENV_HUMIDITY or minValue >= maxValue: minValue = maxValue - 1
 		
-		return self.generateDailySensorDataSet(curveType = self.DEFAULT_HUMIDITY_CURVE, noiseLevel = noiseLevel, minValue = minValue, maxValue = maxValue, startHour = 0, endHour = 24, useSeconds = useSeconds)
+		return self.generateDailySensorDataSet(curveType = self.DEFAULT_HUMIDITY_CURVE, noiseLevel = noiseLevel, minValue = minValue, maxValue = maxValue, startHour = 0, endHour = 24, useSeconds = useSeconds, chunkSize = chunkSize)
 		
-	def generateDailyEnvironmentPressureDataSet(self, noiseLevel: int = DEFAULT_NOISE, minValue: float = MIN_ENV_PRESSURE, maxValue: float = MAX_ENV_PRESSURE, useSeconds: bool = False):
+	def generateDailyEnvironmentPressureDataSet(self, noiseLevel: int = DEFAULT_NOISE, minValue: float = MIN_ENV_PRESSURE, maxValue: float = MAX_ENV_PRESSURE, useSeconds: bool = False, chunkSize: int = 0):
 		"""
 		Generates a time-series data set for indoor temperature simulation over a 24-hour period.
 		
@@ -141,15 +170,17 @@ class SensorDataGenerator(object):
 		@param: useSeconds Defaults to False. If True, the data set will be generated using
 		second-level granularity; that is, one data pair for every second between
 		startHour and endHour.
+		@param: chunkSize Defaults to 0 (generate the full data set). If positive, a
+		SensorDataStream is returned instead, which generates chunkSize entries at a time.
 		@return SensorDataSet The sensor data set containing both time entries and data
 		values for those time entries.
 		"""
 		if maxValue < self.MIN_ENV_PRESSURE or maxValue > self.MAX_ENV_PRESSURE: maxValue = self.MAX_ENV_PRESSURE
 		if minValue < self.MIN_ENV_PRESSURE or minValue >= maxValue: minValue = maxValue - 1
 		
-		return self.generateDailySensorDataSet(curveType = self.DEFAULT_PRESSURE_CURVE, noiseLevel = noiseLevel, minValue = minValue, maxValue = maxValue, startHour = 0, endHour = 24, useSeconds = useSeconds)
+		return self.generateDailySensorDataSet(curveType = self.DEFAULT_PRESSURE_CURVE, noiseLevel = noiseLevel, minValue = minValue, maxValue = maxValue, startHour = 0, endHour = 24, useSeconds = useSeconds, chunkSize = chunkSize)
 		
-	def generateDailyIndoorTemperatureDataSet(self, noiseLevel: int = DEFAULT_NOISE, minValue: float = MIN_INDOOR_TEMP, maxValue: float = MAX_INDOOR_TEMP, useSeconds: bool = False):
+	def generateDailyIndoorTemperatureDataSet(self, noiseLevel: int = DEFAULT_NOISE, minValue: float = MIN_INDOOR_TEMP, maxValue: float = MAX_INDOOR_TEMP, useSeconds: bool = False, chunkSize: int = 0):
 		"""
 		Generates a time-series data set for indoor temperature simulation over a 24-hour period.
 		
@@ -164,15 +195,17 @@ class SensorDataGenerator(object):
 		@param: useSeconds Defaults to False. If True, the data set will be generated using
 		second-level granularity; that is, one data pair for every second between
 		startHour and endHour.
+		@param: chunkSize Defaults to 0 (generate the full data set). If positive, a
+		SensorDataStream is returned instead, which generates chunkSize entries at a time.
 		@return SensorDataSet The sensor data set containing both time entries and data
 		values for those time entries.
 		"""
 		if maxValue < self.MIN_ENV_TEMP or maxValue > self.MAX_ENV_TEMP: maxValue = self.MAX_ENV_TEMP
 		if minValue < self.MIN_ENV_TEMP or minValue >= maxValue: minValue = maxValue - 1
 		
-		return self.generateDailySensorDataSet(curveType = self.DEFAULT_TEMP_CURVE, noiseLevel = noiseLevel, minValue = minValue, maxValue = maxValue, startHour = 0, endHour = 24, useSeconds = useSeconds)
+		return self.generateDailySensorDataSet(curveType = self.DEFAULT_TEMP_CURVE, noiseLevel = noiseLevel, minValue = minValue, maxValue = maxValue, startHour = 0, endHour = 24, useSeconds = useSeconds, chunkSize = chunkSize)
 		
-	def generateDailyMonitorTemperatureDataSet(self, noiseLevel: int = DEFAULT_NOISE, minValue: float = MIN_MONITOR_TEMP, maxValue: float = MAX_MONITOR_TEMP, useSeconds: bool = False):
+	def generateDailyMonitorTemperatureDataSet(self, noiseLevel: int = DEFAULT_NOISE, minValue: float = MIN_MONITOR_TEMP, maxValue: float = MAX_MONITOR_TEMP, useSeconds: bool = False, chunkSize: int = 0):
 		"""
 		Generates a time-series data set for indoor temperature simulation over a 24-hour period.
 		
@@ -187,13 +220,15 @@ class SensorDataGenerator(object):
 		@param: useSeconds Defaults to False. If True, the data set will be generated using
 		second-level granularity; that is, one data pair for every second between
 		startHour and endHour.
+		@param: chunkSize Defaults to 0 (generate the full data set). If positive, a
+		SensorDataStream is returned instead, which generates chunkSize entries at a time.
 		@return SensorDataSet The sensor data set containing both time entries and data
 		values for those time entries.
 		"""
 		if maxValue < self.MIN_MONITOR_TEMP or maxValue > self.MAX_MONITOR_TEMP: maxValue = self.MAX_MONITOR_TEMP
 		if minValue < self.MIN_MONITOR_TEMP or minValue >= maxValue: minValue = maxValue - 1
 		
-		return self.generateDailySensorDataSet(curveType = self.DEFAULT_TEMP_CURVE, noiseLevel = noiseLevel, minValue = minValue, maxValue = maxValue, startHour = 0, endHour = 24, useSeconds = useSeconds)
+		return self.generateDailySensorDataSet(curveType = self.DEFAULT_TEMP_CURVE, noiseLevel = noiseLevel, minValue = minValue, maxValue = maxValue, startHour = 0, endHour = 24, useSeconds = useSeconds, chunkSize = chunkSize)
 		
 	def generateOscillatingSensorDataSet(self, noiseLevel: int = DEFAULT_NOISE, minValue: float = 0.0, maxValue: float = 1000.0, useSeconds: bool = False):
 		"""
@@ -266,6 +301,12 @@ class SensorDataGenerator(object):
 
 			totalSamples = int(abs(abs(startHour) - abs(endHour)) * samplesPerHour)
 			
+		cacheKey = ('trending', bool(trendUpwards), float(minValue), float(maxValue), startHour, endHour, totalSamples)
+		dataSet = self._loadCachedDataSet(cacheKey)
+		
+		if dataSet:
+			return dataSet
+		
 		timeEntries = calcLib.linspace(start = startHour, stop = endHour, num = totalSamples)
 		dataValues = calcLib.sin(timeEntries / self.dayDenominator)
 
@@ -279,15 +320,22 @@ class SensorDataGenerator(object):
 			scaledValues = calcLib.sort(rawScaledValues)[::-1]
 
 		dataSet.setDataEntries(scaledValues)
+		
+		self._storeCachedDataSet(cacheKey, dataSet)
 
 		return dataSet
 		
-	def generateDailySensorDataSet(self, curveType: int = FULL_WAVE, noiseLevel: int = DEFAULT_NOISE, minValue: float = DEFAULT_MIN_VALUE, maxValue: float = DEFAULT_MAX_VALUE, startHour: int = MIN_HOURS, endHour: int = MAX_HOURS, useSeconds = False):
+	def generateDailySensorDataSet(self, curveType: int = FULL_WAVE, noiseLevel: int = DEFAULT_NOISE, minValue: float = DEFAULT_MIN_VALUE, maxValue: float = DEFAULT_MAX_VALUE, startHour: int = MIN_HOURS, endHour: int = MAX_HOURS, useSeconds = False, chunkSize: int = 0):
 		"""
 		Generates a time-series data set. This call will use the parameters to generate
 		time-series data that includes the ordered time points and their values stored
 		within a SensorDataSet instance.
 		
+		If chunkSize is positive, the data set isn't generated up front. Instead, a
+		SensorDataStream is returned, which generates chunkSize entries at a time as
+		they're accessed, so memory use is bounded by the chunk size regardless of
+		the number of entries.
+		
 		The default behavior is to generate a data pair (time point and value) for every
 		minute between startHour and stopHour. If startHour and stopHour are the same, a
 		single data pair will be generated.
@@ -309,6 +357,8 @@ class SensorDataGenerator(object):
 		@param: useSeconds Defaults to False. If True, the data set will be generated using
 		second-level granularity; that is, one data pair for every second between
 		startHour and endHour.
+		@param: chunkSize Defaults to 0 (generate the full data set). If positive, a
+		SensorDataStream is returned instead, which generates chunkSize entries at a time.
 		@return SensorDataSet The sensor data set containing both time entries and data
 		values for those time entries.
 		"""
@@ -330,29 +380,30 @@ class SensorDataGenerator(object):
 		if useSeconds: totalDataPoints = totalDataPoints * 60
 		if totalDataPoints == 0: totalDataPoints = 1
 		
+		denominator = self._getCurveDenominator(curveType)
+		
+		cacheKey = ('daily', noiseLevel, float(minValue), float(maxValue), startHour, endHour, totalDataPoints, float(denominator))
+		
+		if chunkSize > 0:
+			return SensorDataStream( \
+				epochOffsetSeconds = self.epochOffsetSeconds, useCurrentTime = self.useCurrentTime, \
+				startHour = startHour, endHour = endHour, entryCount = totalDataPoints, \
+				denominator = denominator, noiseLevel = noiseLevel, minValue = minValue, maxValue = maxValue, \
+				chunkSize = chunkSize, randomSeed = self._getDataSetSeed(cacheKey))
+		
+		# noisy data sets can only be cached (and re-used) if they're reproducible
+		if noiseLevel == self.NO_NOISE or self.randomSeed is not None:
+			dataSet = self._loadCachedDataSet(cacheKey)
+			
+			if dataSet:
+				return dataSet
+		
 		# create evenly spaced number of 'totalDataPoints' between 'startHour' and 'endHour'
 		timeEntries = calcLib.linspace(start = startHour, stop = endHour, num = totalDataPoints)
 		
 		# generate the distribution data for each point - quick ramp up curve
 		# followed by a more gradual ramp down
-		if self.alignGeneratorToDay:
-			if curveType > 0:
-				denominator = (curveType + self.dayDenominator)
-			elif curveType == 0:
-				denominator = self.dayDenominator
-			else:
-				denominator = abs(curveType) * self.dayDenominator
-				
-			dataValuesClean = calcLib.sin(timeEntries / denominator)
-		else:
-			if curveType > 0:
-				denominator = curveType
-			elif curveType == 0:
-				denominator = 1
-			else:
-				denominator = 1 / abs(curveType)
-				
-			dataValuesClean = calcLib.sin(timeEntries / denominator)
+		dataValuesClean = calcLib.sin(timeEntries / denominator)
 		
 		# re-scale array with 'minValue' as floor and 'maxValue' as ceiling
 		scaledValuesClean = calcLib.interp(dataValuesClean, (dataValuesClean.min(), dataValuesClean.max()), (minValue, maxValue))
@@ -367,7 +418,11 @@ class SensorDataGenerator(object):
 			# the generated noisyness aligns with the magnitude of the values
 			meanMag = int(math.log10(meanValue))
 			noiseScale = ((noiseLevel / 100) * ((10 ** meanMag) / 10))
-			noisyTemp = calcLib.random.normal(0, noiseScale, len(scaledValuesClean))
+			
+			if self.randomSeed is not None:
+				noisyTemp = calcLib.random.default_rng(self._getDataSetSeed(cacheKey)).normal(0, noiseScale, len(scaledValuesClean))
+			else:
+				noisyTemp = calcLib.random.normal(0, noiseScale, len(scaledValuesClean))
 			
 			logging.debug("Noise=%f; Noise Scale=%f; Mean Magnitude=%f" % (noiseLevel, noiseScale, meanMag))
 			
@@ -378,6 +433,9 @@ class SensorDataGenerator(object):
 		else:
 			dataSet.setDataEntries(scaledValuesClean)
 		
+		if noiseLevel == self.NO_NOISE or self.randomSeed is not None:
+			self._storeCachedDataSet(cacheKey, dataSet)
+		
 		return dataSet
 		
 	def generateOnScreenGraph(self, dataSet = None, chartTitle: str = "Sample Data", chartXLabel: str = "X Axis", chartYLabel: str = "Y Axis"):
@@ -393,6 +451,9 @@ class SensorDataGenerator(object):
 		@param chartXLabel The string to use for the X Label.
 		@param chartYLabel The string to use for the Y Label.
 		"""
+		# matplotlib is slow to import, and only needed here
+		import matplotlib.pyplot as plotLib
+		
 		self.plotter = plotLib
 		
 		self.plotter.plot(dataSet.getTimeEntries(), dataSet.getDataEntries())
@@ -402,6 +463,74 @@ class SensorDataGenerator(object):
 		self.plotter.grid(True, which = 'both')
 		self.plotter.show()
 		
+	def _getDataSetSeed(self, cacheKey: tuple = None) -> list:
+		"""
+		Returns the noise seed for the data set with the given parameters,
+		so each data set gets its own (reproducible) noise.
+		
+		@param cacheKey The data set's generator parameter tuple.
+		@return list The seed, or None if the generator isn't seeded.
+		"""
+		if self.randomSeed is None:
+			return None
+		
+		return [self.randomSeed, zlib.crc32(repr(cacheKey).encode('utf-8'))]
+		
+	def _loadCachedDataSet(self, cacheKey: tuple = None):
+		"""
+		Loads the data set with the given parameters from the cache.
+		
+		@param cacheKey The data set's generator parameter tuple.
+		@return SensorDataSet The data set, or None if there's no cache or it isn't cached.
+		"""
+		if not self.dataSetCache:
+			return None
+		
+		entries = self.dataSetCache.loadEntries(cacheKey + (self.randomSeed,))
+		
+		if not entries:
+			return None
+		
+		logging.debug("Loaded simulated data set from cache: %s", str(cacheKey))
+		
+		return SensorDataSet( \
+			epochOffsetSeconds = self.epochOffsetSeconds, useCurrentTime = self.useCurrentTime, \
+			timeEntries = entries[0], dataEntries = entries[1])
+		
+	def _storeCachedDataSet(self, cacheKey: tuple = None, dataSet = None):
+		"""
+		Stores the data set with the given parameters in the cache (if enabled).
+		
+		@param cacheKey The data set's generator parameter tuple.
+		@param dataSet The SensorDataSet to store.
+		"""
+		if self.dataSetCache:
+			self.dataSetCache.storeEntries(cacheKey + (self.randomSeed,), dataSet.getTimeEntries(), dataSet.getDataEntries())
+		
+	def _getCurveDenominator(self, curveType: int = FULL_WAVE) -> float:
+		"""
+		Returns the denominator applied to the time entries (in hours) before
+		taking their sine, which determines the shape of the curve.
+		
+		@param curveType The type of curve - FULL_WAVE, CURVE_UP, CURVE_DOWN,
+		BELL_CURVE, INVERSE_CURVE.
+		@return float
+		"""
+		if self.alignGeneratorToDay:
+			if curveType > 0:
+				return (curveType + self.dayDenominator)
+			elif curveType == 0:
+				return self.dayDenominator
+			else:
+				return abs(curveType) * self.dayDenominator
+		else:
+			if curveType > 0:
+				return curveType
+			elif curveType == 0:
+				return 1
+			else:
+				return 1 / abs(curveType)
+		
 
 from time import time, ctime
 
@@ -521,7 +650,8 @@ class SensorDataSet():
 		"""
 		if not timeEntries is None:
 			# data generator uses a single dimension array, so it's safe to flatten
-			self.timeEntries = timeEntries.flatten()
+			# (ravel avoids copying - e.g. memory-mapped cache entries)
+			self.timeEntries = timeEntries.ravel()
 			logging.info("timeEntries tuple. Array Size: %s  ND Size: %s  Dimensions: %s  Shape: %s  Type: %s", self.timeEntries.size, timeEntries.size, timeEntries.ndim, timeEntries.shape, timeEntries.dtype)
 		
 	def setDataEntries(self, dataEntries):
@@ -533,9 +663,161 @@ class SensorDataSet():
 		"""
 		if not dataEntries is None:
 			# data generator uses a single dimension array, so it's safe to flatten
-			self.dataEntries = dataEntries.flatten()
+			# (ravel avoids copying - e.g. memory-mapped cache entries)
+			self.dataEntries = dataEntries.ravel()
 			logging.info("dataEntries tuple. Array Size: %s  ND Size: %s  Dimensions: %s  Shape: %s  Type: %s", self.dataEntries.size, dataEntries.size, dataEntries.ndim, dataEntries.shape, dataEntries.dtype)
 		
+class SensorDataStream(SensorDataSet):
+	"""
+	Streaming variant of SensorDataSet, which generates its time and data
+	entries one fixed-size chunk at a time as they're accessed, instead of
+	holding the whole data set in memory. It's a drop-in replacement for
+	the sensor sim tasks, which only use getDataEntry() and
+	getDataEntryCount().
+	
+	Each entry is calculated from its absolute index, so the curve's phase
+	is continuous across chunk boundaries, and the noise comes from a
+	single random generator that persists across chunks. Accessing an
+	entry outside the current chunk replaces it, so memory use is bounded
+	by one chunk of time and data entries.
+	
+	getTimeEntries() and getDataEntries() return the current chunk only.
+	"""
+	
+	def __init__(self, epochOffsetSeconds: float = 0.0, useCurrentTime: bool = True, \
+		startHour: float = 0.0, endHour: float = 24.0, entryCount: int = 1, denominator: float = 1.0, \
+		noiseLevel: int = SensorDataGenerator.DEFAULT_NOISE, \
+		minValue: float = SensorDataGenerator.DEFAULT_MIN_VALUE, maxValue: float = SensorDataGenerator.DEFAULT_MAX_VALUE, \
+		chunkSize: int = 1024, randomSeed = None):
+		"""
+		Constructor.
+		
+		@param epochOffsetSeconds See SensorDataSet.
+		@param useCurrentTime See SensorDataSet.
+		@param startHour The hour of the first entry.
+		@param endHour The hour of the last entry.
+		@param entryCount The total number of entries, evenly spaced from startHour to endHour.
+		@param denominator The curve denominator applied to the hours before taking their sine.
+		@param noiseLevel Any positive integer between 0 (no noise) and 100 (max noise).
+		@param minValue The floor of the (noise free) data.
+		@param maxValue The ceiling of the (noise free) data.
+		@param chunkSize The number of entries generated at a time.
+		@param randomSeed The noise seed (None = unseeded).
+		"""
+		super(SensorDataStream, self).__init__(epochOffsetSeconds = epochOffsetSeconds, useCurrentTime = useCurrentTime)
+		
+		self.startHour = startHour
+		self.entryCount = max(1, entryCount)
+		self.hourStep = (endHour - startHour) / (self.entryCount - 1) if self.entryCount > 1 else 0.0
+		self.denominator = denominator
+		self.minValue = minValue
+		self.maxValue = maxValue
+		self.chunkSize = max(1, min(chunkSize, self.entryCount))
+		
+		# the full data set would be re-scaled using its own min and max sine
+		# values, so calculate them (and the mean) over the whole range up front
+		self.sineMin, self.sineMax, sineMean = \
+			self._calculateSineRange(startHour / denominator, (startHour + self.hourStep * (self.entryCount - 1)) / denominator)
+		
+		self.noiseScale = 0.0
+		
+		if noiseLevel != SensorDataGenerator.NO_NOISE:
+			meanValue = float(calcLib.interp(sineMean, (self.sineMin, self.sineMax), (minValue, maxValue)))
+			
+			# same as SensorDataGenerator: based on the order of magnitude of the mean value
+			if meanValue > 0.0:
+				self.noiseScale = ((noiseLevel / 100) * ((10 ** int(math.log10(meanValue))) / 10))
+		
+		self.rng = calcLib.random.default_rng(randomSeed)
+		self.chunkStart = 0
+		self.timeEntries = None
+		self.dataEntries = None
+		
+		self._generateChunk(0)
+		
+	def getDataEntry(self, index = 0) -> float:
+		"""
+		Returns the float value at 'index' in the (full) data entries.
+		If index is < 0 or > the data entry count - 1, 0 will be used.
+		
+		@return float
+		"""
+		if index < 0 or index > self.entryCount - 1:
+			index = 0
+		
+		if not self.chunkStart <= index < self.chunkStart + self.dataEntries.size:
+			self._generateChunk(index)
+		
+		return self.dataEntries[index - self.chunkStart]
+	
+	def getDataEntryCount(self) -> int:
+		"""
+		Returns the number of entries in the (full) data set.
+		
+		@return int
+		"""
+		return self.entryCount
+	
+	def getTimeEntry(self, index: int = 0) -> float:
+		"""
+		Returns the time entry (in hours) at 'index' in the (full) time entries.
+		If index is < 0 or > the data entry count - 1, 0 will be used.
+		
+		@return float
+		"""
+		if index < 0 or index > self.entryCount - 1:
+			index = 0
+		
+		return self.startHour + self.hourStep * index
+	
+	def getChunkSize(self) -> int:
+		return self.chunkSize
+	
+	def _generateChunk(self, index: int = 0):
+		"""
+		Generates the chunk containing the given entry index, replacing
+		the current chunk.
+		
+		@param index The entry index.
+		"""
+		self.chunkStart = (index // self.chunkSize) * self.chunkSize
+		
+		chunkEntryCount = min(self.chunkSize, self.entryCount - self.chunkStart)
+		
+		self.timeEntries = self.startHour + self.hourStep * calcLib.arange(self.chunkStart, self.chunkStart + chunkEntryCount)
+		self.dataEntries = \
+			calcLib.interp(calcLib.sin(self.timeEntries / self.denominator), (self.sineMin, self.sineMax), (self.minValue, self.maxValue))
+		
+		if self.noiseScale > 0.0:
+			self.dataEntries += self.rng.normal(0, self.noiseScale, chunkEntryCount)
+		
+	def _calculateSineRange(self, start: float = 0.0, end: float = 0.0) -> tuple:
+		"""
+		Calculates the min, max and mean of sin(x) for start <= x <= end.
+		
+		@param start
+		@param end
+		@return tuple The (min, max, mean) values.
+		"""
+		if end <= start:
+			value = math.sin(start)
+			
+			return (value, value, value)
+		
+		sineMin = min(math.sin(start), math.sin(end))
+		sineMax = max(math.sin(start), math.sin(end))
+		
+		# the peak (or trough) is reached if any pi / 2 + 2k * pi (or -pi / 2 + 2k * pi) is in range
+		if math.floor((end - math.pi / 2) / (2 * math.pi)) >= math.ceil((start - math.pi / 2) / (2 * math.pi)):
+			sineMax = 1.0
+		
+		if math.floor((end + math.pi / 2) / (2 * math.pi)) >= math.ceil((start + math.pi / 2) / (2 * math.pi)):
+			sineMin = -1.0
+		
+		sineMean = (math.cos(start) - math.cos(end)) / (end - start)
+		
+		return (sineMin, sineMax, sineMean)
+	
 def main():
 	"""
 	Main function definition for running as an application.
@@ -0,0 +1,139 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import hashlib
+import logging
+import os
+
+import numpy as np
+
+class SensorDataSetCache():
+	"""
+	File cache for generated simulation data sets, so they don't need to be
+	regenerated on every start (or every simulated actuation).
+	
+	Each entry is a single .npy file containing a 2 x N array - the time
+	entries followed by the data entries - named using a hash of the
+	generator parameters that produced it. Entries are loaded memory-mapped
+	(read only), so loading is near-instant regardless of the data set size,
+	and the pages are shared between processes using the same cache.
+	
+	Entries are written to a temporary file first and then renamed, so
+	concurrent processes never see a partially written entry.
+	
+	"""
+	
+	# increment if the generator's algorithms change, to invalidate old entries
+	CACHE_FORMAT_VERSION = 1
+	
+	FILE_NAME_PREFIX = 'simdata-'
+	FILE_NAME_SUFFIX = '.npy'
+	
+	def __init__(self, cacheDir: str = None):
+		"""
+		Constructor.
+		
+		@param cacheDir The cache directory, which is created if it doesn't exist.
+		"""
+		if not cacheDir:
+			raise ValueError('Sensor data set cache directory must be set.')
+		
+		self.cacheDir = cacheDir
+		self.hitCount = 0
+		self.missCount = 0
+		
+		os.makedirs(self.cacheDir, exist_ok = True)
+		
+		logging.info("Sensor data set cache directory: %s", self.cacheDir)
+	
+	def getCacheFileName(self, key: tuple = None) -> str:
+		"""
+		Returns the cache file name for the given key.
+		
+		@param key The generator parameter tuple. Must only contain values with a stable repr().
+		@return str The full path to the cache file.
+		"""
+		keyHash = hashlib.sha1(repr((self.CACHE_FORMAT_VERSION,) + tuple(key)).encode('utf-8')).hexdigest()
+		
+		return os.path.join(self.cacheDir, self.FILE_NAME_PREFIX + keyHash[:24] + self.FILE_NAME_SUFFIX)
+	
+	def getHitCount(self) -> int:
+		return self.hitCount
+	
+	def getMissCount(self) -> int:
+		return self.missCount
+	
+	def loadEntries(self, key: tuple = None) -> tuple:
+		"""
+		Loads the cached time and data entries for the given key.
+		
+		@param key The generator parameter tuple.
+		@return tuple The read-only, memory-mapped (timeEntries, dataEntries) arrays, or None if not cached.
+		"""
+		fileName = self.getCacheFileName(key)
+		
+		if os.path.isfile(fileName):
+			try:
+				entries = np.load(fileName, mmap_mode = 'r')
+				
+				if entries.ndim == 2 and entries.shape[0] == 2:
+					self.hitCount += 1
+					
+					return (entries[0], entries[1])
+				
+				logging.warning("Ignoring sensor data set cache file with invalid shape %s: %s", str(entries.shape), fileName)
+			except Exception as e:
+				logging.warning("Failed to load sensor data set cache file %s: %s", fileName, str(e))
+		
+		self.missCount += 1
+		
+		return None
+	
+	def storeEntries(self, key: tuple = None, timeEntries = None, dataEntries = None) -> bool:
+		"""
+		Stores the time and data entries for the given key.
+		
+		@param key The generator parameter tuple.
+		@param timeEntries The time entries array.
+		@param dataEntries The data entries array (same size as timeEntries).
+		@return bool True on success; False otherwise.
+		"""
+		fileName = self.getCacheFileName(key)
+		tempFileName = fileName + '.' + str(os.getpid()) + '.tmp'
+		
+		try:
+			with open(tempFileName, 'wb') as tempFile:
+				np.save(tempFile, np.stack((np.ravel(timeEntries), np.ravel(dataEntries))).astype(np.float64))
+			
+			os.replace(tempFileName, fileName)
+			
+			return True
+		except Exception as e:
+			logging.warning("Failed to store sensor data set cache file %s: %s", fileName, str(e))
+			
+			if os.path.exists(tempFileName):
+				os.remove(tempFileName)
+			
+			return False
@@ -0,0 +1,126 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+import logging
+import math
+
+import numpy as np
+
+class WindSpeedSampler():
+	"""
+	Generates wind speeds for one or more turbines: a farm-wide mean wind
+	speed drawn from a Weibull distribution (the usual model for wind
+	speed at a site), held for a number of steps - e.g. 10 minutes' worth
+	of polls - plus independent per-turbine turbulence, modelled as
+	Gaussian fluctuations with a standard deviation of the turbulence
+	intensity times the mean.
+	
+	"""
+	
+	DEFAULT_WEIBULL_SHAPE        = 2.0
+	DEFAULT_WEIBULL_SCALE        = 8.0
+	DEFAULT_TURBULENCE_INTENSITY = 0.1
+	DEFAULT_MEAN_HOLD_STEPS      = 120
+	
+	def __init__(self, \
+		weibullShape: float = DEFAULT_WEIBULL_SHAPE, \
+		weibullScale: float = DEFAULT_WEIBULL_SCALE, \
+		turbulenceIntensity: float = DEFAULT_TURBULENCE_INTENSITY, \
+		meanHoldSteps: int = DEFAULT_MEAN_HOLD_STEPS, \
+		randomSeed: int = None):
+		"""
+		Constructor.
+		
+		@param weibullShape The Weibull shape parameter, k (2.0 = Rayleigh).
+		@param weibullScale The Weibull scale parameter, c (m/s).
+		@param turbulenceIntensity The turbulence intensity (standard deviation / mean).
+		@param meanHoldSteps The number of steps each mean wind speed is held for.
+		@param randomSeed The random seed (None = unseeded).
+		"""
+		if weibullShape <= 0.0 or weibullScale <= 0.0:
+			raise ValueError('Weibull shape and scale must be positive: ' + str(weibullShape) + ', ' + str(weibullScale))
+		
+		self.weibullShape = weibullShape
+		self.weibullScale = weibullScale
+		self.turbulenceIntensity = max(turbulenceIntensity, 0.0)
+		self.meanHoldSteps = max(meanHoldSteps, 1)
+		self.rng = np.random.default_rng(randomSeed)
+		
+		self.meanWindSpeed = None
+		self.stepCount = 0
+	
+	def getMeanWindSpeed(self) -> float:
+		"""
+		Returns the current farm-wide mean wind speed.
+		
+		@return float The mean wind speed, or None before the first step.
+		"""
+		return self.meanWindSpeed
+	
+	def getExpectedMeanWindSpeed(self) -> float:
+		"""
+		Returns the long-term mean of the Weibull distribution: c * gamma(1 + 1/k).
+		
+		@return float
+		"""
+		return self.weibullScale * math.gamma(1.0 + 1.0 / self.weibullShape)
+	
+	def sampleTurbulence(self, meanWindSpeeds) -> np.ndarray:
+		"""
+		Adds turbulence to the given mean wind speeds.
+		
+		@param meanWindSpeeds A mean wind speed or array of mean wind speeds (m/s).
+		@return ndarray The turbulent wind speeds, which are never negative.
+		"""
+		meanSpeeds = np.asarray(meanWindSpeeds, dtype = np.float64)
+		
+		return np.maximum(meanSpeeds * (1.0 + self.turbulenceIntensity * self.rng.standard_normal(meanSpeeds.shape)), 0.0)
+	
+	def sampleWeibull(self, count: int = 1) -> np.ndarray:
+		"""
+		Draws independent wind speeds from the Weibull distribution.
+		
+		@param count The number of samples.
+		@return ndarray
+		"""
+		return self.weibullScale * self.rng.weibull(self.weibullShape, count)
+	
+	def step(self, turbineCount: int = 1) -> np.ndarray:
+		"""
+		Returns the next wind speed for each turbine, drawing a new mean
+		wind speed every meanHoldSteps steps.
+		
+		@param turbineCount The number of turbines.
+		@return ndarray The wind speed for each turbine (m/s).
+		"""
+		if self.stepCount % self.meanHoldSteps == 0:
+			self.meanWindSpeed = float(self.sampleWeibull(1)[0])
+			
+			logging.debug("New mean wind speed: %.2f m/s", self.meanWindSpeed)
+		
+		self.stepCount += 1
+		
+		return self.sampleTurbulence(np.full(turbineCount, self.meanWindSpeed))
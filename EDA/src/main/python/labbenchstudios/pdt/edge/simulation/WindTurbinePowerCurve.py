@@ -0,0 +1,144 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+import logging
+import math
+
+import numpy as np
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+class WindTurbinePowerCurve():
+	"""
+	Wind turbine power curve, evaluated for arrays of wind speeds (e.g.
+	every turbine in a farm) at once.
+	
+	The curve is either tabulated (wind speed and power pairs, such as a
+	manufacturer's curve) or parametric: between cut-in and rated speed,
+	power follows P = Cp * (p/2) * A * V^3 (see WindTurbineSensorSimTask),
+	then plateaus at the rated power up to cut-out. Either way it's stored
+	as a table and evaluated with np.interp, and power is zero below
+	cut-in and at or above cut-out (where the turbine is parked).
+	
+	"""
+	
+	DEFAULT_CUT_IN_SPEED  = 3.0
+	DEFAULT_CUT_OUT_SPEED = 25.0
+	
+	# table resolution for parametric curves
+	PARAMETRIC_CURVE_POINTS = 256
+	
+	def __init__(self, \
+		cutInSpeed: float = DEFAULT_CUT_IN_SPEED, \
+		ratedSpeed: float = ConfigConst.DEFAULT_RATED_WIND_SPEED, \
+		cutOutSpeed: float = DEFAULT_CUT_OUT_SPEED, \
+		rotorDiameter: float = 8.0, \
+		airDensity: float = 1.225, \
+		maxPowerCoeff: float = 0.35, \
+		windSpeeds = None, \
+		powerValues = None):
+		"""
+		Constructor. If windSpeeds and powerValues are set, the curve is
+		tabulated from them; otherwise it's parametric, using the rotor
+		diameter, air density and power coefficient.
+		
+		@param cutInSpeed The wind speed (m/s) at which the turbine starts generating.
+		@param ratedSpeed The wind speed (m/s) at which the turbine reaches rated power (parametric curves only).
+		@param cutOutSpeed The wind speed (m/s) at which the turbine shuts down.
+		@param rotorDiameter The rotor diameter (m).
+		@param airDensity The air density (kg/m3).
+		@param maxPowerCoeff The power coefficient, Cp.
+		@param windSpeeds The tabulated wind speeds (m/s), in increasing order.
+		@param powerValues The tabulated power output (W) at each wind speed.
+		"""
+		if not 0.0 <= cutInSpeed < cutOutSpeed:
+			raise ValueError('Invalid cut-in / cut-out speeds: ' + str(cutInSpeed) + ' / ' + str(cutOutSpeed))
+		
+		self.cutInSpeed = cutInSpeed
+		self.cutOutSpeed = cutOutSpeed
+		
+		if windSpeeds is not None and powerValues is not None:
+			self.curveSpeeds = np.asarray(windSpeeds, dtype = np.float64)
+			self.curvePowers = np.asarray(powerValues, dtype = np.float64)
+			
+			if self.curveSpeeds.shape != self.curvePowers.shape or self.curveSpeeds.size < 2 or \
+				np.any(np.diff(self.curveSpeeds) <= 0.0):
+				raise ValueError('Tabulated power curve must have matching, increasing wind speeds.')
+			
+			self.ratedSpeed = float(self.curveSpeeds[np.argmax(self.curvePowers)])
+		else:
+			self.ratedSpeed = min(max(ratedSpeed, cutInSpeed), cutOutSpeed)
+			
+			# rated power is reached at the rated speed, then held to cut-out
+			sweptArea = (math.pi * rotorDiameter * rotorDiameter) / 4
+			self.curveSpeeds = np.linspace(self.cutInSpeed, self.ratedSpeed, self.PARAMETRIC_CURVE_POINTS)
+			self.curvePowers = maxPowerCoeff * (airDensity / 2) * sweptArea * self.curveSpeeds ** 3
+		
+		self.ratedPower = float(np.max(self.curvePowers))
+		
+		logging.debug( \
+			"Power curve: cut-in = %.1f m/s, rated = %.1f m/s (%.0f W), cut-out = %.1f m/s", \
+			self.cutInSpeed, self.ratedSpeed, self.ratedPower, self.cutOutSpeed)
+	
+	def getCutInSpeed(self) -> float:
+		return self.cutInSpeed
+	
+	def getCutOutSpeed(self) -> float:
+		return self.cutOutSpeed
+	
+	def getPowerOutput(self, windSpeeds):
+		"""
+		Returns the power output (W) for each wind speed. Speeds above the
+		end of the table (and below cut-out) generate the rated power.
+		
+		@param windSpeeds A wind speed (m/s) or array of wind speeds.
+		@return ndarray The power output for each wind speed (a float for a scalar wind speed).
+		"""
+		speeds = np.asarray(windSpeeds, dtype = np.float64)
+		
+		powers = \
+			np.where(self.isGenerating(speeds), \
+				np.interp(speeds, self.curveSpeeds, self.curvePowers, left = 0.0, right = self.ratedPower), 0.0)
+		
+		return float(powers) if powers.ndim == 0 else powers
+	
+	def getRatedPower(self) -> float:
+		return self.ratedPower
+	
+	def getRatedSpeed(self) -> float:
+		return self.ratedSpeed
+	
+	def isGenerating(self, windSpeeds):
+		"""
+		Returns True for each wind speed within the turbine's operating
+		range (from cut-in, up to but excluding cut-out).
+		
+		@param windSpeeds A wind speed (m/s) or array of wind speeds.
+		@return ndarray The boolean mask (a bool for a scalar wind speed).
+		"""
+		speeds = np.asarray(windSpeeds, dtype = np.float64)
+		
+		return (speeds >= self.cutInSpeed) & (speeds < self.cutOutSpeed)
@@ -29,6 +29,7 @@ import random
 import labbenchstudios.pdt.common.ConfigConst as ConfigConst
 
 from labbenchstudios.pdt.edge.system.BaseSensorTask import BaseSensorTask
+from labbenchstudios.pdt.edge.simulation.WindTurbinePowerCurve import WindTurbinePowerCurve
 from labbenchstudios.pdt.data.SensorData import SensorData
 
 class WindTurbineSensorSimTask(BaseSensorTask):
@@ -115,6 +116,11 @@ class WindTurbineSensorSimTask(BaseSensorTask):
 		else:
 			return self.powerOutput
 	
+	def getPowerCurve(self) -> WindTurbinePowerCurve:
+		"""
+		"""
+		return self.powerCurve
+	
 	def getRotorDiameter(self) -> float:
 		"""
 		"""
@@ -159,6 +165,11 @@ class WindTurbineSensorSimTask(BaseSensorTask):
 		incremented to the next index, up to size - 1, after which it
 		simply will revert back to 0.
 		
+		Power output comes from self.powerCurve: zero below the cut-in
+		speed and at or above the cut-out speed (where the rotor is also
+		stopped), and capped at the rated power above the rated speed.
+		In between, it's calculated using:
+		
 		Formula for calculating power from a wind turbine:
 		  Algorithm: P = Cp * (p/2) * A * (V^3)
 		  Reference: https://windexchange.energy.gov/small-wind-guidebook#generate
@@ -177,20 +188,18 @@ class WindTurbineSensorSimTask(BaseSensorTask):
 
 		# actual hub rotation will be different in a real life scenario
 		# for now, just use the optimalTSR and windspeed to generate a value
-		#
-		# important: this does NOT factor in cut-in speed or cut-out speed
-		#            for Digital Twin testing, cut-in and cut-out processes
-		#            will be managed in the DTA
-
-		if (self.rotorCircumference > 0.0):
-			self.rotorTipSpeed = (60 * self.windSpeed * self.optimalTSR) / self.rotorCircumference
+		# (the rotor is stopped outside of the cut-in to cut-out range)
+		self.rotorTipSpeed = 0
+		self.rotorHubRpm   = 0
+		
+		if (self.powerCurve.isGenerating(self.windSpeed)):
+			if (self.rotorCircumference > 0.0):
+				self.rotorTipSpeed = (60 * self.windSpeed * self.optimalTSR) / self.rotorCircumference
 
-		if (self.rotorTipSpeed > 0.0 and self.hubCircumference > 0.0):
-			self.rotorHubRpm = self.rotorTipSpeed / self.hubCircumference
+			if (self.rotorTipSpeed > 0.0 and self.hubCircumference > 0.0):
+				self.rotorHubRpm = self.rotorTipSpeed / self.hubCircumference
 
-		if (self.airDensity > 0.0):
-			self.powerOutput = \
-				self.maxPowerCoeff * (self.airDensity / 2) * self.rotorSweptArea * (pow(self.windSpeed, 3))
+		self.powerOutput = self.powerCurve.getPowerOutput(self.windSpeed)
 		
 		logging.debug("\nCalculated wind turbine power output:" \
 				"\n\tmaxPowerCoeff:    " + str(self.getMaxPowerCoefficient()) +
@@ -254,3 +263,12 @@ class WindTurbineSensorSimTask(BaseSensorTask):
 		self.cutOutSpeed = 55.0
 
 		self.rotorSweptArea  = (math.pi * (pow(self.rotorDiameter, 2))) / 4
+
+		self.powerCurve = \
+			WindTurbinePowerCurve( \
+				cutInSpeed = self.cutInSpeed, \
+				ratedSpeed = ConfigConst.DEFAULT_RATED_WIND_SPEED, \
+				cutOutSpeed = self.cutOutSpeed, \
+				rotorDiameter = self.rotorDiameter, \
+				airDensity = self.airDensity, \
+				maxPowerCoeff = self.maxPowerCoeff)
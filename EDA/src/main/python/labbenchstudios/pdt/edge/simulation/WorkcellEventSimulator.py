@@ -0,0 +1,464 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+import heapq
+import itertools
+import logging
+
+import numpy as np
+
+class WorkcellEventSimulator():
+	"""
+	Discrete-event simulator for a serial factory workcell line, such
+	as hopper -> conveyor -> robotic manipulator -> pallet loader.
+	
+	Items arrive at the first station at a given rate (a Poisson
+	process), and each station has a finite input buffer, a random
+	(gamma distributed) service time, random failures and repairs
+	(exponentially distributed with the given MTBF and MTTR), and an
+	idle and busy power draw. A station that finishes an item while
+	the next station's buffer is full is blocked until space frees up,
+	and a failure suspends any item in service until the station is
+	repaired. Arrivals to a full first buffer are lost.
+	
+	Events are kept in a heapq priority queue, so the simulator jumps
+	straight from one event to the next - a simulated hour at 30 items
+	per minute is roughly 8K events. Statistics (throughput, station
+	utilization, time averaged WIP and power draw) cover the interval
+	since the last call to resetStatistics().
+	
+	"""
+	
+	# event types
+	ARRIVAL_EVENT      = 0
+	SERVICE_DONE_EVENT = 1
+	FAILURE_EVENT      = 2
+	REPAIR_EVENT       = 3
+	
+	# station states (indexes into each station's state times)
+	IDLE_STATE    = 0
+	BUSY_STATE    = 1
+	BLOCKED_STATE = 2
+	DOWN_STATE    = 3
+	
+	# shape of the gamma distributed service times (4 = coefficient of variation 0.5)
+	SERVICE_TIME_SHAPE = 4.0
+	
+	# random samples are drawn from NumPy in batches, rather than one per event
+	SAMPLE_BATCH_SIZE = 4096
+	
+	def __init__(self, arrivalRate: float = 30.0, randomSeed: int = None):
+		"""
+		Constructor.
+		
+		@param arrivalRate The item arrival rate, in items per minute (0 = paused).
+		@param randomSeed The random seed (None = unseeded).
+		"""
+		self.rng = np.random.default_rng(randomSeed)
+		self.arrivalSamples = []
+		self.stations = []
+		self.events = []
+		self.eventSequence = itertools.count()
+		
+		self.simTimeSecs = 0.0
+		self.arrivalRate = 0.0
+		self.arrivalVersion = 0
+		self.isStarted = False
+		
+		self.itemsArrived = 0
+		self.itemsProduced = 0
+		self.itemsLost = 0
+		self.workInProgress = 0
+		self.eventCount = 0
+		
+		self.resetStatistics()
+		self.setArrivalRate(arrivalRate)
+	
+	def addStation(self, \
+		name: str, serviceTimeSecs: float = 1.0, bufferCapacity: int = 10, \
+		mtbfSecs: float = 0.0, mttrSecs: float = 0.0, idlePower: float = 0.0, busyPower: float = 0.0):
+		"""
+		Adds a station to the end of the line.
+		
+		@param name The station name.
+		@param serviceTimeSecs The mean service time per item.
+		@param bufferCapacity The number of items the station's input buffer holds.
+		@param mtbfSecs The mean time between failures (0 = never fails).
+		@param mttrSecs The mean time to repair.
+		@param idlePower The power draw when idle or blocked (kW).
+		@param busyPower The power draw when processing an item (kW).
+		"""
+		if self.isStarted:
+			raise RuntimeError('Stations must be added before the workcell simulation starts.')
+		
+		if serviceTimeSecs <= 0.0 or bufferCapacity < 1:
+			raise ValueError('Invalid service time or buffer capacity for station: ' + str(name))
+		
+		self.stations.append( \
+			_WorkcellStation(name, serviceTimeSecs, bufferCapacity, mtbfSecs, mttrSecs, idlePower, busyPower, self.simTimeSecs))
+	
+	def getAveragePowerDraw(self) -> float:
+		"""
+		Returns the time averaged total power draw (kW) since the last reset.
+		
+		@return float
+		"""
+		elapsedSecs = self._flushStatistics()
+		
+		if elapsedSecs <= 0.0:
+			return self.getPowerDraw()
+		
+		return sum( \
+			station.idlePower * (station.stateTimes[self.IDLE_STATE] + station.stateTimes[self.BLOCKED_STATE]) + \
+			station.busyPower * station.stateTimes[self.BUSY_STATE] for station in self.stations) / elapsedSecs
+	
+	def getAverageWorkInProgress(self) -> float:
+		"""
+		Returns the time averaged number of items in the line since the last reset.
+		
+		@return float
+		"""
+		elapsedSecs = self._flushStatistics()
+		
+		return self.wipArea / elapsedSecs if elapsedSecs > 0.0 else float(self.workInProgress)
+	
+	def getEventCount(self) -> int:
+		return self.eventCount
+	
+	def getItemsArrived(self) -> int:
+		return self.itemsArrived
+	
+	def getItemsLost(self) -> int:
+		return self.itemsLost
+	
+	def getItemsProduced(self) -> int:
+		return self.itemsProduced
+	
+	def getPowerDraw(self) -> float:
+		"""
+		Returns the current total power draw (kW).
+		
+		@return float
+		"""
+		return sum(station.getPowerDraw() for station in self.stations)
+	
+	def getSimTimeSecs(self) -> float:
+		return self.simTimeSecs
+	
+	def getStationNames(self) -> list:
+		return [station.name for station in self.stations]
+	
+	def getThroughput(self) -> float:
+		"""
+		Returns the number of items produced per minute since the last reset.
+		
+		@return float
+		"""
+		elapsedSecs = self._flushStatistics()
+		
+		return 60.0 * (self.itemsProduced - self.intervalItemsProduced) / elapsedSecs if elapsedSecs > 0.0 else 0.0
+	
+	def getUtilizations(self) -> dict:
+		"""
+		Returns the fraction of time each station spent processing items
+		since the last reset.
+		
+		@return dict The station name to utilization (0.0 - 1.0) mapping.
+		"""
+		elapsedSecs = self._flushStatistics()
+		
+		return { \
+			station.name: (station.stateTimes[self.BUSY_STATE] / elapsedSecs if elapsedSecs > 0.0 else 0.0) \
+			for station in self.stations}
+	
+	def getWorkInProgress(self) -> int:
+		return self.workInProgress
+	
+	def resetStatistics(self):
+		"""
+		Starts a new statistics interval.
+		
+		"""
+		self.intervalStartSecs = self.simTimeSecs
+		self.intervalItemsProduced = self.itemsProduced
+		self.wipArea = 0.0
+		self.wipSinceSecs = self.simTimeSecs
+		
+		for station in self.stations:
+			station.stateTimes = [0.0, 0.0, 0.0, 0.0]
+			station.stateSinceSecs = self.simTimeSecs
+	
+	def run(self, durationSecs: float = 60.0) -> int:
+		"""
+		Processes all events over the next durationSecs of simulated time.
+		
+		@param durationSecs The simulated time to advance.
+		@return int The number of events processed.
+		"""
+		if not self.isStarted:
+			self._start()
+		
+		endTimeSecs = self.simTimeSecs + max(durationSecs, 0.0)
+		events = self.events
+		eventCount = 0
+		
+		while events and events[0][0] <= endTimeSecs:
+			eventTime, sequence, eventType, stationIndex, version = heapq.heappop(events)
+			
+			self.simTimeSecs = eventTime
+			eventCount += 1
+			
+			if eventType == self.SERVICE_DONE_EVENT:
+				station = self.stations[stationIndex]
+				
+				if version == station.serviceVersion:
+					station.isFinished = True
+					self._updateState(station)
+					self._pushItem(stationIndex)
+			elif eventType == self.ARRIVAL_EVENT:
+				if version == self.arrivalVersion:
+					self._handleArrival()
+			elif eventType == self.FAILURE_EVENT:
+				self._handleFailure(stationIndex)
+			elif eventType == self.REPAIR_EVENT:
+				self._handleRepair(stationIndex)
+		
+		self.simTimeSecs = endTimeSecs
+		self.eventCount += eventCount
+		
+		return eventCount
+	
+	def setArrivalRate(self, arrivalRate: float = 30.0):
+		"""
+		Sets the item arrival rate, rescheduling the next arrival.
+		
+		@param arrivalRate The item arrival rate, in items per minute (0 = paused).
+		"""
+		self.arrivalRate = max(arrivalRate, 0.0)
+		self.arrivalVersion += 1
+		
+		if self.isStarted:
+			self._scheduleArrival()
+	
+	def _handleArrival(self):
+		first = self.stations[0]
+		self.itemsArrived += 1
+		
+		if first.queueLength < first.bufferCapacity:
+			first.queueLength += 1
+			self._addWorkInProgress(1)
+			self._startItem(0)
+		else:
+			self.itemsLost += 1
+		
+		self._scheduleArrival()
+	
+	def _handleFailure(self, stationIndex: int):
+		station = self.stations[stationIndex]
+		station.isDown = True
+		
+		# suspend any item in service
+		if station.hasItem and not station.isFinished:
+			station.remainingSecs = station.doneTimeSecs - self.simTimeSecs
+			station.serviceVersion += 1
+		
+		self._updateState(station)
+		self._schedule(self.simTimeSecs + self.rng.exponential(station.mttrSecs), self.REPAIR_EVENT, stationIndex)
+	
+	def _handleRepair(self, stationIndex: int):
+		station = self.stations[stationIndex]
+		station.isDown = False
+		
+		self._updateState(station)
+		self._schedule(self.simTimeSecs + self.rng.exponential(station.mtbfSecs), self.FAILURE_EVENT, stationIndex)
+		
+		if station.hasItem:
+			if station.isFinished:
+				self._pushItem(stationIndex)
+			else:
+				self._scheduleServiceDone(stationIndex, station.remainingSecs)
+		else:
+			self._startItem(stationIndex)
+	
+	def _pushItem(self, stationIndex: int):
+		"""
+		Moves a finished item on to the next station's buffer (or out of
+		the line), unless the next buffer is full or the station is down.
+		
+		"""
+		station = self.stations[stationIndex]
+		isLastStation = (stationIndex == len(self.stations) - 1)
+		
+		if station.isDown:
+			return
+		
+		if not isLastStation and self.stations[stationIndex + 1].queueLength >= self.stations[stationIndex + 1].bufferCapacity:
+			return
+		
+		# release the item before starting the next station, as that may pull from this one
+		station.hasItem = False
+		station.isFinished = False
+		
+		self._updateState(station)
+		
+		if isLastStation:
+			self.itemsProduced += 1
+			self._addWorkInProgress(-1)
+		else:
+			self.stations[stationIndex + 1].queueLength += 1
+			self._startItem(stationIndex + 1)
+		
+		self._startItem(stationIndex)
+	
+	def _startItem(self, stationIndex: int):
+		"""
+		Starts the next buffered item, if the station is free - which also
+		frees a buffer slot for a blocked upstream station.
+		
+		"""
+		station = self.stations[stationIndex]
+		
+		if station.isDown or station.hasItem or station.queueLength == 0:
+			return
+		
+		station.queueLength -= 1
+		station.hasItem = True
+		
+		if not station.serviceSamples:
+			station.serviceSamples = \
+				self.rng.gamma(self.SERVICE_TIME_SHAPE, station.serviceTimeSecs / self.SERVICE_TIME_SHAPE, self.SAMPLE_BATCH_SIZE).tolist()
+		
+		self._scheduleServiceDone(stationIndex, station.serviceSamples.pop())
+		
+		if stationIndex > 0:
+			upstream = self.stations[stationIndex - 1]
+			
+			if upstream.hasItem and upstream.isFinished:
+				self._pushItem(stationIndex - 1)
+	
+	def _addWorkInProgress(self, delta: int):
+		self.wipArea += self.workInProgress * (self.simTimeSecs - self.wipSinceSecs)
+		self.wipSinceSecs = self.simTimeSecs
+		self.workInProgress += delta
+	
+	def _flushStatistics(self) -> float:
+		"""
+		Brings the time based statistics up to the current time.
+		
+		@return float The length of the statistics interval.
+		"""
+		self._addWorkInProgress(0)
+		
+		for station in self.stations:
+			self._updateState(station)
+		
+		return self.simTimeSecs - self.intervalStartSecs
+	
+	def _schedule(self, eventTimeSecs: float, eventType: int, stationIndex: int = 0, version: int = 0):
+		heapq.heappush(self.events, (eventTimeSecs, next(self.eventSequence), eventType, stationIndex, version))
+	
+	def _scheduleArrival(self):
+		if self.arrivalRate > 0.0:
+			# unit exponential samples, scaled to the current mean interval
+			if not self.arrivalSamples:
+				self.arrivalSamples = self.rng.standard_exponential(self.SAMPLE_BATCH_SIZE).tolist()
+			
+			self._schedule( \
+				self.simTimeSecs + self.arrivalSamples.pop() * 60.0 / self.arrivalRate, self.ARRIVAL_EVENT, version = self.arrivalVersion)
+	
+	def _scheduleServiceDone(self, stationIndex: int, serviceSecs: float):
+		station = self.stations[stationIndex]
+		station.isFinished = False
+		station.doneTimeSecs = self.simTimeSecs + serviceSecs
+		station.serviceVersion += 1
+		
+		self._updateState(station)
+		self._schedule(station.doneTimeSecs, self.SERVICE_DONE_EVENT, stationIndex, station.serviceVersion)
+	
+	def _start(self):
+		if not self.stations:
+			raise RuntimeError('Workcell simulation has no stations.')
+		
+		self.isStarted = True
+		self._scheduleArrival()
+		
+		for stationIndex, station in enumerate(self.stations):
+			if station.mtbfSecs > 0.0 and station.mttrSecs > 0.0:
+				self._schedule(self.rng.exponential(station.mtbfSecs), self.FAILURE_EVENT, stationIndex)
+		
+		logging.info("Workcell simulation started: %s", ' -> '.join(self.getStationNames()))
+	
+	def _updateState(self, station):
+		"""
+		Accumulates the time spent in the station's previous state, and
+		updates it to reflect the station's current flags.
+		
+		"""
+		station.stateTimes[station.state] += self.simTimeSecs - station.stateSinceSecs
+		station.stateSinceSecs = self.simTimeSecs
+		
+		if station.isDown:
+			station.state = self.DOWN_STATE
+		elif not station.hasItem:
+			station.state = self.IDLE_STATE
+		elif station.isFinished:
+			station.state = self.BLOCKED_STATE
+		else:
+			station.state = self.BUSY_STATE
+
+class _WorkcellStation():
+	"""
+	Container for a single workcell station's parameters and state.
+	
+	"""
+	
+	def __init__(self, name, serviceTimeSecs, bufferCapacity, mtbfSecs, mttrSecs, idlePower, busyPower, simTimeSecs):
+		self.name = name
+		self.serviceTimeSecs = serviceTimeSecs
+		self.bufferCapacity = bufferCapacity
+		self.mtbfSecs = mtbfSecs
+		self.mttrSecs = mttrSecs
+		self.idlePower = idlePower
+		self.busyPower = busyPower
+		
+		self.queueLength = 0
+		self.hasItem = False
+		self.isFinished = False
+		self.isDown = False
+		self.doneTimeSecs = 0.0
+		self.remainingSecs = 0.0
+		self.serviceVersion = 0
+		self.serviceSamples = []
+		
+		self.state = WorkcellEventSimulator.IDLE_STATE
+		self.stateTimes = [0.0, 0.0, 0.0, 0.0]
+		self.stateSinceSecs = simTimeSecs
+	
+	def getPowerDraw(self) -> float:
+		if self.state == WorkcellEventSimulator.BUSY_STATE:
+			return self.busyPower
+		
+		return 0.0 if self.state == WorkcellEventSimulator.DOWN_STATE else self.idlePower
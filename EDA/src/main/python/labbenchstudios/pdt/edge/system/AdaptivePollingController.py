@@ -0,0 +1,260 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import threading
+
+from collections import deque
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
+from labbenchstudios.pdt.common.SimulationClock import SimulationClock
+
+class AdaptivePollingController():
+	"""
+	Adjusts the poll interval of each sensor task (any BaseSensorTask or
+	BaseSystemUtilTask sub-class, identified by name) based on how much
+	its readings change between polls, and on dispatch queue backpressure.
+	
+	After each poll, the change since the previous reading (as a percent
+	of the larger of the two readings, or of the task's value scale for
+	readings near zero, and capped at MAX_CHANGE_PCT) is smoothed. If it's above upperChangePct, the
+	signal is moving faster than it's being sampled, so the interval is
+	halved; if it's below lowerChangePct, the task is oversampled, so the
+	interval is increased. While the dispatch queue holds more than
+	maxPendingMessages, intervals are only ever increased. Intervals stay
+	within [minPollSecs, maxPollSecs].
+	
+	Managers use this by running their scheduler job every minPollSecs,
+	and only polling the tasks for which isPollDue() returns True. Each
+	interval change is logged, and retained as a change event.
+	
+	"""
+	
+	# smoothing factor for the per-poll change
+	CHANGE_SMOOTHING_ALPHA = 0.5
+	
+	# cap on a single poll's change, so one step (e.g. from 0) can't dominate the smoothed change
+	MAX_CHANGE_PCT = 100.0
+	
+	# interval multipliers used to speed up / slow down polling
+	SPEED_UP_FACTOR  = 0.5
+	SLOW_DOWN_FACTOR = 1.25
+	
+	MAX_CHANGE_EVENTS = 256
+	
+	def __init__(self, \
+		minPollSecs: float = None, maxPollSecs: float = None, \
+		lowerChangePct: float = None, upperChangePct: float = None, maxPendingMessages: int = None, \
+		minValueScale: float = None):
+		"""
+		Constructor. Unless passed in, all settings are loaded from the
+		adaptive polling configuration section.
+		
+		@param minPollSecs The shortest poll interval.
+		@param maxPollSecs The longest poll interval.
+		@param lowerChangePct The per-poll change (percent) below which polling slows down.
+		@param upperChangePct The per-poll change (percent) above which polling speeds up.
+		@param maxPendingMessages The dispatch queue size above which polling slows down.
+		@param minValueScale The default smallest value the per-poll change is a percent of.
+		"""
+		configUtil = ConfigUtil()
+		section = ConfigConst.ADAPTIVE_POLLING_SETTINGS_KEY
+		
+		if minPollSecs is None:
+			minPollSecs = configUtil.getFloat( \
+				section = section, key = ConfigConst.MIN_POLL_SECS_KEY, defaultVal = ConfigConst.DEFAULT_MIN_POLL_SECS)
+		
+		if maxPollSecs is None:
+			maxPollSecs = configUtil.getFloat( \
+				section = section, key = ConfigConst.MAX_POLL_SECS_KEY, defaultVal = ConfigConst.DEFAULT_MAX_POLL_SECS)
+		
+		if lowerChangePct is None:
+			lowerChangePct = configUtil.getFloat( \
+				section = section, key = ConfigConst.LOWER_CHANGE_PCT_KEY, defaultVal = ConfigConst.DEFAULT_LOWER_CHANGE_PCT)
+		
+		if upperChangePct is None:
+			upperChangePct = configUtil.getFloat( \
+				section = section, key = ConfigConst.UPPER_CHANGE_PCT_KEY, defaultVal = ConfigConst.DEFAULT_UPPER_CHANGE_PCT)
+		
+		if maxPendingMessages is None:
+			maxPendingMessages = configUtil.getInteger( \
+				section = section, key = ConfigConst.MAX_PENDING_MESSAGES_KEY, defaultVal = ConfigConst.DEFAULT_MAX_PENDING_MESSAGES)
+		
+		if minValueScale is None:
+			minValueScale = configUtil.getFloat( \
+				section = section, key = ConfigConst.MIN_VALUE_SCALE_KEY, defaultVal = ConfigConst.DEFAULT_MIN_VALUE_SCALE)
+		
+		self.minPollSecs = max(0.1, minPollSecs)
+		self.maxPollSecs = max(self.minPollSecs, maxPollSecs)
+		self.lowerChangePct = lowerChangePct
+		self.upperChangePct = max(lowerChangePct, upperChangePct)
+		self.maxPendingMessages = maxPendingMessages
+		self.minValueScale = max(1.0e-9, minValueScale)
+		
+		# task name -> _TaskPollState
+		self.taskStates = {}
+		self.stateLock = threading.Lock()
+		
+		# (timeSecs, task name, old interval, new interval, reason)
+		self.changeEvents = deque(maxlen = self.MAX_CHANGE_EVENTS)
+	
+	def getMinPollSecs(self) -> float:
+		return self.minPollSecs
+	
+	def getMaxPollSecs(self) -> float:
+		return self.maxPollSecs
+	
+	def registerTask(self, name: str = None, pollSecs: float = ConfigConst.DEFAULT_POLL_CYCLES, valueScale: float = None):
+		"""
+		Registers the named task with its initial poll interval (clamped
+		to the configured bounds). Re-registering a task resets its state.
+		
+		@param name The task name.
+		@param pollSecs The initial poll interval.
+		@param valueScale The smallest value the task's per-poll change is a percent of,
+		e.g. a meaningful magnitude for signals that reach 0 (minValueScale if None).
+		"""
+		with self.stateLock:
+			self.taskStates[name] = \
+				_TaskPollState(self._clampPollSecs(pollSecs), valueScale if valueScale else self.minValueScale)
+	
+	def getPollInterval(self, name: str = None) -> float:
+		"""
+		Returns the named task's current poll interval.
+		
+		@param name The task name.
+		@return float The interval in seconds, or None if the task isn't registered.
+		"""
+		state = self.taskStates.get(name)
+		
+		return state.pollSecs if state else None
+	
+	def isPollDue(self, name: str = None, timeSecs: float = None) -> bool:
+		"""
+		Checks if the named task should be polled now. Unregistered
+		tasks are always due. Since the manager's scheduler runs every
+		minPollSecs, a task is due within half a tick of its interval.
+		
+		@param name The task name.
+		@param timeSecs The current monotonic time in seconds (the current time if None).
+		@return bool
+		"""
+		state = self.taskStates.get(name)
+		
+		if not state or state.lastPollSecs is None:
+			return True
+		
+		if timeSecs is None:
+			timeSecs = SimulationClock().monotonic()
+		
+		return timeSecs - state.lastPollSecs >= state.pollSecs - self.minPollSecs / 2.0
+	
+	def updateTask(self, name: str = None, value: float = 0.0, pendingMessageCount: int = 0, timeSecs: float = None) -> float:
+		"""
+		Records a poll of the named task, and adjusts its poll interval.
+		
+		@param name The task name.
+		@param value The polled value.
+		@param pendingMessageCount The number of messages waiting to be dispatched.
+		@param timeSecs The current monotonic time in seconds (the current time if None).
+		@return float The task's (possibly updated) poll interval.
+		"""
+		if timeSecs is None:
+			timeSecs = SimulationClock().monotonic()
+		
+		with self.stateLock:
+			state = self.taskStates.get(name)
+			
+			if not state:
+				state = _TaskPollState(self.minPollSecs, self.minValueScale)
+				self.taskStates[name] = state
+			
+			lastValue = state.lastValue
+			
+			state.lastPollSecs = timeSecs
+			state.lastValue = value
+			
+			if lastValue is None:
+				return state.pollSecs
+			
+			# relative to the larger reading (and at least the value scale), so
+			# steps from or to ~0 don't produce huge percentages
+			changePct = \
+				min(self.MAX_CHANGE_PCT, \
+					100.0 * abs(value - lastValue) / max(abs(lastValue), abs(value), state.valueScale))
+			
+			if state.smoothedChangePct is None:
+				state.smoothedChangePct = changePct
+			else:
+				state.smoothedChangePct += self.CHANGE_SMOOTHING_ALPHA * (changePct - state.smoothedChangePct)
+			
+			if pendingMessageCount and pendingMessageCount > self.maxPendingMessages:
+				newPollSecs = state.pollSecs * self.SLOW_DOWN_FACTOR
+				reason = 'backpressure (' + str(pendingMessageCount) + ' pending messages)'
+			elif state.smoothedChangePct > self.upperChangePct:
+				newPollSecs = state.pollSecs * self.SPEED_UP_FACTOR
+				reason = 'high rate of change (%.3f%% per poll)' % state.smoothedChangePct
+			elif state.smoothedChangePct < self.lowerChangePct:
+				newPollSecs = state.pollSecs * self.SLOW_DOWN_FACTOR
+				reason = 'low rate of change (%.3f%% per poll)' % state.smoothedChangePct
+			else:
+				return state.pollSecs
+			
+			newPollSecs = self._clampPollSecs(newPollSecs)
+			
+			if newPollSecs != state.pollSecs:
+				logging.info("Poll interval change for %s: %.2f -> %.2f secs - %s", name, state.pollSecs, newPollSecs, reason)
+				
+				self.changeEvents.append((timeSecs, name, state.pollSecs, newPollSecs, reason))
+				state.pollSecs = newPollSecs
+			
+			return state.pollSecs
+	
+	def getChangeEvents(self) -> list:
+		"""
+		Returns the most recent poll interval change events.
+		
+		@return list The (timeSecs, task name, old interval, new interval, reason) tuples, oldest first.
+		"""
+		with self.stateLock:
+			return list(self.changeEvents)
+	
+	def _clampPollSecs(self, pollSecs: float = 0.0) -> float:
+		return min(self.maxPollSecs, max(self.minPollSecs, pollSecs))
+
+class _TaskPollState():
+	"""
+	Per-task state used by AdaptivePollingController.
+	
+	"""
+	
+	def __init__(self, pollSecs: float = 0.0, valueScale: float = 1.0):
+		self.pollSecs = pollSecs
+		self.valueScale = valueScale
+		self.lastPollSecs = None
+		self.lastValue = None
+		self.smoothedChangePct = None
@@ -23,6 +23,7 @@
 #
 
 import logging
+import math
 import random
 
 import labbenchstudios.pdt.common.ConfigConst as ConfigConst
@@ -59,11 +60,23 @@ class BaseSensorTask(ISensorTask):
 		
 		self.latestSensorData = None
 		
+		# setpoint transition: (targetVal, maxStep, responseFactor), or None
+		self.transition = None
+		self.transitionVal = 0.0
+		
 		if not self.dataSet:
 			self.useRandomizer = True
 			self.minVal = minVal
 			self.maxVal = maxVal
 	
+	def clearTargetValue(self):
+		"""
+		Ends any setpoint transition, so telemetry is again generated
+		from the data set (or randomizer).
+		
+		"""
+		self.transition = None
+	
 	def enableSimulatedDataRollover(self, enable: bool = True):
 		"""
 		"""
@@ -96,8 +109,11 @@ class BaseSensorTask(ISensorTask):
 		sensorData.setTypeName(typeName)
 				
 		sensorVal = ConfigConst.DEFAULT_VAL
+		transition = self.transition
 		
-		if self.useRandomizer:
+		if transition:
+			sensorVal = self._stepTransition(*transition)
+		elif self.useRandomizer:
 			if not minVal:
 				minVal = self.minVal
 
@@ -176,6 +192,16 @@ class BaseSensorTask(ISensorTask):
 		"""
 		return self.typeCategoryID
 	
+	def getTargetValue(self) -> float:
+		"""
+		Returns the target value of the current setpoint transition.
+		
+		@return float The target value, or None if there's no transition.
+		"""
+		transition = self.transition
+		
+		return transition[0] if transition else None
+	
 	def getTelemetryValue(self) -> float:
 		"""
 		Returns the current value from the stored self.latestSensorData instance.
@@ -189,8 +215,48 @@ class BaseSensorTask(ISensorTask):
 		
 		return self.latestSensorData.getValue()
 
+	def setTargetValue(self, targetVal: float, maxStep: float = 0.0, responseFactor: float = 0.0):
+		"""
+		Starts an in-place transition from the current telemetry value
+		toward targetVal. Each subsequent call to generateTelemetry()
+		moves the value one step closer: responseFactor (0.0 - 1.0) is
+		the fraction of the remaining gap closed per step (a first order
+		response), and maxStep limits the size of each step (a rate
+		limit). If neither is set, the value jumps to the target. Once
+		reached, the target is held until clearTargetValue() is called.
+		
+		Calling this again mid-transition simply retargets from the
+		current value - there's no data set to regenerate.
+		
+		@param targetVal The target value.
+		@param maxStep The maximum change per step (0.0 = no limit).
+		@param responseFactor The fraction of the gap closed per step (0.0 = none).
+		"""
+		if not self.transition:
+			self.transitionVal = self.getTelemetryValue()
+		
+		self.transition = (targetVal, maxStep, responseFactor)
+	
 	def _generateSensorReading(self, val: float) -> float:
 		"""
 		"""
 		return val
+	
+	def _stepTransition(self, targetVal: float, maxStep: float, responseFactor: float) -> float:
+		"""
+		Moves self.transitionVal one step toward targetVal.
+		
+		@return float The new value.
+		"""
+		delta = targetVal - self.transitionVal
+		
+		if responseFactor > 0.0:
+			delta = delta * min(responseFactor, 1.0)
+		
+		if maxStep > 0.0 and abs(delta) > maxStep:
+			delta = math.copysign(maxStep, delta)
+		
+		self.transitionVal = self.transitionVal + delta
+		
+		return self.transitionVal
 	
\ No newline at end of file
@@ -0,0 +1,210 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import threading
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
+from labbenchstudios.pdt.common.SimulationClock import SimulationClock
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+
+class DeadBandFilter():
+	"""
+	Report-by-exception filter used by the sensor managers to suppress
+	readings that haven't meaningfully changed since the last reported
+	reading, before they're handed to the data message listener.
+	
+	A reading is reported if it's the first for its key, if it differs
+	from the last reported reading by more than the absolute dead-band
+	or by more than the percent dead-band (whichever are non-zero), or
+	if nothing has been reported for the key within maxSilenceSecs (the
+	heartbeat). If both dead-bands for a key are zero, every reading is
+	reported.
+	
+	Dead-bands may be set per sensor type ID; all other types use the
+	default dead-bands. Unless passed in, all settings are loaded from
+	the report-by-exception configuration section.
+	
+	"""
+	
+	def __init__(self, \
+		absoluteDeadBand: float = None, percentDeadBand: float = None, maxSilenceSecs: float = None, \
+		typeAbsoluteDeadBands: dict = None, typePercentDeadBands: dict = None):
+		"""
+		Constructor.
+		
+		@param absoluteDeadBand The default absolute dead-band.
+		@param percentDeadBand The default percent dead-band (relative to the last reported value).
+		@param maxSilenceSecs The max time between reported readings per key (0 disables the heartbeat).
+		@param typeAbsoluteDeadBands Optional typeID -> absolute dead-band overrides.
+		@param typePercentDeadBands Optional typeID -> percent dead-band overrides.
+		"""
+		configUtil = ConfigUtil()
+		section = ConfigConst.REPORT_BY_EXCEPTION_SETTINGS_KEY
+		
+		if absoluteDeadBand is None:
+			absoluteDeadBand = configUtil.getFloat(section = section, key = ConfigConst.ABSOLUTE_DEAD_BAND_KEY)
+		
+		if percentDeadBand is None:
+			percentDeadBand = configUtil.getFloat(section = section, key = ConfigConst.PERCENT_DEAD_BAND_KEY)
+		
+		if maxSilenceSecs is None:
+			maxSilenceSecs = configUtil.getFloat( \
+				section = section, key = ConfigConst.MAX_SILENCE_SECS_KEY, defaultVal = ConfigConst.DEFAULT_MAX_SILENCE_SECS)
+		
+		if typeAbsoluteDeadBands is None:
+			typeAbsoluteDeadBands = \
+				self._parseTypeDeadBands(configUtil.getProperty(section = section, key = ConfigConst.TYPE_ABSOLUTE_DEAD_BANDS_KEY))
+		
+		if typePercentDeadBands is None:
+			typePercentDeadBands = \
+				self._parseTypeDeadBands(configUtil.getProperty(section = section, key = ConfigConst.TYPE_PERCENT_DEAD_BANDS_KEY))
+		
+		self.absoluteDeadBand = max(0.0, absoluteDeadBand)
+		self.percentDeadBand = max(0.0, percentDeadBand)
+		self.maxSilenceSecs = max(0.0, maxSilenceSecs)
+		self.typeAbsoluteDeadBands = typeAbsoluteDeadBands
+		self.typePercentDeadBands = typePercentDeadBands
+		
+		# key -> (last reported values, last reported time)
+		self.lastReported = {}
+		self.filterLock = threading.Lock()
+		
+		self.reportedCount = 0
+		self.suppressedCount = 0
+		self.heartbeatCount = 0
+	
+	def isSensorDataReportable(self, data: SensorData = None, timeSecs: float = None) -> bool:
+		"""
+		Checks if the sensor reading should be reported, using its device
+		ID, type ID and name as the key.
+		
+		@param data The sensor reading.
+		@param timeSecs The current monotonic time in seconds (the current time if None).
+		@return bool True if the reading should be reported; False if it should be suppressed.
+		"""
+		return self.isReportable( \
+			key = (data.getDeviceID(), data.getTypeID(), data.getName()), typeID = data.getTypeID(), \
+			values = (data.getValue(),), timeSecs = timeSecs)
+	
+	def isReportable(self, key = None, typeID: int = ConfigConst.DEFAULT_TYPE_ID, values: tuple = (), timeSecs: float = None) -> bool:
+		"""
+		Checks if the values should be reported. If any value has changed
+		by more than its dead-band, all values are reported (e.g. for
+		readings that carry several values, such as system performance data).
+		
+		@param key The key identifying the reading's source (any hashable value).
+		@param typeID The type ID used to look up the dead-bands.
+		@param values The reading's values.
+		@param timeSecs The current monotonic time in seconds (the current time if None).
+		@return bool True if the values should be reported; False if they should be suppressed.
+		"""
+		if timeSecs is None:
+			timeSecs = SimulationClock().monotonic()
+		
+		absoluteDeadBand = self.typeAbsoluteDeadBands.get(typeID, self.absoluteDeadBand)
+		percentDeadBand = self.typePercentDeadBands.get(typeID, self.percentDeadBand)
+		
+		with self.filterLock:
+			lastReported = self.lastReported.get(key)
+			isReportable = True
+			
+			if lastReported and (absoluteDeadBand > 0.0 or percentDeadBand > 0.0):
+				lastValues, lastTimeSecs = lastReported
+				
+				if self.maxSilenceSecs > 0.0 and timeSecs - lastTimeSecs >= self.maxSilenceSecs:
+					self.heartbeatCount += 1
+				else:
+					isReportable = self._hasChanged(values, lastValues, absoluteDeadBand, percentDeadBand)
+			
+			if isReportable:
+				self.lastReported[key] = (values, timeSecs)
+				self.reportedCount += 1
+			else:
+				self.suppressedCount += 1
+			
+			return isReportable
+	
+	def getReportedCount(self) -> int:
+		return self.reportedCount
+	
+	def getSuppressedCount(self) -> int:
+		return self.suppressedCount
+	
+	def getHeartbeatCount(self) -> int:
+		return self.heartbeatCount
+	
+	def logStatistics(self, name: str = None):
+		"""
+		Logs the reported and suppressed reading counts.
+		
+		@param name The name of the filter's owner, used in the log message.
+		"""
+		total = self.reportedCount + self.suppressedCount
+		
+		logging.info( \
+			"%s report-by-exception: %d of %d readings suppressed (%.1f%%), %d heartbeats.", \
+			name, self.suppressedCount, total, (100.0 * self.suppressedCount / total) if total else 0.0, self.heartbeatCount)
+	
+	def _hasChanged(self, values: tuple = (), lastValues: tuple = (), absoluteDeadBand: float = 0.0, percentDeadBand: float = 0.0) -> bool:
+		if len(values) != len(lastValues):
+			return True
+		
+		for value, lastValue in zip(values, lastValues):
+			change = abs(value - lastValue)
+			
+			if absoluteDeadBand > 0.0 and change > absoluteDeadBand:
+				return True
+			
+			if percentDeadBand > 0.0 and change * 100.0 > percentDeadBand * abs(lastValue):
+				return True
+		
+		return False
+	
+	def _parseTypeDeadBands(self, val: str = None) -> dict:
+		"""
+		Parses per type dead-bands from a comma separated list of
+		'typeID:deadBand' pairs (e.g. '1013:0.25, 1010:1.0').
+		
+		"""
+		typeDeadBands = {}
+		
+		if not val:
+			return typeDeadBands
+		
+		for entry in val.split(','):
+			if not entry.strip():
+				continue
+			
+			try:
+				typeID, deadBand = entry.split(':')
+				typeDeadBands[int(typeID)] = max(0.0, float(deadBand))
+			except ValueError:
+				logging.warning("Ignoring invalid dead-band entry: %s", entry)
+		
+		return typeDeadBands
@@ -25,8 +25,6 @@
 import logging
 import time
 
-from apscheduler.schedulers.background import BackgroundScheduler
-
 from threading import Thread
 
 import labbenchstudios.pdt.common.ConfigConst as ConfigConst
@@ -34,6 +32,7 @@ import labbenchstudios.pdt.common.ConfigConst as ConfigConst
 from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
 from labbenchstudios.pdt.common.IDataManager import IDataManager
 from labbenchstudios.pdt.common.IDataMessageListener import IDataMessageListener
+from labbenchstudios.pdt.common.SimulationClock import SimulationClock
 
 from labbenchstudios.pdt.edge.simulation.FactoryWorkcellSimTask import FactoryWorkcellSimTask
 
@@ -54,7 +53,9 @@ class FactoryWorkcellAdapterManager(IDataManager):
 		Loads the poll rate and other config properties.
 		"""
 		self.configUtil = ConfigUtil()
-		self.pollRate = ConfigConst.DEFAULT_POLL_CYCLES
+		self.pollRate = \
+			self.configUtil.getInteger( \
+				section = ConfigConst.FACTORY_WORKCELL_SETTINGS_KEY, key = ConfigConst.POLL_CYCLES_KEY, defaultVal = ConfigConst.DEFAULT_POLL_CYCLES)
 		
 		self.locationID = \
 			self.configUtil.getProperty( \
@@ -90,14 +91,15 @@ class FactoryWorkcellAdapterManager(IDataManager):
 		# set to True whenever production rate <= 0
 		self.pauseProduction = False
 
-		# poll rate is the non-zero item production rate in seconds
-		if self.itemProdRateSeconds > 0:
-			self.pollRate = self.itemProdRateSeconds
+		# the workcell simulation advances by the elapsed time on each
+		# poll, so the poll rate is independent of the production rate
+		if self.pollRate <= 0:
+			self.pollRate = ConfigConst.DEFAULT_POLL_CYCLES
 
 		self.scheduler = None
 		self.schedThread = None
 
-		self.scheduler = BackgroundScheduler()
+		self.scheduler = SimulationClock().createScheduler()
 		self.scheduler.add_job( \
 			self.handleTelemetry, 'interval', seconds = self.pollRate, \
 			max_instances = 5, coalesce = True, misfire_grace_time = 30)
@@ -117,30 +119,34 @@ class FactoryWorkcellAdapterManager(IDataManager):
 		"""
 		"""
 		self.workcellSimTask.setProductionPauseFlag(enable = self.pauseProduction)
-		self.workcellSimTask.generateTelemetry()
+		itemsProducedData = self.workcellSimTask.generateTelemetry()
 
 		productionStatus = "running"
 
 		if (self.pauseProduction):
 			productionStatus = "paused"
 
-		powerOutputData     = self.workcellSimTask.getPowerOutputTelemetry()
-		rotationalSpeedData = self.workcellSimTask.getRotationalSpeedTelemetry()
-		windSpeedData       = self.workcellSimTask.getWindSpeedTelemetry()
+		throughputData      = self.workcellSimTask.getThroughputTelemetrySensorData()
+		workInProgressData  = self.workcellSimTask.getWorkInProgressTelemetrySensorData()
+		powerDrawData       = self.workcellSimTask.getPowerDrawTelemetrySensorData()
+		utilizationDataList = self.workcellSimTask.getUtilizationTelemetrySensorData()
 		
 		logging.debug( \
-			'Brake is %s: Power output is %s kw, rotational speed is %s rpm, wind speed is %s m/s.', \
+			'Production is %s: Items produced is %s, throughput is %s items/min, WIP is %s, power draw is %s kw.', \
 			productionStatus, \
-			str(powerOutputData.getValue()), \
-			str(rotationalSpeedData.getValue()), \
-			str(windSpeedData.getValue()))
+			str(itemsProducedData.getValue()), \
+			str(throughputData.getValue()), \
+			str(workInProgressData.getValue()), \
+			str(powerDrawData.getValue()))
 		
-		# a future upgrade may package both values into a single generic SensorData
-		# for now, just send two separate SensorData instances
 		if self.dataMsgListener:
-			self.dataMsgListener.handleSensorMessage(data = powerOutputData)
-			self.dataMsgListener.handleSensorMessage(data = rotationalSpeedData)
-			self.dataMsgListener.handleSensorMessage(data = windSpeedData)
+			self.dataMsgListener.handleSensorMessage(data = itemsProducedData)
+			self.dataMsgListener.handleSensorMessage(data = throughputData)
+			self.dataMsgListener.handleSensorMessage(data = workInProgressData)
+			self.dataMsgListener.handleSensorMessage(data = powerDrawData)
+			
+			for utilizationData in utilizationDataList:
+				self.dataMsgListener.handleSensorMessage(data = utilizationData)
 			
 	def setDataMessageListener(self, listener: IDataMessageListener) -> bool:
 		"""
@@ -153,12 +159,17 @@ class FactoryWorkcellAdapterManager(IDataManager):
 		"""
 		if curProdRate == 0:
 			# pause all production
-			self.curItemProdRate = 0
-			self._initItemProductionRateSeconds()
+			self.pauseProduction = True
 		elif curProdRate >= self.minItemProdRate and curProdRate <= self.maxItemProdRate:
 			# update production rate
-			self.curItemProdRate = curProdRate
-			self._initItemProductionRateSeconds()
+			self.pauseProduction = False
+			self.lkgItemProdRate = curProdRate
+			self.workcellSimTask.setProductionRate(curProdRate)
+		else:
+			logging.warning("Workcell production rate out of range. Ignoring: %s", str(curProdRate))
+			return
+		
+		self.workcellSimTask.setProductionPauseFlag(enable = self.pauseProduction)
 
 	def startManager(self):
 		"""
@@ -230,7 +241,7 @@ class FactoryWorkcellAdapterManager(IDataManager):
 
 					elif (command == ConfigConst.COMMAND_UPDATE):
 						logging.info("  --> UPDATING workcell production rate...")
-						self._updateProductionRate(value)
+						self.setProductionRate(value)
 
 					#if self.dataMsgListener:
 					#	self.dataMsgListener.handleActuatorCommandResponse(adResponse)
@@ -0,0 +1,167 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
+from labbenchstudios.pdt.common.IDataManager import IDataManager
+from labbenchstudios.pdt.common.IDataMessageListener import IDataMessageListener
+from labbenchstudios.pdt.common.SimulationClock import SimulationClock
+
+from labbenchstudios.pdt.edge.simulation.FleetSimulator import FleetSimulator
+from labbenchstudios.pdt.edge.simulation.SensorDataGenerator import SensorDataGenerator
+
+from labbenchstudios.pdt.edge.system.DeadBandFilter import DeadBandFilter
+
+class FleetSimAdapterManager(IDataManager):
+	"""
+	Manager class for running a FleetSimulator within a scheduled polling
+	system. Each poll advances the whole fleet by one step, and passes
+	every device's readings (with the device ID set) to the data message
+	listener, so a single EDA can load test the gateway pipeline with
+	many virtual devices.
+	
+	"""
+	
+	def __init__(self):
+		"""
+		Constructor - no args.
+		
+		Loads the poll rate and fleet settings from the configuration.
+		"""
+		self.configUtil = ConfigUtil()
+		
+		self.locationID = \
+			self.configUtil.getProperty( \
+				section = ConfigConst.EDGE_DEVICE, key = ConfigConst.DEVICE_LOCATION_ID_KEY, defaultVal = ConfigConst.NOT_SET)
+		
+		self.pollRate = \
+			self.configUtil.getInteger( \
+				section = ConfigConst.FLEET_SIM_SETTINGS_KEY, key = ConfigConst.POLL_CYCLES_KEY, defaultVal = ConfigConst.DEFAULT_POLL_CYCLES)
+		
+		if self.pollRate <= 0:
+			self.pollRate = ConfigConst.DEFAULT_POLL_CYCLES
+		
+		randomSeed = \
+			self.configUtil.getProperty( \
+				section = ConfigConst.FLEET_SIM_SETTINGS_KEY, key = ConfigConst.FLEET_RANDOM_SEED_KEY, defaultVal = None)
+		
+		self.fleetSim = \
+			FleetSimulator( \
+				deviceCount = self.configUtil.getInteger( \
+					section = ConfigConst.FLEET_SIM_SETTINGS_KEY, key = ConfigConst.FLEET_DEVICE_COUNT_KEY, \
+					defaultVal = ConfigConst.DEFAULT_FLEET_DEVICE_COUNT), \
+				deviceIDPrefix = self.configUtil.getProperty( \
+					section = ConfigConst.FLEET_SIM_SETTINGS_KEY, key = ConfigConst.FLEET_DEVICE_ID_PREFIX_KEY, \
+					defaultVal = ConfigConst.DEFAULT_FLEET_DEVICE_ID_PREFIX), \
+				noiseLevel = self.configUtil.getInteger( \
+					section = ConfigConst.FLEET_SIM_SETTINGS_KEY, key = ConfigConst.FLEET_NOISE_LEVEL_KEY, \
+					defaultVal = SensorDataGenerator.DEFAULT_NOISE), \
+				randomSeed = int(randomSeed) if randomSeed else None)
+		
+		self.scheduler = SimulationClock().createScheduler()
+		self.scheduler.add_job( \
+			self.handleTelemetry, 'interval', seconds = self.pollRate, \
+			max_instances = 1, coalesce = True, misfire_grace_time = 30)
+		
+		self.dataMsgListener = None
+		
+		self.deadBandFilter = None
+		
+		if self.configUtil.getBoolean(section = ConfigConst.REPORT_BY_EXCEPTION_SETTINGS_KEY, key = ConfigConst.ENABLE_REPORT_BY_EXCEPTION_KEY):
+			self.deadBandFilter = DeadBandFilter()
+			logging.info("Report-by-exception filtering enabled")
+	
+	def getFleetSimulator(self) -> FleetSimulator:
+		"""
+		Returns the fleet simulator, e.g. for columnar access to its readings.
+		
+		@return FleetSimulator
+		"""
+		return self.fleetSim
+	
+	def handleTelemetry(self):
+		"""
+		Callback function used by the scheduler to advance the fleet by
+		one step, and dispatch the readings to the data message listener.
+		
+		"""
+		values = self.fleetSim.step()
+		
+		if not self.dataMsgListener:
+			return
+		
+		dispatchCount = 0
+		
+		for data in self.fleetSim.createSensorData(values):
+			data.setLocationID(self.locationID)
+			
+			# suppress unchanged readings (if enabled) before they're dispatched
+			if not self.deadBandFilter or self.deadBandFilter.isSensorDataReportable(data):
+				self.dataMsgListener.handleSensorMessage(data)
+				dispatchCount += 1
+		
+		logging.debug( \
+			"Fleet sim step %d: dispatched %d readings from %d devices", \
+			self.fleetSim.getTickCount(), dispatchCount, self.fleetSim.getDeviceCount())
+	
+	def setDataMessageListener(self, listener: IDataMessageListener) -> bool:
+		"""
+		Sets the data message listener reference, assuming listener is non-null.
+		
+		@param listener The data message listener instance.
+		"""
+		if listener:
+			self.dataMsgListener = listener
+	
+	def startManager(self):
+		"""
+		Starts the fleet sim manager, and starts the scheduled polling.
+		
+		"""
+		logging.info("Starting fleet sim manager with %d devices...", self.fleetSim.getDeviceCount())
+		
+		if not self.scheduler.running:
+			self.scheduler.start()
+		else:
+			logging.warning("FleetSimAdapterManager scheduler already started. Ignoring.")
+	
+	def stopManager(self):
+		"""
+		Stops the fleet sim manager, and stops the scheduler.
+		
+		"""
+		logging.info("Stopping fleet sim manager...")
+		
+		if self.deadBandFilter:
+			self.deadBandFilter.logStatistics(name = "FleetSimAdapterManager")
+		
+		try:
+			if self.scheduler.running:
+				self.scheduler.shutdown()
+		except:
+			logging.warning("FleetSimAdapterManager scheduler already stopped. Ignoring.")
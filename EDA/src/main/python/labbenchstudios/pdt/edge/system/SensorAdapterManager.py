@@ -27,18 +27,21 @@ import traceback
 
 from importlib import import_module
 
-from apscheduler.schedulers.background import BackgroundScheduler
-
 import labbenchstudios.pdt.common.ConfigConst as ConfigConst
 
 from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
 from labbenchstudios.pdt.common.IDataManager import IDataManager
 from labbenchstudios.pdt.common.IDataMessageListener import IDataMessageListener
+from labbenchstudios.pdt.common.SimulationClock import SimulationClock
 from labbenchstudios.pdt.common.ResourceNameEnum import ResourceNameEnum
 
 from labbenchstudios.pdt.data.ActuatorData import ActuatorData
 from labbenchstudios.pdt.data.SensorData import SensorData
 
+from labbenchstudios.pdt.edge.system.AdaptivePollingController import AdaptivePollingController
+from labbenchstudios.pdt.edge.system.DeadBandFilter import DeadBandFilter
+
+from labbenchstudios.pdt.edge.simulation.EnvironmentPlantModel import EnvironmentPlantModel
 from labbenchstudios.pdt.edge.simulation.SensorDataGenerator import SensorDataGenerator
 from labbenchstudios.pdt.edge.simulation.HumiditySensorSimTask import HumiditySensorSimTask
 from labbenchstudios.pdt.edge.simulation.TemperatureSensorSimTask import TemperatureSensorSimTask
@@ -51,14 +54,16 @@ class SensorAdapterManager(IDataManager):
 	
 	"""
 	
+	# maximum change per poll cycle when ramping to a new setpoint
+	TEMP_SETPOINT_STEP     = 0.1
+	HUMIDITY_SETPOINT_STEP = 0.5
+	
 	def __init__(self):
 		"""
 		Constructor.
 		
 		"""
 		self.configUtil = ConfigUtil()
-		
-		self.pauseScheduler = False
 
 		self.deviceID = \
 			self.configUtil.getProperty( \
@@ -74,6 +79,10 @@ class SensorAdapterManager(IDataManager):
 			
 		if self.pollRate <= 0:
 			self.pollRate = ConfigConst.DEFAULT_POLL_CYCLES
+		
+		self.setpointResponse = \
+			self.configUtil.getFloat( \
+				section = ConfigConst.ENVIRONMENTAL_SETTINGS_KEY, key = ConfigConst.SIM_SETPOINT_RESPONSE_KEY, defaultVal = 0.0)
 			
 		self.useEnvDataEmulator  = \
 			self.configUtil.getBoolean( \
@@ -87,11 +96,21 @@ class SensorAdapterManager(IDataManager):
 			self.configUtil.getBoolean( \
 				section = ConfigConst.ENVIRONMENTAL_SETTINGS_KEY, key = ConfigConst.ENABLE_SENSE_HAT_KEY)
 			
+		# with adaptive polling, the scheduler runs at the shortest poll interval,
+		# and each task is only polled once its own interval has elapsed
+		self.pollingController = None
+		
+		if self.configUtil.getBoolean(section = ConfigConst.ADAPTIVE_POLLING_SETTINGS_KEY, key = ConfigConst.ENABLE_ADAPTIVE_POLLING_KEY):
+			self.pollingController = AdaptivePollingController()
+			logging.info("Adaptive polling enabled")
+		
+		schedulerPollSecs = self.pollingController.getMinPollSecs() if self.pollingController else self.pollRate
+		
 		# technically we only need 1 instance - important to set coalesce
 		# to True and allow for misfire grace period
-		self.scheduler = BackgroundScheduler()
+		self.scheduler = SimulationClock().createScheduler()
 		self.scheduler.add_job( \
-			self.handleTelemetry, 'interval', seconds = self.pollRate, max_instances = 2, coalesce = True, misfire_grace_time = 15)
+			self.handleTelemetry, 'interval', seconds = schedulerPollSecs, max_instances = 2, coalesce = True, misfire_grace_time = 15)
 		
 		self.dataMsgListener = None
 		
@@ -107,9 +126,26 @@ class SensorAdapterManager(IDataManager):
 		
 		self.isEnvSensingActive = False
 		
+		self.deadBandFilter = None
+		
+		if self.configUtil.getBoolean(section = ConfigConst.REPORT_BY_EXCEPTION_SETTINGS_KEY, key = ConfigConst.ENABLE_REPORT_BY_EXCEPTION_KEY):
+			self.deadBandFilter = DeadBandFilter()
+			logging.info("Report-by-exception filtering enabled")
+		
 		# see PIOT-CDA-03-006 description for thoughts on the next line of code
 		self._initEnvironmentalSensorTasks()
 		
+		# closes the loop between the actuator commands and the simulated readings
+		self.plantModel = None
+		
+		if self.useSimulator and \
+			self.configUtil.getBoolean(section = ConfigConst.ENVIRONMENTAL_SETTINGS_KEY, key = ConfigConst.ENABLE_PLANT_MODEL_KEY):
+			self._initPlantModel()
+		
+		if self.pollingController and self.isEnvSensingActive:
+			for sensorTask in (self.humidityAdapter, self.pressureAdapter, self.tempAdapter):
+				self.pollingController.registerTask(name = sensorTask.getName(), pollSecs = self.pollRate)
+		
 	def handleTelemetry(self):
 		"""
 		Callback function used by the scheduler to invoke the retrieval
@@ -117,32 +153,28 @@ class SensorAdapterManager(IDataManager):
 		is retrieved, the data listener will be invoked.
 		
 		"""
-		if self.pauseScheduler:
-			logging.info("Scheduler temporarily paused.")
-			return
-		
 		if self.isEnvSensingActive:
-			humidityData = self.humidityAdapter.generateTelemetry()
-			pressureData = self.pressureAdapter.generateTelemetry()
-			tempData     = self.tempAdapter.generateTelemetry()
-			
-			humidityData.setDeviceID(self.deviceID)
-			humidityData.setLocationID(self.locationID)
-
-			pressureData.setDeviceID(self.deviceID)
-			pressureData.setLocationID(self.locationID)
-			
-			tempData.setDeviceID(self.deviceID)
-			tempData.setLocationID(self.locationID)
+			if self.plantModel:
+				self._stepPlantModel()
 			
-			logging.debug('Generated humidity data: ' + str(humidityData.getValue()))
-			logging.debug('Generated pressure data: ' + str(pressureData.getValue()))
-			logging.debug('Generated temp data: ' + str(tempData.getValue()))
-			
-			if self.dataMsgListener:
-				self.dataMsgListener.handleSensorMessage(humidityData)
-				self.dataMsgListener.handleSensorMessage(pressureData)
-				self.dataMsgListener.handleSensorMessage(tempData)
+			for sensorTask in (self.humidityAdapter, self.pressureAdapter, self.tempAdapter):
+				if self.pollingController and not self.pollingController.isPollDue(sensorTask.getName()):
+					continue
+				
+				data = sensorTask.generateTelemetry()
+				data.setDeviceID(self.deviceID)
+				data.setLocationID(self.locationID)
+				
+				logging.debug('Generated %s data: %s', data.getName(), str(data.getValue()))
+				
+				if self.pollingController:
+					self.pollingController.updateTask( \
+						name = sensorTask.getName(), value = data.getValue(), \
+						pendingMessageCount = self.dataMsgListener.getPendingMessageCount() if self.dataMsgListener else 0)
+				
+				# suppress unchanged readings (if enabled) before they're dispatched
+				if self.dataMsgListener and (not self.deadBandFilter or self.deadBandFilter.isSensorDataReportable(data)):
+					self.dataMsgListener.handleSensorMessage(data)
 		else:
 			logging.debug('Environmental sensing is not active. Ignoring handle telemetry call.')
 			
@@ -179,6 +211,9 @@ class SensorAdapterManager(IDataManager):
 		"""
 		logging.info("Stopped SensorAdapterManager.")
 		
+		if self.deadBandFilter:
+			self.deadBandFilter.logStatistics(name = "SensorAdapterManager")
+		
 		try:
 			self.scheduler.shutdown()
 			
@@ -190,85 +225,78 @@ class SensorAdapterManager(IDataManager):
 		
 	def updateSimulationData(self, data: ActuatorData = None):
 		"""
+		Ramps the simulated temperature or humidity toward the value of
+		a thermostat or humidifier command. If the plant model is enabled,
+		the command is applied to the plant's actuator state instead.
+		
+		@param data The ActuatorData command.
 		"""
 		if data and self.useSimulator:
 			command = data.getCommand()
 			value = data.getValue()
 
 			logging.info( \
-				"Updating environmental simulated data set: name = %s, type = %s, cmd = %s, val = %s", \
+				"Updating environmental simulated setpoint: name = %s, type = %s, cmd = %s, val = %s", \
 				data.getName(), str(data.getTypeID()), str(command), str(value))
 
-			self.pauseScheduler = True
-
+			# update the plant's actuator state, or ramp the existing task toward the
+			# new setpoint in place - either way, each command is O(1), with no data
+			# set generation or scheduler pause
 			try:
-				if data.getTypeID() == ConfigConst.THERMOSTAT_TYPE:
-					simData = \
-						self._generateTrendingSimulationData( \
-							curVal = self.tempAdapter.getTelemetryValue(), \
-							targetVal = data.getValue(), \
-							increment = 0.1)
+				if self.plantModel:
+					self.plantModel.applyActuatorCommand(data = data)
 
-					self.tempAdapter = None
-					self.tempAdapter = TemperatureSensorSimTask(dataSet = simData)
-					self.tempAdapter.enableSimulatedDataRollover(enable = False)
+				elif data.getTypeID() == ConfigConst.THERMOSTAT_TYPE:
+					self.tempAdapter.setTargetValue( \
+						targetVal = value, maxStep = self.TEMP_SETPOINT_STEP, responseFactor = self.setpointResponse)
 
 				elif data.getTypeID() == ConfigConst.HUMIDIFIER_TYPE:
-					simData = \
-						self._generateTrendingSimulationData( \
-							curVal = self.humidityAdapter.getTelemetryValue(), \
-							targetVal = data.getValue(), \
-							increment = 0.5)
-
-					self.humidityAdapter = None
-					self.humidityAdapter = HumiditySensorSimTask(dataSet = simData)
-					self.humidityAdapter.enableSimulatedDataRollover(enable = False)
+					self.humidityAdapter.setTargetValue( \
+						targetVal = value, maxStep = self.HUMIDITY_SETPOINT_STEP, responseFactor = self.setpointResponse)
 
 			except Exception as e:
-				logging.warning("Failed to reconfigure simulated data sets. Resuming.")
+				logging.warning("Failed to update simulated setpoint. Ignoring.")
 				traceback.print_exception(type(e), e, e.__traceback__)
 
-			self.pauseScheduler = False
-
-	def _generateTrendingSimulationData(self, curVal: float = 0.0, targetVal: float = 0.0, increment: float = 0.1):
+	def _initPlantModel(self):
 		"""
+		Creates the environment plant model, starting from the current
+		simulated temperature and humidity.
+		
 		"""
-		if (not self.dataGenerator):
-			self.dataGenerator = SensorDataGenerator()
-
-		minVal = curVal
-		maxVal = curVal
-		trendUp = False
-
-		if (curVal > targetVal):
-			minVal = targetVal
-			maxVal = curVal
-			trendUp = False
-
-		if (curVal < targetVal):
-			minVal = curVal
-			maxVal = targetVal
-			trendUp = True
-
-		logging.info( \
-			"\n\n*****\n" +
-			"Updating simulation data set:" + \
-			"\n\tTrend Up:  " + str(trendUp) + \
-			"\n\tIncrement: " + str(increment) + \
-			"\n\tCur Val:   " + str(curVal) + \
-			"\n\tMin Val:   " + str(minVal) + \
-			"\n\tMax Val:   " + str(maxVal) + \
-			"\n*****\n\n")
-			
-		simData = \
-			self.dataGenerator.generateTrendingSensorDataSet( \
-				trendUpwards = trendUp, \
-				increment = increment, \
-				minValue = minVal, \
-				maxValue = maxVal, \
-				useIncrementForSampleCount = True)
-			
-		return simData
+		self.plantTimeScale = \
+			self.configUtil.getFloat( \
+				section = ConfigConst.ENVIRONMENTAL_SETTINGS_KEY, key = ConfigConst.PLANT_TIME_SCALE_KEY, defaultVal = 1.0)
+		
+		self.plantModel = \
+			EnvironmentPlantModel( \
+				initialTemp = self.tempAdapter.getTelemetryValue(), \
+				initialHumidity = self.humidityAdapter.getTelemetryValue(), \
+				outdoorTemp = self.configUtil.getFloat( \
+					section = ConfigConst.ENVIRONMENTAL_SETTINGS_KEY, key = ConfigConst.PLANT_OUTDOOR_TEMP_KEY, defaultVal = 10.0), \
+				outdoorHumidity = self.configUtil.getFloat( \
+					section = ConfigConst.ENVIRONMENTAL_SETTINGS_KEY, key = ConfigConst.PLANT_OUTDOOR_HUMIDITY_KEY, defaultVal = 30.0))
+		
+		self.lastPlantStepTime = None
+		
+		logging.info("Environment plant model enabled: time scale = %.1f", self.plantTimeScale)
+	
+	def _stepPlantModel(self):
+		"""
+		Advances the plant model by the (scaled) clock time since the
+		last step, and sets the temperature and humidity sim tasks to the
+		resulting zone state.
+		
+		"""
+		curTime = SimulationClock().monotonic()
+		
+		if self.lastPlantStepTime is not None:
+			self.plantModel.step(dtSecs = (curTime - self.lastPlantStepTime) * self.plantTimeScale)
+		
+		self.lastPlantStepTime = curTime
+		
+		self.tempAdapter.setTargetValue(targetVal = self.plantModel.getTemperature())
+		self.humidityAdapter.setTargetValue(targetVal = self.plantModel.getHumidity())
 	
 	def _initEnvironmentalSensorTasks(self):
 		"""
@@ -302,18 +330,23 @@ class SensorAdapterManager(IDataManager):
 			self.configUtil.getFloat( \
 				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.TEMP_SIM_CEILING_KEY, defaultVal = SensorDataGenerator.HI_NORMAL_INDOOR_TEMP)
 		
+		# if positive, the simulated data sets are generated in chunks as they're used
+		simDataChunkSize = \
+			self.configUtil.getInteger( \
+				section = ConfigConst.ENVIRONMENTAL_SETTINGS_KEY, key = ConfigConst.SIM_DATA_CHUNK_SIZE_KEY, defaultVal = 0)
+		
 		if self.useSimulator:
 			self.dataGenerator = SensorDataGenerator()
 			
 			humidityData = \
 				self.dataGenerator.generateDailyEnvironmentHumidityDataSet( \
-					minValue = humidityFloor, maxValue = humidityCeiling, useSeconds = False)
+					minValue = humidityFloor, maxValue = humidityCeiling, useSeconds = False, chunkSize = simDataChunkSize)
 			pressureData = \
 				self.dataGenerator.generateDailyEnvironmentPressureDataSet( \
-					minValue = pressureFloor, maxValue = pressureCeiling, useSeconds = False)
+					minValue = pressureFloor, maxValue = pressureCeiling, useSeconds = False, chunkSize = simDataChunkSize)
 			tempData     = \
 				self.dataGenerator.generateDailyIndoorTemperatureDataSet( \
-					minValue = tempFloor, maxValue = tempCeiling, useSeconds = False)
+					minValue = tempFloor, maxValue = tempCeiling, useSeconds = False, chunkSize = simDataChunkSize)
 			
 			self.humidityAdapter = HumiditySensorSimTask(dataSet = humidityData)
 			self.pressureAdapter = PressureSensorSimTask(dataSet = pressureData)
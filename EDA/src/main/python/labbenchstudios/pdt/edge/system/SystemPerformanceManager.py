@@ -24,14 +24,15 @@
 
 import logging
 
-from apscheduler.schedulers.background import BackgroundScheduler
-
 import labbenchstudios.pdt.common.ConfigConst as ConfigConst
 
 from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
 from labbenchstudios.pdt.common.IDataManager import IDataManager
 from labbenchstudios.pdt.common.IDataMessageListener import IDataMessageListener
+from labbenchstudios.pdt.common.SimulationClock import SimulationClock
 
+from labbenchstudios.pdt.edge.system.AdaptivePollingController import AdaptivePollingController
+from labbenchstudios.pdt.edge.system.DeadBandFilter import DeadBandFilter
 from labbenchstudios.pdt.edge.system.SystemCpuUtilTask import SystemCpuUtilTask
 from labbenchstudios.pdt.edge.system.SystemMemUtilTask import SystemMemUtilTask
 
@@ -62,23 +63,66 @@ class SystemPerformanceManager(IDataManager):
 		if self.pollRate <= 0:
 			self.pollRate = ConfigConst.DEFAULT_POLL_CYCLES
 			
+		# with adaptive polling, the scheduler runs at the shortest poll interval,
+		# and each task is only polled once its own interval has elapsed
+		self.pollingController = None
+		
+		if configUtil.getBoolean(section = ConfigConst.ADAPTIVE_POLLING_SETTINGS_KEY, key = ConfigConst.ENABLE_ADAPTIVE_POLLING_KEY):
+			self.pollingController = AdaptivePollingController()
+			logging.info("Adaptive polling enabled")
+		
+		schedulerPollSecs = self.pollingController.getMinPollSecs() if self.pollingController else self.pollRate
+		
 		#self.scheduler = BackgroundScheduler()
 		#self.scheduler.add_job(self.handleTelemetry, 'interval', seconds = self.pollRate)
-		self.scheduler = BackgroundScheduler()
+		self.scheduler = SimulationClock().createScheduler()
 		self.scheduler.add_job( \
-			self.handleTelemetry, 'interval', seconds = self.pollRate, \
+			self.handleTelemetry, 'interval', seconds = schedulerPollSecs, \
 			max_instances = 2, coalesce = True, misfire_grace_time = 15)
 		
 		self.cpuUtilTask = SystemCpuUtilTask()
 		self.memUtilTask = SystemMemUtilTask()
 		
+		self.cpuUtilPct = 0.0
+		self.memUtilPct = 0.0
+		
+		if self.pollingController:
+			for utilTask in (self.cpuUtilTask, self.memUtilTask):
+				self.pollingController.registerTask(name = utilTask.getName(), pollSecs = self.pollRate)
+		
 		self.dataMsgListener = None
 		
+		self.deadBandFilter = None
+		
+		if configUtil.getBoolean(section = ConfigConst.REPORT_BY_EXCEPTION_SETTINGS_KEY, key = ConfigConst.ENABLE_REPORT_BY_EXCEPTION_KEY):
+			self.deadBandFilter = DeadBandFilter()
+			logging.info("Report-by-exception filtering enabled")
+		
 	def handleTelemetry(self):
 		"""
 		"""
-		self.cpuUtilPct = self.cpuUtilTask.getTelemetryValue()
-		self.memUtilPct = self.memUtilTask.getTelemetryValue()
+		if self.pollingController:
+			# poll only the tasks that are due, and report the latest value of the others
+			isCpuPollDue = self.pollingController.isPollDue(self.cpuUtilTask.getName())
+			isMemPollDue = self.pollingController.isPollDue(self.memUtilTask.getName())
+			
+			if not (isCpuPollDue or isMemPollDue):
+				return
+			
+			pendingMessageCount = self.dataMsgListener.getPendingMessageCount() if self.dataMsgListener else 0
+			
+			if isCpuPollDue:
+				self.cpuUtilPct = self.cpuUtilTask.getTelemetryValue()
+				self.pollingController.updateTask( \
+					name = self.cpuUtilTask.getName(), value = self.cpuUtilPct, pendingMessageCount = pendingMessageCount)
+			
+			if isMemPollDue:
+				self.memUtilPct = self.memUtilTask.getTelemetryValue()
+				self.pollingController.updateTask( \
+					name = self.memUtilTask.getName(), value = self.memUtilPct, pendingMessageCount = pendingMessageCount)
+		else:
+			self.cpuUtilPct = self.cpuUtilTask.getTelemetryValue()
+			self.memUtilPct = self.memUtilTask.getTelemetryValue()
 		
 		logging.debug('CPU utilization is %s percent, and memory utilization is %s percent.', str(self.cpuUtilPct), str(self.memUtilPct))
 		
@@ -87,6 +131,11 @@ class SystemPerformanceManager(IDataManager):
 		sysPerfData.setCpuUtilization(self.cpuUtilPct)
 		sysPerfData.setMemoryUtilization(self.memUtilPct)
 		
+		# suppress unchanged readings (if enabled) before they're dispatched
+		if self.deadBandFilter and not self.deadBandFilter.isReportable( \
+			key = ConfigConst.SYSTEM_PERF_NAME, typeID = ConfigConst.SYSTEM_PERF_TYPE, values = (self.cpuUtilPct, self.memUtilPct)):
+			return
+		
 		if self.dataMsgListener:
 			self.dataMsgListener.handleSystemPerformanceMessage(data = sysPerfData)
 			
@@ -116,6 +165,9 @@ class SystemPerformanceManager(IDataManager):
 		"""
 		logging.info("Stopping system performance manager...")
 		
+		if self.deadBandFilter:
+			self.deadBandFilter.logStatistics(name = "SystemPerformanceManager")
+		
 		try:
 			if self.scheduler.running:
 				self.scheduler.shutdown()
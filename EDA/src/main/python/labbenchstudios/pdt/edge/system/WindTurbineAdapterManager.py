@@ -25,8 +25,6 @@
 import logging
 import time
 
-from apscheduler.schedulers.background import BackgroundScheduler
-
 from threading import Thread
 
 import labbenchstudios.pdt.common.ConfigConst as ConfigConst
@@ -34,6 +32,7 @@ import labbenchstudios.pdt.common.ConfigConst as ConfigConst
 from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
 from labbenchstudios.pdt.common.IDataManager import IDataManager
 from labbenchstudios.pdt.common.IDataMessageListener import IDataMessageListener
+from labbenchstudios.pdt.common.SimulationClock import SimulationClock
 
 from labbenchstudios.pdt.edge.simulation.WindTurbineSensorSimTask import WindTurbineSensorSimTask
 
@@ -41,6 +40,11 @@ from labbenchstudios.pdt.data.ActuatorData import ActuatorData
 from labbenchstudios.pdt.data.SensorData import SensorData
 
 from labbenchstudios.pdt.edge.simulation.SensorDataGenerator import SensorDataGenerator
+from labbenchstudios.pdt.edge.simulation.WindFarmWakeModel import WindFarmWakeModel
+from labbenchstudios.pdt.edge.simulation.WindSpeedSampler import WindSpeedSampler
+
+from labbenchstudios.pdt.edge.system.AdaptivePollingController import AdaptivePollingController
+from labbenchstudios.pdt.edge.system.DeadBandFilter import DeadBandFilter
 
 class WindTurbineAdapterManager(IDataManager):
 	"""
@@ -77,9 +81,19 @@ class WindTurbineAdapterManager(IDataManager):
 		self.scheduler = None
 		self.schedThread = None
 
-		self.scheduler = BackgroundScheduler()
+		# with adaptive polling, the scheduler runs at the shortest poll interval,
+		# and each task is only polled once its own interval has elapsed
+		self.pollingController = None
+		
+		if self.configUtil.getBoolean(section = ConfigConst.ADAPTIVE_POLLING_SETTINGS_KEY, key = ConfigConst.ENABLE_ADAPTIVE_POLLING_KEY):
+			self.pollingController = AdaptivePollingController()
+			logging.info("Adaptive polling enabled")
+		
+		schedulerPollSecs = self.pollingController.getMinPollSecs() if self.pollingController else self.pollRate
+		
+		self.scheduler = SimulationClock().createScheduler()
 		self.scheduler.add_job( \
-			self.handleTelemetry, 'interval', seconds = self.pollRate, \
+			self.handleTelemetry, 'interval', seconds = schedulerPollSecs, \
 			max_instances = 5, coalesce = True, misfire_grace_time = 30)
 
 		'''
@@ -91,12 +105,32 @@ class WindTurbineAdapterManager(IDataManager):
 		self.dataMsgListener = None
 		self.curCommand = ConfigConst.DEFAULT_COMMAND
 
+		self.deadBandFilter = None
+		
+		if self.configUtil.getBoolean(section = ConfigConst.REPORT_BY_EXCEPTION_SETTINGS_KEY, key = ConfigConst.ENABLE_REPORT_BY_EXCEPTION_KEY):
+			self.deadBandFilter = DeadBandFilter()
+			logging.info("Report-by-exception filtering enabled")
+		
 		self._initTasks()
+		
+		if self.pollingController:
+			self.pollingController.registerTask(name = self.windTurbineSimTask.getName(), pollSecs = self.pollRate)
 
 	def handleTelemetry(self):
 		"""
 		"""
+		if self.pollingController and not self.pollingController.isPollDue(self.windTurbineSimTask.getName()):
+			return
+		
 		self.windTurbineSimTask.enableBrakingSystem(enable = self.enableWindTurbineBraking)
+		
+		farmPowerOutput = None
+		
+		if self.windFarmModel:
+			farmPowerOutput = self._updateWindFarm()
+		elif self.windSpeedSampler:
+			self.windTurbineSimTask.setTargetValue(targetVal = float(self.windSpeedSampler.step()[0]))
+		
 		self.windTurbineSimTask.generateTelemetry()
 
 		brakingStatus = "disabled"
@@ -115,12 +149,30 @@ class WindTurbineAdapterManager(IDataManager):
 			str(rotationalSpeedData.getValue()), \
 			str(windSpeedData.getValue()))
 		
+		# wind speed drives the turbine's dynamics, so it determines the poll interval
+		if self.pollingController:
+			self.pollingController.updateTask( \
+				name = self.windTurbineSimTask.getName(), value = windSpeedData.getValue(), \
+				pendingMessageCount = self.dataMsgListener.getPendingMessageCount() if self.dataMsgListener else 0)
+		
+		telemetry = [powerOutputData, rotationalSpeedData, windSpeedData]
+		
+		if farmPowerOutput is not None:
+			farmPowerData = SensorData()
+			farmPowerData.updateData(powerOutputData)
+			farmPowerData.setName(ConfigConst.WIND_FARM_NAME)
+			farmPowerData.setTypeID(ConfigConst.WIND_FARM_POWER_OUTPUT_SENSOR_TYPE)
+			farmPowerData.setValue(farmPowerOutput)
+			
+			telemetry.append(farmPowerData)
+		
 		# a future upgrade may package both values into a single generic SensorData
-		# for now, just send two separate SensorData instances
+		# for now, just send separate SensorData instances
 		if self.dataMsgListener:
-			self.dataMsgListener.handleSensorMessage(data = powerOutputData)
-			self.dataMsgListener.handleSensorMessage(data = rotationalSpeedData)
-			self.dataMsgListener.handleSensorMessage(data = windSpeedData)
+			for data in telemetry:
+				# suppress unchanged readings (if enabled) before they're dispatched
+				if not self.deadBandFilter or self.deadBandFilter.isSensorDataReportable(data):
+					self.dataMsgListener.handleSensorMessage(data = data)
 			
 	def setDataMessageListener(self, listener: IDataMessageListener) -> bool:
 		"""
@@ -151,6 +203,9 @@ class WindTurbineAdapterManager(IDataManager):
 		"""
 		logging.info("Stopping wind turbine manager...")
 		
+		if self.deadBandFilter:
+			self.deadBandFilter.logStatistics(name = "WindTurbineAdapterManager")
+		
 		try:
 			if self.schedThread:
 				self.schedThread.join()
@@ -227,7 +282,92 @@ class WindTurbineAdapterManager(IDataManager):
 				minValue = minWindSpeed, maxValue = maxWindSpeed, useSeconds = False)
 		
 		self.windTurbineSimTask = WindTurbineSensorSimTask(dataSet = windSpeedData)
+		
+		# optionally, replace the oscillating wind speed with Weibull sampled wind
+		self.windSpeedSampler = None
+		self.windFarmModel = None
+		
+		if self.configUtil.getBoolean(section = ConfigConst.WIND_TURBINE_SETTINGS_KEY, key = ConfigConst.ENABLE_WEIBULL_WIND_KEY):
+			self._initWindSpeedSampler()
+		
+		# the wind farm always uses Weibull sampled wind
+		if self.configUtil.getBoolean(section = ConfigConst.WIND_TURBINE_SETTINGS_KEY, key = ConfigConst.ENABLE_WIND_FARM_KEY):
+			if not self.windSpeedSampler:
+				self._initWindSpeedSampler()
+			
+			self._initWindFarm()
 			
+	def _initWindFarm(self):
+		"""
+		Creates the wind farm wake model, using the simulated turbine's
+		rotor diameter and power curve for every turbine in the farm.
+		
+		"""
+		section = ConfigConst.WIND_TURBINE_SETTINGS_KEY
+		
+		self.windFarmModel = \
+			WindFarmWakeModel( \
+				rowCount = self.configUtil.getInteger(section = section, key = ConfigConst.WIND_FARM_ROWS_KEY, defaultVal = 1), \
+				columnCount = self.configUtil.getInteger(section = section, key = ConfigConst.WIND_FARM_COLUMNS_KEY, defaultVal = 1), \
+				turbineSpacing = self.configUtil.getFloat( \
+					section = section, key = ConfigConst.WIND_FARM_SPACING_KEY, defaultVal = WindFarmWakeModel.DEFAULT_TURBINE_SPACING), \
+				rotorDiameter = self.windTurbineSimTask.getRotorDiameter(), \
+				wakeDecay = self.configUtil.getFloat( \
+					section = section, key = ConfigConst.WAKE_DECAY_KEY, defaultVal = WindFarmWakeModel.DEFAULT_WAKE_DECAY), \
+				thrustCoeff = self.configUtil.getFloat( \
+					section = section, key = ConfigConst.THRUST_COEFF_KEY, defaultVal = WindFarmWakeModel.DEFAULT_THRUST_COEFF))
+		
+		self.windDirection = self.configUtil.getFloat(section = section, key = ConfigConst.WIND_DIRECTION_KEY, defaultVal = 270.0)
+		
+		# the simulated turbine is one of the farm's turbines
+		self.farmTurbineIndex = \
+			min(max(self.configUtil.getInteger(section = section, key = ConfigConst.WIND_FARM_TURBINE_INDEX_KEY, defaultVal = 0), 0), \
+				self.windFarmModel.getTurbineCount() - 1)
+		
+	def _initWindSpeedSampler(self):
+		"""
+		Creates the Weibull wind speed sampler, drawing a new mean wind
+		speed every 10 minutes.
+		
+		"""
+		self.windSpeedSampler = \
+			WindSpeedSampler( \
+				weibullShape = self.configUtil.getFloat( \
+					section = ConfigConst.WIND_TURBINE_SETTINGS_KEY, key = ConfigConst.WEIBULL_SHAPE_KEY, \
+					defaultVal = WindSpeedSampler.DEFAULT_WEIBULL_SHAPE), \
+				weibullScale = self.configUtil.getFloat( \
+					section = ConfigConst.WIND_TURBINE_SETTINGS_KEY, key = ConfigConst.WEIBULL_SCALE_KEY, \
+					defaultVal = WindSpeedSampler.DEFAULT_WEIBULL_SCALE), \
+				turbulenceIntensity = self.configUtil.getFloat( \
+					section = ConfigConst.WIND_TURBINE_SETTINGS_KEY, key = ConfigConst.TURBULENCE_INTENSITY_KEY, \
+					defaultVal = WindSpeedSampler.DEFAULT_TURBULENCE_INTENSITY), \
+				meanHoldSteps = max(1, 600 // self.pollRate))
+		
+		logging.info( \
+			"Using Weibull wind: expected mean wind speed %.1f m/s", self.windSpeedSampler.getExpectedMeanWindSpeed())
+		
+	def _updateWindFarm(self) -> float:
+		"""
+		Steps the farm's wind, applies the wake losses, and passes the
+		simulated turbine its effective wind speed.
+		
+		@return float The total farm power output (W).
+		"""
+		farmWindSpeeds = \
+			self.windFarmModel.getEffectiveWindSpeeds( \
+				freeStreamSpeeds = self.windSpeedSampler.step(turbineCount = self.windFarmModel.getTurbineCount()), \
+				windDirection = self.windDirection)
+		
+		farmPowerOutputs = self.windTurbineSimTask.getPowerCurve().getPowerOutput(farmWindSpeeds)
+		
+		# the brake only stops the simulated turbine
+		if self.enableWindTurbineBraking:
+			farmPowerOutputs[self.farmTurbineIndex] = 0.0
+		
+		self.windTurbineSimTask.setTargetValue(targetVal = float(farmWindSpeeds[self.farmTurbineIndex]))
+		
+		return float(farmPowerOutputs.sum())
+	
 	def _initSampleWeatherData(self):
 		pass
 		
@@ -0,0 +1,137 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import time
+import unittest
+
+from datetime import datetime, timezone
+
+from labbenchstudios.pdt.common.ClockScheduler import ClockScheduler
+from labbenchstudios.pdt.common.SimulationClock import SimulationClock
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+
+class SimulationClockTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SimulationClock. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	START_TIME = datetime(2024, 6, 1, tzinfo = timezone.utc).timestamp()
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SimulationClock class...")
+		
+	def setUp(self):
+		self.clock = SimulationClock()
+		self.scheduler = None
+
+	def tearDown(self):
+		# restore the (shared) clock to real time for the other tests
+		self.clock.stopClock()
+		
+		if self.scheduler:
+			self.scheduler.shutdown()
+		
+		self.clock.configure(mode = SimulationClock.REAL_TIME_MODE)
+	
+	def testSteppedAdvanceRunsJobsInOrder(self):
+		self.clock.configure(mode = SimulationClock.STEPPED_TIME_MODE, startTime = self.START_TIME)
+		
+		runTimes = []
+		
+		self.scheduler = self.clock.createScheduler()
+		self.scheduler.add_job(lambda: runTimes.append(('a', self.clock.monotonic())), 'interval', seconds = 10)
+		self.scheduler.add_job(lambda: runTimes.append(('b', self.clock.monotonic())), 'interval', seconds = 25)
+		
+		self.assertIsInstance(self.scheduler, ClockScheduler)
+		self.assertEqual(self.clock.advance(100.0), 0)
+		
+		self.scheduler.start()
+		
+		self.assertEqual(self.clock.advance(100.0), 14)
+		self.assertEqual([t for name, t in runTimes if name == 'a'], [110.0 + i * 10.0 for i in range(10)])
+		self.assertEqual([t for name, t in runTimes if name == 'b'], [125.0, 150.0, 175.0, 200.0])
+		self.assertEqual([t for name, t in runTimes], sorted(t for name, t in runTimes))
+		self.assertEqual(self.clock.now(), self.START_TIME + 200.0)
+	
+	def testTimeStampsFollowClock(self):
+		self.clock.configure(mode = SimulationClock.STEPPED_TIME_MODE, startTime = self.START_TIME)
+		self.clock.advance(3600.0)
+		
+		data = SensorData()
+		
+		self.assertEqual(data.getTimeStamp(), '2024-06-01T01:00:00+00:00')
+	
+	def testSimulatedDayRunsFasterThanRealTime(self):
+		self.clock.configure(mode = SimulationClock.STEPPED_TIME_MODE, startTime = self.START_TIME)
+		
+		runTimes = []
+		
+		self.scheduler = self.clock.createScheduler()
+		self.scheduler.add_job(lambda: runTimes.append(self.clock.monotonic()), 'interval', seconds = 60)
+		self.scheduler.start()
+		
+		startTime = time.perf_counter()
+		
+		self.clock.startClock()
+		self.clock.sleep(86400.0)
+		
+		elapsedSecs = time.perf_counter() - startTime
+		
+		logging.info("Ran a simulated day (%d jobs) in %s secs.", len(runTimes), str(elapsedSecs))
+		
+		self.assertGreaterEqual(self.clock.getElapsedSecs(), 86400.0)
+		self.assertGreaterEqual(len(runTimes), 1440)
+		self.assertEqual(runTimes[:3], [60.0, 120.0, 180.0])
+		self.assertLess(elapsedSecs, 30.0)
+	
+	def testScaledTime(self):
+		self.clock.configure(mode = SimulationClock.SCALED_TIME_MODE, timeScale = 100.0, startTime = self.START_TIME)
+		
+		startTime = time.perf_counter()
+		self.clock.sleep(20.0)
+		elapsedSecs = time.perf_counter() - startTime
+		
+		self.assertGreaterEqual(self.clock.getElapsedSecs(), 20.0)
+		self.assertGreaterEqual(elapsedSecs, 0.15)
+		self.assertLess(elapsedSecs, 5.0)
+	
+	def testRealTime(self):
+		self.assertTrue(self.clock.isRealTime())
+		self.assertAlmostEqual(self.clock.now(), time.time(), delta = 1.0)
+		self.assertNotIsInstance(self.clock.createScheduler(), ClockScheduler)
+		
+		with self.assertRaises(RuntimeError):
+			self.clock.advance(1.0)
+	
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,113 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import unittest
+
+from labbenchstudios.pdt.edge.system.AdaptivePollingController import AdaptivePollingController
+
+class AdaptivePollingControllerTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	AdaptivePollingController. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing AdaptivePollingController class...")
+		
+	def setUp(self):
+		self.controller = AdaptivePollingController( \
+			minPollSecs = 1.0, maxPollSecs = 60.0, lowerChangePct = 0.1, upperChangePct = 2.0, maxPendingMessages = 100)
+
+	def tearDown(self):
+		pass
+
+	def testSlowSignalIncreasesInterval(self):
+		self.controller.registerTask(name = 'Pressure', pollSecs = 5.0)
+		
+		for i in range(50):
+			self.controller.updateTask(name = 'Pressure', value = 1013.0, timeSecs = i)
+		
+		self.assertEqual(self.controller.getPollInterval('Pressure'), 60.0)
+		self.assertGreater(len(self.controller.getChangeEvents()), 0)
+		
+	def testFastSignalDecreasesInterval(self):
+		self.controller.registerTask(name = 'WindSpeed', pollSecs = 10.0)
+		
+		for i in range(20):
+			self.controller.updateTask(name = 'WindSpeed', value = 10.0 if i % 2 else 15.0, timeSecs = i)
+		
+		self.assertEqual(self.controller.getPollInterval('WindSpeed'), 1.0)
+		
+	def testStepFromZeroRecovers(self):
+		# a step from 0 shouldn't hold the task at the minimum interval much
+		# longer than a similar step from a non-zero value
+		self.assertLessEqual(self._getStepRecoveryPolls(0.0, 2.0), self._getStepRecoveryPolls(1.0, 2.0) + 1)
+		self.assertLess(self._getStepRecoveryPolls(0.0, 2.0), 15)
+		
+	def testBackpressureIncreasesInterval(self):
+		self.controller.registerTask(name = 'WindSpeed', pollSecs = 4.0)
+		
+		self.controller.updateTask(name = 'WindSpeed', value = 10.0, timeSecs = 0)
+		pollSecs = self.controller.updateTask(name = 'WindSpeed', value = 15.0, pendingMessageCount = 500, timeSecs = 4)
+		
+		self.assertGreater(pollSecs, 4.0)
+		
+	def testIsPollDue(self):
+		self.controller.registerTask(name = 'Temperature', pollSecs = 5.0)
+		
+		self.assertTrue(self.controller.isPollDue('Temperature', timeSecs = 0))
+		self.assertTrue(self.controller.isPollDue('Unregistered', timeSecs = 0))
+		
+		self.controller.updateTask(name = 'Temperature', value = 20.0, timeSecs = 0)
+		
+		self.assertFalse(self.controller.isPollDue('Temperature', timeSecs = 3))
+		self.assertTrue(self.controller.isPollDue('Temperature', timeSecs = 5))
+	
+	def _getStepRecoveryPolls(self, fromValue: float, toValue: float) -> int:
+		"""
+		Polls a value, steps it once, and returns the number of polls
+		after the step until the interval increases from the minimum.
+		
+		"""
+		name = 'Step' + str(fromValue)
+		self.controller.registerTask(name = name, pollSecs = 1.0)
+		self.controller.updateTask(name = name, value = fromValue, timeSecs = 0)
+		
+		for i in range(100):
+			pollSecs = self.controller.updateTask(name = name, value = toValue, timeSecs = 1 + i)
+			
+			if pollSecs > 1.0:
+				return i
+		
+		return 100
+		
+if __name__ == "__main__":
+	unittest.main()
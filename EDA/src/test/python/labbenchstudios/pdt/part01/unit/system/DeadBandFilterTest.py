@@ -0,0 +1,113 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import unittest
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+from labbenchstudios.pdt.edge.system.DeadBandFilter import DeadBandFilter
+
+class DeadBandFilterTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	DeadBandFilter. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing DeadBandFilter class...")
+		
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+
+	def testAbsoluteDeadBand(self):
+		deadBandFilter = DeadBandFilter(absoluteDeadBand = 0.5, percentDeadBand = 0.0, maxSilenceSecs = 0)
+		
+		self.assertTrue(deadBandFilter.isSensorDataReportable(self._createSensorData(20.0), timeSecs = 0))
+		self.assertFalse(deadBandFilter.isSensorDataReportable(self._createSensorData(20.4), timeSecs = 1))
+		
+		# the change is measured from the last reported value, not the last reading
+		self.assertFalse(deadBandFilter.isSensorDataReportable(self._createSensorData(19.6), timeSecs = 2))
+		self.assertTrue(deadBandFilter.isSensorDataReportable(self._createSensorData(20.6), timeSecs = 3))
+		
+		self.assertEqual(deadBandFilter.getReportedCount(), 2)
+		self.assertEqual(deadBandFilter.getSuppressedCount(), 2)
+		
+	def testPercentAndTypeDeadBands(self):
+		deadBandFilter = DeadBandFilter( \
+			absoluteDeadBand = 0.0, percentDeadBand = 1.0, maxSilenceSecs = 0, \
+			typeAbsoluteDeadBands = {ConfigConst.HUMIDITY_SENSOR_TYPE: 5.0}, typePercentDeadBands = {ConfigConst.HUMIDITY_SENSOR_TYPE: 0.0})
+		
+		self.assertTrue(deadBandFilter.isSensorDataReportable(self._createSensorData(100.0), timeSecs = 0))
+		self.assertFalse(deadBandFilter.isSensorDataReportable(self._createSensorData(100.9), timeSecs = 1))
+		self.assertTrue(deadBandFilter.isSensorDataReportable(self._createSensorData(101.1), timeSecs = 2))
+		
+		self.assertTrue(deadBandFilter.isSensorDataReportable(self._createSensorData(40.0, ConfigConst.HUMIDITY_SENSOR_TYPE), timeSecs = 0))
+		self.assertFalse(deadBandFilter.isSensorDataReportable(self._createSensorData(44.0, ConfigConst.HUMIDITY_SENSOR_TYPE), timeSecs = 1))
+		
+	def testHeartbeat(self):
+		deadBandFilter = DeadBandFilter(absoluteDeadBand = 1.0, percentDeadBand = 0.0, maxSilenceSecs = 60)
+		
+		self.assertTrue(deadBandFilter.isReportable(key = 'cpu', values = (10.0,), timeSecs = 0))
+		self.assertFalse(deadBandFilter.isReportable(key = 'cpu', values = (10.0,), timeSecs = 59))
+		self.assertTrue(deadBandFilter.isReportable(key = 'cpu', values = (10.0,), timeSecs = 60))
+		self.assertEqual(deadBandFilter.getHeartbeatCount(), 1)
+		
+	def testMultipleValues(self):
+		deadBandFilter = DeadBandFilter(absoluteDeadBand = 1.0, percentDeadBand = 0.0, maxSilenceSecs = 0)
+		
+		self.assertTrue(deadBandFilter.isReportable(key = 'sysPerf', values = (10.0, 50.0), timeSecs = 0))
+		self.assertFalse(deadBandFilter.isReportable(key = 'sysPerf', values = (10.5, 50.5), timeSecs = 1))
+		self.assertTrue(deadBandFilter.isReportable(key = 'sysPerf', values = (10.5, 52.0), timeSecs = 2))
+		
+	def testDisabledDeadBands(self):
+		deadBandFilter = DeadBandFilter(absoluteDeadBand = 0.0, percentDeadBand = 0.0, maxSilenceSecs = 0)
+		
+		self.assertTrue(deadBandFilter.isReportable(key = 'cpu', values = (10.0,), timeSecs = 0))
+		self.assertTrue(deadBandFilter.isReportable(key = 'cpu', values = (10.0,), timeSecs = 1))
+		
+	def testParseTypeDeadBands(self):
+		typeDeadBands = DeadBandFilter()._parseTypeDeadBands('1013:0.25, 1010:1.0, invalid, ')
+		
+		self.assertEqual(typeDeadBands, {1013: 0.25, 1010: 1.0})
+		
+	def _createSensorData(self, value: float, typeID: int = ConfigConst.TEMP_SENSOR_TYPE) -> SensorData:
+		data = SensorData(name = 'Sensor' + str(typeID), typeID = typeID)
+		data.setDeviceID('device001')
+		data.setValue(value)
+		
+		return data
+	
+if __name__ == "__main__":
+	unittest.main()
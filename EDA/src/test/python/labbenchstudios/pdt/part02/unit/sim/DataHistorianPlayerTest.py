@@ -0,0 +1,211 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+import json
+import logging
+import os
+import tempfile
+import time
+import unittest
+
+from pathlib import Path
+
+from labbenchstudios.pdt.common.SimulationClock import SimulationClock
+
+from labbenchstudios.pdt.edge.simulation.DataHistorianPlayer import DataHistorianPlayer
+
+class DataHistorianPlayerTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	DataHistorianPlayer. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	SIM_TEST_DATA_DIR = Path(__file__).resolve().parents[8] / 'simTestData'
+	
+	TEMP_FILE_NAME     = str(SIM_TEST_DATA_DIR / 'PIOT_SimulatedTestData_IndoorTemperature.json')
+	HUMIDITY_FILE_NAME = str(SIM_TEST_DATA_DIR / 'PIOT_SimulatedTestData_IndoorHumidity.json')
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing DataHistorianPlayer class...")
+		
+	def setUp(self):
+		self.dataList = []
+		
+		with open(self.TEMP_FILE_NAME, 'r') as tempFile:
+			self.tempRecords = json.load(tempFile)['sensorDataList']
+
+	def tearDown(self):
+		# restore the (shared) clock to real time for the other tests
+		clock = SimulationClock()
+		clock.stopClock()
+		clock.configure(mode = SimulationClock.REAL_TIME_MODE)
+	
+	def handleSensorMessage(self, data = None) -> bool:
+		self.dataList.append(data)
+		
+		return True
+	
+	def testStreamParsingInSmallReads(self):
+		# a read size of a few characters splits every record across reads
+		player = self._createPlayer(self.TEMP_FILE_NAME, readSize = 7)
+		
+		self.assertEqual(player.playToOffset(float('inf')), len(self.tempRecords))
+		
+		for data, record in zip(self.dataList, self.tempRecords):
+			self.assertEqual(data.getName(), record['name'])
+			self.assertEqual(data.getTypeID(), record['typeID'])
+			self.assertEqual(data.getValue(), record['value'])
+			self.assertEqual(data.getTimeStamp(), record['timeStamp'])
+	
+	def testRecordingsMergedByTimeOffset(self):
+		player = self._createPlayer([self.TEMP_FILE_NAME, self.HUMIDITY_FILE_NAME])
+		player.playToOffset(float('inf'))
+		
+		timeOffsets = [data.timeOffsetSeconds for data in self.dataList]
+		
+		self.assertGreater(len(self.dataList), len(self.tempRecords))
+		self.assertEqual(timeOffsets, sorted(timeOffsets))
+		self.assertEqual(len({data.getTypeID() for data in self.dataList}), 2)
+	
+	def testSeek(self):
+		player = self._createPlayer(self.TEMP_FILE_NAME)
+		
+		player.seek(1000.0)
+		player.playToOffset(1100.0)
+		
+		expectedRecords = [record for record in self.tempRecords if 1000.0 <= record['timeOffsetSeconds'] <= 1100.0]
+		
+		self.assertEqual([data.getValue() for data in self.dataList], [record['value'] for record in expectedRecords])
+		
+		# seeking backwards re-opens the recording
+		player.seek(0.0)
+		player.playToOffset(0.0)
+		
+		self.assertEqual(self.dataList[-1].getValue(), self.tempRecords[0]['value'])
+	
+	def testBareArrayWithTimeStampsOnly(self):
+		records = [ \
+			{'name': 'TempSensor', 'typeID': 1013, 'timeStamp': '2022-10-29T13:26:08+00:00', 'value': 20.0}, \
+			{'name': 'TempSensor', 'typeID': 1013, 'timeStamp': '2022-10-29T13:26:38+00:00', 'value': 21.0}, \
+			{'name': 'TempSensor', 'typeID': 1013, 'timeStamp': '2022-10-29T13:27:08+00:00', 'value': 22.0}]
+		
+		with tempfile.TemporaryDirectory() as tempDir:
+			fileName = os.path.join(tempDir, 'recording.json')
+			
+			with open(fileName, 'w') as recordingFile:
+				json.dump(records, recordingFile)
+			
+			player = self._createPlayer(fileName)
+			
+			# offsets fall back to the time since the first time stamp
+			self.assertEqual(player.playToOffset(30.0), 2)
+			self.assertEqual(player.playToOffset(60.0), 1)
+	
+	def testThreadedPlayback(self):
+		player = self._createPlayer(self.TEMP_FILE_NAME, speedFactor = DataHistorianPlayer.MAX_SPEED, enableLoop = True)
+		player.startManager()
+		
+		try:
+			self._waitFor(lambda: player.getLoopCount() >= 2)
+			
+			player.pause()
+			recordCount = len(self.dataList)
+			time.sleep(0.1)
+			
+			self.assertEqual(len(self.dataList), recordCount)
+			self.assertEqual(player.getRecordCount(), recordCount)
+			self.assertGreaterEqual(recordCount, 2 * len(self.tempRecords))
+			
+			# at 1000x real time, 200 secs of recording take 0.2 secs
+			player.seek(0.0)
+			player.setSpeedFactor(1000.0)
+			player.resume()
+			
+			self._waitFor(lambda: player.getPlaybackOffset() >= 200.0)
+			
+			self.assertTrue(player.isPlaying())
+			self.assertLess(len(self.dataList) - recordCount, len(self.tempRecords))
+		finally:
+			player.stopManager()
+		
+		self.assertFalse(player.isPlaying())
+	
+	def testSteppedClockPlayback(self):
+		clock = SimulationClock()
+		clock.configure(mode = SimulationClock.STEPPED_TIME_MODE)
+		
+		# at 1x, the 24000 secs of recording play in simulated time, not wall clock time
+		player = self._createPlayer(self.TEMP_FILE_NAME)
+		player.startManager()
+		
+		try:
+			# the clock isn't running, so playback can't move on
+			time.sleep(0.1)
+			
+			self.assertLessEqual(len(self.dataList), 1)
+			self.assertEqual(player.getPlaybackOffset(), 0.0)
+			
+			clock.startClock()
+			
+			self._waitFor(lambda: not player.isPlaying())
+			
+			self.assertEqual(len(self.dataList), len(self.tempRecords))
+			self.assertGreaterEqual(clock.getElapsedSecs(), self.tempRecords[-1]['timeOffsetSeconds'])
+		finally:
+			player.stopManager()
+	
+	def testSteppedClockStopInterruptsPlayback(self):
+		clock = SimulationClock()
+		clock.configure(mode = SimulationClock.STEPPED_TIME_MODE)
+		
+		player = self._createPlayer(self.TEMP_FILE_NAME)
+		player.startManager()
+		time.sleep(0.1)
+		
+		# the player waits on the (stopped) clock - stopping must not wait for it
+		startTime = time.monotonic()
+		player.stopManager()
+		
+		self.assertFalse(player.isPlaying())
+		self.assertLess(time.monotonic() - startTime, 1.0)
+	
+	def _createPlayer(self, fileNames, **kwargs) -> DataHistorianPlayer:
+		return DataHistorianPlayer(fileNames = fileNames, updateTimeStamps = False, dataMsgListener = self, **kwargs)
+	
+	def _waitFor(self, condition, timeoutSecs: float = 10.0):
+		endTime = time.monotonic() + timeoutSecs
+		
+		while not condition():
+			self.assertLess(time.monotonic(), endTime)
+			time.sleep(0.01)
+	
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,106 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+import logging
+import unittest
+
+import numpy as np
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.data.ActuatorData import ActuatorData
+from labbenchstudios.pdt.edge.simulation.EnvironmentPlantModel import EnvironmentPlantModel
+
+class EnvironmentPlantModelTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	EnvironmentPlantModel. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing EnvironmentPlantModel class...")
+		
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+	
+	def testFreeResponseMatchesAnalyticSolution(self):
+		plant = EnvironmentPlantModel(initialTemp = 20.0, outdoorTemp = 10.0)
+		
+		# with the actuators off, T(t) = Tout + (T0 - Tout) * exp(-t * UA / C)
+		timeConstant = EnvironmentPlantModel.DEFAULT_THERMAL_CAPACITANCE / EnvironmentPlantModel.DEFAULT_THERMAL_CONDUCTANCE
+		
+		# variable timesteps give the same result
+		for dtSecs in (1.0, 600.0, 17.5, 3000.0, 1981.5):
+			plant.step(dtSecs)
+		
+		self.assertAlmostEqual(plant.getSimTimeSecs(), 5600.0)
+		self.assertAlmostEqual(plant.getTemperature(), 10.0 + 10.0 * np.exp(-5600.0 / timeConstant))
+		
+	def testActuatorCommandsDriveZones(self):
+		plant = EnvironmentPlantModel(zoneCount = 2, initialTemp = [15.0, 25.0], initialHumidity = 35.0)
+		
+		hvacCmd = ActuatorData(typeID = ConfigConst.HVAC_ACTUATOR_TYPE)
+		hvacCmd.setCommand(ConfigConst.COMMAND_ON)
+		hvacCmd.setValue(21.0)
+		
+		humidifierCmd = ActuatorData(typeID = ConfigConst.HUMIDIFIER_ACTUATOR_TYPE)
+		humidifierCmd.setCommand(ConfigConst.COMMAND_ON)
+		humidifierCmd.setValue(45.0)
+		
+		self.assertTrue(plant.applyActuatorCommand(hvacCmd))
+		self.assertTrue(plant.applyActuatorCommand(humidifierCmd, zoneIndex = 1))
+		self.assertFalse(plant.applyActuatorCommand(ActuatorData(typeID = ConfigConst.LED_DISPLAY_ACTUATOR_TYPE)))
+		
+		times, temps, humidities = plant.run(durationSecs = 8 * 3600.0, stepSecs = 60.0)
+		
+		self.assertEqual(temps.shape, (480, 2))
+		self.assertAlmostEqual(times[-1], 8 * 3600.0)
+		
+		# both zones settle near the HVAC setpoint (within the control band)
+		for temp in temps[-1]:
+			self.assertAlmostEqual(temp, 21.0, delta = EnvironmentPlantModel.DEFAULT_CONTROL_BAND)
+		
+		# only the humidified zone rises toward its setpoint; the other decays toward outdoors
+		self.assertGreater(humidities[-1][1], 40.0)
+		self.assertLess(humidities[-1][0], 35.0)
+		
+		# switching the HVAC off lets the zones drift back toward outdoors
+		hvacCmd.setCommand(ConfigConst.COMMAND_OFF)
+		plant.applyActuatorCommand(hvacCmd)
+		plant.step(4 * 3600.0)
+		
+		self.assertTrue(np.all(plant.getTemperatures() < 17.0))
+		
+if __name__ == "__main__":
+	unittest.main()
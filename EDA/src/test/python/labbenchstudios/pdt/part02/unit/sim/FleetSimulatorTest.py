@@ -0,0 +1,129 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import time
+import unittest
+
+import numpy as np
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.edge.simulation.FleetSimulator import FleetSimulator
+from labbenchstudios.pdt.edge.simulation.SensorDataGenerator import SensorDataGenerator
+
+class FleetSimulatorTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit and benchmark tests
+	for FleetSimulator. It should not be considered complete, but serve
+	as a starting point for the student implementing additional
+	functionality within their Programming the IoT environment.
+	"""
+	
+	BENCHMARK_DEVICE_COUNT = 10000
+	BENCHMARK_STEP_COUNT = 50
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing FleetSimulator class...")
+		
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+	
+	def testStepShapeAndRange(self):
+		fleetSim = FleetSimulator(deviceCount = 50, noiseLevel = SensorDataGenerator.NO_NOISE, randomSeed = 1)
+		
+		values = fleetSim.step()
+		
+		self.assertEqual(values.shape, (50, 3))
+		self.assertEqual(fleetSim.getSensorTypeIDs(), \
+			(ConfigConst.HUMIDITY_SENSOR_TYPE, ConfigConst.PRESSURE_SENSOR_TYPE, ConfigConst.TEMP_SENSOR_TYPE))
+		
+		# without noise, the readings stay within the default curve ranges
+		self.assertTrue(np.all(values[:, 2] >= SensorDataGenerator.LOW_NORMAL_INDOOR_TEMP))
+		self.assertTrue(np.all(values[:, 2] <= SensorDataGenerator.HI_NORMAL_INDOOR_TEMP))
+		
+	def testDevicePhasesDiffer(self):
+		fleetSim = FleetSimulator(deviceCount = 50, noiseLevel = SensorDataGenerator.NO_NOISE, randomSeed = 1)
+		
+		values = fleetSim.step()
+		
+		self.assertGreater(len(np.unique(np.round(values[:, 2], 6))), 1)
+		
+	def testSeededRepeatability(self):
+		valuesA = FleetSimulator(deviceCount = 20, randomSeed = 7).generateBatch(5)
+		valuesB = FleetSimulator(deviceCount = 20, randomSeed = 7).generateBatch(5)
+		
+		np.testing.assert_array_equal(valuesA, valuesB)
+		
+	def testBatchMatchesSteps(self):
+		batchSim = FleetSimulator(deviceCount = 20, noiseLevel = SensorDataGenerator.NO_NOISE, randomSeed = 3)
+		stepSim = FleetSimulator(deviceCount = 20, noiseLevel = SensorDataGenerator.NO_NOISE, randomSeed = 3)
+		
+		batch = batchSim.generateBatch(4)
+		
+		for i in range(4):
+			np.testing.assert_allclose(batch[i], stepSim.step())
+		
+		self.assertEqual(batchSim.getTickCount(), 4)
+		
+	def testCreateSensorData(self):
+		fleetSim = FleetSimulator(deviceCount = 5, randomSeed = 1)
+		
+		values = fleetSim.step()
+		dataList = fleetSim.createSensorData(values)
+		
+		self.assertEqual(len(dataList), 15)
+		self.assertEqual(dataList[0].getDeviceID(), fleetSim.getDeviceIDs()[0])
+		self.assertEqual(dataList[-1].getDeviceID(), fleetSim.getDeviceIDs()[-1])
+		self.assertEqual(dataList[-1].getTypeID(), ConfigConst.TEMP_SENSOR_TYPE)
+		self.assertAlmostEqual(dataList[-1].getValue(), values[-1, 2])
+		
+	def testStepThroughput(self):
+		fleetSim = FleetSimulator(deviceCount = self.BENCHMARK_DEVICE_COUNT, randomSeed = 1)
+		fleetSim.step()
+		
+		startTime = time.perf_counter()
+		
+		for i in range(self.BENCHMARK_STEP_COUNT):
+			fleetSim.step()
+		
+		devicesPerSec = self.BENCHMARK_DEVICE_COUNT * self.BENCHMARK_STEP_COUNT / (time.perf_counter() - startTime)
+		
+		startTime = time.perf_counter()
+		fleetSim.createSensorData(fleetSim.step())
+		
+		pipelineDevicesPerSec = self.BENCHMARK_DEVICE_COUNT / (time.perf_counter() - startTime)
+		
+		logging.info("Fleet step: %.0f devices/sec; SensorData conversion: %.0f devices/sec", devicesPerSec, pipelineDevicesPerSec)
+		
+		self.assertGreater(devicesPerSec, pipelineDevicesPerSec)
+	
+if __name__ == "__main__":
+	unittest.main()
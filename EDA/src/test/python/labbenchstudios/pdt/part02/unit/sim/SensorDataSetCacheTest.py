@@ -0,0 +1,115 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from labbenchstudios.pdt.edge.simulation.SensorDataGenerator import SensorDataGenerator
+from labbenchstudios.pdt.edge.simulation.SensorDataSetCache import SensorDataSetCache
+
+class SensorDataSetCacheTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SensorDataSetCache and its use by SensorDataGenerator. It
+	should not be considered complete, but serve as a starting
+	point for the student implementing additional functionality
+	within their Programming the IoT environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SensorDataSetCache class...")
+		
+	def setUp(self):
+		self.cacheDir = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.cacheDir, ignore_errors = True)
+	
+	def testStoreAndLoadEntries(self):
+		cache = SensorDataSetCache(cacheDir = self.cacheDir)
+		
+		self.assertIsNone(cache.loadEntries(('test', 1)))
+		self.assertTrue(cache.storeEntries(('test', 1), np.arange(5.0), np.arange(5.0) * 2))
+		
+		timeEntries, dataEntries = cache.loadEntries(('test', 1))
+		
+		self.assertIsInstance(dataEntries, np.memmap)
+		self.assertFalse(dataEntries.flags.writeable)
+		np.testing.assert_array_equal(dataEntries, np.arange(5.0) * 2)
+		self.assertEqual(cache.getHitCount(), 1)
+		self.assertEqual(cache.getMissCount(), 1)
+		self.assertNotEqual(cache.getCacheFileName(('test', 1)), cache.getCacheFileName(('test', 2)))
+		
+	def testSeededDataSetCached(self):
+		generator = SensorDataGenerator(cacheDir = self.cacheDir, randomSeed = 42)
+		
+		dataSetA = generator.generateDailyIndoorTemperatureDataSet(useSeconds = True)
+		dataSetB = generator.generateDailyIndoorTemperatureDataSet(useSeconds = True)
+		
+		self.assertEqual(generator.dataSetCache.getHitCount(), 1)
+		self.assertEqual(len(os.listdir(self.cacheDir)), 1)
+		np.testing.assert_array_equal(dataSetA.getDataEntries(), dataSetB.getDataEntries())
+		np.testing.assert_array_equal(dataSetA.getTimeEntries(), dataSetB.getTimeEntries())
+		
+		# the cached entries are used as is (memory-mapped), not copied
+		self.assertIsInstance(dataSetB.getDataEntries(), np.memmap)
+		
+	def testSeededNoiseReproducible(self):
+		dataSetA = SensorDataGenerator(cacheDir = '', randomSeed = 7).generateDailyEnvironmentHumidityDataSet()
+		dataSetB = SensorDataGenerator(cacheDir = '', randomSeed = 7).generateDailyEnvironmentHumidityDataSet()
+		dataSetC = SensorDataGenerator(cacheDir = '', randomSeed = 8).generateDailyEnvironmentHumidityDataSet()
+		
+		np.testing.assert_array_equal(dataSetA.getDataEntries(), dataSetB.getDataEntries())
+		self.assertFalse(np.array_equal(dataSetA.getDataEntries(), dataSetC.getDataEntries()))
+		
+	def testUnseededNoisyDataSetNotCached(self):
+		generator = SensorDataGenerator(cacheDir = self.cacheDir, randomSeed = None)
+		
+		generator.generateDailyIndoorTemperatureDataSet()
+		
+		self.assertEqual(os.listdir(self.cacheDir), [])
+		
+		generator.generateDailyIndoorTemperatureDataSet(noiseLevel = SensorDataGenerator.NO_NOISE)
+		
+		self.assertEqual(len(os.listdir(self.cacheDir)), 1)
+		
+	def testTrendingDataSetCached(self):
+		generator = SensorDataGenerator(cacheDir = self.cacheDir)
+		
+		dataSetA = generator.generateTrendingSensorDataSet(trendUpwards = True, minValue = 20.0, maxValue = 25.0, increment = 0.1, useIncrementForSampleCount = True)
+		dataSetB = generator.generateTrendingSensorDataSet(trendUpwards = True, minValue = 20.0, maxValue = 25.0, increment = 0.1, useIncrementForSampleCount = True)
+		
+		self.assertEqual(generator.dataSetCache.getHitCount(), 1)
+		np.testing.assert_array_equal(dataSetA.getDataEntries(), dataSetB.getDataEntries())
+	
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,109 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import unittest
+
+import numpy as np
+
+from labbenchstudios.pdt.edge.simulation.SensorDataGenerator import SensorDataGenerator
+from labbenchstudios.pdt.edge.simulation.SensorDataGenerator import SensorDataStream
+from labbenchstudios.pdt.edge.simulation.TemperatureSensorSimTask import TemperatureSensorSimTask
+
+class SensorDataStreamTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SensorDataStream. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SensorDataStream class...")
+		
+	def setUp(self):
+		self.dataGenerator = SensorDataGenerator()
+
+	def tearDown(self):
+		pass
+	
+	def testStreamMatchesDataSet(self):
+		for curveType in (SensorDataGenerator.FULL_WAVE, SensorDataGenerator.BELL_CURVE, SensorDataGenerator.INVERSE_CURVE):
+			dataSet = self.dataGenerator.generateDailySensorDataSet( \
+				curveType = curveType, noiseLevel = SensorDataGenerator.NO_NOISE, minValue = 10.0, maxValue = 20.0, startHour = 0, endHour = 24)
+			dataStream = self.dataGenerator.generateDailySensorDataSet( \
+				curveType = curveType, noiseLevel = SensorDataGenerator.NO_NOISE, minValue = 10.0, maxValue = 20.0, startHour = 0, endHour = 24, \
+				chunkSize = 100)
+			
+			self.assertIsInstance(dataStream, SensorDataStream)
+			self.assertEqual(dataStream.getDataEntryCount(), dataSet.getDataEntryCount())
+			
+			streamValues = np.array([dataStream.getDataEntry(i) for i in range(dataStream.getDataEntryCount())])
+			
+			# the stream re-scales using the exact sine range, rather than the sampled range
+			np.testing.assert_allclose(streamValues, dataSet.getDataEntries(), atol = 0.01)
+			self.assertAlmostEqual(dataStream.getTimeEntry(500), dataSet.getTimeEntry(500))
+		
+	def testMemoryBoundedToChunk(self):
+		dataStream = self.dataGenerator.generateDailyIndoorTemperatureDataSet(useSeconds = True, chunkSize = 256)
+		
+		self.assertEqual(dataStream.getDataEntryCount(), 24 * 60 * 60)
+		
+		for i in range(0, dataStream.getDataEntryCount(), 997):
+			dataStream.getDataEntry(i)
+			
+			self.assertLessEqual(dataStream.getDataEntries().size, 256)
+			self.assertLessEqual(dataStream.getTimeEntries().size, 256)
+		
+	def testContinuousAcrossChunks(self):
+		dataStream = self.dataGenerator.generateDailySensorDataSet( \
+			noiseLevel = SensorDataGenerator.NO_NOISE, minValue = 0.0, maxValue = 100.0, startHour = 0, endHour = 24, useSeconds = True, \
+			chunkSize = 64)
+		
+		values = np.array([dataStream.getDataEntry(i) for i in range(1000)])
+		
+		# one second steps: no jumps at the chunk boundaries
+		self.assertLess(np.max(np.abs(np.diff(values))), 0.01)
+		
+	def testSimTaskConsumesStream(self):
+		dataStream = self.dataGenerator.generateDailyIndoorTemperatureDataSet( \
+			minValue = SensorDataGenerator.LOW_NORMAL_INDOOR_TEMP, maxValue = SensorDataGenerator.HI_NORMAL_INDOOR_TEMP, chunkSize = 50)
+		
+		simTask = TemperatureSensorSimTask(dataSet = dataStream)
+		
+		for i in range(dataStream.getDataEntryCount() + 10):
+			sd = simTask.generateTelemetry()
+			
+			self.assertGreater(sd.getValue(), SensorDataGenerator.MIN_INDOOR_TEMP)
+			self.assertLess(sd.getValue(), SensorDataGenerator.MAX_INDOOR_TEMP)
+		
+		# the task rolled over to the start of the data set
+		self.assertEqual(simTask.dataSetIndex, 11)
+	
+if __name__ == "__main__":
+	unittest.main()
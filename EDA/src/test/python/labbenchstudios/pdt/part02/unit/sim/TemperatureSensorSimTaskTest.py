@@ -27,6 +27,7 @@ import unittest
 
 import labbenchstudios.pdt.common.ConfigConst as ConfigConst
 
+from labbenchstudios.pdt.edge.simulation.SensorDataGenerator import SensorDataGenerator
 from labbenchstudios.pdt.edge.simulation.TemperatureSensorSimTask import TemperatureSensorSimTask
 
 class TemperatureSensorSimTaskTest(unittest.TestCase):
@@ -64,6 +65,31 @@ class TemperatureSensorSimTaskTest(unittest.TestCase):
 		
 		self.assertGreater(val, 0.0)
 		logging.info("Temperature data: %f", val)
+		
+	def testSetTargetValue(self):
+		simTask = TemperatureSensorSimTask(dataSet = SensorDataGenerator().generateDailyIndoorTemperatureDataSet())
+		startVal = simTask.getTelemetryValue()
+		targetVal = startVal + 1.0
+		
+		# rate limited ramp, then hold at the target
+		simTask.setTargetValue(targetVal = targetVal, maxStep = 0.25)
+		
+		self.assertEqual(simTask.getTargetValue(), targetVal)
+		
+		for i in range(1, 5):
+			self.assertAlmostEqual(simTask.generateTelemetry().getValue(), startVal + i * 0.25)
+		
+		self.assertAlmostEqual(simTask.generateTelemetry().getValue(), targetVal)
+		
+		# retargeting mid-ramp continues from the current value, with a first order response
+		simTask.setTargetValue(targetVal = startVal, responseFactor = 0.5)
+		
+		self.assertAlmostEqual(simTask.generateTelemetry().getValue(), startVal + 0.5)
+		self.assertAlmostEqual(simTask.generateTelemetry().getValue(), startVal + 0.25)
+		
+		simTask.clearTargetValue()
+		
+		self.assertIsNone(simTask.getTargetValue())
 
 if __name__ == "__main__":
 	unittest.main()
@@ -0,0 +1,130 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+import logging
+import time
+import unittest
+
+from labbenchstudios.pdt.edge.simulation.WorkcellEventSimulator import WorkcellEventSimulator
+
+class WorkcellEventSimulatorTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	WorkcellEventSimulator. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing WorkcellEventSimulator class...")
+		
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+	
+	def testItemsAreConserved(self):
+		workcellSim = self._createWorkcellSim(arrivalRate = 50.0, mtbfSecs = 1800.0, mttrSecs = 300.0)
+		workcellSim.run(4 * 3600.0)
+		
+		self.assertGreater(workcellSim.getItemsProduced(), 0)
+		self.assertGreater(workcellSim.getItemsLost(), 0)
+		self.assertEqual( \
+			workcellSim.getItemsProduced() + workcellSim.getWorkInProgress() + workcellSim.getItemsLost(), \
+			workcellSim.getItemsArrived())
+	
+	def testUtilizationMatchesThroughput(self):
+		workcellSim = self._createWorkcellSim(arrivalRate = 20.0)
+		workcellSim.run(600.0)
+		workcellSim.resetStatistics()
+		workcellSim.run(8 * 3600.0)
+		
+		throughput = workcellSim.getThroughput()
+		utilizations = workcellSim.getUtilizations()
+		
+		logging.info("Throughput: %s items/min, utilizations: %s", str(throughput), str(utilizations))
+		
+		# no failures or losses, so throughput tracks the arrival rate,
+		# and each station is busy for its service time per item
+		self.assertAlmostEqual(throughput, 20.0, delta = 1.0)
+		
+		for name, serviceTimeSecs in (('hopper', 1.0), ('robot', 2.0)):
+			self.assertAlmostEqual(utilizations[name], throughput * serviceTimeSecs / 60.0, delta = 0.02)
+		
+		self.assertGreater(workcellSim.getAverageWorkInProgress(), 0.0)
+		self.assertGreater(workcellSim.getAveragePowerDraw(), 0.2)
+		self.assertLess(workcellSim.getAveragePowerDraw(), 2.0)
+	
+	def testPausedArrivals(self):
+		workcellSim = self._createWorkcellSim(arrivalRate = 30.0)
+		workcellSim.run(600.0)
+		workcellSim.setArrivalRate(0.0)
+		
+		# the items already in the workcell finish, then nothing is produced
+		workcellSim.run(600.0)
+		itemsArrived = workcellSim.getItemsArrived()
+		itemsProduced = workcellSim.getItemsProduced()
+		
+		workcellSim.run(3600.0)
+		
+		self.assertEqual(workcellSim.getWorkInProgress(), 0)
+		self.assertEqual(workcellSim.getItemsArrived(), itemsArrived)
+		self.assertEqual(workcellSim.getItemsProduced(), itemsProduced)
+		
+		workcellSim.setArrivalRate(30.0)
+		workcellSim.run(600.0)
+		
+		self.assertGreater(workcellSim.getItemsProduced(), itemsProduced)
+	
+	def testSimulationRate(self):
+		workcellSim = self._createWorkcellSim(arrivalRate = 30.0, mtbfSecs = 8 * 3600.0, mttrSecs = 900.0)
+		simHours = 10
+		
+		startTime = time.perf_counter()
+		eventCount = workcellSim.run(simHours * 3600.0)
+		elapsedSecs = time.perf_counter() - startTime
+		
+		logging.info( \
+			"Simulated %s hours (%s events) in %s secs: %s simulated hours per second.", \
+			str(simHours), str(eventCount), str(elapsedSecs), str(simHours / elapsedSecs))
+		
+		self.assertGreater(eventCount, 0)
+		
+	def _createWorkcellSim(self, arrivalRate: float, mtbfSecs: float = 0.0, mttrSecs: float = 0.0) -> WorkcellEventSimulator:
+		workcellSim = WorkcellEventSimulator(arrivalRate = arrivalRate, randomSeed = 42)
+		workcellSim.addStation('hopper', serviceTimeSecs = 1.0, bufferCapacity = 10, idlePower = 0.1, busyPower = 0.4)
+		workcellSim.addStation( \
+			'robot', serviceTimeSecs = 2.0, bufferCapacity = 5, \
+			mtbfSecs = mtbfSecs, mttrSecs = mttrSecs, idlePower = 0.5, busyPower = 1.5)
+		
+		return workcellSim
+	
+if __name__ == "__main__":
+	unittest.main()
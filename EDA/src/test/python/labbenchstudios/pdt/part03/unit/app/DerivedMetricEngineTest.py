@@ -0,0 +1,123 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import unittest
+
+import numpy as np
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+from labbenchstudios.pdt.edge.app.DerivedMetricEngine import DerivedMetricEngine
+
+class DerivedMetricEngineTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	DerivedMetricEngine. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing DerivedMetricEngine class...")
+		
+	def setUp(self):
+		self.engine = DerivedMetricEngine()
+		self.engine.addEnvironmentalMetrics()
+		self.engine.addWindTurbineMetrics(airDensity = 1.225, rotorSweptArea = 50.0, maxPowerCoeff = 0.35, ratedWindSpeed = 12.0)
+
+	def tearDown(self):
+		pass
+	
+	def testDewPointAndHeatIndex(self):
+		self.assertAlmostEqual(self.engine.calculateDewPoint(25.0, 60.0), 16.69, places = 2)
+		self.assertAlmostEqual(self.engine.calculateHeatIndex(32.0, 70.0), 40.41, places = 2)
+		
+	def testRecomputeOnlyOnInputChange(self):
+		self.assertEqual(self.engine.processSensorData(self._createSensorData(ConfigConst.TEMP_SENSOR_TYPE, 25.0)), [])
+		
+		derivedDataList = self.engine.processSensorData(self._createSensorData(ConfigConst.HUMIDITY_SENSOR_TYPE, 60.0))
+		derivedTypeIDs = {data.getTypeID(): data for data in derivedDataList}
+		
+		self.assertEqual(set(derivedTypeIDs), {ConfigConst.DEW_POINT_SENSOR_TYPE, ConfigConst.HEAT_INDEX_SENSOR_TYPE})
+		self.assertAlmostEqual(derivedTypeIDs[ConfigConst.DEW_POINT_SENSOR_TYPE].getValue(), 16.69, places = 2)
+		self.assertEqual(derivedTypeIDs[ConfigConst.DEW_POINT_SENSOR_TYPE].getDeviceID(), 'device001')
+		
+		# unchanged inputs: nothing to recompute
+		self.assertEqual(self.engine.processSensorData(self._createSensorData(ConfigConst.HUMIDITY_SENSOR_TYPE, 60.0)), [])
+		self.assertEqual(len(self.engine.processSensorData(self._createSensorData(ConfigConst.TEMP_SENSOR_TYPE, 26.0))), 2)
+		
+		# unrelated types and other devices don't trigger anything
+		self.assertEqual(self.engine.processSensorData(self._createSensorData(ConfigConst.PRESSURE_SENSOR_TYPE, 1013.0)), [])
+		self.assertEqual(self.engine.processSensorData(self._createSensorData(ConfigConst.HUMIDITY_SENSOR_TYPE, 50.0, 'device002')), [])
+		
+	def testWindTurbineMetrics(self):
+		ratedPower = 0.35 * (1.225 / 2.0) * 50.0 * pow(12.0, 3)
+		
+		derivedDataList = self.engine.processSensorData( \
+			self._createSensorData(ConfigConst.WIND_TURBINE_POWER_OUTPUT_SENSOR_TYPE, ratedPower / 2.0))
+		
+		self.assertEqual(len(derivedDataList), 1)
+		self.assertEqual(derivedDataList[0].getTypeID(), ConfigConst.WIND_TURBINE_CAPACITY_FACTOR_SENSOR_TYPE)
+		self.assertAlmostEqual(derivedDataList[0].getValue(), 0.5)
+		
+	def testEvaluateBatch(self):
+		temps = np.array([20.0, 25.0, 30.0])
+		humidities = np.array([40.0, 60.0, 80.0])
+		
+		dewPoints = self.engine.evaluateBatch( \
+			name = ConfigConst.DEW_POINT_NAME, \
+			inputs = {ConfigConst.TEMP_SENSOR_TYPE: temps, ConfigConst.HUMIDITY_SENSOR_TYPE: humidities})
+		
+		self.assertEqual(dewPoints.shape, (3,))
+		self.assertAlmostEqual(dewPoints[1], self.engine.calculateDewPoint(25.0, 60.0))
+		
+		powerCoeffs = self.engine.evaluateBatch( \
+			name = ConfigConst.POWER_COEFF_NAME, \
+			inputs = { \
+				ConfigConst.WIND_TURBINE_POWER_OUTPUT_SENSOR_TYPE: [0.0, 1000.0], \
+				ConfigConst.WIND_TURBINE_AIR_SPEED_SENSOR_TYPE: [0.0, 8.0]})
+		
+		self.assertEqual(powerCoeffs[0], 0.0)
+		self.assertGreater(powerCoeffs[1], 0.0)
+		self.assertIsNone(self.engine.evaluateBatch(name = ConfigConst.DEW_POINT_NAME, inputs = {ConfigConst.TEMP_SENSOR_TYPE: temps}))
+		
+	def testInvalidMetric(self):
+		self.assertFalse(self.engine.addMetric(name = ConfigConst.DEW_POINT_NAME, typeID = 9999, inputTypeIDs = (1,), calcFunc = abs))
+		self.assertFalse(self.engine.addMetric(name = 'SelfReference', typeID = 1, inputTypeIDs = (1,), calcFunc = abs))
+		
+	def _createSensorData(self, typeID: int, value: float, deviceID: str = 'device001') -> SensorData:
+		data = SensorData(name = 'Sensor' + str(typeID), typeID = typeID)
+		data.setDeviceID(deviceID)
+		data.setValue(value)
+		
+		return data
+	
+if __name__ == "__main__":
+	unittest.main()
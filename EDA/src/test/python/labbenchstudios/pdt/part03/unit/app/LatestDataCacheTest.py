@@ -0,0 +1,128 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import threading
+import unittest
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+from labbenchstudios.pdt.edge.app.LatestDataCache import LatestDataCache
+
+class LatestDataCacheTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	LatestDataCache. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing LatestDataCache class...")
+		
+	def setUp(self):
+		self.cache = LatestDataCache(maxEntries = 64, stripeCount = 4)
+
+	def tearDown(self):
+		pass
+	
+	def testLookupByNameAndDeviceType(self):
+		first = self._createSensorData('device001', ConfigConst.TEMP_SENSOR_TYPE, 20.0)
+		second = self._createSensorData('device001', ConfigConst.TEMP_SENSOR_TYPE, 21.0)
+		other = self._createSensorData('device002', ConfigConst.HUMIDITY_SENSOR_TYPE, 40.0)
+		
+		self.assertTrue(self.cache.storeData(first))
+		self.assertTrue(self.cache.storeData(second))
+		self.assertTrue(self.cache.storeData(other))
+		self.assertFalse(self.cache.storeData(None))
+		
+		self.assertIs(self.cache.getDataByName(first.getName()), second)
+		self.assertIs(self.cache.getDataByDeviceAndType('device001', ConfigConst.TEMP_SENSOR_TYPE), second)
+		self.assertIs(self.cache.getDataByDeviceAndType('device002', ConfigConst.HUMIDITY_SENSOR_TYPE), other)
+		self.assertIsNone(self.cache.getDataByDeviceAndType('device003', ConfigConst.TEMP_SENSOR_TYPE))
+		self.assertIsNone(self.cache.getDataByName(None))
+		
+	def testEviction(self):
+		for i in range(200):
+			self.cache.storeData(self._createSensorData('device' + str(i), i, float(i)))
+		
+		self.assertLessEqual(self.cache.getSize(), 64)
+		self.assertGreater(self.cache.getEvictionCount(), 0)
+		
+		# the most recent entry is never evicted
+		self.assertIsNotNone(self.cache.getDataByDeviceAndType('device199', 199))
+		
+	def testSnapshotSharesItems(self):
+		data = self._createSensorData('device001', ConfigConst.TEMP_SENSOR_TYPE, 20.0)
+		self.cache.storeData(data)
+		
+		snapshot = self.cache.getDeviceAndTypeSnapshot()
+		
+		self.assertIs(snapshot[('device001', ConfigConst.TEMP_SENSOR_TYPE)], data)
+		self.assertIs(self.cache.getNameSnapshot()[data.getName()], data)
+		
+		# later updates don't change an existing snapshot
+		self.cache.storeData(self._createSensorData('device001', ConfigConst.TEMP_SENSOR_TYPE, 22.0))
+		self.assertIs(snapshot[('device001', ConfigConst.TEMP_SENSOR_TYPE)], data)
+		
+	def testConcurrentAccess(self):
+		errors = []
+		
+		def writer(offset: int):
+			for i in range(2000):
+				self.cache.storeData(self._createSensorData('device' + str(offset), i % 32, float(i)))
+		
+		def reader():
+			try:
+				for i in range(2000):
+					self.cache.getDataByDeviceAndType('device0', i % 32)
+					self.cache.getNameSnapshot()
+			except Exception as e:
+				errors.append(e)
+		
+		threads = [threading.Thread(target = writer, args = (i,)) for i in range(2)] + [threading.Thread(target = reader) for i in range(2)]
+		
+		for t in threads:
+			t.start()
+		
+		for t in threads:
+			t.join()
+		
+		self.assertEqual(errors, [])
+		self.assertLessEqual(len(self.cache.getDeviceAndTypeSnapshot()), 64)
+		
+	def _createSensorData(self, deviceID: str, typeID: int, value: float) -> SensorData:
+		data = SensorData(name = 'Sensor' + str(typeID), typeID = typeID)
+		data.setDeviceID(deviceID)
+		data.setValue(value)
+		
+		return data
+	
+if __name__ == "__main__":
+	unittest.main()
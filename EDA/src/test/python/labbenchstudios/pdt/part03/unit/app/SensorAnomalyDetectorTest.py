@@ -0,0 +1,121 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import unittest
+
+import numpy as np
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+from labbenchstudios.pdt.edge.app.SensorAnomalyDetector import SensorAnomalyDetector
+
+class SensorAnomalyDetectorTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SensorAnomalyDetector. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SensorAnomalyDetector class...")
+		
+	def setUp(self):
+		rng = np.random.default_rng(seed = 42)
+		
+		self.values = rng.normal(loc = 20.0, scale = 0.5, size = 2000)
+		self.values[[300, 1200]] += 10.0
+		self.values[1500:1540] = self.values[1500]
+
+	def tearDown(self):
+		pass
+	
+	def testEwmaOutlierFlagsSensorData(self):
+		detector = SensorAnomalyDetector(stuckSampleCount = 0)
+		
+		for value in self.values[0:300]:
+			self.assertEqual(detector.processSensorData(self._createSensorData(value)), ConfigConst.DEFAULT_STATUS)
+		
+		data = self._createSensorData(self.values[300])
+		
+		self.assertEqual(detector.processSensorData(data), ConfigConst.OUTLIER_ANOMALY_STATUS)
+		self.assertEqual(data.getStatusCode(), ConfigConst.OUTLIER_ANOMALY_STATUS)
+		self.assertTrue(data.hasErrorFlag())
+		self.assertEqual(detector.getOutlierCount(), 1)
+		
+	def testStreamsTrackedPerDeviceAndType(self):
+		detector = SensorAnomalyDetector(warmupSamples = 10, stuckSampleCount = 0)
+		
+		for value in self.values[0:100]:
+			detector.processSensorData(self._createSensorData(value, 'device001'))
+		
+		# a new stream is still warming up, so isn't flagged
+		self.assertEqual(detector.processSensorData(self._createSensorData(100.0, 'device002')), ConfigConst.DEFAULT_STATUS)
+		self.assertEqual(detector.processSensorData(self._createSensorData(100.0, 'device001')), ConfigConst.OUTLIER_ANOMALY_STATUS)
+		self.assertEqual(detector.getStreamCount(), 2)
+		
+	def testStuckSensor(self):
+		detector = SensorAnomalyDetector(stuckSampleCount = 5)
+		statusCodes = [detector.processValue('stream', 20.0) for i in range(6)]
+		
+		self.assertEqual(statusCodes.count(ConfigConst.STUCK_SENSOR_ANOMALY_STATUS), 2)
+		self.assertEqual(statusCodes[4], ConfigConst.STUCK_SENSOR_ANOMALY_STATUS)
+		self.assertEqual(detector.processValue('stream', 21.0), ConfigConst.DEFAULT_STATUS)
+		
+	def testMadOutlier(self):
+		detector = SensorAnomalyDetector(detectionMethod = ConfigConst.MAD_DETECTION_METHOD, stuckSampleCount = 0)
+		statusCodes = [detector.processValue('stream', value) for value in self.values[0:1300]]
+		
+		self.assertEqual(statusCodes[300], ConfigConst.OUTLIER_ANOMALY_STATUS)
+		self.assertEqual(statusCodes[1200], ConfigConst.OUTLIER_ANOMALY_STATUS)
+		
+	def testBackfillMatchesStreaming(self):
+		for method in (ConfigConst.EWMA_DETECTION_METHOD, ConfigConst.MAD_DETECTION_METHOD):
+			detector = SensorAnomalyDetector(detectionMethod = method)
+			
+			streamed = [detector.processValue('stream', value) for value in self.values]
+			backfilled = detector.backfillValues(self.values)
+			
+			self.assertEqual(backfilled.tolist(), streamed)
+			self.assertIn(ConfigConst.STUCK_SENSOR_ANOMALY_STATUS, streamed)
+			
+	def testInvalidMethod(self):
+		with self.assertRaises(ValueError):
+			SensorAnomalyDetector(detectionMethod = 'unknown')
+		
+	def _createSensorData(self, value: float, deviceID: str = 'device001') -> SensorData:
+		data = SensorData(name = ConfigConst.TEMP_SENSOR_NAME, typeID = ConfigConst.TEMP_SENSOR_TYPE)
+		data.setDeviceID(deviceID)
+		data.setValue(value)
+		
+		return data
+	
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,110 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import unittest
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+from labbenchstudios.pdt.edge.app.SensorDataRollupProcessor import SensorDataRollupProcessor
+
+class SensorDataRollupProcessorTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SensorDataRollupProcessor. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	WINDOW_SECS = 60
+	BASE_TIME = '2024-01-01T00:00:00+00:00'
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SensorDataRollupProcessor class...")
+		
+	def setUp(self):
+		self.processor = SensorDataRollupProcessor(windowSecs = self.WINDOW_SECS)
+
+	def tearDown(self):
+		pass
+	
+	def testSingleWindowRollup(self):
+		for secs, val in [(0, 10.0), (15, 30.0), (59, 20.0)]:
+			self.assertEqual(self.processor.processSensorData(self._createSensorData(secs, val)), [])
+		
+		# first reading in the next window closes the previous one
+		rollups = self.processor.processSensorData(self._createSensorData(60, 99.0))
+		
+		self.assertEqual(len(rollups), 1)
+		
+		rollup = rollups[0]
+		
+		self.assertEqual(rollup.getMinValue(), 10.0)
+		self.assertEqual(rollup.getMaxValue(), 30.0)
+		self.assertEqual(rollup.getMeanValue(), 20.0)
+		self.assertEqual(rollup.getSampleCount(), 3)
+		self.assertEqual(rollup.getWindowSecs(), self.WINDOW_SECS)
+		self.assertEqual(rollup.getWindowStartMillis(), 1704067200000)
+		self.assertEqual(rollup.getTypeID(), ConfigConst.TEMP_SENSOR_TYPE)
+		
+		logging.info("Rollup: " + str(rollup))
+	
+	def testWindowsKeyedByType(self):
+		self.processor.processSensorData(self._createSensorData(0, 10.0))
+		self.processor.processSensorData(self._createSensorData(0, 40.0, typeID = ConfigConst.HUMIDITY_SENSOR_TYPE))
+		
+		self.assertEqual(self.processor.getOpenWindowCount(), 2)
+		
+		rollups = self.processor.flushRollups()
+		
+		self.assertEqual(len(rollups), 2)
+		self.assertEqual(self.processor.getOpenWindowCount(), 0)
+	
+	def testLateReadingDropped(self):
+		self.processor.processSensorData(self._createSensorData(120, 10.0))
+		
+		self.assertEqual(self.processor.processSensorData(self._createSensorData(30, 50.0)), [])
+		self.assertEqual(self.processor.getLateReadingCount(), 1)
+		
+		rollup = self.processor.flushRollups()[0]
+		
+		self.assertEqual(rollup.getSampleCount(), 1)
+		self.assertEqual(rollup.getMaxValue(), 10.0)
+	
+	def _createSensorData(self, offsetSecs: int, val: float, typeID: int = ConfigConst.TEMP_SENSOR_TYPE) -> SensorData:
+		sd = SensorData(typeCategoryID = ConfigConst.ENV_TYPE_CATEGORY, typeID = typeID, name = ConfigConst.TEMP_SENSOR_NAME)
+		sd.setValue(val)
+		
+		# pin the timestamp so the window boundaries are deterministic
+		sd.timeStamp = '2024-01-01T00:%02d:%02d+00:00' % (offsetSecs // 60, offsetSecs % 60)
+		
+		return sd
+
+if __name__ == "__main__":
+	unittest.main()
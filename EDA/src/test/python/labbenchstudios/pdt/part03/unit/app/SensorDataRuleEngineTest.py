@@ -0,0 +1,173 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+from labbenchstudios.pdt.edge.app.DurationRule import DurationRule
+from labbenchstudios.pdt.edge.app.HysteresisRule import HysteresisRule
+from labbenchstudios.pdt.edge.app.RateOfChangeRule import RateOfChangeRule
+from labbenchstudios.pdt.edge.app.SensorDataRuleEngine import SensorDataRuleEngine
+from labbenchstudios.pdt.edge.app.ThresholdRule import ThresholdRule
+
+class SensorDataRuleEngineTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SensorDataRuleEngine and its rules. It should not be considered
+	complete, but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SensorDataRuleEngine class...")
+		
+	def setUp(self):
+		self.ruleEngine = SensorDataRuleEngine()
+
+	def tearDown(self):
+		pass
+	
+	def testThresholdRuleTransitionsOnly(self):
+		rule = ThresholdRule(name = 'Cooling', typeID = ConfigConst.TEMP_SENSOR_TYPE, operator = '>', threshold = 25.0, onValue = 25.0)
+		
+		self.assertIsNone(rule.processSensorData(self._createSensorData(20.0), 0))
+		
+		ad = rule.processSensorData(self._createSensorData(26.0), 1000)
+		
+		self.assertIsNotNone(ad)
+		self.assertEqual(ad.getCommand(), ConfigConst.COMMAND_ON)
+		self.assertEqual(ad.getValue(), 25.0)
+		
+		# still above the threshold: no new command
+		self.assertIsNone(rule.processSensorData(self._createSensorData(27.0), 2000))
+		
+		ad = rule.processSensorData(self._createSensorData(24.0), 3000)
+		
+		self.assertEqual(ad.getCommand(), ConfigConst.COMMAND_OFF)
+		
+	def testHysteresisRule(self):
+		rule = HysteresisRule(name = 'Heating', typeID = ConfigConst.TEMP_SENSOR_TYPE, onThreshold = 18.0, offThreshold = 20.0)
+		
+		self.assertIsNone(rule.processSensorData(self._createSensorData(19.0), 0))
+		self.assertEqual(rule.processSensorData(self._createSensorData(17.5), 1000).getCommand(), ConfigConst.COMMAND_ON)
+		
+		# inside the dead band: stays on
+		self.assertIsNone(rule.processSensorData(self._createSensorData(19.5), 2000))
+		self.assertEqual(rule.processSensorData(self._createSensorData(20.5), 3000).getCommand(), ConfigConst.COMMAND_OFF)
+		
+	def testRateOfChangeRule(self):
+		rule = RateOfChangeRule(name = 'RapidRise', typeID = ConfigConst.TEMP_SENSOR_TYPE, operator = '>', rateThreshold = 0.5)
+		
+		self.assertIsNone(rule.processSensorData(self._createSensorData(20.0), 0))
+		self.assertIsNone(rule.processSensorData(self._createSensorData(20.2), 1000))
+		self.assertEqual(rule.processSensorData(self._createSensorData(21.2), 2000).getCommand(), ConfigConst.COMMAND_ON)
+		self.assertEqual(rule.processSensorData(self._createSensorData(21.3), 3000).getCommand(), ConfigConst.COMMAND_OFF)
+		
+	def testDurationRule(self):
+		rule = DurationRule(name = 'SustainedHeat', typeID = ConfigConst.TEMP_SENSOR_TYPE, operator = '>', threshold = 30.0, durationSecs = 5)
+		
+		self.assertIsNone(rule.processSensorData(self._createSensorData(31.0), 0))
+		self.assertIsNone(rule.processSensorData(self._createSensorData(31.0), 4000))
+		self.assertEqual(rule.processSensorData(self._createSensorData(31.0), 5000).getCommand(), ConfigConst.COMMAND_ON)
+		self.assertEqual(rule.processSensorData(self._createSensorData(29.0), 6000).getCommand(), ConfigConst.COMMAND_OFF)
+		
+		# the condition must hold for the full duration again
+		self.assertIsNone(rule.processSensorData(self._createSensorData(31.0), 7000))
+		self.assertFalse(rule.isActive('device001'))
+		
+	def testRuleStatePerDevice(self):
+		rule = ThresholdRule(name = 'Cooling', typeID = ConfigConst.TEMP_SENSOR_TYPE, operator = '>', threshold = 25.0)
+		
+		self.assertIsNotNone(rule.processSensorData(self._createSensorData(26.0, 'device001'), 0))
+		self.assertIsNotNone(rule.processSensorData(self._createSensorData(26.0, 'device002'), 0))
+		self.assertIsNone(rule.processSensorData(self._createSensorData(26.0, 'device001'), 1000))
+		
+	def testEngineEvaluatesRulesByTypeID(self):
+		self.ruleEngine.addRule(ThresholdRule(name = 'Cooling', typeID = ConfigConst.TEMP_SENSOR_TYPE, operator = '>', threshold = 25.0))
+		self.ruleEngine.addRule(ThresholdRule(name = 'Humid', typeID = ConfigConst.HUMIDITY_SENSOR_TYPE, operator = '>', threshold = 60.0))
+		
+		self.assertEqual(self.ruleEngine.getRuleCount(), 2)
+		self.assertTrue(self.ruleEngine.hasRules(ConfigConst.TEMP_SENSOR_TYPE))
+		self.assertFalse(self.ruleEngine.hasRules(ConfigConst.PRESSURE_SENSOR_TYPE))
+		
+		commands = self.ruleEngine.processSensorData(self._createSensorData(30.0))
+		
+		self.assertEqual(len(commands), 1)
+		self.assertEqual(commands[0].getCommand(), ConfigConst.COMMAND_ON)
+		self.assertEqual(self.ruleEngine.processSensorData(self._createSensorData(30.0)), [])
+		
+		self.ruleEngine.clearRules()
+		
+		self.assertEqual(self.ruleEngine.getRuleCount(), 0)
+		
+	def testOffCommandsBeforeOnCommands(self):
+		# cooling is added first, so a naive evaluation order would end with heating's 'off'
+		self.ruleEngine.addRule(ThresholdRule(name = 'HvacCooling', typeID = ConfigConst.TEMP_SENSOR_TYPE, operator = '>', threshold = 25.0))
+		self.ruleEngine.addRule(ThresholdRule(name = 'HvacHeating', typeID = ConfigConst.TEMP_SENSOR_TYPE, operator = '<', threshold = 18.0))
+		
+		self.assertEqual(self.ruleEngine.processSensorData(self._createSensorData(15.0))[-1].getCommand(), ConfigConst.COMMAND_ON)
+		
+		# a single reading jumps from below the floor to above the ceiling
+		commands = self.ruleEngine.processSensorData(self._createSensorData(30.0))
+		
+		self.assertEqual([ad.getCommand() for ad in commands], [ConfigConst.COMMAND_OFF, ConfigConst.COMMAND_ON])
+		self.assertIn('HvacCooling', commands[-1].getStateData())
+		
+	def testLoadRules(self):
+		ruleDefs = { ConfigConst.RULES_PROP: [ \
+			{ConfigConst.RULE_TYPE_PROP: ConfigConst.THRESHOLD_RULE_TYPE, 'name': 'Cooling', 'typeID': ConfigConst.TEMP_SENSOR_TYPE, 'operator': '>', 'threshold': 25.0}, \
+			{ConfigConst.RULE_TYPE_PROP: ConfigConst.HYSTERESIS_RULE_TYPE, 'name': 'Dry', 'typeID': ConfigConst.HUMIDITY_SENSOR_TYPE, 'onThreshold': 30.0, 'offThreshold': 35.0}, \
+			{ConfigConst.RULE_TYPE_PROP: 'Unknown', 'name': 'Bad'}, \
+			{ConfigConst.RULE_TYPE_PROP: ConfigConst.THRESHOLD_RULE_TYPE, 'name': 'BadOperator', 'operator': '!='} ] }
+		
+		with tempfile.TemporaryDirectory() as tempDir:
+			ruleConfigFile = os.path.join(tempDir, 'rules.json')
+			
+			with open(ruleConfigFile, 'w') as f:
+				json.dump(ruleDefs, f)
+			
+			self.assertEqual(self.ruleEngine.loadRules(ruleConfigFile), 2)
+		
+		self.assertTrue(self.ruleEngine.hasRules(ConfigConst.HUMIDITY_SENSOR_TYPE))
+		self.assertEqual(self.ruleEngine.loadRules(ruleConfigFile), 0)
+		
+	def _createSensorData(self, value: float, deviceID: str = 'device001') -> SensorData:
+		data = SensorData(name = ConfigConst.TEMP_SENSOR_NAME, typeID = ConfigConst.TEMP_SENSOR_TYPE)
+		data.setDeviceID(deviceID)
+		data.setValue(value)
+		
+		return data
+	
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,135 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import unittest
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+from labbenchstudios.pdt.edge.app.ForecastThresholdRule import ForecastThresholdRule
+from labbenchstudios.pdt.edge.app.SensorDataRuleEngine import SensorDataRuleEngine
+from labbenchstudios.pdt.edge.app.SensorForecaster import SensorForecaster
+
+class SensorForecasterTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SensorForecaster and ForecastThresholdRule. It should not be
+	considered complete, but serve as a starting point for the student
+	implementing additional functionality within their Programming the
+	IoT environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SensorForecaster class...")
+		
+	def setUp(self):
+		self.forecaster = SensorForecaster(horizonsSecs = (60, 300), minSamples = 5)
+
+	def tearDown(self):
+		pass
+	
+	def testLinearRampForecast(self):
+		# 0.01 deg / sec, sampled every 10 secs
+		for i in range(50):
+			self.forecaster.updateValue(streamKey = 'temp', value = 20.0 + 0.1 * i, timeSecs = 10.0 * i)
+		
+		forecasts = self.forecaster.getForecasts('temp')
+		
+		self.assertAlmostEqual(self.forecaster.getTrend('temp'), 0.01, places = 6)
+		self.assertAlmostEqual(forecasts[60], 24.9 + 0.6, places = 4)
+		self.assertAlmostEqual(forecasts[300], 24.9 + 3.0, places = 4)
+		
+	def testIrregularSampling(self):
+		timeSecs = 0.0
+		
+		for i in range(30):
+			timeSecs += 5.0 if i % 2 else 20.0
+			self.forecaster.updateValue(streamKey = 'temp', value = 0.5 * timeSecs, timeSecs = timeSecs)
+		
+		self.assertAlmostEqual(self.forecaster.getTrend('temp'), 0.5, places = 6)
+		self.assertAlmostEqual(self.forecaster.getForecast('temp', 60), 0.5 * (timeSecs + 60), places = 4)
+		
+	def testMinSamples(self):
+		for i in range(4):
+			self.forecaster.updateValue(streamKey = 'temp', value = 20.0, timeSecs = float(i))
+		
+		self.assertIsNone(self.forecaster.getForecast('temp', 60))
+		self.assertEqual(self.forecaster.getForecasts('temp'), {})
+		
+		self.forecaster.updateValue(streamKey = 'temp', value = 20.0, timeSecs = 4.0)
+		
+		self.assertAlmostEqual(self.forecaster.getForecast('temp', 60), 20.0)
+		
+	def testOutOfOrderReadingIgnored(self):
+		self.forecaster.updateValue(streamKey = 'temp', value = 20.0, timeSecs = 10.0)
+		self.forecaster.updateValue(streamKey = 'temp', value = 50.0, timeSecs = 10.0)
+		self.forecaster.updateValue(streamKey = 'temp', value = 50.0, timeSecs = 5.0)
+		
+		self.assertEqual(self.forecaster.streamStates['temp'].count, 1)
+		self.assertEqual(self.forecaster.streamStates['temp'].level, 20.0)
+		
+	def testProcessSensorDataPerDevice(self):
+		for i in range(5):
+			self.forecaster.processSensorData(self._createSensorData(20.0, 'device001', 10.0 * i))
+			forecasts = self.forecaster.processSensorData(self._createSensorData(30.0, 'device002', 10.0 * i))
+		
+		self.assertEqual(self.forecaster.getStreamCount(), 2)
+		self.assertAlmostEqual(forecasts[300], 30.0)
+		
+	def testForecastRuleTriggersBeforeCrossing(self):
+		rule = ForecastThresholdRule( \
+			name = 'Cooling', typeID = ConfigConst.TEMP_SENSOR_TYPE, operator = '>', threshold = 25.0, \
+			horizonSecs = 300, minSamples = 5, onValue = 25.0)
+		
+		onTimeSecs = None
+		
+		# rising 0.01 deg / sec from 20: crosses 25 at 500 secs
+		for i in range(60):
+			timeSecs = 10.0 * i
+			ad = rule.processSensorData(self._createSensorData(20.0 + 0.01 * timeSecs), int(timeSecs * 1000))
+			
+			if ad and not onTimeSecs:
+				onTimeSecs = timeSecs
+		
+		self.assertIsNotNone(onTimeSecs)
+		self.assertLess(onTimeSecs, 500.0)
+		self.assertGreaterEqual(onTimeSecs, 150.0)
+		
+	def testForecastRuleType(self):
+		self.assertIs(SensorDataRuleEngine.RULE_TYPES[ConfigConst.FORECAST_RULE_TYPE], ForecastThresholdRule)
+		
+	def _createSensorData(self, value: float, deviceID: str = 'device001', offsetSecs: float = 0.0) -> SensorData:
+		data = SensorData(name = ConfigConst.TEMP_SENSOR_NAME, typeID = ConfigConst.TEMP_SENSOR_TYPE)
+		data.setDeviceID(deviceID)
+		data.setValue(value)
+		data.addTimeOffsetSeconds(offsetSecs)
+		
+		return data
+	
+if __name__ == "__main__":
+	unittest.main()
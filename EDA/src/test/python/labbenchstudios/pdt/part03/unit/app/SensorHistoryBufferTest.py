@@ -0,0 +1,115 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import math
+import unittest
+
+import numpy as np
+
+from labbenchstudios.pdt.edge.app.SensorHistoryBuffer import SensorHistoryBuffer
+
+class SensorHistoryBufferTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SensorHistoryBuffer. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	BASE_TIME_MILLIS = 1704067200000
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SensorHistoryBuffer class...")
+		
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+	
+	def testEmptyBuffer(self):
+		shb = SensorHistoryBuffer(capacity = 10, historySecs = 0)
+		timeStamps, values = shb.getWindow()
+		
+		self.assertEqual(len(values), 0)
+		self.assertTrue(math.isnan(shb.getMean()))
+		self.assertTrue(math.isnan(shb.getMin()))
+		self.assertTrue(math.isnan(shb.getSlope()))
+		
+	def testRollingStatsMatchNumpy(self):
+		shb = SensorHistoryBuffer(capacity = 100, historySecs = 0)
+		rng = np.random.default_rng(7)
+		samples = 20.0 + rng.normal(0.0, 2.0, 1000) + np.arange(1000) * 0.01
+		
+		for i, value in enumerate(samples):
+			shb.addSample(timeStampMillis = self.BASE_TIME_MILLIS + i * 1000, value = float(value))
+			
+			if i % 97 == 0 or i == len(samples) - 1:
+				expected = samples[max(0, i - 99):i + 1]
+				
+				self.assertAlmostEqual(shb.getMean(), expected.mean(), places = 9)
+				self.assertAlmostEqual(shb.getMin(), expected.min(), places = 12)
+				self.assertAlmostEqual(shb.getMax(), expected.max(), places = 12)
+				self.assertAlmostEqual(shb.getStdDev(), expected.std(), places = 9)
+				
+				if len(expected) > 1:
+					expectedSlope = np.polyfit(np.arange(len(expected), dtype = float), expected, 1)[0]
+					self.assertAlmostEqual(shb.getSlope(), expectedSlope, places = 9)
+		
+		self.assertEqual(shb.getCount(), 100)
+		
+	def testWindowViewsAreContiguousAndZeroCopy(self):
+		shb = SensorHistoryBuffer(capacity = 50, historySecs = 0)
+		
+		for i in range(137):
+			shb.addSample(timeStampMillis = self.BASE_TIME_MILLIS + i * 1000, value = float(i))
+		
+		timeStamps, values = shb.getWindow()
+		
+		self.assertEqual(values.tolist(), [float(i) for i in range(87, 137)])
+		self.assertTrue(np.all(np.diff(timeStamps) == 1000))
+		self.assertTrue(np.shares_memory(values, shb.values))
+		
+		timeStamps, values = shb.getWindow(windowSecs = 9)
+		
+		self.assertEqual(values.tolist(), [float(i) for i in range(127, 137)])
+		
+	def testTimeBasedEviction(self):
+		shb = SensorHistoryBuffer(capacity = 1000, historySecs = 60)
+		
+		for i in range(300):
+			shb.addSample(timeStampMillis = self.BASE_TIME_MILLIS + i * 1000, value = float(i))
+		
+		self.assertEqual(shb.getCount(), 61)
+		self.assertEqual(shb.getMin(), 239.0)
+		self.assertEqual(shb.getMax(), 299.0)
+		self.assertAlmostEqual(shb.getSlope(), 1.0, places = 9)
+		
+if __name__ == "__main__":
+	unittest.main()
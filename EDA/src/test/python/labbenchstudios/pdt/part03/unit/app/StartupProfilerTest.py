@@ -0,0 +1,76 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import unittest
+
+from labbenchstudios.pdt.edge.app.StartupProfiler import StartupProfiler
+
+class StartupProfilerTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	StartupProfiler. It should not be considered complete, but serve
+	as a starting point for the student implementing additional
+	functionality within their Programming the IoT environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing StartupProfiler class...")
+		
+		self.profiler = StartupProfiler()
+		
+	def testDeviceDataManagerImportSkipsHeavyPackages(self):
+		loadedPackages = self.profiler.getLoadedPackages(StartupProfiler.DEFAULT_MODULE)
+		
+		self.assertIn('labbenchstudios', loadedPackages)
+		
+		for packageName in StartupProfiler.HEAVY_PACKAGES:
+			self.assertNotIn(packageName, loadedPackages)
+		
+	def testProfileImports(self):
+		importTimes = self.profiler.profileImports(StartupProfiler.DEFAULT_MODULE)
+		importNames = [importTime[0] for importTime in importTimes]
+		
+		self.assertIn(StartupProfiler.DEFAULT_MODULE, importNames)
+		
+		# sorted by cumulative time, and cumulative time includes self time
+		for i in range(1, len(importTimes)):
+			self.assertGreaterEqual(importTimes[i - 1][2], importTimes[i][2])
+		
+		for name, selfMicros, cumulativeMicros in importTimes:
+			self.assertGreaterEqual(cumulativeMicros, selfMicros)
+		
+	def testBenchmarkStartup(self):
+		startupTimes = self.profiler.benchmarkStartup(runCount = 2)
+		
+		self.assertEqual(len(startupTimes), 2)
+		
+		for startupTime in startupTimes:
+			self.assertGreater(startupTime, 0.0)
+		
+if __name__ == "__main__":
+	unittest.main()
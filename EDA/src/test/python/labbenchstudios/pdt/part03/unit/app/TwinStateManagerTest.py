@@ -0,0 +1,158 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import json
+import logging
+import threading
+import unittest
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.ResourceNameEnum import ResourceNameEnum
+from labbenchstudios.pdt.data.ActuatorData import ActuatorData
+from labbenchstudios.pdt.data.SensorData import SensorData
+from labbenchstudios.pdt.data.SystemPerformanceData import SystemPerformanceData
+from labbenchstudios.pdt.edge.app.DeviceDataManager import DeviceDataManager
+from labbenchstudios.pdt.edge.app.TwinStateManager import TwinStateManager
+
+class TwinStateManagerTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	TwinStateManager. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing TwinStateManager class...")
+		
+	def setUp(self):
+		self.tsm = TwinStateManager(deviceID = 'edgedevice001')
+
+	def tearDown(self):
+		pass
+	
+	def testVersionedUpdates(self):
+		self.assertEqual(self.tsm.getVersion(), 0)
+		
+		sensorData = SensorData(name = ConfigConst.TEMP_SENSOR_NAME, typeID = ConfigConst.TEMP_SENSOR_TYPE)
+		sensorData.setValue(21.5)
+		
+		actuatorData = ActuatorData(name = ConfigConst.HVAC_ACTUATOR_NAME)
+		actuatorData.setCommand(ConfigConst.COMMAND_ON)
+		
+		self.assertEqual(self.tsm.updateSensorData(sensorData), 1)
+		self.assertEqual(self.tsm.updateActuatorResponse(actuatorData), 2)
+		self.assertEqual(self.tsm.updateSystemPerformanceData(SystemPerformanceData()), 3)
+		self.assertEqual(self.tsm.updateSensorData(None), 3)
+		
+		snapshot = self.tsm.getSnapshot()
+		
+		self.assertEqual(snapshot[ConfigConst.VERSION_PROP], 3)
+		self.assertEqual(snapshot[ConfigConst.SENSOR_DATA_PROP][ConfigConst.TEMP_SENSOR_NAME][ConfigConst.VALUE_PROP], 21.5)
+		self.assertEqual(snapshot[ConfigConst.ACTUATOR_RESPONSES_PROP][ConfigConst.HVAC_ACTUATOR_NAME][ConfigConst.COMMAND_PROP], ConfigConst.COMMAND_ON)
+		
+	def testSnapshotIsolation(self):
+		sensorData = SensorData(name = ConfigConst.TEMP_SENSOR_NAME, typeID = ConfigConst.TEMP_SENSOR_TYPE)
+		sensorData.setValue(20.0)
+		self.tsm.updateSensorData(sensorData)
+		
+		snapshot = self.tsm.getSnapshot()
+		
+		# neither later updates nor changes to the data instance affect the snapshot
+		sensorData.setValue(30.0)
+		self.tsm.updateSensorData(sensorData)
+		
+		self.assertEqual(snapshot[ConfigConst.SENSOR_DATA_PROP][ConfigConst.TEMP_SENSOR_NAME][ConfigConst.VALUE_PROP], 20.0)
+		self.assertEqual(self.tsm.getSnapshot()[ConfigConst.SENSOR_DATA_PROP][ConfigConst.TEMP_SENSOR_NAME][ConfigConst.VALUE_PROP], 30.0)
+		
+		with self.assertRaises(TypeError):
+			snapshot[ConfigConst.SENSOR_DATA_PROP][ConfigConst.TEMP_SENSOR_NAME] = None
+		
+	def testSerialization(self):
+		sensorData = SensorData(name = ConfigConst.TEMP_SENSOR_NAME, typeID = ConfigConst.TEMP_SENSOR_TYPE)
+		sensorData.setValue(22.0)
+		self.tsm.updateSensorData(sensorData)
+		
+		jsonSnapshot = json.loads(self.tsm.getSnapshotAsJson())
+		binarySnapshot = self.tsm.loadSnapshotFromBytes(self.tsm.getSnapshotAsBytes())
+		
+		self.assertEqual(jsonSnapshot, binarySnapshot)
+		self.assertEqual(jsonSnapshot[ConfigConst.DEVICE_ID_PROP], 'edgedevice001')
+		self.assertEqual(jsonSnapshot[ConfigConst.SENSOR_DATA_PROP][ConfigConst.TEMP_SENSOR_NAME][ConfigConst.VALUE_PROP], 22.0)
+		
+	def testConsistentSnapshotsDuringUpdates(self):
+		errors = []
+		isDone = threading.Event()
+		
+		def writer():
+			for i in range(2000):
+				# both sensors always share the same value within a version
+				for name in ('SensorA', 'SensorB'):
+					sensorData = SensorData(name = name)
+					sensorData.setValue(float(i))
+					self.tsm.updateSensorData(sensorData)
+			
+			isDone.set()
+		
+		def reader():
+			while not isDone.is_set():
+				snapshot = self.tsm.getSnapshot()
+				sensors = snapshot[ConfigConst.SENSOR_DATA_PROP]
+				
+				# SensorA is always updated first, so it's never behind SensorB
+				if 'SensorA' in sensors and 'SensorB' in sensors:
+					delta = sensors['SensorA'][ConfigConst.VALUE_PROP] - sensors['SensorB'][ConfigConst.VALUE_PROP]
+					
+					if delta not in (0.0, 1.0):
+						errors.append(delta)
+		
+		threads = [threading.Thread(target = writer), threading.Thread(target = reader)]
+		
+		for t in threads:
+			t.start()
+		
+		for t in threads:
+			t.join()
+		
+		self.assertEqual(errors, [])
+		self.assertEqual(self.tsm.getVersion(), 4000)
+		
+	def testSystemRequestHandling(self):
+		ddm = DeviceDataManager()
+		
+		sensorData = SensorData(name = ConfigConst.TEMP_SENSOR_NAME, typeID = ConfigConst.TEMP_SENSOR_TYPE)
+		ddm.handleSensorMessage(sensorData)
+		
+		self.assertEqual(ddm.getTwinStateSnapshot()[ConfigConst.VERSION_PROP], 1)
+		self.assertTrue(ddm.handleIncomingMessage(ResourceNameEnum.SYSTEM_REQUEST_RESOURCE, ConfigConst.TWIN_STATE_SNAPSHOT_REQUEST))
+		self.assertTrue(ddm.handleIncomingMessage(ResourceNameEnum.SYSTEM_REQUEST_RESOURCE, '{"request": "TwinStateSnapshot", "format": "binary"}'))
+		self.assertFalse(ddm.handleIncomingMessage(ResourceNameEnum.SYSTEM_REQUEST_RESOURCE, 'UnknownRequest'))
+		
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,168 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from datetime import datetime, timedelta, timezone
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.data.ActuatorData import ActuatorData
+from labbenchstudios.pdt.data.SensorData import SensorData
+from labbenchstudios.pdt.data.SystemPerformanceData import SystemPerformanceData
+from labbenchstudios.pdt.edge.connection.FilePersistenceConnector import FilePersistenceConnector
+
+class FilePersistenceConnectorTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	FilePersistenceConnector. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	BASE_TIME = datetime(2024, 1, 1, tzinfo = timezone.utc)
+	READING_COUNT = 20000
+	
+	# a loose floor - well below what the segment writer sustains, so slow CI hosts still pass
+	MIN_READINGS_PER_SEC = 1000
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing FilePersistenceConnector class...")
+		
+	def setUp(self):
+		self.storagePath = tempfile.mkdtemp()
+		self.fpc = FilePersistenceConnector(storagePath = self.storagePath)
+		self.fpc.connectClient()
+
+	def tearDown(self):
+		self.fpc.disconnectClient()
+		shutil.rmtree(self.storagePath, ignore_errors = True)
+	
+	def testStoreAndLoadSensorDataRange(self):
+		for i in range(1000):
+			typeID = ConfigConst.TEMP_SENSOR_TYPE if i % 2 else ConfigConst.HUMIDITY_SENSOR_TYPE
+			self.assertTrue(self.fpc.storeSensorData(data = self._createSensorData(i, typeID)))
+		
+		dataList = \
+			self.fpc.loadSensorData( \
+				typeID = ConfigConst.TEMP_SENSOR_TYPE, \
+				startDate = self.BASE_TIME + timedelta(seconds = 100), \
+				endDate = self.BASE_TIME + timedelta(seconds = 199))
+		
+		self.assertEqual(len(dataList), 50)
+		self.assertIsInstance(dataList[0], SensorData)
+		self.assertEqual(dataList[0].getValue(), 101.0)
+		self.assertEqual(dataList[-1].getValue(), 199.0)
+		self.assertEqual(len(self.fpc.loadSensorData()), 1000)
+	
+	def testSegmentRollover(self):
+		self.fpc.maxSegmentBytes = 4096
+		
+		for i in range(500):
+			self.fpc.storeSensorData(data = self._createSensorData(i))
+		
+		segDir = os.path.join(self.storagePath, ConfigConst.SENSOR_DATA_PERSISTENCE_NAME)
+		segCount = len([f for f in os.listdir(segDir) if f.endswith(FilePersistenceConnector.SEGMENT_FILE_EXT)])
+		
+		self.assertGreater(segCount, 1)
+		
+		dataList = \
+			self.fpc.loadSensorData( \
+				startDate = self.BASE_TIME + timedelta(seconds = 400), endDate = self.BASE_TIME + timedelta(seconds = 409))
+		
+		self.assertEqual([sd.getValue() for sd in dataList], [float(i) for i in range(400, 410)])
+	
+	def testRangeStartsOnDuplicateTimeStamp(self):
+		self.fpc.indexIntervalBytes = 200
+		
+		for i in range(10):
+			self.fpc.storeSensorData(data = self._createSensorData(i))
+		
+		# enough records share one time stamp to span several index entries
+		# (the value is set directly, as setValue() updates the time stamp)
+		for i in range(50):
+			sd = self._createSensorData(10)
+			sd.value = 1000.0 + i
+			self.fpc.storeSensorData(data = sd)
+		
+		self.fpc.storeSensorData(data = self._createSensorData(11))
+		
+		dataList = self.fpc.loadSensorData(startDate = self.BASE_TIME + timedelta(seconds = 10))
+		
+		self.assertEqual(len(dataList), 51)
+		self.assertEqual(dataList[0].getValue(), 1000.0)
+		self.assertEqual(dataList[-1].getValue(), 11.0)
+	
+	def testStoreAndLoadOtherTypes(self):
+		ad = ActuatorData(typeCategoryID = ConfigConst.ENV_TYPE_CATEGORY, typeID = ConfigConst.HVAC_ACTUATOR_TYPE)
+		ad.setCommand(ConfigConst.COMMAND_ON)
+		
+		spd = SystemPerformanceData()
+		spd.setCpuUtilization(12.5)
+		
+		self.assertTrue(self.fpc.storeActuatorData(data = ad))
+		self.assertTrue(self.fpc.storeSystemPerformanceData(data = spd))
+		
+		self.assertEqual(self.fpc.loadActuatorData(typeID = ConfigConst.HVAC_ACTUATOR_TYPE)[0].getCommand(), ConfigConst.COMMAND_ON)
+		self.assertEqual(self.fpc.loadSystemPerformanceData()[0].getCpuUtilization(), 12.5)
+		self.assertEqual(self.fpc.loadConnectionStateData(), [])
+	
+	def testWriteThroughput(self):
+		dataList = [self._createSensorData(i) for i in range(self.READING_COUNT)]
+		
+		startTime = time.perf_counter()
+		
+		for sd in dataList:
+			self.fpc.storeSensorData(data = sd)
+		
+		self.fpc.flush()
+		
+		elapsed = time.perf_counter() - startTime
+		
+		logging.info("Stored %d readings in %f secs (%d readings/sec).", self.READING_COUNT, elapsed, int(self.READING_COUNT / elapsed))
+		
+		storedList = self.fpc.loadSensorData()
+		
+		self.assertEqual(len(storedList), self.READING_COUNT)
+		self.assertEqual(storedList[-1].getValue(), float(self.READING_COUNT - 1))
+		self.assertGreater(self.READING_COUNT / elapsed, self.MIN_READINGS_PER_SEC)
+	
+	def _createSensorData(self, offsetSecs: int, typeID: int = ConfigConst.TEMP_SENSOR_TYPE) -> SensorData:
+		sd = SensorData(typeCategoryID = ConfigConst.ENV_TYPE_CATEGORY, typeID = typeID, name = ConfigConst.TEMP_SENSOR_NAME)
+		sd.setValue(float(offsetSecs))
+		sd.timeStamp = (self.BASE_TIME + timedelta(seconds = offsetSecs)).isoformat()
+		
+		return sd
+
+if __name__ == "__main__":
+	unittest.main()
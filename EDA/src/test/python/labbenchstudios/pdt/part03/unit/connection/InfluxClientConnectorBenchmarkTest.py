@@ -0,0 +1,167 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import time
+import unittest
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+from labbenchstudios.pdt.edge.connection.InfluxClientConnector import InfluxClientConnector
+from labbenchstudios.pdt.edge.connection.LocalTsdbServer import LocalTsdbServer
+
+class InfluxClientConnectorBenchmarkTest(unittest.TestCase):
+	"""
+	This test case class contains very basic benchmark tests for
+	InfluxClientConnector, using LocalTsdbServer as a stand-in for
+	a real InfluxDB server. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	ORG_ID = 'pdt'
+	CLIENT_TOKEN = 'pdt-local-token'
+	SYNC_POINT_COUNT = 500
+	BATCH_POINT_COUNT = 5000
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing InfluxClientConnector against LocalTsdbServer...")
+		
+		# the HTTP client and server are chatty at DEBUG level
+		logging.getLogger('urllib3').setLevel(logging.WARNING)
+		logging.getLogger('influxdb_client').setLevel(logging.WARNING)
+		
+		self.tsdbServer = LocalTsdbServer()
+		self.tsdbServer.startServer()
+		
+	@classmethod
+	def tearDownClass(self):
+		self.tsdbServer.stopServer()
+		
+	def setUp(self):
+		self.tsdbServer.clearData()
+		self.tsdbServer.setLatency(0)
+		self.tsdbServer.setErrorRate(0.0)
+		
+	def testSyncWriteThroughput(self):
+		pointsPerSec = self._runWriteBenchmark(ConfigConst.SYNC_WRITE_MODE, self.SYNC_POINT_COUNT)
+		
+		self.assertEqual(self.tsdbServer.getReceivedPointCount(), self.SYNC_POINT_COUNT)
+		self.assertEqual(self.tsdbServer.getWriteRequestCount(), self.SYNC_POINT_COUNT)
+		self.assertGreater(pointsPerSec, 0)
+		
+	def testBatchWriteThroughput(self):
+		pointsPerSec = self._runWriteBenchmark(ConfigConst.BATCH_WRITE_MODE, self.BATCH_POINT_COUNT)
+		
+		self.assertEqual(self.tsdbServer.getReceivedPointCount(), self.BATCH_POINT_COUNT)
+		self.assertLess(self.tsdbServer.getWriteRequestCount(), self.BATCH_POINT_COUNT)
+		self.assertGreater(pointsPerSec, 0)
+		
+	def testSyncVersusBatchWithLatency(self):
+		self.tsdbServer.setLatency(5)
+		
+		syncPointsPerSec = self._runWriteBenchmark(ConfigConst.SYNC_WRITE_MODE, 100)
+		
+		self.tsdbServer.clearData()
+		
+		batchPointsPerSec = self._runWriteBenchmark(ConfigConst.BATCH_WRITE_MODE, 1000)
+		
+		# with per-request latency, batching should win by a wide margin
+		self.assertGreater(batchPointsPerSec, syncPointsPerSec)
+		
+	def testWriteErrorInjection(self):
+		icc = self._createConnector(ConfigConst.SYNC_WRITE_MODE)
+		icc.connectClient()
+		
+		self.tsdbServer.setErrorRate(1.0)
+		self.assertFalse(icc.storeSensorData(data = self._createSensorData(0)))
+		self.assertEqual(self.tsdbServer.getRejectedRequestCount(), 1)
+		
+		self.tsdbServer.setErrorRate(0.0)
+		self.assertTrue(icc.storeSensorData(data = self._createSensorData(1)))
+		self.assertEqual(self.tsdbServer.getReceivedPointCount(), 1)
+		
+		icc.disconnectClient()
+		
+	def testQueryStoredData(self):
+		icc = self._createConnector(ConfigConst.SYNC_WRITE_MODE)
+		icc.connectClient()
+		
+		for i in range(10):
+			icc.storeSensorData(data = self._createSensorData(i))
+		
+		query = \
+			'from(bucket: "' + icc.sensorDataBucket + '") |> range(start: 0) ' + \
+			'|> filter(fn: (r) => r._measurement == "' + ConfigConst.TEMP_SENSOR_NAME + '") |> limit(n: 5)'
+		
+		tables = icc.dbClientQueryApi.query(query, org = self.ORG_ID)
+		records = [record for table in tables for record in table.records]
+		
+		self.assertEqual(len(records), 5)
+		self.assertEqual(records[0].get_field(), ConfigConst.VALUE_PROP)
+		self.assertEqual(records[0].get_value(), 20.0)
+		
+		icc.disconnectClient()
+		
+	def _createConnector(self, writeMode: str) -> InfluxClientConnector:
+		# spilling would hide rejected writes (and leave a spill file behind)
+		return \
+			InfluxClientConnector( \
+				serverHost = self.tsdbServer.host, serverPort = self.tsdbServer.getPort(), \
+				clientToken = self.CLIENT_TOKEN, orgID = self.ORG_ID, writeMode = writeMode, \
+				enableSpillFile = False)
+	
+	def _createSensorData(self, i: int) -> SensorData:
+		data = SensorData(name = ConfigConst.TEMP_SENSOR_NAME, typeID = ConfigConst.TEMP_SENSOR_TYPE)
+		data.setValue(20.0 + i)
+		
+		return data
+	
+	def _runWriteBenchmark(self, writeMode: str, pointCount: int) -> float:
+		icc = self._createConnector(writeMode)
+		icc.connectClient()
+		
+		dataList = [self._createSensorData(i) for i in range(pointCount)]
+		startTime = time.perf_counter()
+		
+		for data in dataList:
+			icc.storeSensorData(data = data)
+		
+		# disconnecting flushes any pending batches
+		icc.disconnectClient()
+		
+		elapsedSecs = time.perf_counter() - startTime
+		pointsPerSec = pointCount / elapsedSecs
+		
+		logging.info('Write mode %s: %d points in %.3f secs (%.0f points / sec)', writeMode, pointCount, elapsedSecs, pointsPerSec)
+		
+		return pointsPerSec
+	
+if __name__ == "__main__":
+	unittest.main()
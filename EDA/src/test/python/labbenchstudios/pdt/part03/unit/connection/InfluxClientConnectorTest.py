@@ -0,0 +1,154 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from datetime import datetime, timedelta, timezone
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+from labbenchstudios.pdt.edge.connection.InfluxClientConnector import InfluxClientConnector
+
+class InfluxClientConnectorTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for the
+	spill file handling in InfluxClientConnector, using a write API
+	that fails while the server is 'unreachable'. It should not be
+	considered complete, but serve as a starting point for the student
+	implementing additional functionality within their Programming
+	the IoT environment.
+	"""
+	
+	BASE_TIME = datetime(2024, 1, 1, tzinfo = timezone.utc)
+	POINT_COUNT = 50
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing InfluxClientConnector spill file handling...")
+		
+	def setUp(self):
+		self.storagePath = tempfile.mkdtemp()
+		self.writtenLines = []
+		self.writeRequestCount = 0
+		self.isServerUp = True
+		
+		self.icc = \
+			InfluxClientConnector( \
+				serverHost = 'localhost', spillFilePath = os.path.join(self.storagePath, 'spill.lp'))
+		
+		# stand in for the client and write API created by connectClient()
+		self.icc.dbClient = self
+		self.icc.dbClientWriteApi = self
+		
+		self.icc.spillFileMgr.checkIntervalSecs = 0.05
+		self.icc.spillFileMgr.startManager()
+
+	def tearDown(self):
+		self.icc.disconnectClient()
+		shutil.rmtree(self.storagePath, ignore_errors = True)
+	
+	def close(self):
+		pass
+	
+	def ping(self) -> bool:
+		return self.isServerUp
+	
+	def write(self, bucket: str = None, record = None, write_precision = None):
+		self.writeRequestCount += 1
+		
+		if not self.isServerUp:
+			raise ConnectionError('Server unreachable.')
+		
+		lines = record if isinstance(record, list) else [record.to_line_protocol()]
+		self.writtenLines.extend(lines)
+	
+	def testSpillWhileUnreachableAndDrainOnRecovery(self):
+		self.assertTrue(self.icc.storeSensorData(data = self._createSensorData(0)))
+		self.assertEqual(len(self.writtenLines), 1)
+		
+		self.isServerUp = False
+		
+		for i in range(1, self.POINT_COUNT):
+			self.assertTrue(self.icc.storeSensorData(data = self._createSensorData(i)))
+		
+		# only the first failed write reaches the server - the rest go straight to the spill file
+		self.assertEqual(self.writeRequestCount, 2)
+		self.assertEqual(len(self.writtenLines), 1)
+		self.assertFalse(self.icc.isServerAvailable)
+		self.assertTrue(self.icc.spillFileMgr.hasSpilledPoints())
+		self.assertEqual(self.icc.spillFileMgr.getSpilledCount(), self.POINT_COUNT - 1)
+		
+		self.isServerUp = True
+		self._waitFor(lambda: self.icc.isServerAvailable)
+		
+		self.assertFalse(self.icc.spillFileMgr.hasSpilledPoints())
+		self.assertEqual(self.icc.spillFileMgr.getReingestedCount(), self.POINT_COUNT - 1)
+		
+		# direct writes resume once drained
+		self.assertTrue(self.icc.storeSensorData(data = self._createSensorData(self.POINT_COUNT)))
+		
+		values = [float(line.split('value=')[1].split(',')[0].split(' ')[0]) for line in self.writtenLines]
+		
+		self.assertEqual(values, [20.0 + i for i in range(self.POINT_COUNT + 1)])
+	
+	def testFailedSpillResumesDirectWrites(self):
+		# the spill file's parent is a regular file, so every spill fails
+		blockingFileName = os.path.join(self.storagePath, 'notADirectory')
+		open(blockingFileName, 'w').close()
+		
+		self.icc.spillFileMgr.spillFileName = os.path.join(blockingFileName, 'spill.lp')
+		self.isServerUp = False
+		
+		self.assertFalse(self.icc.storeSensorData(data = self._createSensorData(0)))
+		self.assertTrue(self.icc.isServerAvailable)
+		
+		self.isServerUp = True
+		
+		self.assertTrue(self.icc.storeSensorData(data = self._createSensorData(1)))
+		self.assertEqual(len(self.writtenLines), 1)
+	
+	def _createSensorData(self, i: int) -> SensorData:
+		data = SensorData(name = ConfigConst.TEMP_SENSOR_NAME, typeID = ConfigConst.TEMP_SENSOR_TYPE)
+		data.setValue(20.0 + i)
+		data.timeStamp = (self.BASE_TIME + timedelta(seconds = i)).isoformat()
+		
+		return data
+	
+	def _waitFor(self, condition, timeoutSecs: float = 10.0):
+		endTime = time.monotonic() + timeoutSecs
+		
+		while not condition():
+			self.assertLess(time.monotonic(), endTime)
+			time.sleep(0.01)
+	
+if __name__ == "__main__":
+	unittest.main()
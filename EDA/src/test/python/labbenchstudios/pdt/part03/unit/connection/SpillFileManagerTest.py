@@ -0,0 +1,169 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from labbenchstudios.pdt.edge.connection.SpillFileManager import SpillFileManager
+
+class SpillFileManagerTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SpillFileManager. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	BUCKET_NAME = 'pdt-sensor-data'
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SpillFileManager class...")
+		
+	def setUp(self):
+		self.storagePath = tempfile.mkdtemp()
+		self.writtenLines = []
+		self.isWriteFailing = False
+		self.failAfterWriteCount = None
+		self.writeCount = 0
+		self.isHealthy = False
+		self.reingestCompleteCount = 0
+		
+		self.sfm = \
+			SpillFileManager( \
+				spillFileName = os.path.join(self.storagePath, 'spill.lp'), \
+				writeFunc = self._write, \
+				healthCheckFunc = lambda: self.isHealthy, \
+				reingestCompleteFunc = self._handleReingestComplete, \
+				maxPointsPerSec = 100000, batchSize = 100, checkIntervalSecs = 0.05)
+
+	def tearDown(self):
+		self.sfm.stopManager()
+		shutil.rmtree(self.storagePath, ignore_errors = True)
+	
+	def testReingestWithDuplicates(self):
+		lines = [self._createLine(i) for i in range(500)]
+		
+		self.assertTrue(self.sfm.appendPoints(self.BUCKET_NAME, lines))
+		self.assertTrue(self.sfm.appendPoints(self.BUCKET_NAME, lines[0:100]))
+		self.assertTrue(self.sfm.hasSpilledPoints())
+		
+		self.assertTrue(self.sfm.reingestSpilledPoints())
+		self.assertFalse(self.sfm.hasSpilledPoints())
+		self.assertEqual(self.writtenLines, lines)
+		self.assertEqual(self.sfm.getDuplicateCount(), 100)
+		
+	def testReingestFailureKeepsPoints(self):
+		lines = [self._createLine(i) for i in range(250)]
+		
+		self.sfm.appendPoints(self.BUCKET_NAME, lines)
+		self.isWriteFailing = True
+		
+		self.assertFalse(self.sfm.reingestSpilledPoints())
+		self.assertTrue(self.sfm.hasSpilledPoints())
+		
+		self.isWriteFailing = False
+		
+		self.assertTrue(self.sfm.reingestSpilledPoints())
+		self.assertEqual(sorted(self.writtenLines), sorted(lines))
+		
+	def testFailureMidDrainKeepsRemainingPoints(self):
+		lines = [self._createLine(i) for i in range(1000)]
+		
+		self.sfm.appendPoints(self.BUCKET_NAME, lines)
+		
+		# the third batch fails - the rest of the drain file goes back to the spill file
+		self.failAfterWriteCount = 2
+		
+		self.assertFalse(self.sfm.reingestSpilledPoints())
+		self.assertEqual(self.writtenLines, lines[0:200])
+		
+		self.failAfterWriteCount = None
+		
+		self.assertTrue(self.sfm.reingestSpilledPoints())
+		self.assertEqual(self.writtenLines, lines)
+		
+	def testDuplicateWindowIsBounded(self):
+		self.sfm.DEDUP_WINDOW_SIZE = 100
+		lines = [self._createLine(i) for i in range(300)]
+		
+		self.sfm.appendPoints(self.BUCKET_NAME, lines)
+		self.sfm.appendPoints(self.BUCKET_NAME, lines[250:300])
+		self.sfm.appendPoints(self.BUCKET_NAME, lines[0:50])
+		
+		# recent duplicates are skipped; older ones are (harmlessly) re-ingested
+		self.assertTrue(self.sfm.reingestSpilledPoints())
+		self.assertEqual(self.sfm.getDuplicateCount(), 50)
+		self.assertEqual(self.writtenLines, lines + lines[0:50])
+		
+	def testBackgroundReingest(self):
+		self.sfm.startManager()
+		self.sfm.appendPoints(self.BUCKET_NAME, [self._createLine(i) for i in range(50)])
+		
+		time.sleep(0.2)
+		self.assertEqual(len(self.writtenLines), 0)
+		
+		self.isHealthy = True
+		
+		for i in range(50):
+			if self.reingestCompleteCount > 0:
+				break
+			
+			time.sleep(0.05)
+		
+		self.assertEqual(len(self.writtenLines), 50)
+		self.assertEqual(self.reingestCompleteCount, 1)
+		
+	def testRateLimit(self):
+		self.sfm.maxPointsPerSec = 1000
+		self.sfm.appendPoints(self.BUCKET_NAME, [self._createLine(i) for i in range(400)])
+		
+		startTime = time.monotonic()
+		self.assertTrue(self.sfm.reingestSpilledPoints())
+		
+		# 400 points at 1000 points / sec should take roughly 0.4 secs
+		self.assertGreaterEqual(time.monotonic() - startTime, 0.3)
+		
+	def _createLine(self, i: int) -> str:
+		return 'TempSensor,deviceID=edge\\ 001,typeID=1013 value=%s %d' % (str(20.0 + i % 5), 1704067200000 + i * 1000)
+	
+	def _handleReingestComplete(self):
+		self.reingestCompleteCount += 1
+		
+	def _write(self, bucketName: str, lines: list):
+		if self.isWriteFailing or self.writeCount == self.failAfterWriteCount:
+			raise ConnectionError('Server unavailable')
+		
+		self.writeCount += 1
+		self.writtenLines.extend(lines)
+		
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,141 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from datetime import datetime, timedelta, timezone
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.data.ActuatorData import ActuatorData
+from labbenchstudios.pdt.data.SensorData import SensorData
+from labbenchstudios.pdt.data.SystemPerformanceData import SystemPerformanceData
+from labbenchstudios.pdt.edge.connection.SqlitePersistenceConnector import SqlitePersistenceConnector
+
+class SqlitePersistenceConnectorTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SqlitePersistenceConnector. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	BASE_TIME = datetime(2024, 1, 1, tzinfo = timezone.utc)
+	READING_COUNT = 20000
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SqlitePersistenceConnector class...")
+		
+	def setUp(self):
+		self.storagePath = tempfile.mkdtemp()
+		self.spc = SqlitePersistenceConnector(dbFile = os.path.join(self.storagePath, 'historian.db'))
+		self.spc.connectClient()
+
+	def tearDown(self):
+		self.spc.disconnectClient()
+		shutil.rmtree(self.storagePath, ignore_errors = True)
+	
+	def testStoreAndLoadSensorDataRange(self):
+		for i in range(1000):
+			typeID = ConfigConst.TEMP_SENSOR_TYPE if i % 2 else ConfigConst.HUMIDITY_SENSOR_TYPE
+			self.assertTrue(self.spc.storeSensorData(data = self._createSensorData(i, typeID)))
+		
+		dataList = \
+			self.spc.loadSensorData( \
+				typeID = ConfigConst.TEMP_SENSOR_TYPE, \
+				startDate = self.BASE_TIME + timedelta(seconds = 100), \
+				endDate = self.BASE_TIME + timedelta(seconds = 199))
+		
+		self.assertEqual(len(dataList), 50)
+		self.assertIsInstance(dataList[0], SensorData)
+		self.assertEqual(dataList[0].getValue(), 101.0)
+		self.assertEqual(dataList[-1].getValue(), 199.0)
+		self.assertFalse(dataList[0].hasErrorFlag())
+		
+		columns = self.spc.loadSensorDataColumns(typeID = ConfigConst.HUMIDITY_SENSOR_TYPE)
+		
+		self.assertEqual(len(columns['ts']), 500)
+		self.assertEqual(columns['value'][1], 2.0)
+	
+	def testStoreAndLoadOtherTypes(self):
+		ad = ActuatorData(typeCategoryID = ConfigConst.ENV_TYPE_CATEGORY, typeID = ConfigConst.HVAC_ACTUATOR_TYPE)
+		ad.setCommand(ConfigConst.COMMAND_ON)
+		ad.setAsResponse()
+		
+		spd = SystemPerformanceData()
+		spd.setCpuUtilization(12.5)
+		
+		self.assertTrue(self.spc.storeActuatorData(data = ad))
+		self.assertTrue(self.spc.storeSystemPerformanceData(data = spd))
+		
+		adList = self.spc.loadActuatorData(typeID = ConfigConst.HVAC_ACTUATOR_TYPE)
+		
+		self.assertEqual(adList[0].getCommand(), ConfigConst.COMMAND_ON)
+		self.assertTrue(adList[0].isResponseFlagEnabled())
+		self.assertEqual(self.spc.loadSystemPerformanceData()[0].getCpuUtilization(), 12.5)
+		self.assertEqual(self.spc.loadConnectionStateData(), [])
+	
+	def testRetentionPruning(self):
+		self.spc.retentionSecs = 3600
+		
+		# the first reading is far older than the retention period
+		self.spc.storeSensorData(data = self._createSensorData(0))
+		self.spc.storeSensorData(data = SensorData(typeID = ConfigConst.TEMP_SENSOR_TYPE))
+		
+		self.assertEqual(len(self.spc.loadSensorData()), 1)
+	
+	def testWriteThroughput(self):
+		dataList = [self._createSensorData(i) for i in range(self.READING_COUNT)]
+		
+		startTime = time.perf_counter()
+		
+		for sd in dataList:
+			self.spc.storeSensorData(data = sd)
+		
+		self.spc.flush()
+		
+		elapsed = time.perf_counter() - startTime
+		
+		self.assertEqual(self.spc.getRowsWritten(), self.READING_COUNT)
+		
+		logging.info("Committed %d readings in %f secs (%d readings/sec).", self.READING_COUNT, elapsed, int(self.READING_COUNT / elapsed))
+	
+	def _createSensorData(self, offsetSecs: int, typeID: int = ConfigConst.TEMP_SENSOR_TYPE) -> SensorData:
+		sd = SensorData(typeCategoryID = ConfigConst.ENV_TYPE_CATEGORY, typeID = typeID, name = ConfigConst.TEMP_SENSOR_NAME)
+		sd.setValue(float(offsetSecs))
+		sd.timeStamp = (self.BASE_TIME + timedelta(seconds = offsetSecs)).isoformat()
+		
+		return sd
+
+if __name__ == "__main__":
+	unittest.main()
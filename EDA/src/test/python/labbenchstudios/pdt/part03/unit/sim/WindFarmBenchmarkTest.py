@@ -0,0 +1,111 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import time
+import unittest
+
+import numpy as np
+
+from labbenchstudios.pdt.edge.simulation.WindFarmWakeModel import WindFarmWakeModel
+from labbenchstudios.pdt.edge.simulation.WindSpeedSampler import WindSpeedSampler
+from labbenchstudios.pdt.edge.simulation.WindTurbinePowerCurve import WindTurbinePowerCurve
+
+class WindFarmBenchmarkTest(unittest.TestCase):
+	"""
+	This test case class contains very basic benchmark tests for the
+	vectorized wind farm simulation. The timings are logged; the only
+	timing checks are relative (e.g. vectorized versus per-turbine), so
+	the results don't depend on the host's speed. It should not be considered
+	complete, but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT environment.
+	"""
+	
+	TURBINE_COUNT = 500
+	STEP_COUNT    = 200
+	ROW_COUNT     = 20
+	COLUMN_COUNT  = 25
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Running wind farm benchmarks...")
+		
+	def testPowerCurveFarmStep(self):
+		curve = WindTurbinePowerCurve()
+		sampler = WindSpeedSampler(randomSeed = 42)
+		
+		startTime = time.perf_counter()
+		
+		for i in range(self.STEP_COUNT):
+			farmPower = np.sum(curve.getPowerOutput(sampler.step(turbineCount = self.TURBINE_COUNT)))
+		
+		stepSecs = (time.perf_counter() - startTime) / self.STEP_COUNT
+		
+		# the same step, one turbine at a time
+		windSpeeds = sampler.step(turbineCount = self.TURBINE_COUNT)
+		startTime = time.perf_counter()
+		
+		perTurbinePower = sum(float(curve.getPowerOutput(float(windSpeed))) for windSpeed in windSpeeds)
+		
+		perTurbineStepSecs = time.perf_counter() - startTime
+		
+		logging.info( \
+			"%d turbine farm step: %.1f usec vectorized, %.1f usec one turbine at a time", \
+			self.TURBINE_COUNT, stepSecs * 1.0e6, perTurbineStepSecs * 1.0e6)
+		
+		self.assertTrue(np.isfinite(farmPower))
+		np.testing.assert_allclose(perTurbinePower, np.sum(curve.getPowerOutput(windSpeeds)))
+		self.assertLess(stepSecs, perTurbineStepSecs)
+		
+	def testWakeModelFarmStep(self):
+		wakeModel = WindFarmWakeModel(rowCount = self.ROW_COUNT, columnCount = self.COLUMN_COUNT)
+		powerCurve = WindTurbinePowerCurve()
+		sampler = WindSpeedSampler(randomSeed = 42)
+		turbineCount = wakeModel.getTurbineCount()
+		
+		self.assertEqual(turbineCount, self.TURBINE_COUNT)
+		
+		startTime = time.perf_counter()
+		wakeModel.getWakeDeficits(windDirection = 255.0)
+		directionSecs = time.perf_counter() - startTime
+		
+		# steps in the same wind direction reuse the cached wake deficits
+		startTime = time.perf_counter()
+		
+		for i in range(self.STEP_COUNT):
+			farmPower = np.sum(powerCurve.getPowerOutput( \
+				wakeModel.getEffectiveWindSpeeds(sampler.step(turbineCount = turbineCount), windDirection = 255.0)))
+		
+		stepSecs = (time.perf_counter() - startTime) / self.STEP_COUNT
+		
+		logging.info( \
+			"%d turbine farm: new wind direction %.1f ms, step %.1f usec", turbineCount, directionSecs * 1.0e3, stepSecs * 1.0e6)
+		
+		self.assertTrue(np.isfinite(farmPower))
+		self.assertLess(stepSecs, directionSecs)
+		
+if __name__ == "__main__":
+	unittest.main()
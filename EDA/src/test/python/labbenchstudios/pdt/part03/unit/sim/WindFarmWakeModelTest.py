@@ -0,0 +1,91 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+import logging
+import math
+import unittest
+
+import numpy as np
+
+from labbenchstudios.pdt.edge.simulation.WindFarmWakeModel import WindFarmWakeModel
+
+class WindFarmWakeModelTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	WindFarmWakeModel. It should not be considered complete, but serve
+	as a starting point for the student implementing additional
+	functionality within their Programming the IoT environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing WindFarmWakeModel class...")
+		
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+	
+	def _getJensenDeficit(self, downstreamDist: float, rotorDiameter: float = 8.0) -> float:
+		return \
+			(1.0 - math.sqrt(1.0 - WindFarmWakeModel.DEFAULT_THRUST_COEFF)) / \
+			(1.0 + WindFarmWakeModel.DEFAULT_WAKE_DECAY * downstreamDist / (rotorDiameter / 2)) ** 2
+	
+	def testRowWakeDeficits(self):
+		# one west to east row, 56 m (7 rotor diameters) apart
+		wakeModel = WindFarmWakeModel(rowCount = 1, columnCount = 3)
+		
+		np.testing.assert_allclose(wakeModel.getPositions(), [[0.0, 0.0], [56.0, 0.0], [112.0, 0.0]])
+		
+		# westerly wind: the first turbine is unwaked, the rest combine as the root sum of squares
+		np.testing.assert_allclose( \
+			wakeModel.getWakeDeficits(windDirection = 270.0), \
+			[0.0, self._getJensenDeficit(56.0), math.hypot(self._getJensenDeficit(56.0), self._getJensenDeficit(112.0))])
+		
+		# easterly wind reverses the order, and a northerly wind leaves the row unwaked
+		self.assertEqual(wakeModel.getWakeDeficits(windDirection = 90.0)[2], 0.0)
+		self.assertGreater(wakeModel.getWakeDeficits(windDirection = 90.0)[0], 0.0)
+		np.testing.assert_allclose(wakeModel.getWakeDeficits(windDirection = 0.0), [0.0, 0.0, 0.0])
+		
+		np.testing.assert_allclose( \
+			wakeModel.getEffectiveWindSpeeds(freeStreamSpeeds = 10.0, windDirection = 270.0), \
+			10.0 * (1.0 - wakeModel.getWakeDeficits(windDirection = 270.0)))
+		
+	def testWakeExpansion(self):
+		# a turbine offset crosswind is only waked once the wake has expanded far enough
+		wakeModel = WindFarmWakeModel(positions = [[0.0, 0.0], [56.0, 12.0], [400.0, -25.0]])
+		
+		deficits = wakeModel.getWakeDeficits(windDirection = 270.0)
+		
+		# the first turbine's wake radius is 4 + 0.075 * 56 = 8.2 m at 56 m, and 34 m at 400 m
+		# (the second turbine's wake, 37 m across from the third, has only expanded to 29.8 m)
+		self.assertEqual(deficits[1], 0.0)
+		self.assertAlmostEqual(deficits[2], self._getJensenDeficit(400.0))
+		
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,117 @@
+##
+# MIT License
+# 
+# Copyright (c) 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+
+import logging
+import unittest
+
+import numpy as np
+
+from labbenchstudios.pdt.edge.simulation.SensorDataGenerator import SensorDataGenerator
+from labbenchstudios.pdt.edge.simulation.WindSpeedSampler import WindSpeedSampler
+from labbenchstudios.pdt.edge.simulation.WindTurbinePowerCurve import WindTurbinePowerCurve
+from labbenchstudios.pdt.edge.simulation.WindTurbineSensorSimTask import WindTurbineSensorSimTask
+
+class WindTurbinePowerCurveTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	WindTurbinePowerCurve and WindSpeedSampler. It should not be
+	considered complete, but serve as a starting point for the student
+	implementing additional functionality within their Programming the
+	IoT environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing WindTurbinePowerCurve class...")
+		
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+	
+	def testParametricCurve(self):
+		curve = WindTurbinePowerCurve(cutInSpeed = 3.0, ratedSpeed = 12.0, cutOutSpeed = 25.0, rotorDiameter = 8.0)
+		
+		# P = Cp * (p/2) * A * V^3
+		expectedPower = lambda windSpeed: 0.35 * (1.225 / 2) * (np.pi * 64.0 / 4) * windSpeed ** 3
+		
+		self.assertAlmostEqual(curve.getRatedPower(), expectedPower(12.0))
+		self.assertAlmostEqual(curve.getPowerOutput(6.0), expectedPower(6.0), delta = expectedPower(6.0) * 0.001)
+		
+		powers = curve.getPowerOutput([0.0, 2.9, 12.0, 20.0, 24.9, 25.0, 40.0])
+		
+		np.testing.assert_allclose(powers, [0.0, 0.0, curve.getRatedPower(), curve.getRatedPower(), curve.getRatedPower(), 0.0, 0.0])
+		
+	def testTabulatedCurve(self):
+		curve = WindTurbinePowerCurve(cutInSpeed = 3.0, cutOutSpeed = 20.0, windSpeeds = [3.0, 5.0, 10.0, 12.0], powerValues = [0.0, 1000.0, 8000.0, 10000.0])
+		
+		self.assertEqual(curve.getRatedSpeed(), 12.0)
+		np.testing.assert_allclose(curve.getPowerOutput([2.0, 4.0, 11.0, 15.0, 21.0]), [0.0, 500.0, 9000.0, 10000.0, 0.0])
+		
+		with self.assertRaises(ValueError):
+			WindTurbinePowerCurve(windSpeeds = [5.0, 3.0], powerValues = [0.0, 1000.0])
+		
+	def testSimTaskUsesPowerCurve(self):
+		simTask = WindTurbineSensorSimTask(dataSet = SensorDataGenerator().generateOscillatingSensorDataSet(minValue = 2.0, maxValue = 20.0))
+		
+		for windSpeed in (2.0, 8.0, 30.0, 60.0):
+			simTask.setTargetValue(targetVal = windSpeed)
+			simTask.generateTelemetry()
+			
+			self.assertEqual(simTask.getWindSpeed(), windSpeed)
+			self.assertAlmostEqual(simTask.getPowerOutput(), simTask.getPowerCurve().getPowerOutput(windSpeed))
+			
+			if windSpeed < simTask.getPowerCurve().getCutInSpeed() or windSpeed >= simTask.getPowerCurve().getCutOutSpeed():
+				self.assertEqual(simTask.getPowerOutput(), 0.0)
+				self.assertEqual(simTask.getCalculatedRotorHubRpm(), 0.0)
+			else:
+				self.assertGreater(simTask.getCalculatedRotorHubRpm(), 0.0)
+		
+	def testWeibullSampling(self):
+		sampler = WindSpeedSampler(weibullShape = 2.0, weibullScale = 8.0, turbulenceIntensity = 0.1, meanHoldSteps = 10, randomSeed = 42)
+		
+		self.assertAlmostEqual(np.mean(sampler.sampleWeibull(100000)), sampler.getExpectedMeanWindSpeed(), delta = 0.1)
+		
+		# the farm-wide mean is held for meanHoldSteps steps, with per-turbine turbulence around it
+		windSpeeds = sampler.step(turbineCount = 1000)
+		meanWindSpeed = sampler.getMeanWindSpeed()
+		
+		for i in range(9):
+			sampler.step(turbineCount = 1000)
+		
+		self.assertEqual(sampler.getMeanWindSpeed(), meanWindSpeed)
+		self.assertEqual(windSpeeds.shape, (1000,))
+		self.assertAlmostEqual(np.mean(windSpeeds), meanWindSpeed, delta = meanWindSpeed * 0.02)
+		self.assertAlmostEqual(np.std(windSpeeds), meanWindSpeed * 0.1, delta = meanWindSpeed * 0.02)
+		
+		sampler.step(turbineCount = 1000)
+		
+		self.assertNotEqual(sampler.getMeanWindSpeed(), meanWindSpeed)
+		
+if __name__ == "__main__":
+	unittest.main()